@@ -0,0 +1,865 @@
+"""
+HTTP JSON API for server configurator
+Catalog, search, availability and configurator sessions over asyncio (stdlib only)
+
+Endpoints:
+    GET    /api/catalog?type=&in_stock=1&lang=&offset=&limit=   components in catalog order
+    GET    /api/components/<id>?lang=                           one component
+    GET    /api/search?q=&type=&lang=&limit=                    search by name, manufacturer or model
+    GET    /api/availability?ids=a,b&currency=                  price and availability of components
+    POST   /api/sessions                  {"language": "en"}    new session -> {"token": ...}
+    GET    /api/sessions/<token>?currency=                      current configuration with validation
+    DELETE /api/sessions/<token>                                end a session
+    GET    /api/sessions/<token>/available?type=&in_stock=1     components compatible with the configuration
+    POST   /api/sessions/<token>/components  {"id": ...}        add a component
+    DELETE /api/sessions/<token>/components/<id>                remove a component
+    GET    /api/sessions/<token>/export?format=&currency=&compact=1   export (streamed)
+    GET    /api/events?ids=a,b                                  catalog changes (Server-Sent Events)
+    GET    /api/sessions/<token>/events?catalog=1&ids=a,b       configuration changes (Server-Sent Events)
+    GET    /api/stats                                           request counts and latency per route
+
+Connections are kept alive (HTTP/1.1). Catalog responses carry an ETag made
+from the catalog version and the request, so If-None-Match is answered with
+304 without touching the catalog, and encoded bodies are cached per ETag.
+Exports are tagged with ServerConfigurator.export_etag() and streamed with
+chunked encoding. Handlers that walk the catalog or validate a configuration
+run in a thread pool; the event loop only parses requests and writes
+responses. Each response has a Server-Timing header, and per-route counts
+and latencies are kept in ApiStats.
+
+Event streams (see change_events.py) push configuration changes made by any
+client of a session, and price/availability changes from the catalog
+publisher, so tabs sharing a configuration do not poll. A configuration is
+published under the session lock, so streams see edits in the order they
+were made; sessions that end (removed, expired, evicted) close their streams.
+
+Usage: python api_server.py [--host 127.0.0.1] [--port 8080] [--workers N]
+       [--snapshot catalog.snap | --database catalog.db | --catalog-dir catalog/]
+       python api_server.py --load-test [--host 127.0.0.1] [--port 8080] [--connections 32] [--requests 20000]
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from catalog import Catalog, shared_publisher
+from change_events import CATALOG_TOPIC, EventHub, session_topic
+from configurator import ServerConfigurator
+from currency import CurrencyError, check_currency
+from data_models import Component, ComponentType
+from export_writer import FORMATS as EXPORT_FORMATS, component_json
+from sessions import SessionManager
+from translations import DEFAULT_LANGUAGE, LANGUAGES, localizer
+
+KEEP_ALIVE_TIMEOUT = 15.0
+HEARTBEAT = 15.0              # seconds between keep-alive comments on idle event streams
+COALESCE_DELAY = 0.05         # event streams wait this long after a change so bursts go out as one
+EXPIRE_INTERVAL = 60.0        # seconds between sweeps of idle sessions
+MAX_BODY = 64 * 1024
+MAX_HEADERS = 100
+MAX_IDS = 500                 # ids per availability request
+DEFAULT_LIMIT = 1000          # components per listing page
+MAX_LIMIT = 10_000
+BODY_CACHE_SIZE = 512         # encoded catalog responses kept per ETag
+
+CONTENT_TYPES = {"json": "application/json", "ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+class ApiError(Exception):
+    """Request that cannot be served, reported to the client as {"error": message}"""
+    
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+@dataclass
+class Request:
+    """Parsed HTTP request"""
+    method: str
+    path: str
+    query: Dict[str, str]
+    headers: Dict[str, str]  # lower-case names
+    body: bytes = b""
+    version: str = "HTTP/1.1"
+    
+    @property
+    def keep_alive(self) -> bool:
+        """Whether the connection stays open after the response"""
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return "keep-alive" in connection
+        return "close" not in connection
+    
+    def json(self) -> Dict:
+        """Body as a JSON object ({} when empty)"""
+        if not self.body:
+            return {}
+        try:
+            value = json.loads(self.body)
+        except ValueError:
+            raise ApiError(400, "Request body is not valid JSON")
+        if not isinstance(value, dict):
+            raise ApiError(400, "Request body must be a JSON object")
+        return value
+
+
+@dataclass
+class Response:
+    """Complete response (streamed exports are written directly)"""
+    status: int
+    body: bytes = b""
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class RouteStats:
+    """Counters of one route"""
+    requests: int = 0
+    errors: int = 0          # 4xx and 5xx responses
+    not_modified: int = 0    # 304 responses
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    
+    @property
+    def mean_seconds(self) -> float:
+        """Mean time to respond"""
+        return self.seconds / self.requests if self.requests else 0.0
+
+
+@dataclass
+class ApiStats:
+    """Request counters and latency per route (updated on the event loop only)"""
+    routes: Dict[str, RouteStats] = field(default_factory=dict)
+    
+    def record(self, route: str, status: int, seconds: float) -> None:
+        """Account one response"""
+        stats = self.routes.get(route)
+        if stats is None:
+            stats = self.routes[route] = RouteStats()
+        stats.requests += 1
+        stats.errors += status >= 400
+        stats.not_modified += status == 304
+        stats.seconds += seconds
+        stats.max_seconds = max(stats.max_seconds, seconds)
+    
+    def to_dict(self) -> Dict:
+        """JSON-ready counters"""
+        return {
+            route: {"requests": stats.requests, "errors": stats.errors, "not_modified": stats.not_modified,
+                    "mean_ms": round(stats.mean_seconds * 1000, 3), "max_ms": round(stats.max_seconds * 1000, 3)}
+            for route, stats in sorted(self.routes.items())
+        }
+    
+    def format(self) -> str:
+        """One line per route"""
+        return "\n".join(
+            f"{route:12} {stats.requests} requests, {stats.errors} errors, {stats.not_modified} not modified, "
+            f"mean {stats.mean_seconds * 1000:.2f}ms, max {stats.max_seconds * 1000:.2f}ms"
+            for route, stats in sorted(self.routes.items())
+        )
+
+
+def _etag(*key) -> str:
+    return '"' + hashlib.blake2b(repr(key).encode(), digest_size=12).hexdigest() + '"'
+
+
+def _matches(request: Request, etag: str) -> bool:
+    """If-None-Match check (weak comparison, as for GET)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+class _ChunkedWriter:
+    """Async writer for export_writer.write_export_async() sending HTTP chunks"""
+    
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+    
+    def write(self, data: bytes) -> None:
+        if data:
+            self.writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+    
+    async def drain(self) -> None:
+        await self.writer.drain()
+
+
+class ApiServer:
+    """
+    HTTP JSON API over a SessionManager
+    Catalog endpoints read the catalog the manager's sessions use
+    """
+    
+    # (method, path pattern, handler, route name); handlers marked cacheable only read the catalog
+    ROUTES = [
+        ("GET", r"/api/catalog", "_catalog", "catalog"),
+        ("GET", r"/api/components/(?P<component_id>[^/]+)", "_component", "component"),
+        ("GET", r"/api/search", "_search", "search"),
+        ("GET", r"/api/availability", "_availability", "availability"),
+        ("POST", r"/api/sessions", "_create_session", "session"),
+        ("GET", r"/api/sessions/(?P<token>[^/]+)", "_session", "session"),
+        ("DELETE", r"/api/sessions/(?P<token>[^/]+)", "_remove_session", "session"),
+        ("GET", r"/api/sessions/(?P<token>[^/]+)/available", "_available", "available"),
+        ("POST", r"/api/sessions/(?P<token>[^/]+)/components", "_add", "add"),
+        ("DELETE", r"/api/sessions/(?P<token>[^/]+)/components/(?P<component_id>[^/]+)", "_remove", "remove"),
+        ("GET", r"/api/sessions/(?P<token>[^/]+)/export", "_export", "export"),
+        ("GET", r"/api/events", "_events", "events"),
+        ("GET", r"/api/sessions/(?P<token>[^/]+)/events", "_events", "events"),
+        ("GET", r"/api/stats", "_stats", "stats"),
+    ]
+    CACHEABLE = {"catalog", "component", "search", "availability"}
+    STREAMING = {"export", "events"}  # async handlers writing the response themselves
+    
+    def __init__(self, sessions: Optional[SessionManager] = None, workers: Optional[int] = None,
+                 keep_alive_timeout: float = KEEP_ALIVE_TIMEOUT, allow_origin: Optional[str] = "*",
+                 body_cache_size: int = BODY_CACHE_SIZE, heartbeat: float = HEARTBEAT,
+                 coalesce_delay: float = COALESCE_DELAY, expire_interval: float = EXPIRE_INTERVAL):
+        self.sessions = sessions if sessions is not None else SessionManager()  # empty manager is falsy
+        self.executor = ThreadPoolExecutor(workers or min(32, (os.cpu_count() or 1) + 4),
+                                           thread_name_prefix="api")
+        self.keep_alive_timeout = keep_alive_timeout
+        self.allow_origin = allow_origin  # Access-Control-Allow-Origin for the web pages, None to omit
+        self.body_cache_size = body_cache_size
+        self.heartbeat = heartbeat
+        self.coalesce_delay = coalesce_delay
+        self.expire_interval = expire_interval
+        self.stats = ApiStats()
+        self.events = EventHub()
+        if self.sessions.source is not None:
+            self.sessions.source.add_listener(self.events.catalog_changed)
+        self.sessions.add_listener(self._session_ended)
+        self._routes = [(method, re.compile(pattern + "$"), getattr(self, handler), name)
+                        for method, pattern, handler, name in self.ROUTES]
+        self._bodies: "OrderedDict[str, bytes]" = OrderedDict()  # ETag -> encoded body
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers = set()  # open connections, closed by close()
+        self._sweeper: Optional[asyncio.Task] = None
+    
+    @property
+    def catalog(self) -> Catalog:
+        """Catalog served by the catalog endpoints"""
+        return self.sessions.catalog or self.sessions.source.current
+    
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        """Start listening (port 0 picks a free port, see .port)"""
+        self.events.bind(asyncio.get_running_loop())
+        self._server = await asyncio.start_server(self._connection, host, port, reuse_address=True)
+        self._sweeper = asyncio.create_task(self._sweep())
+        return self._server
+    
+    @property
+    def port(self) -> int:
+        """Port the server listens on"""
+        return self._server.sockets[0].getsockname()[1]
+    
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8080,
+                            on_ready: Optional[Callable[[], None]] = None) -> None:
+        """Start and serve until cancelled, on_ready() is called once the port is open"""
+        server = await self.start(host, port)
+        if on_ready is not None:
+            on_ready()
+        async with server:
+            await server.serve_forever()
+    
+    async def close(self) -> None:
+        """Stop listening, end event streams, close open connections and shut the thread pool down"""
+        if self.sessions.source is not None:
+            self.sessions.source.remove_listener(self.events.catalog_changed)
+        self.sessions.remove_listener(self._session_ended)
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+        self.events.close()
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+        self.executor.shutdown(wait=False)
+    
+    async def _sweep(self) -> None:
+        """Expire idle sessions now and then, so their event streams end"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.expire_interval)
+            await loop.run_in_executor(self.executor, self.sessions.expire)
+    
+    def _session_ended(self, token: str) -> None:
+        self.events.publish(session_topic(token), "closed", token)
+    
+    # Connections
+    
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one connection until it is closed or idle for keep_alive_timeout"""
+        self._writers.add(writer)
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.keep_alive_timeout)
+                except ApiError as e:
+                    writer.write(self._head(Response(e.status), {"error": str(e)}, keep_alive=False))
+                    await writer.drain()
+                    return
+                if request is None:
+                    return
+                start = time.perf_counter()
+                route, status = await self._respond(request, writer, start)
+                self.stats.record(route, status, time.perf_counter() - start)
+                if not request.keep_alive:
+                    return
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+    
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Request]:
+        """Next request on the connection, None at end of stream"""
+        try:
+            line = await reader.readline()
+            if not line:
+                return None
+            parts = line.decode("latin-1").split()
+            if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+                raise ApiError(400, "Malformed request line")
+            method, target, version = parts
+            headers: Dict[str, str] = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n"):
+                    break
+                if not line:
+                    raise asyncio.IncompleteReadError(b"", None)
+                if len(headers) >= MAX_HEADERS:
+                    raise ApiError(431, "Too many headers")
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+        except ValueError:  # line longer than the reader limit
+            raise ApiError(431, "Request line or header too long")
+        
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise ApiError(411, "Chunked request bodies are not supported, send Content-Length")
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise ApiError(400, "Invalid Content-Length")
+        if length > MAX_BODY:
+            raise ApiError(413, f"Request body over {MAX_BODY} bytes")
+        body = await reader.readexactly(length) if length > 0 else b""
+        url = urlsplit(target)
+        return Request(method.upper(), unquote(url.path), dict(parse_qsl(url.query, keep_blank_values=True)),
+                       headers, body, version)
+    
+    def _head(self, response: Response, error: Optional[Dict] = None, keep_alive: bool = True,
+              start: Optional[float] = None) -> bytes:
+        """Status line, headers and body of a complete response"""
+        if error is not None:
+            response.body = json.dumps(error).encode("utf-8")
+            response.headers.setdefault("Content-Type", "application/json; charset=utf-8")
+        headers = self._common_headers(keep_alive, start)
+        headers.update(response.headers)
+        if response.status not in (204, 304):
+            headers["Content-Length"] = str(len(response.body))
+        head = f"HTTP/1.1 {response.status} {HTTPStatus(response.status).phrase}\r\n" + \
+            "".join(f"{name}: {value}\r\n" for name, value in headers.items()) + "\r\n"
+        return head.encode("latin-1") + (response.body if response.status not in (204, 304) else b"")
+    
+    def _common_headers(self, keep_alive: bool, start: Optional[float]) -> Dict[str, str]:
+        headers = {"Connection": "keep-alive" if keep_alive else "close"}
+        if start is not None:
+            headers["Server-Timing"] = f"app;dur={(time.perf_counter() - start) * 1000:.3f}"
+        if self.allow_origin:
+            headers["Access-Control-Allow-Origin"] = self.allow_origin
+            headers["Access-Control-Expose-Headers"] = "ETag, Server-Timing"
+        return headers
+    
+    async def _respond(self, request: Request, writer: asyncio.StreamWriter, start: float) -> Tuple[str, int]:
+        """Route and answer one request, returns (route name, status)"""
+        route = "unknown"
+        try:
+            if request.method == "OPTIONS" and self.allow_origin:
+                response = Response(204, headers={
+                    "Access-Control-Allow-Methods": "GET, POST, DELETE, OPTIONS",
+                    "Access-Control-Allow-Headers": "Content-Type, If-None-Match",
+                    "Access-Control-Max-Age": "86400",
+                })
+            else:
+                handler, params, route = self._route(request)
+                if route in self.STREAMING:
+                    return route, await handler(request, writer, start, **params)
+                if route in self.CACHEABLE:
+                    response = await self._cached(request, route, handler, params)
+                else:
+                    response = await self._run(handler, request, **params)
+        except ApiError as e:
+            response = Response(e.status, headers=e.headers)
+            writer.write(self._head(response, {"error": str(e)}, request.keep_alive, start))
+        except ConnectionAbortedError:  # a streamed body broke after its headers: only closing tells the client
+            request.headers["connection"] = "close"
+            return route, 500
+        except ConnectionError:
+            raise
+        except Exception as e:  # a bug in a handler must not take the connection loop down
+            response = Response(500)
+            writer.write(self._head(response, {"error": f"Internal error: {e.__class__.__name__}"},
+                                    request.keep_alive, start))
+        else:
+            writer.write(self._head(response, None, request.keep_alive, start))
+        await writer.drain()
+        return route, response.status
+    
+    def _route(self, request: Request):
+        allowed = []
+        for method, pattern, handler, name in self._routes:
+            match = pattern.match(request.path)
+            if match:
+                if method == request.method:
+                    return handler, match.groupdict(), name
+                allowed.append(method)
+        if allowed:
+            raise ApiError(405, f"Method {request.method} not allowed", {"Allow": ", ".join(allowed)})
+        raise ApiError(404, f"Not found: {request.path}")
+    
+    async def _run(self, handler: Callable, *args, **kwargs) -> Response:
+        """Run a handler in the thread pool; a payload becomes a 200 JSON response"""
+        def call():
+            result = handler(*args, **kwargs)
+            if isinstance(result, Response):
+                return result
+            return Response(200, json.dumps(result).encode("utf-8"),
+                            {"Content-Type": "application/json; charset=utf-8"})
+        return await asyncio.get_running_loop().run_in_executor(self.executor, call)
+    
+    async def _cached(self, request: Request, route: str, handler: Callable, params: Dict) -> Response:
+        """Catalog response tagged with the catalog version: 304, cached body or handler result"""
+        catalog = self.catalog
+        etag = _etag(catalog.data.catalog_version, id(catalog), route, sorted(params.items()),
+                     sorted(request.query.items()))
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _matches(request, etag):
+            return Response(304, headers=headers)
+        body = self._bodies.get(etag)
+        if body is None:
+            response = await self._run(handler, request, catalog=catalog, **params)
+            if response.status != 200:
+                return response
+            body = response.body
+            self._bodies[etag] = body
+            while len(self._bodies) > self.body_cache_size:
+                self._bodies.popitem(last=False)
+        else:
+            self._bodies.move_to_end(etag)
+        headers["Content-Type"] = "application/json; charset=utf-8"
+        return Response(200, body, headers)
+    
+    # Request parameters
+    
+    @staticmethod
+    def _language(request: Request) -> str:
+        language = request.query.get("lang") or DEFAULT_LANGUAGE
+        if language not in LANGUAGES:
+            raise ApiError(400, f"Unknown language: {language}")
+        return language
+    
+    @staticmethod
+    def _component_type(request: Request, required: bool = False) -> Optional[ComponentType]:
+        value = request.query.get("type")
+        if not value:
+            if required:
+                raise ApiError(400, "Parameter 'type' is required")
+            return None
+        try:
+            return ComponentType(value)
+        except ValueError:
+            raise ApiError(400, f"Unknown component type: {value}")
+    
+    @staticmethod
+    def _currency(request: Request) -> Optional[str]:
+        value = request.query.get("currency")
+        try:
+            return check_currency(value) if value else None
+        except CurrencyError as e:
+            raise ApiError(400, str(e))
+    
+    @staticmethod
+    def _page(request: Request) -> Tuple[int, int]:
+        try:
+            offset = int(request.query.get("offset", 0))
+            limit = int(request.query.get("limit", DEFAULT_LIMIT))
+        except ValueError:
+            raise ApiError(400, "offset and limit must be integers")
+        if offset < 0 or not 0 <= limit <= MAX_LIMIT:
+            raise ApiError(400, f"offset must be >= 0 and limit between 0 and {MAX_LIMIT}")
+        return offset, limit
+    
+    @staticmethod
+    def _flag(request: Request, name: str) -> bool:
+        return request.query.get(name, "") in ("1", "true", "yes")
+    
+    def _session_for(self, token: str) -> ServerConfigurator:
+        session = self.sessions.get(token)
+        if session is None:
+            raise ApiError(404, "Unknown or expired session")
+        return session
+    
+    @staticmethod
+    def _listing(components: Sequence[Component], language: str, offset: int, limit: int, version: int) -> Dict:
+        views = localizer(language).components(components[offset:offset + limit], version)
+        return {"total": len(components), "offset": offset,
+                "components": [component_json(view) for view in views]}
+    
+    # Catalog handlers (run in the thread pool, results cached per ETag)
+    
+    def _catalog(self, request: Request, catalog: Catalog) -> Dict:
+        component_type = self._component_type(request)
+        offset, limit = self._page(request)
+        data = catalog.data
+        if component_type is None:
+            components = list(data.components.values())
+            if self._flag(request, "in_stock"):
+                components = [component for component in components if component.availability]
+        elif self._flag(request, "in_stock"):
+            components = data.get_available_components_by_type(component_type)
+        else:
+            components = data.get_components_by_type(component_type)
+        return self._listing(components, self._language(request), offset, limit, data.version)
+    
+    def _component(self, request: Request, catalog: Catalog, component_id: str) -> Dict:
+        component = catalog.data.components.get(component_id)
+        if component is None:
+            raise ApiError(404, f"Component {component_id} not found")
+        return component_json(localizer(self._language(request)).component(component, catalog.data.version))
+    
+    def _search(self, request: Request, catalog: Catalog) -> Dict:
+        query = request.query.get("q", "").strip()
+        if not query:
+            raise ApiError(400, "Parameter 'q' is required")
+        offset, limit = self._page(request)
+        components = catalog.data.search_components(query, self._component_type(request))
+        return self._listing(components, self._language(request), offset, limit, catalog.data.version)
+    
+    def _availability(self, request: Request, catalog: Catalog) -> Dict:
+        ids = [component_id for component_id in request.query.get("ids", "").split(",") if component_id]
+        if not ids:
+            raise ApiError(400, "Parameter 'ids' is required")
+        if len(ids) > MAX_IDS:
+            raise ApiError(400, f"At most {MAX_IDS} ids per request")
+        currency = self._currency(request)
+        columns = catalog.data.price_columns() if currency else None
+        result = {}
+        for component_id in ids:
+            component = catalog.data.components.get(component_id)
+            if component is None:
+                result[component_id] = None
+                continue
+            result[component_id] = {
+                "price": columns.price(component_id, currency) if currency else component.price,
+                "availability": component.availability
+            }
+        return {"currency": currency, "components": result}
+    
+    # Session handlers (run in the thread pool)
+    
+    def _configuration(self, token: str, session: ServerConfigurator, currency: Optional[str] = None) -> Dict:
+        config = session.get_current_configuration(currency)
+        return {
+            "token": token,
+            "id": config.id,
+            "name": config.name,
+            "language": session.language,
+            "total_price": config.total_price,
+            "currency": config.currency,
+            "is_valid": config.is_valid,
+            "validation_errors": config.validation_errors,
+            "components": {
+                component_type.value: [component_json(view) for view in session.translations.components(components, session.data.version)]
+                for component_type, components in config.components.items()
+            },
+            "missing_components": [component.id for component in session.missing_components],
+        }
+    
+    def _create_session(self, request: Request) -> Response:
+        language = request.json().get("language", DEFAULT_LANGUAGE)
+        if language not in LANGUAGES:
+            raise ApiError(400, f"Unknown language: {language}")
+        token, session = self.sessions.create(language)
+        return Response(201, json.dumps(self._configuration(token, session)).encode("utf-8"),
+                        {"Content-Type": "application/json; charset=utf-8"})
+    
+    def _session(self, request: Request, token: str) -> Dict:
+        return self._configuration(token, self._session_for(token), self._currency(request))
+    
+    def _remove_session(self, request: Request, token: str) -> Dict:
+        if not self.sessions.remove(token):  # the manager's listener closes the streams
+            raise ApiError(404, "Unknown or expired session")
+        return {"removed": True}
+    
+    def _available(self, request: Request, token: str) -> Dict:
+        session = self._session_for(token)
+        component_type = self._component_type(request, required=True)
+        offset, limit = self._page(request)
+        components = session.get_available_components(component_type, self._flag(request, "in_stock"))
+        views = session.translations.components(components[offset:offset + limit], session.data.version)
+        return {"total": len(components), "offset": offset, "components": [component_json(view) for view in views]}
+    
+    def _add(self, request: Request, token: str) -> Response:
+        session = self._session_for(token)
+        component_id = request.json().get("id")
+        if not isinstance(component_id, str):
+            raise ApiError(400, "Field 'id' is required")
+        if component_id not in session.data.components:
+            raise ApiError(404, f"Component {component_id} not found")
+        with session.lock:  # published in the order the edits were made
+            added, errors = session.add_component(component_id)
+            configuration = self._configuration(token, session)
+            if added:
+                self.events.publish(session_topic(token), "configuration", token, configuration)
+        payload = {"added": added, "errors": errors, "configuration": configuration}
+        return Response(200 if added else 409, json.dumps(payload).encode("utf-8"),
+                        {"Content-Type": "application/json; charset=utf-8"})
+    
+    def _remove(self, request: Request, token: str, component_id: str) -> Dict:
+        session = self._session_for(token)
+        with session.lock:  # published in the order the edits were made
+            if not session.remove_component(component_id):
+                raise ApiError(404, f"Component {component_id} is not in the configuration")
+            configuration = self._configuration(token, session)
+            self.events.publish(session_topic(token), "configuration", token, configuration)
+        return {"removed": True, "configuration": configuration}
+    
+    def _stats(self, request: Request) -> Dict:
+        return {"routes": self.stats.to_dict(), "sessions": vars(self.sessions.stats()),
+                "events": vars(self.events.stats())}
+    
+    # Export (streamed on the event loop)
+    
+    async def _export(self, request: Request, writer: asyncio.StreamWriter, start: float, token: str) -> int:
+        format_type = request.query.get("format", "json")
+        if format_type not in EXPORT_FORMATS:
+            raise ApiError(400, f"Unsupported format: {format_type}")
+        currency = self._currency(request)
+        compact = self._flag(request, "compact")
+        loop = asyncio.get_running_loop()
+        session = await loop.run_in_executor(self.executor, self._session_for, token)
+        etag = await loop.run_in_executor(self.executor, session.export_etag, format_type, currency, compact)
+        
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _matches(request, etag):
+            writer.write(self._head(Response(304, headers=headers), None, request.keep_alive, start))
+            await writer.drain()
+            return 304
+        
+        chunked = request.version != "HTTP/1.0"
+        keep_alive = request.keep_alive and chunked
+        headers["Content-Type"] = CONTENT_TYPES[format_type] + "; charset=utf-8"
+        all_headers = self._common_headers(keep_alive, start)
+        all_headers.update(headers)
+        if chunked:
+            all_headers["Transfer-Encoding"] = "chunked"
+        writer.write((f"HTTP/1.1 200 OK\r\n" + "".join(f"{name}: {value}\r\n" for name, value in all_headers.items())
+                      + "\r\n").encode("latin-1"))
+        try:
+            await session.write_export_async(_ChunkedWriter(writer) if chunked else writer,
+                                             format_type, currency, compact)
+        except Exception as e:  # headers are out, the client sees a truncated body
+            raise ConnectionAbortedError(f"Export failed: {e}") from e
+        if chunked:
+            writer.write(b"0\r\n\r\n")
+        else:
+            request.headers["connection"] = "close"  # HTTP/1.0: the end of the body is the end of the stream
+        await writer.drain()
+        return 200
+    
+    # Event streams (Server-Sent Events, one subscriber per stream)
+    
+    async def _events(self, request: Request, writer: asyncio.StreamWriter, start: float,
+                      token: Optional[str] = None) -> int:
+        """
+        Stream events until the client disconnects, the session ends or the server closes
+        Session streams start with the current configuration and include catalog
+        events with catalog=1; ids= limits component events to those components
+        """
+        loop = asyncio.get_running_loop()
+        topics = [CATALOG_TOPIC]
+        first = None
+        if token is not None:
+            session = await loop.run_in_executor(self.executor, self._session_for, token)
+            topics = [session_topic(token)] + (topics if self._flag(request, "catalog") else [])
+            first = await loop.run_in_executor(self.executor, self._configuration, token, session)
+        ids = request.query.get("ids")
+        subscriber = self.events.subscribe(topics, set(filter(None, ids.split(","))) if ids else None)
+        
+        request.headers["connection"] = "close"  # the stream is the rest of the connection
+        headers = self._common_headers(False, start)
+        headers.update({"Content-Type": "text/event-stream; charset=utf-8", "Cache-Control": "no-cache"})
+        writer.write((f"HTTP/1.1 200 OK\r\n" + "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+                      + "\r\n").encode("latin-1") + f"retry: {int(self.heartbeat * 1000)}\n\n".encode())
+        if first is not None:
+            writer.write(f"event: configuration\ndata: {json.dumps(first)}\n\n".encode("utf-8"))
+        try:
+            await writer.drain()
+            while not subscriber.closed:
+                events = await subscriber.next_events(self.heartbeat, self.coalesce_delay)
+                if not events:
+                    if subscriber.closed:
+                        break
+                    writer.write(b": ping\n\n")  # finds clients that went away
+                for event in events:
+                    writer.write(event.sse())
+                    if event.kind == "closed":
+                        subscriber.close()
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.events.unsubscribe(subscriber)
+        return 200
+
+
+# Load test
+
+@dataclass
+class LoadStats:
+    """Results of a load test run"""
+    requests: int = 0
+    errors: int = 0           # responses with status >= 400
+    not_modified: int = 0
+    seconds: float = 0.0
+    latencies: List[float] = field(default_factory=list, repr=False)
+    
+    @property
+    def requests_per_second(self) -> float:
+        """Throughput"""
+        return self.requests / self.seconds if self.seconds else 0.0
+    
+    def percentile(self, fraction: float) -> float:
+        """Latency below which this fraction of requests completed, in seconds"""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+    
+    def format(self) -> str:
+        """One-line summary"""
+        return (f"{self.requests} requests in {self.seconds:.3f}s ({self.requests_per_second:,.0f}/s), "
+                f"{self.errors} errors, {self.not_modified} not modified, latency p50 "
+                f"{self.percentile(0.5) * 1000:.2f}ms, p99 {self.percentile(0.99) * 1000:.2f}ms")
+
+
+async def read_response(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str], bytes]:
+    """(status, lower-case headers, body) of one HTTP/1.1 response"""
+    status = int((await reader.readline()).split()[1])
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if headers.get("transfer-encoding") == "chunked":
+        parts = []
+        while True:
+            line = await reader.readline()
+            if not line:  # the server closed a broken stream before the last chunk
+                raise asyncio.IncompleteReadError(b"".join(parts), None)
+            size = int(line.strip(), 16)
+            data = await reader.readexactly(size + 2)
+            if size == 0:
+                break
+            parts.append(data[:-2])
+        return status, headers, b"".join(parts)
+    return status, headers, await reader.readexactly(int(headers.get("content-length", 0)))
+
+
+async def _load_connection(host: str, port: int, requests: List[Tuple[str, str, bytes]],
+                           revalidate: bool, stats: LoadStats) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    etags: Dict[str, str] = {}
+    try:
+        for method, path, body in requests:
+            extra = f"If-None-Match: {etags[path]}\r\n" if revalidate and path in etags else ""
+            if body:
+                extra += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+            start = time.perf_counter()
+            writer.write(f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n{extra}\r\n".encode("latin-1") + body)
+            status, headers, _ = await read_response(reader)
+            stats.latencies.append(time.perf_counter() - start)
+            stats.requests += 1
+            stats.errors += status >= 400
+            stats.not_modified += status == 304
+            if "etag" in headers:
+                etags[path] = headers["etag"]
+    finally:
+        writer.close()
+
+
+async def load_test(host: str, port: int, paths: Sequence, connections: int = 32, requests: int = 20_000,
+                    revalidate: bool = False) -> LoadStats:
+    """
+    Send requests over keep-alive connections, cycling through paths
+    paths are URLs for GET or (method, path, JSON body) tuples; with revalidate
+    repeated GETs send If-None-Match with the last ETag seen on the connection
+    """
+    plan = [(item, "") if isinstance(item, str) else item for item in paths]
+    plan = [("GET", item[0], b"") if len(item) == 2 else (item[0], item[1], json.dumps(item[2]).encode())
+            for item in plan]
+    per_connection = [[plan[(c + i * connections) % len(plan)] for i in range(requests // connections)]
+                      for c in range(connections)]
+    stats = LoadStats()
+    start = time.perf_counter()
+    await asyncio.gather(*(_load_connection(host, port, sequence, revalidate, stats)
+                           for sequence in per_connection))
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def main(argv: List[str]) -> None:
+    """Serve the API, or run a load test against a running server"""
+    options = {}
+    arguments = iter(argv)
+    for argument in arguments:
+        if argument in ("-h", "--help"):
+            print(__doc__)
+            return
+        options[argument] = True if argument == "--load-test" else next(arguments, None)
+    host = options.get("--host", "127.0.0.1")
+    port = int(options.get("--port", 8080))
+    
+    if options.get("--load-test"):
+        stats = asyncio.run(load_test(
+            host, port, ["/api/catalog?type=processor", "/api/search?q=xeon", "/api/components/hp_ml350g4p",
+                         "/api/availability?ids=hp_ml350g4p,intel_xeon_e5620"],
+            connections=int(options.get("--connections", 32)), requests=int(options.get("--requests", 20_000))
+        ))
+        print(stats.format())
+        return
+    
+    source = shared_publisher(catalog_dir=options.get("--catalog-dir"), snapshot_path=options.get("--snapshot"),
+                              database_path=options.get("--database"))
+    server = ApiServer(SessionManager(source=source),
+                       workers=int(options["--workers"]) if "--workers" in options else None)
+    try:
+        asyncio.run(server.serve_forever(host, port, on_ready=lambda: print(
+            f"Serving on http://{host}:{server.port}/api/ ({len(server.catalog.data.components)} components)",
+            flush=True
+        )))
+    except KeyboardInterrupt:
+        print(server.stats.format())
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,301 @@
+"""
+Vectorized batch validation
+Evaluates compatibility rules for many configurations at once using NumPy
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from conditions import BatchContext, ConditionContext, MissingValue, attribute_value, compile_batch_condition
+from data_models import Component, ComponentType, CompatibilityType, ServerConfiguratorData
+
+_UNSEEN = object()  # cache miss marker (None is a cached "text value")
+
+
+class BatchValidator:
+    """
+    Validates many configurations against the rules of one catalog version
+    
+    Configurations are encoded as a dense count matrix (configurations x components)
+    restricted to the component ids referenced by rules. Every rule check then
+    becomes a column-wise comparison over the whole batch. Dense rather than
+    sparse: rules reference few components, so the matrix is narrow, and the
+    checks slice whole columns, which a CSR row layout would make slower.
+    
+    CONDITION rules are evaluated as array expressions too (see
+    compile_batch_condition): the same pass over the batch accumulates the
+    aggregates they read, per-type counts, attribute sums and the attributes of
+    the first component of a type, as columns of a second matrix. Only rows
+    holding a text value where a condition expects a number, and conditions
+    comparing text, go through the per-configuration closure.
+    """
+    
+    def __init__(self, data: ServerConfiguratorData):
+        self.version = data.version
+        self.columns: Dict[str, int] = {}
+        self.component_types: Dict[str, ComponentType] = {}
+        self.messages: List[str] = []
+        
+        # (check indexes, columns) per check kind, in rule order
+        required, excluded_a, excluded_b = [], [], []
+        too_many, too_few = [], []
+        # (check index, primary column or None, rule, array form or None)
+        self._conditions: List[tuple] = []
+        # Condition aggregates: key -> column of the feature or attribute matrix
+        self._features: Dict[tuple, int] = {}
+        self._attributes: Dict[tuple, int] = {}
+        # Per component type: feature columns added per group (len) and per component, attribute columns
+        self._group_features: Dict[ComponentType, List[int]] = {}
+        self._component_features: Dict[ComponentType, List[tuple]] = {}
+        self._first_attributes: Dict[ComponentType, List[tuple]] = {}
+        
+        for rule in data.compatibility_rules:
+            primary = data.components.get(rule.primary_component_id)
+            
+            if rule.rule_type == CompatibilityType.REQUIRED:
+                if primary:
+                    required.append((len(self.messages), self._column(primary)))
+                    self.messages.append(f"Required component {rule.primary_component_id} is missing")
+            
+            elif rule.rule_type == CompatibilityType.EXCLUDED:
+                secondary = data.components.get(rule.secondary_component_id) if rule.secondary_component_id else None
+                if primary and secondary:
+                    excluded_a.append((len(self.messages), self._column(primary)))
+                    excluded_b.append(self._column(secondary))
+                    self.messages.append(
+                        f"Components {rule.primary_component_id} and {rule.secondary_component_id} are incompatible"
+                    )
+            
+            elif rule.rule_type == CompatibilityType.LIMITED:
+                if primary:
+                    column = self._column(primary)
+                    if rule.max_quantity:
+                        too_many.append((len(self.messages), column, rule.max_quantity))
+                        self.messages.append(
+                            f"Too many {rule.primary_component_id} components (max: {rule.max_quantity})"
+                        )
+                    if rule.min_quantity:
+                        too_few.append((len(self.messages), column, rule.min_quantity))
+                        self.messages.append(
+                            f"Not enough {rule.primary_component_id} components (min: {rule.min_quantity})"
+                        )
+            
+            elif rule.rule_type == CompatibilityType.CONDITION:
+                if primary or not rule.primary_component_id:
+                    column = self._column(primary) if primary else None
+                    batch = compile_batch_condition(rule.condition or "")
+                    if batch is not None:
+                        for key in batch[1]:
+                            self._aggregate(key)
+                    self._conditions.append((len(self.messages), column, rule, batch and batch[0]))
+                    self.messages.append(f"Condition {rule.id} failed: {rule.condition}")
+        
+        self._required = self._arrays(required, 2)
+        self._excluded = self._arrays(excluded_a, 2) + (np.array(excluded_b, dtype=np.intp),)
+        self._too_many = self._arrays(too_many, 3)
+        self._too_few = self._arrays(too_few, 3)
+    
+    def _column(self, component: Component) -> int:
+        """Intern component id as a count matrix column"""
+        if component.id not in self.columns:
+            self.columns[component.id] = len(self.columns)
+            self.component_types[component.id] = component.component_type
+        return self.columns[component.id]
+    
+    def _aggregate(self, key: tuple) -> None:
+        """Register a condition aggregate as a matrix column"""
+        kind, component_type, argument = key
+        types = list(ComponentType) if component_type is None else [component_type]
+        if kind == "attribute":
+            if key not in self._attributes:
+                self._attributes[key] = len(self._attributes)
+                self._first_attributes.setdefault(component_type, []).append((self._attributes[key], argument))
+            return
+        if key in self._features:
+            return
+        column = self._features[key] = len(self._features)
+        for each_type in types:
+            if kind == "count" and argument is None:
+                self._group_features.setdefault(each_type, []).append(column)
+            else:
+                self._component_features.setdefault(each_type, []).append((column, kind, argument))
+    
+    def _contributions(self, component_type: ComponentType, component: Component) -> Optional[tuple]:
+        """(feature column, amount) added by a component of a group, None if an attribute is text"""
+        contributions = []
+        for column, kind, argument in self._component_features[component_type]:
+            if kind == "count":
+                if component.id == argument:
+                    contributions.append((column, 1.0))
+                continue
+            try:
+                value = attribute_value(component, argument)
+            except MissingValue:  # counts as zero
+                continue
+            if not isinstance(value, (int, float)):
+                return None
+            contributions.append((column, float(value)))
+        return tuple(contributions)
+    
+    def _first_values(self, component_type: ComponentType, component: Component) -> Optional[tuple]:
+        """(attribute column, value) of the first component of a group, None if an attribute is text"""
+        values = []
+        for column, name in self._first_attributes[component_type]:
+            try:
+                value = attribute_value(component, name)
+            except MissingValue:  # left invalid
+                continue
+            if not isinstance(value, (int, float)):
+                return None
+            values.append((column, float(value)))
+        return tuple(values)
+    
+    @staticmethod
+    def _arrays(checks: List[tuple], width: int) -> tuple:
+        """Transpose check tuples into index arrays"""
+        return tuple(np.array([check[i] for check in checks], dtype=np.intp) for i in range(width))
+    
+    def encode(self, configurations: Iterable[Dict[ComponentType, List[Component]]]) -> np.ndarray:
+        """
+        Encode configurations as a dense component count matrix (one row per configuration)
+        Like validate_configuration, a component is only counted under its own type
+        """
+        return self._encode(configurations)[0]
+    
+    def _encode(self, configurations: Iterable[Dict[ComponentType, List[Component]]]
+                ) -> Tuple[np.ndarray, BatchContext, List[int]]:
+        """Count matrix, condition aggregates and rows whose conditions need the per-row closure"""
+        rows: List[int] = []
+        cols: List[int] = []
+        columns = self.columns
+        component_types = self.component_types
+        count = 0
+        
+        feature_rows: List[int] = []
+        feature_cols: List[int] = []
+        amounts: List[float] = []
+        attribute_rows: List[int] = []
+        attribute_cols: List[int] = []
+        values: List[float] = []
+        text_rows: List[int] = []
+        # One entry per component type read by conditions: (type, group columns, caches by component id)
+        plans = [
+            (component_type, self._group_features.get(component_type, ()),
+             {} if component_type in self._component_features else None,
+             {} if component_type in self._first_attributes else None)
+            for component_type in ComponentType
+            if component_type in self._group_features or component_type in self._component_features
+            or component_type in self._first_attributes
+        ]
+        
+        for row, configuration in enumerate(configurations):
+            count += 1
+            for component_type, components in configuration.items():
+                for component in components:
+                    column = columns.get(component.id)
+                    if column is not None and component_types[component.id] == component_type:
+                        rows.append(row)
+                        cols.append(column)
+            
+            text = False
+            for component_type, group_columns, contributions, first_values in plans:
+                components = configuration.get(component_type)
+                if not components:
+                    continue
+                for column in group_columns:
+                    feature_rows.append(row)
+                    feature_cols.append(column)
+                    amounts.append(len(components))
+                if contributions is not None:
+                    for component in components:
+                        added = contributions.get(component.id, _UNSEEN)
+                        if added is _UNSEEN:
+                            added = contributions[component.id] = self._contributions(component_type, component)
+                        if added is None:
+                            text = True
+                            continue
+                        for column, amount in added:
+                            feature_rows.append(row)
+                            feature_cols.append(column)
+                            amounts.append(amount)
+                if first_values is not None:
+                    first = components[0]
+                    found = first_values.get(first.id, _UNSEEN)
+                    if found is _UNSEEN:
+                        found = first_values[first.id] = self._first_values(component_type, first)
+                    if found is None:
+                        text = True
+                        continue
+                    for column, value in found:
+                        attribute_rows.append(row)
+                        attribute_cols.append(column)
+                        values.append(value)
+            if text:
+                text_rows.append(row)
+        
+        width = len(columns)
+        flat = np.array(rows, dtype=np.intp) * width + np.array(cols, dtype=np.intp)
+        counts = np.bincount(flat, minlength=count * width).reshape(count, width)
+        
+        aggregates: Dict[tuple, tuple] = {}
+        if self._features:
+            width = len(self._features)
+            flat = np.array(feature_rows, dtype=np.intp) * width + np.array(feature_cols, dtype=np.intp)
+            features = np.bincount(flat, weights=amounts, minlength=count * width).reshape(count, width)
+            for key, column in self._features.items():
+                aggregates[key] = (features[:, column], None)
+        if self._attributes:
+            attributes = np.full((count, len(self._attributes)), np.nan)
+            attributes[attribute_rows, attribute_cols] = values
+            missing = np.isnan(attributes)
+            for key, column in self._attributes.items():
+                aggregates[key] = (attributes[:, column], missing[:, column])
+        return counts, BatchContext(count, aggregates), text_rows
+    
+    def validate(self, configurations: Iterable[Dict[ComponentType, List[Component]]]) -> List[List[str]]:
+        """Validate configurations, returns one error list per configuration"""
+        if self._conditions:
+            configurations = list(configurations)
+        counts, context, text_rows = self._encode(configurations)
+        errors: List[List[str]] = [[] for _ in range(counts.shape[0])]
+        if not self.messages:
+            return errors
+        
+        failed = np.zeros((counts.shape[0], len(self.messages)), dtype=bool)
+        
+        index, column = self._required
+        failed[:, index] = counts[:, column] == 0
+        
+        index, column_a, column_b = self._excluded
+        failed[:, index] = (counts[:, column_a] > 0) & (counts[:, column_b] > 0)
+        
+        index, column, limit = self._too_many
+        failed[:, index] = counts[:, column] > limit
+        
+        index, column, limit = self._too_few
+        failed[:, index] = counts[:, column] < limit
+        
+        # Conditions run as array expressions, with the per-configuration closure
+        # only for conditions on text and rows holding text values
+        contexts: Dict[int, ConditionContext] = {}
+        for index, column, rule, batch in self._conditions:
+            if batch is not None:
+                failed[:, index] = batch(context) if column is None else batch(context) & (counts[:, column] > 0)
+                rows = text_rows
+            else:
+                rows = range(counts.shape[0])
+            if column is not None:
+                rows = [row for row in rows if counts[row, column]] if batch is not None \
+                    else np.flatnonzero(counts[:, column]).tolist()
+            for row in rows:
+                if row not in contexts:
+                    contexts[row] = ConditionContext(configurations[row])
+                failed[row, index] = rule.compiled_condition(contexts[row]) is False
+        
+        # Row-major order keeps each configuration's errors in rule order
+        messages = self.messages
+        for row, check in zip(*(axis.tolist() for axis in np.nonzero(failed))):
+            errors[row].append(messages[check])
+        
+        return errors
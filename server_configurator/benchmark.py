@@ -0,0 +1,702 @@
+"""
+Benchmarks for server configurator
+Usage: python benchmark.py [benchmark_name ...]
+"""
+
+import random
+import sys
+import time
+
+from sample_data import create_sample_data
+
+
+def timed(function, *args):
+    """Run function once, return (result, seconds)"""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def random_configurations(data, count, seed=42):
+    """Generate random configurations over catalog components"""
+    rng = random.Random(seed)
+    components = list(data.components.values())
+    configurations = []
+    for _ in range(count):
+        configuration = {}
+        for component in rng.choices(components, k=rng.randint(1, 12)):
+            configuration.setdefault(component.component_type, []).append(component)
+        configurations.append(configuration)
+    return configurations
+
+
+def synthetic_catalog(count, seed=42):
+    """Catalog with `count` generated components (cycling through sample components)"""
+    from data_models import Component, ServerConfiguratorData
+    
+    templates = list(create_sample_data().components.values())
+    rng = random.Random(seed)
+    data = ServerConfiguratorData()
+    for i in range(count):
+        template = templates[i % len(templates)]
+        data.add_component(Component(
+            id=f"{template.id}_{i}",
+            name=f"{template.name} #{i}",
+            component_type=template.component_type,
+            manufacturer=template.manufacturer,
+            model=f"{template.model}-{i}",
+            attributes=list(template.attributes),
+            price=round(rng.uniform(10, 5000), 2),
+            availability=rng.random() > 0.1,
+            description=template.description
+        ))
+    return data
+
+
+def bench_validate_many(count=100_000):
+    """Scalar validate_configuration loop vs vectorized validate_many"""
+    data = create_sample_data()
+    configurations = random_configurations(data, count)
+    
+    scalar, scalar_time = timed(lambda: [data.validate_configuration(c) for c in configurations])
+    batch, batch_time = timed(data.validate_many, configurations)
+    assert scalar == batch
+    
+    print(f"validate_many: {count} configurations")
+    print(f"  scalar loop:   {scalar_time:.3f}s")
+    print(f"  validate_many: {batch_time:.3f}s ({scalar_time / batch_time:.1f}x)")
+
+
+def bench_compiled_rules(count=100_000):
+    """Interpreted validate_configuration vs generated validator"""
+    data = create_sample_data()
+    configurations = random_configurations(data, count)
+    
+    validate, compile_time = timed(data.compile_rules)
+    interpreted, interpreted_time = timed(lambda: [data.validate_configuration(c) for c in configurations])
+    compiled, compiled_time = timed(lambda: [validate(c) for c in configurations])
+    assert interpreted == compiled
+    
+    print(f"compiled_rules: {count} configurations, {len(data.compatibility_rules)} rules")
+    print(f"  compile:     {compile_time * 1000:.2f}ms")
+    print(f"  interpreted: {interpreted_time:.3f}s")
+    print(f"  compiled:    {compiled_time:.3f}s ({interpreted_time / compiled_time:.1f}x)")
+
+
+def bench_rule_analysis(count=100_000):
+    """Validation cost before and after rule set minimization"""
+    from rule_analyzer import analyze_rules
+    
+    data = create_sample_data()
+    configurations = random_configurations(data, count)
+    _, before_time = timed(lambda: [data.validate_configuration(c) for c in configurations])
+    rules_before = len(data.compatibility_rules)
+    
+    analysis, analysis_time = timed(analyze_rules, data)
+    analysis.apply(data)
+    _, after_time = timed(lambda: [data.validate_configuration(c) for c in configurations])
+    
+    print(f"rule_analysis: {count} configurations")
+    print(f"  analysis: {analysis_time * 1000:.2f}ms")
+    print(f"  rules:    {rules_before} -> {len(data.compatibility_rules)}")
+    print(f"  validate: {before_time:.3f}s -> {after_time:.3f}s")
+
+
+def bench_matrix_memory(count=100_000, degree=20):
+    """Memory of dict-of-lists matrix vs symmetric CompatibilityMatrix"""
+    import tracemalloc
+    from compatibility_matrix import CompatibilityMatrix
+    
+    rng = random.Random(1)
+    ids = [f"component_{i}" for i in range(count)]
+    neighbors = [set() for _ in range(count)]
+    for i in range(count):
+        for j in rng.sample(range(count), degree // 2):
+            if i != j:
+                neighbors[i].add(j)
+                neighbors[j].add(i)
+    
+    tracemalloc.start()
+    matrix = {ids[i]: [ids[j] for j in neighbors[i]] for i in range(count)}
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    tracemalloc.start()
+    compat, build_time = timed(CompatibilityMatrix.from_dict, matrix)
+    compat_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    pairs = [(ids[rng.randrange(count)], ids[rng.randrange(count)]) for _ in range(100_000)]
+    _, lookup_time = timed(lambda: [compat.compatible(a, b) for a, b in pairs])
+    
+    edges = sum(len(row) for row in neighbors) // 2
+    print(f"matrix_memory: {count} components, {edges} pairs")
+    print(f"  dict of lists:       {dict_bytes / 2**20:.1f} MiB")
+    print(f"  CompatibilityMatrix: {compat_bytes / 2**20:.1f} MiB "
+          f"(pair storage {compat.memory_usage() / 2**20:.1f} MiB, built in {build_time:.2f}s)")
+    print(f"  100k lookups:        {lookup_time * 1000:.1f}ms")
+
+
+def bench_catalog_load(count=100_000):
+    """Streaming catalog load throughput per file format"""
+    import tempfile
+    from catalog_loader import dump_catalog, load_catalog_dir
+    
+    data = synthetic_catalog(count)
+    print(f"catalog_load: {count} components")
+    for file_type in ("ndjson", "json", "csv"):
+        with tempfile.TemporaryDirectory() as directory:
+            dump_catalog(data, {}, directory, file_type)
+            _, _, stats = load_catalog_dir(directory)
+            print(f"  {file_type:7} {stats.format()}")
+
+
+def bench_snapshot_startup(count=100_000):
+    """Cold start: NDJSON catalog load vs memory-mapped snapshot"""
+    import os
+    import tempfile
+    from catalog_loader import dump_catalog, load_catalog_dir
+    from catalog_snapshot import open_snapshot, write_snapshot
+    
+    data = synthetic_catalog(count)
+    ids = random.Random(3).sample(list(data.components), 1000)
+    with tempfile.TemporaryDirectory() as directory:
+        dump_catalog(data, {}, directory)
+        _, load_time = timed(load_catalog_dir, directory)
+        
+        path = os.path.join(directory, "catalog.snap")
+        _, write_time = timed(write_snapshot, path, data)
+        (snapshot_data, _), open_time = timed(open_snapshot, path)
+        _, lookup_time = timed(lambda: [snapshot_data.components[i] for i in ids])
+        _, search_time = timed(snapshot_data.search_components, "xeon")
+        
+        print(f"snapshot_startup: {count} components, snapshot {os.path.getsize(path) / 2**20:.1f} MiB")
+        print(f"  ndjson load:        {load_time:.3f}s")
+        print(f"  snapshot write:     {write_time:.3f}s")
+        print(f"  snapshot open:      {open_time * 1000:.2f}ms")
+        print(f"  {len(ids)} lookups:       {lookup_time * 1000:.2f}ms")
+        print(f"  search 'xeon':      {search_time * 1000:.2f}ms")
+
+
+def bench_vendor_import(count=100_000):
+    """Vendor CSV import: serial vs process pool"""
+    import csv
+    import os
+    import tempfile
+    from vendor_import import import_vendor_files
+    
+    brands = ["HPE", "Dell EMC", "Lenovo", "Huawei", "Supermicro", "Inspur"]
+    categories = ["Server", "CPU", "Memory", "SSD", "HDD", "RAID", "NIC", "PSU"]
+    rng = random.Random(5)
+    workers = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "vendor.csv")
+        with open(path, "w", newline="", encoding="utf-8") as stream:
+            writer = csv.writer(stream)
+            writer.writerow(["Part Number", "Vendor", "Model", "Category", "Price", "Stock", "Form Factor"])
+            for i in range(count):
+                # ~10% of rows repeat a product already listed
+                number = rng.randrange(i) if i and rng.random() < 0.1 else i
+                writer.writerow([f"P{i}", rng.choice(brands), f"MX-{number}", rng.choice(categories),
+                                 f"{rng.uniform(10, 5000):.2f}", rng.randint(0, 9), "2U"])
+        
+        print(f"vendor_import: {count} rows")
+        for pool_size in sorted({1, workers, max(2, workers)}):
+            _, stats = import_vendor_files([path], create_sample_data(), workers=pool_size)
+            print(f"  workers={pool_size}: {stats.format()}")
+
+
+def bench_sessions(count=10_000):
+    """Memory per configurator session with the shared catalog"""
+    import tracemalloc
+    from configurator import ServerConfigurator
+    
+    ServerConfigurator()  # load shared catalog outside the measurement
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sessions, seconds = timed(lambda: [ServerConfigurator() for _ in range(count)])
+    for session in sessions:
+        session.add_component("hp_ml350g4p")
+        session.add_component("intel_xeon_3_0_604")
+        session.add_component("kingston_1gb_ddr2_400")
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    
+    print(f"sessions: {count} sessions with 3 components each")
+    print(f"  created in {seconds * 1000:.1f}ms, {used / count:,.0f} bytes per session")
+
+
+def bench_session_manager(count=100_000, max_sessions=10_000):
+    """Session manager churn: create, look up and spill sessions"""
+    import tempfile
+    from sessions import FileSessionStore, SessionManager
+    
+    rng = random.Random(11)
+    with tempfile.TemporaryDirectory() as directory:
+        manager = SessionManager(max_sessions=max_sessions, store=FileSessionStore(directory))
+        tokens, create_time = timed(lambda: [manager.create()[0] for _ in range(count)])
+        recent = tokens[-max_sessions:]
+        _, hit_time = timed(lambda: [manager.get(rng.choice(recent)) for _ in range(count)])
+        _, restore_time = timed(lambda: [manager.get(token) for token in tokens[:1000]])
+        
+        print(f"session_manager: {count} sessions, max {max_sessions} in memory")
+        print(f"  create:        {count / create_time:,.0f}/s (with spill)")
+        print(f"  get (memory):  {count / hit_time:,.0f}/s")
+        print(f"  get (restore): {1000 / restore_time:,.0f}/s")
+        print(f"  {manager.stats().format()}")
+
+
+def bench_threaded_reads(operations=20_000, thread_counts=(1, 2, 4, 8)):
+    """Catalog read throughput per thread count, with a concurrent catalog writer"""
+    import threading
+    from catalog import Catalog, CatalogPublisher
+    from configurator import ServerConfigurator
+    from data_models import Component, ComponentType
+    
+    publisher = CatalogPublisher(Catalog.load())
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"threaded_reads: {operations} operations per run, GIL {'enabled' if gil else 'disabled'}")
+    
+    for thread_count in thread_counts:
+        stop = threading.Event()
+        
+        def reader(count):
+            session = ServerConfigurator(source=publisher)
+            session.add_component("hp_ml350g4p")
+            for _ in range(count):
+                session.get_available_components(ComponentType.MEMORY)
+                session.get_current_configuration()
+        
+        def writer():
+            number = 0
+            while not stop.wait(0.01):
+                number += 1
+                component = Component(f"psu_{number}", "PSU", ComponentType.POWER_SUPPLY, "X", "PSU", [], 1.0)
+                publisher.update(lambda data, matrix: data.add_component(component))
+        
+        threads = [threading.Thread(target=reader, args=(operations // thread_count,)) for _ in range(thread_count)]
+        updater = threading.Thread(target=writer)
+        updater.start()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        seconds = time.perf_counter() - start
+        stop.set()
+        updater.join()
+        print(f"  {thread_count} threads: {operations / seconds:,.0f} operations/s")
+
+
+def _private_memory():
+    """Private (unshared) bytes of this process, Linux only"""
+    total = 0
+    with open("/proc/self/smaps_rollup") as stream:
+        for line in stream:
+            if line.startswith(("Private_Clean:", "Private_Dirty:")):
+                total += int(line.split()[1]) * 1024
+    return total
+
+
+def _prefork_worker(args):
+    """Worker: load catalog, look up components, report private memory growth"""
+    mode, path, ids = args
+    from catalog import Catalog
+    
+    before = _private_memory()
+    if mode == "snapshot":
+        catalog = Catalog.load(snapshot_path=path)
+    else:
+        catalog = Catalog.load(catalog_dir=path)
+    for component_id in ids:
+        catalog.data.components[component_id]
+    return _private_memory() - before
+
+
+def bench_prefork_memory(count=100_000, worker_counts=(1, 2, 4)):
+    """Per-worker memory: own catalog per worker vs one shared snapshot"""
+    import multiprocessing
+    import os
+    import tempfile
+    from catalog_loader import dump_catalog
+    from catalog_snapshot import SharedSnapshot
+    
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        print("prefork_memory: needs Linux /proc")
+        return
+    data = synthetic_catalog(count)
+    ids = random.Random(3).sample(list(data.components), 1000)
+    context = multiprocessing.get_context("fork")
+    with tempfile.TemporaryDirectory() as directory, SharedSnapshot(data) as shared:
+        dump_catalog(data, {}, directory)
+        print(f"prefork_memory: {count} components, shared snapshot {shared.size / 2**20:.1f} MiB")
+        for mode, path in (("own catalog", directory), ("snapshot", shared.path)):
+            for workers in worker_counts:
+                with context.Pool(workers) as pool:
+                    used = pool.map(_prefork_worker, [(mode, path, ids)] * workers)
+                print(f"  {mode:11} x{workers}: {sum(used) / 2**20:7.1f} MiB private total "
+                      f"({sum(used) / workers / 2**20:.1f} MiB per worker)")
+
+
+def bench_catalog_reload(count=100_000, changed=1000):
+    """Hot reload: diff and patch vs building a new catalog"""
+    import dataclasses
+    from catalog import Catalog, CatalogPublisher
+    from compatibility_matrix import CompatibilityMatrix
+    
+    data = synthetic_catalog(count)
+    publisher = CatalogPublisher(Catalog(data, CompatibilityMatrix()))
+    validate = data.compile_rules()
+    
+    new_data = synthetic_catalog(count)
+    rng = random.Random(9)
+    for component_id in rng.sample(list(new_data.components), changed):
+        component = new_data.components[component_id]
+        new_data.components[component_id] = dataclasses.replace(component, price=component.price + 1)
+    new = Catalog(new_data, CompatibilityMatrix())
+    
+    diff, seconds = timed(publisher.reload, new)
+    print(f"catalog_reload: {count} components, {changed} price changes")
+    print(f"  diff + patch + swap: {seconds * 1000:.1f}ms ({diff.format()})")
+    print(f"  compiled rules kept: {publisher.current.data.compile_rules() is validate}")
+
+
+def bench_price_feed(count=100_000, deltas=200_000, batch_size=1000):
+    """Price/availability deltas: in-place batches vs copy-on-write publish per batch"""
+    from catalog import Catalog, CatalogPublisher
+    from compatibility_matrix import CompatibilityMatrix
+    from price_feed import PriceFeed
+    
+    data = synthetic_catalog(count)
+    publisher = CatalogPublisher(Catalog(data, CompatibilityMatrix()))
+    validate = data.compile_rules()
+    rng = random.Random(11)
+    ids = list(data.components)
+    updates = [(rng.choice(ids), round(rng.uniform(10, 5000), 2), rng.random() > 0.1) for _ in range(deltas)]
+    
+    def feed_all():
+        feed = PriceFeed(publisher, batch_size=batch_size, max_delay=3600)
+        for component_id, price, availability in updates:
+            feed.submit(component_id, price, availability)
+        feed.flush()
+        return feed.stats()
+    
+    stats, seconds = timed(feed_all)
+    print(f"price_feed: {count} components, {deltas} deltas, batches of {batch_size}")
+    print(f"  in place:      {seconds:.3f}s ({deltas / seconds:,.0f} deltas/s, {stats.format()})")
+    print(f"  compiled rules kept: {publisher.current.data.compile_rules() is validate}")
+    
+    def replace_one_batch(data, matrix):
+        data.apply_updates(updates[:batch_size])
+    _, seconds = timed(publisher.update, replace_one_batch)
+    print(f"  copy-on-write: {seconds * 1000:.1f}ms per batch ({batch_size / seconds:,.0f} deltas/s)")
+
+
+def bench_currency(count=100_000, requests=100_000):
+    """Price columns per currency: build, rate refresh and per-request totals"""
+    from currency import DEFAULT_RATES, set_rates
+    
+    data = synthetic_catalog(count)
+    _, build_seconds = timed(data.price_columns)
+    set_rates(dict(DEFAULT_RATES, BYN=DEFAULT_RATES["BYN"] * 1.01))
+    _, refresh_seconds = timed(data.price_columns)
+    set_rates(DEFAULT_RATES)
+    print(f"currency: {count} components x 4 currencies")
+    print(f"  build columns: {build_seconds * 1000:.1f}ms, rate refresh: {refresh_seconds * 1000:.1f}ms")
+    
+    rng = random.Random(5)
+    ids = list(data.components)
+    configurations = [rng.sample(ids, 10) for _ in range(requests)]
+    columns = data.price_columns()
+    for currency in ("USD", "BYN", "RUB", "EUR"):
+        _, seconds = timed(lambda: [columns.total(ids, currency) for ids in configurations])
+        print(f"  {currency} total of 10 components: {seconds / requests * 1e6:.2f}us")
+    components = [[data.components[component_id] for component_id in ids] for ids in configurations]
+    _, seconds = timed(lambda: [sum(c.price for c in parts) for parts in components])
+    print(f"  catalog-currency sum for reference: {seconds / requests * 1e6:.2f}us")
+
+
+def bench_translations(lookups=1_000_000):
+    """Translation lookups: per-call fallback lookup vs compiled table and translate_many"""
+    from translations import ENGLISH, LANGUAGES, compile_translations
+    
+    keys = list(ENGLISH) * (lookups // len(ENGLISH))
+    language = "ru"
+    _, dynamic = timed(lambda: [LANGUAGES.get(language, ENGLISH).get(key, key) for key in keys])
+    table = compile_translations("ru")
+    _, compiled = timed(lambda: [table.get(key) for key in keys])
+    _, batch = timed(table.translate_many, keys)
+    print(f"translations: {len(keys)} lookups")
+    print(f"  per-call fallback: {dynamic / len(keys) * 1e9:.0f}ns, compiled get: {compiled / len(keys) * 1e9:.0f}ns, "
+          f"translate_many: {batch / len(keys) * 1e9:.0f}ns per key")
+
+
+def bench_export(count=50_000):
+    """Export of a large configuration (json.dumps vs streaming vs cached fragments), quote export and ETag"""
+    import io
+    import json
+    import tracemalloc
+    from data_models import ServerConfiguration
+    from export_writer import component_record, configuration_header, write_export
+    
+    data = synthetic_catalog(count)
+    components = {}
+    for component in data.components.values():
+        components.setdefault(component.component_type, []).append(component)
+    configuration = ServerConfiguration(id="bench", name="Bench", components=components,
+                                        total_price=0.0, is_valid=True, validation_errors=[])
+    
+    class Sink(io.TextIOBase):
+        """Discards output, counts characters"""
+        size = 0
+        
+        def write(self, text):
+            self.size += len(text)
+            return len(text)
+    
+    def dumps_all():
+        document = dict(configuration_header(configuration), components={
+            component_type.value: [component_record(c, c.price) for c in components]
+            for component_type, components in configuration.components.items()
+        })
+        return Sink().write(json.dumps(document, indent=2))
+    
+    fragments = data.export_fragments()
+    write_export(Sink(), configuration, fragments=fragments)
+    print(f"export: configuration of {count} components")
+    for label, function in (("json.dumps", dumps_all),
+                            ("streaming", lambda: write_export(Sink(), configuration)),
+                            ("cached fragments", lambda: write_export(Sink(), configuration, fragments=fragments)),
+                            ("streaming ndjson", lambda: write_export(Sink(), configuration, "ndjson"))):
+        size, seconds = timed(function)
+        tracemalloc.start()
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  {label:17} {seconds:.3f}s, {size / 1e6:.1f}MB written, peak memory {peak / 1e6:.1f}MB")
+    
+    from configurator import ServerConfigurator
+    from catalog import Catalog
+    
+    configurator = ServerConfigurator(catalog=Catalog.load())
+    for component_id in ("hp_ml350g4p", "intel_xeon_3_0_604", "kingston_1gb_ddr2_400", "seagate_500gb_sata"):
+        configurator.add_component(component_id)
+    requests = 10_000
+    _, seconds = timed(lambda: [configurator.export_configuration() for _ in range(requests)])
+    _, etag_seconds = timed(lambda: [configurator.export_etag() for _ in range(requests)])
+    print(f"  quote export: {seconds / requests * 1e6:.1f}us, etag: {etag_seconds / requests * 1e6:.1f}us")
+
+
+def bench_bulk_quotes(count=20_000, worker_counts=(1, 2, 4)):
+    """Bulk quotes (JSON and CSV, Russian and English) for saved configurations per worker count"""
+    import os
+    import tempfile
+    from bulk_quotes import generate_quotes
+    from catalog import Catalog
+    
+    catalog = Catalog.load()
+    rng = random.Random(11)
+    ids = list(catalog.data.components)
+    states = [{"id": f"quote_{i}", "configuration_id": i, "components": rng.sample(ids, rng.randint(2, 8))}
+              for i in range(count)]
+    print(f"bulk_quotes: {count} configurations x 2 formats x 2 languages, {os.cpu_count()} CPUs")
+    with tempfile.TemporaryDirectory() as directory:
+        for workers in worker_counts:
+            stats = generate_quotes(states, os.path.join(directory, f"quotes_{workers}.zip"),
+                                    catalog=catalog, workers=workers)
+            print(f"  x{workers}: {stats.format()}")
+
+
+def bench_config_store(count=100_000, single=1000):
+    """SQLite configuration store: batched vs single saves, lookups by component"""
+    import os
+    import tempfile
+    from config_store import ConfigurationStore, SavedConfiguration
+    
+    rng = random.Random(13)
+    ids = [f"component_{i}" for i in range(5000)]
+    configurations = [SavedConfiguration(rng.sample(ids, rng.randint(3, 12)), f"Quote {i}", f"owner_{i % 500}")
+                      for i in range(count)]
+    with tempfile.TemporaryDirectory() as directory:
+        store = ConfigurationStore(os.path.join(directory, "configurations.db"))
+        _, batched = timed(store.save_many, configurations)
+        _, one_by_one = timed(lambda: [store.save(SavedConfiguration(c.components, c.name, c.owner))
+                                       for c in configurations[:single]])
+        print(f"config_store: {count} configurations, journal {store.journal_mode}")
+        print(f"  save_many: {batched:.3f}s ({count / batched:,.0f}/s), "
+              f"one per transaction: {single / one_by_one:,.0f}/s")
+        
+        lookups = rng.sample(ids, 1000)
+        found, seconds = timed(lambda: [store.containing(component_id) for component_id in lookups])
+        print(f"  containing(X): {seconds / len(lookups) * 1e6:.0f}us "
+              f"({sum(map(len, found)) / len(found):.0f} configurations per component)")
+        _, seconds = timed(store.containing_any, lookups[:100])
+        _, owner_seconds = timed(lambda: [store.by_owner(f"owner_{i}", limit=20) for i in range(100)])
+        print(f"  containing_any(100 ids): {seconds * 1000:.1f}ms, "
+              f"by_owner(limit=20): {owner_seconds / 100 * 1000:.2f}ms")
+        store.close()
+
+
+def bench_catalog_db(count=100_000, lookups=1000):
+    """SQLite catalog: open time, lookup and search latency, memory held vs in-memory catalog"""
+    import os
+    import tempfile
+    import tracemalloc
+    from catalog_db import open_catalog_db, write_catalog_db
+    
+    tracemalloc.start()
+    data = synthetic_catalog(count)
+    in_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    ids = random.Random(17).sample(list(data.components), lookups)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalog.db")
+        _, write_time = timed(write_catalog_db, path, data, {})
+        del data
+        
+        tracemalloc.start()
+        (db_data, _), open_time = timed(open_catalog_db, path)
+        _, cold_time = timed(lambda: [db_data.components[i] for i in ids])
+        _, warm_time = timed(lambda: [db_data.components[i] for i in ids])
+        held = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        found, search_time = timed(db_data.search_components, "xeon")
+        _, narrow_time = timed(db_data.search_components, "#4242")
+        
+        print(f"catalog_db: {count} components, database {os.path.getsize(path) / 2**20:.1f} MiB, "
+              f"write {write_time:.3f}s")
+        print(f"  open:               {open_time * 1000:.2f}ms")
+        print(f"  lookup cold / warm: {cold_time / lookups * 1e6:.0f}us / {warm_time / lookups * 1e6:.1f}us")
+        print(f"  search 'xeon':      {search_time * 1000:.1f}ms ({len(found)} found), '#4242': {narrow_time * 1000:.2f}ms")
+        print(f"  memory held:        {held / 2**20:.1f} MiB ({lookups} cached) "
+              f"vs in-memory catalog {in_memory / 2**20:.1f} MiB")
+        db_data.database.close()
+
+
+def bench_api(requests=20_000, connections=32):
+    """HTTP API load test: catalog reads, revalidation with ETags and session calls (keep-alive)"""
+    import asyncio
+    import os
+    import subprocess
+    import socket
+    from api_server import load_test
+    
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    # Server in its own process, so the client does not share its event loop and GIL
+    server = subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                            "api_server.py"), "--port", str(port)],
+                              stdout=subprocess.PIPE, text=True)
+    try:
+        server.stdout.readline()  # "Serving on ..."
+        catalog = ["/api/catalog?type=processor", "/api/search?q=xeon", "/api/components/hp_ml350g4p",
+                   "/api/availability?ids=hp_ml350g4p,intel_xeon_e5620&currency=BYN"]
+        print(f"api: {requests} requests over {connections} keep-alive connections")
+        for name, paths, revalidate in [
+            ("catalog", catalog, False),
+            ("revalidate", catalog, True),
+            ("sessions", [("POST", "/api/sessions", {"language": "en"})], False),
+        ]:
+            stats = asyncio.run(load_test("127.0.0.1", port, paths, connections, requests, revalidate))
+            print(f"  {name:11} {stats.format()}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def bench_events(updates=100_000, subscriber_counts=(0, 100, 10_000), components=1000):
+    """Change events: publish cost on the mutation path per subscriber count, fan-out with coalescing"""
+    import asyncio
+    from change_events import CATALOG_TOPIC, EventHub
+    
+    ids = [f"component_{i % components}" for i in range(updates)]
+    
+    async def run(count):
+        loop = asyncio.get_running_loop()
+        hub = EventHub()
+        hub.bind(loop)
+        subscribers = [hub.subscribe([CATALOG_TOPIC], None) for _ in range(count)]
+        
+        def mutate():
+            for price, component_id in enumerate(ids):
+                hub.publish(CATALOG_TOPIC, "component", component_id, {"id": component_id, "price": price})
+        
+        _, publish_time = await loop.run_in_executor(None, timed, mutate)  # publisher thread
+        start = time.perf_counter()
+        await asyncio.sleep(0)  # last dispatch
+        delivered = [len(await subscriber.next_events(0)) for subscriber in subscribers]
+        return publish_time, time.perf_counter() - start, delivered, hub.stats()
+    
+    print(f"events: {updates} price updates over {components} components, published from another thread")
+    for count in subscriber_counts:
+        publish_time, drain_time, delivered, stats = asyncio.run(run(count))
+        print(f"  {count:6} subscribers: publish {publish_time / updates * 1e6:.2f}us/update, "
+              f"{stats.dispatched:,} dispatched, {max(delivered, default=0)} events per subscriber "
+              f"(drained in {drain_time * 1000:.1f}ms)")
+
+
+def bench_static_catalog(count=2000):
+    """Static catalog build: full and incremental build, one shard vs the whole catalog per page load"""
+    import gzip
+    import json
+    import os
+    import tempfile
+    from export_writer import component_json
+    from catalog import Catalog
+    from compatibility_matrix import CompatibilityMatrix
+    from static_catalog import build_static_catalog
+    
+    catalog = Catalog(synthetic_catalog(count), CompatibilityMatrix.from_dict({}))
+    whole = json.dumps([component_json(component) for component in catalog.data.components.values()],
+                       ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    with tempfile.TemporaryDirectory() as directory:
+        manifest, full = build_static_catalog(directory, catalog)
+        catalog.data.apply_updates([(next(iter(catalog.data.components)), 1.0, None)])
+        _, incremental = build_static_catalog(directory, catalog)
+        shard = os.path.join(directory, manifest["categories"]["processor"]["ru"])
+        shard_size, shard_gzip = os.path.getsize(shard), os.path.getsize(shard + ".gz")
+        manifest_size = os.path.getsize(os.path.join(directory, "manifest.json"))
+    
+    print(f"static_catalog: {count} components, {len(manifest['servers'])} servers")
+    print(f"  full build:        {full.format()}")
+    print(f"  after price change: {incremental.format()}")
+    print(f"  whole catalog:     {len(whole) / 1024:.1f} KiB, gzip {len(gzip.compress(whole)) / 1024:.1f} KiB")
+    print(f"  one category:      {shard_size / 1024:.1f} KiB, gzip {shard_gzip / 1024:.1f} KiB "
+          f"(+ manifest {manifest_size / 1024:.1f} KiB)")
+
+
+BENCHMARKS = {
+    "validate_many": bench_validate_many,
+    "compiled_rules": bench_compiled_rules,
+    "rule_analysis": bench_rule_analysis,
+    "matrix_memory": bench_matrix_memory,
+    "catalog_load": bench_catalog_load,
+    "snapshot_startup": bench_snapshot_startup,
+    "vendor_import": bench_vendor_import,
+    "sessions": bench_sessions,
+    "session_manager": bench_session_manager,
+    "threaded_reads": bench_threaded_reads,
+    "prefork_memory": bench_prefork_memory,
+    "catalog_reload": bench_catalog_reload,
+    "price_feed": bench_price_feed,
+    "currency": bench_currency,
+    "translations": bench_translations,
+    "export": bench_export,
+    "bulk_quotes": bench_bulk_quotes,
+    "config_store": bench_config_store,
+    "catalog_db": bench_catalog_db,
+    "api": bench_api,
+    "events": bench_events,
+    "static_catalog": bench_static_catalog,
+}
+
+
+def main(names):
+    """Run selected benchmarks (all by default)"""
+    for name in names or BENCHMARKS:
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
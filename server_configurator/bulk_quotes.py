@@ -0,0 +1,314 @@
+"""
+Bulk quote generation for server configurator
+Validates, prices and renders quotes for many saved configurations in parallel
+
+Saved configurations are session states (ServerConfigurator.get_state()): lines
+of an NDJSON file or a directory of spilled sessions (FileSessionStore). Each
+state is restored against the catalog and rendered in every requested format
+and language; quotes are written to a directory or a zip archive, in input order.
+
+Worker processes map one shared catalog snapshot (see catalog_snapshot.py) and
+keep export fragments per language, so a quote only splices prices. At most
+2 * workers batches are in flight, so memory does not grow with the input.
+
+Usage: python bulk_quotes.py <states.ndjson|sessions dir> <output dir|.zip> [--workers N]
+       [--formats json,csv] [--languages ru,en] [--currency BYN]
+"""
+
+import json
+import os
+import sys
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from catalog import Catalog
+from configurator import ServerConfigurator
+from currency import check_currency, current_rates, set_rates
+from export_writer import FORMATS, ExportFragments, iter_export
+from translations import LANGUAGES, localizer
+
+BATCH_SIZE = 50
+MAX_REPORTED_ERRORS = 20
+
+Quote = Tuple[str, bytes]  # file name, content
+
+
+class QuoteError(ValueError):
+    """Invalid saved configuration or quote options"""
+
+
+@dataclass
+class QuoteStats:
+    """Counters of a bulk quote run"""
+    configurations: int = 0
+    quotes: int = 0     # files written (configurations x formats x languages)
+    invalid: int = 0    # configurations failing validation (quoted anyway, with errors listed)
+    missing: int = 0    # saved components no longer in the catalog (dropped from quotes)
+    skipped: int = 0    # malformed saved configurations
+    bytes: int = 0
+    seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)  # first MAX_REPORTED_ERRORS messages
+    
+    @property
+    def configurations_per_second(self) -> float:
+        """Throughput"""
+        return self.configurations / self.seconds if self.seconds else 0.0
+    
+    def format(self) -> str:
+        """One-line summary"""
+        return (f"{self.configurations} configurations: {self.quotes} quotes ({self.bytes / 2**20:.1f} MiB), "
+                f"{self.invalid} invalid, {self.missing} missing components, {self.skipped} skipped "
+                f"in {self.seconds:.3f}s ({self.configurations_per_second:,.0f} configurations/s)")
+
+
+class QuoteRenderer:
+    """Renders quotes against one catalog (one renderer per worker process)"""
+    
+    EXTENSIONS = {"json": "json", "ndjson": "ndjson", "csv": "csv"}
+    
+    def __init__(self, catalog: Catalog, formats: Sequence[str] = ("json", "csv"),
+                 languages: Sequence[str] = ("ru", "en"), currency: Optional[str] = None):
+        self.catalog = catalog
+        self.formats = tuple(formats)
+        self.languages = tuple(languages)
+        self.currency = check_currency(currency) if currency else None
+        # Localized views are cached per language, so their fragments can be cached too
+        self.fragments = {language: ExportFragments(catalog.data.version) for language in self.languages}
+    
+    def render(self, name: str, state: Dict) -> Tuple[List[Quote], bool, int]:
+        """Quotes for one saved configuration: (quotes, is_valid, missing component count)"""
+        components = state.get("components") if isinstance(state, dict) else None
+        if not isinstance(components, list) or not all(isinstance(item, str) for item in components):
+            raise QuoteError(f"{name}: not a saved configuration")
+        configurator = ServerConfigurator.from_state(state, catalog=self.catalog)
+        config = configurator.get_current_configuration(self.currency)
+        missing = len(state["components"]) - sum(len(components) for components in config.components.values())
+        
+        price, price_header = None, "Price"
+        if self.currency:
+            columns = self.catalog.data.price_columns()
+            price, price_header = (lambda comp: columns.price(comp.id, self.currency)), f"Price ({self.currency})"
+        quotes = []
+        for language in self.languages:
+            views = localizer(language)
+            localized = replace(config, components={
+                component_type: views.components(components, self.catalog.data.version)
+                for component_type, components in config.components.items()
+            })
+            for format_type in self.formats:
+                text = "".join(iter_export(localized, format_type, price, price_header,
+                                           fragments=self.fragments[language]))
+                quotes.append((f"{name}.{language}.{self.EXTENSIONS[format_type]}", text.encode("utf-8")))
+        return quotes, config.is_valid, missing
+    
+    def render_batch(self, batch: List[Tuple[str, Dict]]) -> List[Tuple[str, Optional[List[Quote]], bool, int]]:
+        """Render a batch, a state that cannot be quoted gives (error message, None, False, 0)"""
+        results = []
+        for name, state in batch:
+            try:
+                quotes, is_valid, missing = self.render(name, state)
+            except QuoteError as e:
+                results.append((str(e), None, False, 0))
+            except Exception as e:  # one broken state must not abort the run (and the pool)
+                results.append((f"{name}: {e.__class__.__name__}: {e}", None, False, 0))
+            else:
+                results.append((name, quotes, is_valid, missing))
+        return results
+
+
+_renderer: Optional[QuoteRenderer] = None
+
+
+def _init_worker(snapshot_path: str, rates: Dict[str, float], formats, languages, currency) -> None:
+    global _renderer
+    set_rates(rates)
+    _renderer = QuoteRenderer(Catalog.load(snapshot_path=snapshot_path), formats, languages, currency)
+
+
+def _render_batch(batch):
+    return _renderer.render_batch(batch)
+
+
+def _batches(states: Iterable[Tuple[str, Dict]], batch_size: int) -> Iterator[List[Tuple[str, Dict]]]:
+    batch = []
+    for item in states:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _render_batches(batches: Iterable, renderer: QuoteRenderer, workers: int) -> Iterator[list]:
+    """Render batches in order, with at most 2 * workers batches in flight"""
+    if workers <= 1:
+        for batch in batches:
+            yield renderer.render_batch(batch)
+        return
+    
+    from catalog_snapshot import SharedSnapshot
+    
+    catalog = renderer.catalog
+    with SharedSnapshot(catalog.data, catalog.compatibility_matrix) as shared, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(shared.path, current_rates().rates, renderer.formats,
+                                          renderer.languages, renderer.currency)) as executor:
+        pending = deque()
+        for batch in batches:
+            pending.append(executor.submit(_render_batch, batch))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class QuoteOutput:
+    """Quote files in a directory, or in a zip archive if the path ends with .zip"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.archive = None
+        if path.endswith(".zip"):
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            # Compression runs in the parent process; level 1 keeps it from limiting the workers
+            self.archive = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=1)
+        else:
+            os.makedirs(path, exist_ok=True)
+    
+    def write(self, name: str, content: bytes) -> None:
+        """Store one quote file"""
+        if self.archive is not None:
+            self.archive.writestr(name, content)
+        else:
+            with open(os.path.join(self.path, name), "wb") as stream:
+                stream.write(content)
+    
+    def close(self) -> None:
+        """Finish the archive"""
+        if self.archive is not None:
+            self.archive.close()
+    
+    def __enter__(self) -> "QuoteOutput":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def read_states(path: str) -> Iterator[Tuple[str, Dict]]:
+    """
+    (quote name, saved configuration) pairs from an NDJSON file or a directory of spilled sessions
+    Names are the "id" field or the session token, line numbers otherwise
+    """
+    if os.path.isdir(path):
+        for file_name in sorted(os.listdir(path)):
+            if file_name.endswith(".json"):
+                with open(os.path.join(path, file_name), "r", encoding="utf-8") as stream:
+                    try:
+                        state = json.load(stream)
+                    except ValueError:
+                        state = None
+                yield file_name[:-len(".json")], state
+        return
+    with open(path, "r", encoding="utf-8") as stream:
+        for number, line in enumerate(stream, 1):
+            if line.strip():
+                try:
+                    state = json.loads(line)
+                except ValueError:
+                    state = None
+                yield _quote_name(state, f"quote_{number:06d}"), state
+
+
+def _quote_name(state, default: str) -> str:
+    name = state.get("id") if isinstance(state, dict) else None
+    return os.path.basename(str(name)) if name else default
+
+
+def _unique_names(named: Iterable[Tuple[str, Dict]]) -> Iterator[Tuple[str, Dict]]:
+    """Suffix repeated names ("a", "a_2", ...) so quotes never overwrite each other"""
+    seen = set()
+    for name, state in named:
+        unique, number = name, 1
+        while unique in seen:
+            number += 1
+            unique = f"{name}_{number}"
+        seen.add(unique)
+        yield unique, state
+
+
+def generate_quotes(states: Iterable, output: str, catalog: Optional[Catalog] = None,
+                    formats: Sequence[str] = ("json", "csv"), languages: Sequence[str] = ("ru", "en"),
+                    currency: Optional[str] = None, workers: Optional[int] = None,
+                    batch_size: int = BATCH_SIZE) -> QuoteStats:
+    """
+    Render quotes for saved configurations into output (directory or .zip)
+    states are session states or (name, state) pairs; with workers > 1 the
+    catalog is shared with worker processes through a snapshot
+    """
+    start = time.perf_counter()
+    for format_type in formats:
+        if format_type not in FORMATS:
+            raise QuoteError(f"Unsupported format: {format_type}")
+    for language in languages:
+        if language not in LANGUAGES:
+            raise QuoteError(f"Unknown language: {language}")
+    renderer = QuoteRenderer(catalog or Catalog.load(), formats, languages, currency)
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    stats = QuoteStats()
+    
+    named = _unique_names(
+        item if isinstance(item, tuple) else (_quote_name(item, f"quote_{number:06d}"), item)
+        for number, item in enumerate(states, 1)
+    )
+    with QuoteOutput(output) as target:
+        for results in _render_batches(_batches(named, batch_size), renderer, workers):
+            for name, quotes, is_valid, missing in results:
+                if quotes is None:
+                    stats.skipped += 1
+                    if len(stats.errors) < MAX_REPORTED_ERRORS:
+                        stats.errors.append(name)
+                    continue
+                stats.configurations += 1
+                stats.invalid += not is_valid
+                stats.missing += missing
+                for file_name, content in quotes:
+                    target.write(file_name, content)
+                    stats.quotes += 1
+                    stats.bytes += len(content)
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def main(argv: List[str]) -> None:
+    """Render quotes for saved configurations with the sample catalog and print stats"""
+    paths, options = [], {}
+    arguments = iter(argv)
+    for argument in arguments:
+        if argument.startswith("--"):
+            options[argument] = next(arguments, None)
+        else:
+            paths.append(argument)
+    if len(paths) != 2:
+        print(__doc__)
+        return
+    
+    stats = generate_quotes(
+        read_states(paths[0]), paths[1],
+        formats=options.get("--formats", "json,csv").split(","),
+        languages=options.get("--languages", "ru,en").split(","),
+        currency=options.get("--currency"),
+        workers=int(options["--workers"]) if "--workers" in options else None
+    )
+    print(stats.format())
+    for error in stats.errors:
+        print(f"  {error}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,221 @@
+"""
+Shared catalog for server configurator sessions
+The catalog and compatibility matrix are loaded once per process, frozen and
+shared by every ServerConfigurator; a session only holds its configuration
+
+Changes are copy-on-write: CatalogPublisher applies them to a private copy,
+freezes it and swaps the published reference, so readers never take a lock
+and always see one consistent catalog. Full reloads are diffed against the
+live catalog first (see catalog_reload.py). Price and availability deltas are
+the exception: they are applied in place (see price_feed.py).
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from data_models import ServerConfiguratorData
+from compatibility_matrix import CompatibilityMatrix
+
+
+@dataclass(frozen=True)
+class Catalog:
+    """Loaded catalog: component data, compatibility matrix and load reports"""
+    data: ServerConfiguratorData
+    compatibility_matrix: CompatibilityMatrix
+    load_stats: Optional[object] = None     # catalog_loader.LoadStats for catalog_dir
+    rule_analysis: Optional[object] = None  # rule_analyzer.RuleAnalysis for optimize_rules
+    
+    @classmethod
+    def load(cls, optimize_rules: bool = False, catalog_dir: Optional[str] = None,
+             snapshot_path: Optional[str] = None, freeze: bool = True,
+             database_path: Optional[str] = None) -> "Catalog":
+        """
+        Load catalog from a snapshot, a catalog database, a catalog directory or sample data
+        With freeze=False the catalog can still be modified (private copy)
+        """
+        load_stats = None
+        matrix = None
+        if snapshot_path:
+            # Memory-mapped binary snapshot (see catalog_snapshot.py), decoded lazily
+            from catalog_snapshot import open_snapshot
+            data, compatibility_matrix = open_snapshot(snapshot_path)
+        elif database_path:
+            # SQLite catalog (see catalog_db.py), components read on demand
+            from catalog_db import open_catalog_db
+            data, compatibility_matrix = open_catalog_db(database_path)
+        elif catalog_dir:
+            # Catalog from data files (see catalog_loader.py) instead of sample_data
+            from catalog_loader import load_catalog_dir
+            data, matrix, load_stats = load_catalog_dir(catalog_dir)
+        else:
+            from sample_data import create_sample_data, create_compatibility_matrix
+            data = create_sample_data()
+            matrix = create_compatibility_matrix()
+        
+        rule_analysis = None
+        if optimize_rules:
+            # Drop duplicate/subsumed/dead rules and symmetrize the matrix at load time
+            from rule_analyzer import analyze_rules
+            rule_analysis = analyze_rules(data, matrix)
+            rule_analysis.apply(data, matrix)
+        if matrix is not None:
+            compatibility_matrix = CompatibilityMatrix.from_dict(matrix)
+        
+        if freeze:
+            data.freeze()
+            compatibility_matrix.freeze()
+        return cls(data, compatibility_matrix, load_stats, rule_analysis)
+    
+    def copy(self) -> "Catalog":
+        """Writable copy; components and rules are shared, containers are copied"""
+        return Catalog(self.data.copy(), self.compatibility_matrix.copy(), self.load_stats, self.rule_analysis)
+
+
+class CatalogPublisher:
+    """
+    Holds the current catalog snapshot
+    Readers take `current` without locking; writers are serialized, change a
+    copy and publish it with a single reference assignment
+    """
+    
+    def __init__(self, catalog: Catalog, loader: Optional[Callable[[], Catalog]] = None,
+                 paths: Optional[List[str]] = None):
+        self._current = catalog
+        self._write_lock = threading.Lock()
+        self.loader = loader        # loads a fresh catalog for reload()
+        self.paths = paths or []    # catalog files watched by watch()
+        self._listeners: List[Callable[[Catalog, Optional[List[str]]], None]] = []
+    
+    @property
+    def current(self) -> Catalog:
+        """Latest published catalog (frozen)"""
+        return self._current
+    
+    def add_listener(self, listener: Callable[[Catalog, Optional[List[str]]], None]) -> None:
+        """
+        Call listener(catalog, changed_ids) after every change, outside the write lock
+        changed_ids lists components updated in place, None means a new catalog was published
+        """
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[Catalog, Optional[List[str]]], None]) -> None:
+        """Stop calling listener"""
+        self._listeners.remove(listener)
+    
+    def _notify(self, catalog: Catalog, changed: Optional[List[str]]) -> None:
+        for listener in list(self._listeners):
+            listener(catalog, changed)
+    
+    def update(self, change: Callable[[ServerConfiguratorData, CompatibilityMatrix], None]) -> Catalog:
+        """
+        Apply change(data, matrix) to a copy of the current catalog and publish it
+        Sessions pick the new catalog up on their next operation
+        """
+        with self._write_lock:
+            draft = self._current.copy()
+            change(draft.data, draft.compatibility_matrix)
+            draft.data.advance_past(self._current.data)
+            draft.data.freeze()
+            draft.compatibility_matrix.freeze()
+            self._current = draft
+        self._notify(draft, None)
+        return draft
+    
+    def apply_updates(self, updates) -> Tuple[List[str], List[str]]:
+        """
+        Apply (component_id, price, availability) updates to the current catalog in place
+        No copy is made; serialized with update() and reload(). Returns (changed ids, unknown ids)
+        """
+        with self._write_lock:
+            catalog = self._current
+            changed, unknown = catalog.data.apply_updates(updates)
+        if changed:
+            self._notify(catalog, changed)
+        return changed, unknown
+    
+    def publish(self, catalog: Catalog) -> None:
+        """Replace the current catalog with an already built one (its catalog_version moves past the current one)"""
+        catalog.data.freeze()
+        catalog.compatibility_matrix.freeze()
+        with self._write_lock:
+            if catalog is not self._current:
+                catalog.data.advance_past(self._current.data)
+            self._current = catalog
+        self._notify(catalog, None)
+    
+    def reload(self, catalog: Optional[Catalog] = None):
+        """
+        Diff a newly loaded catalog (from loader by default) against the current
+        one, patch only what changed and publish; returns the CatalogDiff
+        """
+        from catalog_reload import diff_catalogs, patch_catalog
+        
+        if catalog is None:
+            if self.loader is None:
+                raise ValueError("No catalog loader to reload from")
+            catalog = self.loader()
+        with self._write_lock:
+            diff = diff_catalogs(self._current, catalog)
+            if diff:
+                patched = patch_catalog(self._current, catalog, diff)
+                patched.data.freeze()
+                patched.compatibility_matrix.freeze()
+                self._current = patched
+        if diff:
+            self._notify(patched, None)
+        return diff
+    
+    def watch(self, interval: float = 5.0, on_reload=None):
+        """Start a CatalogWatcher thread reloading when catalog files change"""
+        from catalog_reload import CatalogWatcher
+        
+        if not self.paths:
+            raise ValueError("Catalog was not loaded from files, nothing to watch")
+        watcher = CatalogWatcher(self, self.paths, interval, on_reload)
+        watcher.start()
+        return watcher
+
+
+_shared: Dict[Tuple, CatalogPublisher] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_publisher(optimize_rules: bool = False, catalog_dir: Optional[str] = None,
+                     snapshot_path: Optional[str] = None, database_path: Optional[str] = None) -> CatalogPublisher:
+    """
+    Get the process-wide catalog publisher for these load options
+    The catalog is loaded on first use; later calls return the same publisher
+    """
+    key = (
+        optimize_rules,
+        os.path.abspath(catalog_dir) if catalog_dir else None,
+        os.path.abspath(snapshot_path) if snapshot_path else None,
+        os.path.abspath(database_path) if database_path else None
+    )
+    publisher = _shared.get(key)
+    if publisher is None:
+        with _shared_lock:
+            publisher = _shared.get(key)
+            if publisher is None:
+                catalog = Catalog.load(optimize_rules, catalog_dir, snapshot_path, database_path=database_path)
+                publisher = _shared[key] = CatalogPublisher(
+                    catalog,
+                    loader=lambda: Catalog.load(optimize_rules, catalog_dir, snapshot_path, freeze=False,
+                                                database_path=database_path),
+                    paths=[path for path in (catalog_dir, snapshot_path, database_path) if path]
+                )
+    return publisher
+
+
+def shared_catalog(optimize_rules: bool = False, catalog_dir: Optional[str] = None,
+                   snapshot_path: Optional[str] = None, database_path: Optional[str] = None) -> Catalog:
+    """Current process-wide frozen catalog for these load options"""
+    return shared_publisher(optimize_rules, catalog_dir, snapshot_path, database_path).current
+
+
+def clear_shared_catalogs() -> None:
+    """Forget loaded catalogs (next sessions load them again)"""
+    with _shared_lock:
+        _shared.clear()
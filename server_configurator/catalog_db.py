@@ -0,0 +1,572 @@
+"""
+SQLite catalog backend for server configurator
+Components, attributes, rules and the compatibility relation in indexed tables
+
+Tables:
+    meta                      format version, catalog version
+    components                one row per component, rowid = catalog position
+    attributes                (component position, number) -> name, value, unit
+    components_search         FTS5 trigram index over name, manufacturer, model
+    rules, rule_components    compatibility rules and (component id -> rule) index
+    matrix_components         component id -> matrix number, constrained flag
+    compatible_pairs          compatible pairs, stored in both directions
+
+Only what a query needs is read: components are built on access and kept in
+a bounded LRU cache, so a catalog larger than memory can be served. Readers
+take connections from a pool (one per concurrent thread), each with its own
+prepared statement cache. Price and availability updates (apply_updates) are
+kept as in-memory overrides on top of the read-only database.
+
+Usage: python catalog_db.py <output.db> [catalog_dir]
+"""
+
+import os
+import queue
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from compatibility_matrix import CompatibilityMatrix
+from data_models import (
+    Component, ComponentType, ComponentAttribute,
+    CompatibilityRule, CompatibilityType, ServerConfiguratorData
+)
+
+FORMAT_VERSION = 1
+POOL_SIZE = 8
+CACHE_SIZE = 10_000        # components kept in memory
+CACHED_STATEMENTS = 128    # prepared statements per connection
+PAGE_SIZE = 500            # rows per query when reading many components
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value) WITHOUT ROWID;
+CREATE TABLE components (
+    position INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    component_type TEXT NOT NULL,
+    manufacturer TEXT NOT NULL,
+    model TEXT NOT NULL,
+    price REAL,
+    availability INTEGER NOT NULL,
+    description TEXT
+);
+CREATE INDEX components_type ON components (component_type, position);
+CREATE TABLE attributes (
+    component_position INTEGER NOT NULL,
+    number INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    unit TEXT,
+    is_required INTEGER NOT NULL,
+    PRIMARY KEY (component_position, number)
+) WITHOUT ROWID;
+CREATE VIRTUAL TABLE components_search USING fts5(
+    name, manufacturer, model, content='components', content_rowid='position', tokenize='trigram'
+);
+CREATE TABLE rules (
+    number INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    rule_type TEXT NOT NULL,
+    primary_component_id TEXT NOT NULL,
+    secondary_component_id TEXT,
+    condition TEXT,
+    max_quantity INTEGER,
+    min_quantity INTEGER
+);
+CREATE TABLE rule_components (
+    component_id TEXT NOT NULL,
+    rule_number INTEGER NOT NULL,
+    PRIMARY KEY (component_id, rule_number)
+) WITHOUT ROWID;
+CREATE TABLE matrix_components (
+    component_id TEXT PRIMARY KEY,
+    number INTEGER NOT NULL,
+    constrained INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE compatible_pairs (
+    component_id TEXT NOT NULL,
+    other_id TEXT NOT NULL,
+    PRIMARY KEY (component_id, other_id)
+) WITHOUT ROWID;
+"""
+
+_COMPONENT_COLUMNS = "position, id, name, component_type, manufacturer, model, price, availability, description"
+
+
+class CatalogDatabaseError(ValueError):
+    """Invalid or incompatible catalog database"""
+
+
+def _lower(value: Optional[str]) -> Optional[str]:
+    """str.lower() for SQL (SQLite's lower() only folds ASCII)"""
+    return value.lower() if value is not None else None
+
+
+# Writing
+
+def write_catalog_db(path: str, data: ServerConfiguratorData,
+                     matrix: Union[Dict[str, List[str]], CompatibilityMatrix, None] = None) -> None:
+    """Write a fully built catalog as a SQLite database"""
+    if os.path.exists(path + ".tmp"):
+        os.remove(path + ".tmp")
+    connection = sqlite3.connect(path + ".tmp")
+    try:
+        connection.executescript(SCHEMA)
+        with connection:
+            connection.executemany("INSERT INTO meta VALUES (?, ?)",
+                                   [("format_version", FORMAT_VERSION), ("catalog_version", data.version)])
+            components = list(data.components.values())
+            connection.executemany(
+                f"INSERT INTO components ({_COMPONENT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ((position, c.id, c.name, c.component_type.value, c.manufacturer, c.model, c.price,
+                  1 if c.availability else 0, c.description) for position, c in enumerate(components))
+            )
+            connection.executemany(
+                "INSERT INTO attributes VALUES (?, ?, ?, ?, ?, ?)",
+                ((position, number, attr.name, attr.value, attr.unit, 1 if attr.is_required else 0)
+                 for position, c in enumerate(components) for number, attr in enumerate(c.attributes))
+            )
+            connection.execute("INSERT INTO components_search (components_search) VALUES ('rebuild')")
+            
+            connection.executemany(
+                "INSERT INTO rules VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                ((number, rule.id, rule.rule_type.value, rule.primary_component_id, rule.secondary_component_id,
+                  rule.condition, rule.max_quantity, rule.min_quantity)
+                 for number, rule in enumerate(data.compatibility_rules))
+            )
+            connection.executemany(
+                "INSERT OR IGNORE INTO rule_components VALUES (?, ?)",
+                ((component_id, number) for number, rule in enumerate(data.compatibility_rules)
+                 for component_id in (rule.primary_component_id, rule.secondary_component_id) if component_id)
+            )
+            
+            if isinstance(matrix, dict):
+                matrix = CompatibilityMatrix.from_dict(matrix)
+            names, constrained, indptr, indices, _, _ = (matrix or CompatibilityMatrix()).csr()
+            connection.executemany("INSERT INTO matrix_components VALUES (?, ?, ?)",
+                                   ((name, number, constrained[number]) for number, name in enumerate(names)))
+            pairs = ((names[row], names[indices[position]])
+                     for row in range(len(indptr) - 1) for position in range(indptr[row], indptr[row + 1]))
+            connection.executemany("INSERT OR IGNORE INTO compatible_pairs VALUES (?, ?)",
+                                   (pair for a, b in pairs for pair in ((a, b), (b, a))))
+        connection.execute("ANALYZE")
+    finally:
+        connection.close()
+    os.replace(path + ".tmp", path)
+
+
+# Reading
+
+class CatalogDatabase:
+    """
+    Read-only catalog database: connection pool, component cache and queries
+    Thread-safe; each concurrent reader uses its own pooled connection
+    """
+    
+    def __init__(self, path: str, pool_size: int = POOL_SIZE, cache_size: int = CACHE_SIZE,
+                 cached_statements: int = CACHED_STATEMENTS):
+        if not os.path.exists(path):
+            raise CatalogDatabaseError(f"{path}: no such catalog database")
+        self.path = path
+        self.cache_size = cache_size
+        self.cached_statements = cached_statements
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._capacity = threading.Semaphore(pool_size)
+        self._cache: "OrderedDict[str, Component]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Price/availability updates on top of the read-only database, applied when components are built
+        self.overrides: Dict[str, Tuple[Optional[float], bool]] = {}
+        
+        try:
+            meta = dict(self.query("SELECT key, value FROM meta"))
+        except sqlite3.DatabaseError as e:
+            raise CatalogDatabaseError(f"{path}: not a catalog database ({e})")
+        if meta.get("format_version") != FORMAT_VERSION:
+            raise CatalogDatabaseError(f"{path}: unsupported catalog database version {meta.get('format_version')}")
+        self.catalog_version = meta["catalog_version"]
+        self.component_count = self.query("SELECT COUNT(*) FROM components")[0][0]
+    
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled connection (blocks while pool_size connections are in use)"""
+        self._capacity.acquire()
+        try:
+            try:
+                connection = self._pool.get_nowait()
+            except queue.Empty:
+                connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False,
+                                             cached_statements=self.cached_statements)
+                connection.create_function("py_lower", 1, _lower, deterministic=True)
+            try:
+                yield connection
+            finally:
+                self._pool.put(connection)
+        finally:
+            self._capacity.release()
+    
+    def query(self, sql: str, parameters: Sequence = ()) -> List[tuple]:
+        """Run a read query on a pooled connection"""
+        with self.connection() as connection:
+            return connection.execute(sql, parameters).fetchall()
+    
+    def close(self) -> None:
+        """Close pooled connections"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+    
+    # Components
+    
+    def component(self, component_id: str) -> Optional[Component]:
+        """Component by id, None if absent"""
+        with self._cache_lock:
+            component = self._cache.get(component_id)
+            if component is not None:
+                self._cache.move_to_end(component_id)
+                return component
+        rows = self.query(f"SELECT {_COMPONENT_COLUMNS} FROM components WHERE id = ?", (component_id,))
+        return self._build(rows)[0] if rows else None
+    
+    def contains(self, component_id: str) -> bool:
+        """Check if a component is in the database"""
+        with self._cache_lock:
+            if component_id in self._cache:
+                return True
+        return bool(self.query("SELECT 1 FROM components WHERE id = ?", (component_id,)))
+    
+    def component_ids(self) -> Iterator[str]:
+        """All component ids in catalog order, read page by page"""
+        last = -1
+        while True:
+            rows = self.query("SELECT position, id FROM components WHERE position > ? ORDER BY position LIMIT ?",
+                              (last, PAGE_SIZE))
+            if not rows:
+                return
+            for _, component_id in rows:
+                yield component_id
+            last = rows[-1][0]
+    
+    def components_of_type(self, component_type: ComponentType) -> List[Component]:
+        """Components of a type in catalog order"""
+        return self._build(self.query(
+            f"SELECT {_COMPONENT_COLUMNS} FROM components WHERE component_type = ? ORDER BY position",
+            (component_type.value,)
+        ))
+    
+    def search(self, query: str) -> List[Component]:
+        """Components whose name, manufacturer or model contains query (case-insensitive)"""
+        if len(query) >= 3:
+            # Trigram index: a quoted phrase matches any substring of at least 3 characters
+            rows = self.query(
+                f"SELECT {_COMPONENT_COLUMNS} FROM components WHERE position IN "
+                "(SELECT rowid FROM components_search WHERE components_search MATCH ?) ORDER BY position",
+                ('"' + query.replace('"', '""') + '"',)
+            )
+            # The index folds case like SQLite, which may differ from str.lower() outside ASCII
+            needle = query.lower()
+            rows = [row for row in rows
+                    if needle in row[2].lower() or needle in row[4].lower() or needle in row[5].lower()]
+        else:
+            rows = self.query(
+                f"SELECT {_COMPONENT_COLUMNS} FROM components WHERE instr(py_lower(name), ?) "
+                "OR instr(py_lower(manufacturer), ?) OR instr(py_lower(model), ?) ORDER BY position",
+                (query.lower(),) * 3
+            )
+        return self._build(rows)
+    
+    def _build(self, rows: List[tuple]) -> List[Component]:
+        """Components for component rows: cached ones as they are, the rest built with their attributes"""
+        components: List[Optional[Component]] = []
+        missing: Dict[int, int] = {}  # position -> index in rows
+        with self._cache_lock:
+            for index, row in enumerate(rows):
+                component = self._cache.get(row[1])
+                if component is not None:
+                    self._cache.move_to_end(row[1])
+                else:
+                    missing[row[0]] = index
+                components.append(component)
+        
+        positions = list(missing)
+        attributes: Dict[int, List[ComponentAttribute]] = {}
+        for start in range(0, len(positions), PAGE_SIZE):
+            page = positions[start:start + PAGE_SIZE]
+            for position, name, value, unit, is_required in self.query(
+                "SELECT component_position, name, value, unit, is_required FROM attributes "
+                f"WHERE component_position IN ({', '.join('?' * len(page))}) "
+                "ORDER BY component_position, number", page
+            ):
+                attributes.setdefault(position, []).append(ComponentAttribute(name, value, unit, bool(is_required)))
+        
+        with self._cache_lock:
+            for position, index in missing.items():
+                row = rows[index]
+                component = self._cache.get(row[1])  # built meanwhile by another thread
+                if component is None:
+                    component = Component(
+                        id=row[1], name=row[2], component_type=ComponentType(row[3]),
+                        manufacturer=row[4], model=row[5], attributes=attributes.get(position, []),
+                        price=row[6], availability=bool(row[7]), description=row[8]
+                    )
+                    override = self.overrides.get(component.id)
+                    if override is not None:
+                        component.price, component.availability = override
+                    self._cache[component.id] = component
+                components[index] = component
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return components
+    
+    @property
+    def cached_components(self) -> int:
+        """Number of components currently held in memory"""
+        return len(self._cache)
+    
+    # Rules
+    
+    def rules(self) -> List[CompatibilityRule]:
+        """All compatibility rules in order"""
+        return [
+            CompatibilityRule(
+                id=rule_id, rule_type=CompatibilityType(rule_type), primary_component_id=primary,
+                secondary_component_id=secondary, condition=condition,
+                max_quantity=max_quantity, min_quantity=min_quantity
+            )
+            for rule_id, rule_type, primary, secondary, condition, max_quantity, min_quantity in self.query(
+                "SELECT id, rule_type, primary_component_id, secondary_component_id, condition, "
+                "max_quantity, min_quantity FROM rules ORDER BY number"
+            )
+        ]
+    
+    def rule_numbers(self, component_id: str) -> List[int]:
+        """Indexes of rules referencing a component"""
+        return [row[0] for row in self.query(
+            "SELECT rule_number FROM rule_components WHERE component_id = ? ORDER BY rule_number", (component_id,)
+        )]
+
+
+class DatabaseComponents(MutableMapping):
+    """
+    Component id -> Component mapping backed by a catalog database
+    Components added later live in an in-memory overlay
+    """
+    
+    def __init__(self, database: CatalogDatabase):
+        self._database = database
+        self._overlay: Dict[str, Component] = {}
+        self._added = 0  # overlay ids not present in the database
+    
+    def __getitem__(self, component_id: str) -> Component:
+        if component_id in self._overlay:
+            return self._overlay[component_id]
+        component = self._database.component(component_id)
+        if component is None:
+            raise KeyError(component_id)
+        return component
+    
+    def __contains__(self, component_id) -> bool:
+        return component_id in self._overlay or self._database.contains(component_id)
+    
+    def __setitem__(self, component_id: str, component: Component) -> None:
+        if component_id not in self._overlay and not self._database.contains(component_id):
+            self._added += 1
+        self._overlay[component_id] = component
+    
+    def __delitem__(self, component_id: str) -> None:
+        raise TypeError("Database components cannot be deleted")
+    
+    def __iter__(self) -> Iterator[str]:
+        yield from self._database.component_ids()
+        for component_id in self._overlay:
+            if not self._database.contains(component_id):
+                yield component_id
+    
+    def __len__(self) -> int:
+        return self._database.component_count + self._added
+
+
+class DatabaseCompatibilityMatrix(CompatibilityMatrix):
+    """Read-only CompatibilityMatrix answered by indexed queries"""
+    
+    def __init__(self, database: CatalogDatabase):
+        super().__init__()
+        self._database = database
+        self.frozen = True
+    
+    def _intern(self, component_id: str) -> int:
+        raise TypeError("Database matrix is read-only, copy it with CompatibilityMatrix.from_dict(to_dict())")
+    
+    def compatible(self, a: str, b: str) -> bool:
+        """Check if two components can be used together"""
+        constrained = dict(self._database.query(
+            "SELECT component_id, constrained FROM matrix_components WHERE component_id IN (?, ?)", (a, b)
+        ))
+        if not constrained.get(a) and not constrained.get(b):
+            return True
+        return bool(self._database.query(
+            "SELECT 1 FROM compatible_pairs WHERE component_id = ? AND other_id = ?", (a, b)
+        ))
+    
+    def is_constrained(self, component_id: str) -> bool:
+        """Check if component has a compatibility row"""
+        return bool(self._database.query(
+            "SELECT 1 FROM matrix_components WHERE component_id = ? AND constrained", (component_id,)
+        ))
+    
+    __contains__ = is_constrained
+    
+    def __len__(self) -> int:
+        return self._database.query("SELECT COUNT(*) FROM matrix_components WHERE constrained")[0][0]
+    
+    def row(self, component_id: str) -> List[str]:
+        """Ids of components compatible with component_id (listed pairs only)"""
+        return [row[0] for row in self._database.query(
+            "SELECT p.other_id FROM compatible_pairs p JOIN matrix_components m ON m.component_id = p.other_id "
+            "WHERE p.component_id = ? ORDER BY m.number", (component_id,)
+        )]
+    
+    def constrained_ids(self) -> List[str]:
+        """Ids of all components that have a compatibility row"""
+        return [row[0] for row in self._database.query(
+            "SELECT component_id FROM matrix_components WHERE constrained ORDER BY number"
+        )]
+    
+    def copy(self) -> "DatabaseCompatibilityMatrix":
+        """The matrix is read-only, copies share it"""
+        return self
+    
+    def freeze(self) -> None:
+        """Already read-only"""
+    
+    def compact(self) -> None:
+        """Nothing to compact"""
+    
+    def csr(self):
+        """Compacted storage of an in-memory copy (for writing snapshots)"""
+        return CompatibilityMatrix.from_dict(self.to_dict()).csr()
+    
+    def memory_usage(self) -> int:
+        """Pairs stay in the database"""
+        return 0
+
+
+class DatabaseCatalogData(ServerConfiguratorData):
+    """ServerConfiguratorData whose catalog lives in a SQLite database"""
+    
+    def __init__(self, database: CatalogDatabase):
+        super().__init__()
+        self.database = database
+        self.components = DatabaseComponents(database)
+        self.compatibility_rules = database.rules()
+        for rule in self.compatibility_rules:
+            if rule.rule_type == CompatibilityType.CONDITION:
+                from conditions import compile_condition
+                rule.compiled_condition = compile_condition(rule.condition or "")
+        # The rule index is valid while this list holds the database rules unchanged:
+        # add_compatibility_rule sets _rules_changed, replacing the list breaks the identity
+        self._database_rules = self.compatibility_rules
+        self._rules_changed = False
+        self.version = database.catalog_version
+    
+    def copy(self) -> "DatabaseCatalogData":
+        """Writable copy over the same database, components added since opening are copied"""
+        data = DatabaseCatalogData.__new__(DatabaseCatalogData)
+        ServerConfiguratorData.__init__(data)
+        data.database = self.database
+        data.components = DatabaseComponents(self.database)
+        data.components._overlay = dict(self.components._overlay)
+        data.components._added = self.components._added
+        data.compatibility_rules = list(self.compatibility_rules)
+        data._database_rules = data.compatibility_rules
+        data._rules_changed = self._rules_changed or self.compatibility_rules is not self._database_rules
+        data.categories = {component_type: list(ids) for component_type, ids in self.categories.items()}
+        data.version = self.version
+        data.value_version = self.value_version
+        data.use_compiled_rules = self.use_compiled_rules
+        data._batch_validator = self._batch_validator
+        data._compiled_validator = self._compiled_validator
+        return data
+    
+    def add_compatibility_rule(self, rule: CompatibilityRule) -> None:
+        """Add compatibility rule, the database rule index no longer covers it"""
+        super().add_compatibility_rule(rule)
+        self._rules_changed = True
+    
+    def apply_updates(self, updates) -> Tuple[List[str], List[str]]:
+        """Update prices/availability in place, kept as overrides so evicted components get them back"""
+        changed, unknown = super().apply_updates(updates)
+        for component_id in changed:
+            if component_id not in self.components._overlay:
+                component = self.components[component_id]
+                self.database.overrides[component_id] = (component.price, component.availability)
+        return changed, unknown
+    
+    def get_components_by_type(self, component_type: ComponentType) -> List[Component]:
+        """Database components of a type, then components added or replaced since opening"""
+        overlay = self.components._overlay
+        components = [component for component in self.database.components_of_type(component_type)
+                      if component.id not in overlay]
+        return components + super().get_components_by_type(component_type)
+    
+    def get_available_components_by_type(self, component_type: ComponentType) -> List[Component]:
+        """Components of a type in stock (not cached: the catalog may not fit in memory)"""
+        return [component for component in self.get_components_by_type(component_type) if component.availability]
+    
+    def search_components(self, query: str, component_type: Optional[ComponentType] = None) -> List[Component]:
+        """Search through the FTS5 index, then components added or replaced since opening"""
+        overlay = self.components._overlay
+        results = []
+        for component in self.database.search(query):
+            if component.id in overlay:
+                continue  # replaced: matched on its current fields below
+            if not component_type or component.component_type == component_type:
+                results.append(component)
+        
+        query_lower = query.lower()
+        for component in overlay.values():
+            if component_type and component.component_type != component_type:
+                continue
+            if (query_lower in component.name.lower() or
+                    query_lower in component.manufacturer.lower() or
+                    query_lower in component.model.lower()):
+                results.append(component)
+        return results
+    
+    def rules_for_component(self, component_id: str) -> List[CompatibilityRule]:
+        """Rules referencing a component, through the rule index"""
+        if self._rules_changed or self.compatibility_rules is not self._database_rules:
+            return super().rules_for_component(component_id)
+        return [self.compatibility_rules[number] for number in self.database.rule_numbers(component_id)]
+
+
+def open_catalog_db(path: str, pool_size: int = POOL_SIZE,
+                    cache_size: int = CACHE_SIZE) -> Tuple[DatabaseCatalogData, DatabaseCompatibilityMatrix]:
+    """Open catalog database, returns (data, compatibility matrix)"""
+    database = CatalogDatabase(path, pool_size, cache_size)
+    return DatabaseCatalogData(database), DatabaseCompatibilityMatrix(database)
+
+
+def main(argv: List[str]) -> None:
+    """Build a catalog database from sample data or a catalog directory"""
+    if not argv:
+        print(__doc__)
+        return
+    if len(argv) > 1:
+        from catalog_loader import load_catalog_dir
+        data, matrix, _ = load_catalog_dir(argv[1])
+    else:
+        from sample_data import create_sample_data, create_compatibility_matrix
+        data, matrix = create_sample_data(), create_compatibility_matrix()
+    write_catalog_db(argv[0], data, matrix)
+    print(f"Wrote {argv[0]}: {len(data.components)} components, {len(data.compatibility_rules)} rules")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
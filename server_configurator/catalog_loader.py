@@ -0,0 +1,381 @@
+"""
+Catalog loader for server configurator
+Builds ServerConfiguratorData from JSON / NDJSON / CSV catalog files
+
+Files are read one record at a time, so memory is bounded by the catalog
+being built, not by the size of the files.
+
+Component records:
+    {"id": ..., "name": ..., "type": "server", "manufacturer": ..., "model": ...,
+     "price": 1500.0, "availability": true, "description": ...,
+     "attributes": [{"name": "socket", "value": "604", "unit": null}, ...]}
+    CSV: same columns, attributes as "attr:<name>" or "attr:<name>:<unit>" columns
+
+Rule records:
+    {"id": ..., "rule_type": "excluded", "primary_component_id": ...,
+     "secondary_component_id": ..., "condition": ..., "max_quantity": ..., "min_quantity": ...}
+
+Matrix records:
+    {"id": ..., "compatible": [...]}
+    CSV: component_id,compatible_id (one pair per line)
+
+Usage: python catalog_loader.py export <directory> [ndjson|json|csv]
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+from data_models import (
+    Component, ComponentType, ComponentAttribute,
+    CompatibilityRule, CompatibilityType, ServerConfiguratorData
+)
+
+FORMATS = {".ndjson": "ndjson", ".jsonl": "ndjson", ".json": "json", ".csv": "csv"}
+
+RULE_COLUMNS = [
+    "id", "rule_type", "primary_component_id", "secondary_component_id",
+    "condition", "max_quantity", "min_quantity"
+]
+
+_CHUNK_SIZE = 64 * 1024
+
+
+class CatalogLoadError(ValueError):
+    """Invalid catalog file or record"""
+
+
+@dataclass
+class LoadStats:
+    """Counters and throughput of a catalog load"""
+    components: int = 0
+    rules: int = 0
+    matrix_rows: int = 0
+    seconds: float = 0.0
+    files: List[str] = field(default_factory=list)
+    
+    @property
+    def records(self) -> int:
+        """Total records read"""
+        return self.components + self.rules + self.matrix_rows
+    
+    @property
+    def records_per_second(self) -> float:
+        """Load throughput"""
+        return self.records / self.seconds if self.seconds else 0.0
+    
+    def format(self) -> str:
+        """One-line summary"""
+        return (f"{self.components} components, {self.rules} rules, {self.matrix_rows} matrix rows "
+                f"in {self.seconds:.3f}s ({self.records_per_second:,.0f} records/s)")
+
+
+def file_format(path: str) -> str:
+    """Detect file format by extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise CatalogLoadError(f"Unsupported catalog file type: {path}")
+    return FORMATS[extension]
+
+
+def _iter_json_array(stream: TextIO, path: str) -> Iterator[dict]:
+    """Stream records from a top-level JSON array without reading the whole file"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    started = False
+    eof = False
+    
+    while True:
+        # Skip whitespace and separators, refilling the buffer as needed
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position < len(buffer) or eof:
+                break
+            chunk = stream.read(_CHUNK_SIZE)
+            buffer, position = buffer[position:] + chunk, 0
+            eof = not chunk
+        
+        if not started:
+            if buffer[position:position + 1] != "[":
+                raise CatalogLoadError(f"{path}: expected a JSON array of records")
+            started = True
+            position += 1
+            continue
+        if position >= len(buffer):
+            raise CatalogLoadError(f"{path}: unterminated JSON array")
+        if buffer[position] == "]":
+            return
+        
+        try:
+            record, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise CatalogLoadError(f"{path}: invalid JSON near offset {position}") from None
+            chunk = stream.read(_CHUNK_SIZE)
+            buffer, position = buffer[position:] + chunk, 0
+            eof = not chunk
+            continue
+        yield record
+        buffer, position = buffer[end:], 0
+
+
+def iter_records(path: str) -> Iterator[dict]:
+    """Stream raw records (dicts) from a catalog file"""
+    file_type = file_format(path)
+    with open(path, encoding="utf-8", newline="") as stream:
+        if file_type == "ndjson":
+            for line_number, line in enumerate(stream, 1):
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as e:
+                        raise CatalogLoadError(f"{path}:{line_number}: {e.msg}") from None
+        elif file_type == "json":
+            yield from _iter_json_array(stream, path)
+        else:
+            yield from csv.DictReader(stream)
+
+
+def _optional(value):
+    """Empty CSV cells are None"""
+    return None if value in ("", None) else value
+
+
+def _number(value, convert):
+    """Optional numeric field"""
+    value = _optional(value)
+    return None if value is None else convert(value)
+
+
+def _boolean(value) -> bool:
+    """Boolean field, missing means True (availability default)"""
+    if isinstance(value, bool):
+        return value
+    value = _optional(value)
+    return True if value is None else str(value).strip().lower() in ("1", "true", "yes", "y")
+
+
+def component_from_record(record: dict) -> Component:
+    """Build Component from a JSON or CSV record"""
+    attributes = []
+    raw_attributes = record.get("attributes")
+    if isinstance(raw_attributes, list):
+        for attribute in raw_attributes:
+            attributes.append(ComponentAttribute(
+                str(attribute["name"]), str(attribute["value"]), attribute.get("unit"),
+                attribute.get("is_required", True)
+            ))
+    elif isinstance(raw_attributes, dict):
+        attributes = [ComponentAttribute(name, str(value)) for name, value in raw_attributes.items()]
+    
+    for column, value in record.items():
+        if column.startswith("attr:") and _optional(value) is not None:
+            _, name, *unit = column.split(":", 2)
+            attributes.append(ComponentAttribute(name, str(value), unit[0] if unit else None))
+    
+    try:
+        return Component(
+            id=record["id"],
+            name=record["name"],
+            component_type=ComponentType(record.get("type") or record["component_type"]),
+            manufacturer=record.get("manufacturer") or "",
+            model=record.get("model") or "",
+            attributes=attributes,
+            price=_number(record.get("price"), float),
+            availability=_boolean(record.get("availability")),
+            description=_optional(record.get("description"))
+        )
+    except (KeyError, ValueError) as e:
+        raise CatalogLoadError(f"Invalid component record {record.get('id')!r}: {e}") from None
+
+
+def rule_from_record(record: dict) -> CompatibilityRule:
+    """Build CompatibilityRule from a JSON or CSV record"""
+    try:
+        return CompatibilityRule(
+            id=record["id"],
+            rule_type=CompatibilityType(record["rule_type"]),
+            primary_component_id=record.get("primary_component_id") or "",
+            secondary_component_id=_optional(record.get("secondary_component_id")),
+            condition=_optional(record.get("condition")),
+            max_quantity=_number(record.get("max_quantity"), int),
+            min_quantity=_number(record.get("min_quantity"), int)
+        )
+    except (KeyError, ValueError) as e:
+        raise CatalogLoadError(f"Invalid rule record {record.get('id')!r}: {e}") from None
+
+
+def load_matrix(path: str, matrix: Optional[Dict[str, List[str]]] = None) -> Tuple[Dict[str, List[str]], int]:
+    """Load compatibility matrix rows, returns (matrix, record count)"""
+    matrix = {} if matrix is None else matrix
+    count = 0
+    for record in iter_records(path):
+        count += 1
+        if "compatible" in record:
+            row = matrix.setdefault(record["id"], [])
+            row.extend(record["compatible"])
+        else:
+            matrix.setdefault(record["component_id"], []).append(record["compatible_id"])
+    return matrix, count
+
+
+def load_catalog(components_path: str, rules_path: Optional[str] = None,
+                 matrix_path: Optional[str] = None,
+                 data: Optional[ServerConfiguratorData] = None
+                 ) -> Tuple[ServerConfiguratorData, Dict[str, List[str]], LoadStats]:
+    """
+    Load catalog from separate component, rule and matrix files
+    Returns (data, compatibility matrix, stats)
+    """
+    start = time.perf_counter()
+    data = ServerConfiguratorData() if data is None else data
+    stats = LoadStats()
+    
+    stats.files.append(components_path)
+    for record in iter_records(components_path):
+        data.add_component(component_from_record(record))
+        stats.components += 1
+    
+    if rules_path:
+        stats.files.append(rules_path)
+        for record in iter_records(rules_path):
+            data.add_compatibility_rule(rule_from_record(record))
+            stats.rules += 1
+    
+    matrix: Dict[str, List[str]] = {}
+    if matrix_path:
+        stats.files.append(matrix_path)
+        matrix, stats.matrix_rows = load_matrix(matrix_path)
+    
+    stats.seconds = time.perf_counter() - start
+    return data, matrix, stats
+
+
+def find_catalog_files(directory: str) -> Tuple[str, Optional[str], Optional[str]]:
+    """Locate components.*, rules.* and matrix.* files in a directory"""
+    found = {}
+    for name in sorted(os.listdir(directory)):
+        stem, extension = os.path.splitext(name)
+        if stem in ("components", "rules", "matrix") and extension.lower() in FORMATS:
+            found.setdefault(stem, os.path.join(directory, name))
+    if "components" not in found:
+        raise CatalogLoadError(f"No components file in {directory}")
+    return found["components"], found.get("rules"), found.get("matrix")
+
+
+def load_catalog_dir(directory: str) -> Tuple[ServerConfiguratorData, Dict[str, List[str]], LoadStats]:
+    """Load catalog from a directory with components/rules/matrix files"""
+    return load_catalog(*find_catalog_files(directory))
+
+
+# Export (to produce catalog files from Python-defined data)
+
+def component_to_record(component: Component) -> dict:
+    """Component as a JSON record"""
+    return {
+        "id": component.id,
+        "name": component.name,
+        "type": component.component_type.value,
+        "manufacturer": component.manufacturer,
+        "model": component.model,
+        "price": component.price,
+        "availability": component.availability,
+        "description": component.description,
+        "attributes": [
+            {"name": attr.name, "value": attr.value, "unit": attr.unit} for attr in component.attributes
+        ]
+    }
+
+
+def rule_to_record(rule: CompatibilityRule) -> dict:
+    """Rule as a JSON record"""
+    return {
+        "id": rule.id,
+        "rule_type": rule.rule_type.value,
+        "primary_component_id": rule.primary_component_id,
+        "secondary_component_id": rule.secondary_component_id,
+        "condition": rule.condition,
+        "max_quantity": rule.max_quantity,
+        "min_quantity": rule.min_quantity
+    }
+
+
+def _write_records(path: str, records: Iterator[dict], columns: Optional[List[str]] = None) -> None:
+    """Write records in the format given by the file extension"""
+    file_type = file_format(path)
+    with open(path, "w", encoding="utf-8", newline="") as stream:
+        if file_type == "ndjson":
+            for record in records:
+                stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        elif file_type == "json":
+            stream.write("[\n")
+            for index, record in enumerate(records):
+                stream.write(("" if index == 0 else ",\n") + json.dumps(record, ensure_ascii=False))
+            stream.write("\n]\n")
+        else:
+            writer = csv.DictWriter(stream, fieldnames=columns)
+            writer.writeheader()
+            for record in records:
+                writer.writerow(record)
+
+
+def dump_catalog(data: ServerConfiguratorData, matrix: Dict[str, List[str]],
+                 directory: str, file_type: str = "ndjson") -> None:
+    """Write components, rules and matrix files into a directory"""
+    os.makedirs(directory, exist_ok=True)
+    extension = {"ndjson": ".ndjson", "json": ".json", "csv": ".csv"}[file_type]
+    components = list(data.components.values())
+    rules = (rule_to_record(rule) for rule in data.compatibility_rules)
+    
+    if file_type == "csv":
+        attribute_columns = list(dict.fromkeys(
+            f"attr:{attr.name}" + (f":{attr.unit}" if attr.unit else "")
+            for component in components for attr in component.attributes
+        ))
+        columns = ["id", "name", "type", "manufacturer", "model", "price", "availability", "description"]
+        
+        def component_rows():
+            for component in components:
+                record = component_to_record(component)
+                del record["attributes"]
+                for attr in component.attributes:
+                    record[f"attr:{attr.name}" + (f":{attr.unit}" if attr.unit else "")] = attr.value
+                yield record
+        
+        _write_records(os.path.join(directory, "components.csv"), component_rows(), columns + attribute_columns)
+        _write_records(os.path.join(directory, "rules.csv"), rules, RULE_COLUMNS)
+        _write_records(os.path.join(directory, "matrix.csv"), (
+            {"component_id": component_id, "compatible_id": other_id}
+            for component_id, row in matrix.items() for other_id in row
+        ), ["component_id", "compatible_id"])
+        return
+    
+    _write_records(os.path.join(directory, "components" + extension),
+                   (component_to_record(component) for component in components))
+    _write_records(os.path.join(directory, "rules" + extension), rules)
+    _write_records(os.path.join(directory, "matrix" + extension), (
+        {"id": component_id, "compatible": row} for component_id, row in matrix.items()
+    ))
+
+
+def main(argv: List[str]) -> None:
+    """Export built-in sample catalog to data files"""
+    if len(argv) < 2 or argv[0] != "export":
+        print(__doc__)
+        return
+    from sample_data import create_sample_data, create_compatibility_matrix
+    
+    file_type = argv[2] if len(argv) > 2 else "ndjson"
+    dump_catalog(create_sample_data(), create_compatibility_matrix(), argv[1], file_type)
+    _, _, stats = load_catalog_dir(argv[1])
+    print(f"Exported to {argv[1]}: {stats.format()}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
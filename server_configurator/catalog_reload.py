@@ -0,0 +1,169 @@
+"""
+Hot catalog reload for server configurator
+Diffs a newly loaded catalog against the live one and patches only what changed
+
+The patched catalog is a copy-on-write copy of the live one (see catalog.py):
+unchanged components, rules and matrix arrays are shared, and validator caches
+survive when only component values (price, availability, attributes) changed.
+Sessions switch to it on their next operation; components that disappeared are
+moved to ServerConfigurator.missing_components.
+"""
+
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+from catalog import Catalog
+
+MATRIX_PATCH_LIMIT = 0.1  # patch matrix rows up to this share of rows, replace it above
+
+
+@dataclass
+class CatalogDiff:
+    """Differences between the live catalog and a newly loaded one"""
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)   # same id, different values
+    retyped: List[str] = field(default_factory=list)   # changed component type (also in changed)
+    rules_changed: bool = False
+    matrix_rows: List[str] = field(default_factory=list)  # ids whose compatibility row changed
+    
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed or self.rules_changed or self.matrix_rows)
+    
+    @property
+    def structural(self) -> bool:
+        """True if validators must be rebuilt (components added/removed/retyped or rules changed)"""
+        return bool(self.added or self.removed or self.retyped or self.rules_changed)
+    
+    def format(self) -> str:
+        """One-line summary"""
+        return (f"{len(self.added)} added, {len(self.removed)} removed, {len(self.changed)} changed, "
+                f"rules {'changed' if self.rules_changed else 'unchanged'}, "
+                f"{len(self.matrix_rows)} matrix rows changed")
+
+
+def diff_catalogs(live: Catalog, new: Catalog) -> CatalogDiff:
+    """Compare components, rules and compatibility rows"""
+    diff = CatalogDiff()
+    live_components, new_components = live.data.components, new.data.components
+    for component_id, component in new_components.items():
+        current = live_components.get(component_id)
+        if current is None:
+            diff.added.append(component_id)
+        elif current != component:
+            diff.changed.append(component_id)
+            if current.component_type != component.component_type:
+                diff.retyped.append(component_id)
+    diff.removed = [component_id for component_id in live_components if component_id not in new_components]
+    diff.rules_changed = list(live.data.compatibility_rules) != list(new.data.compatibility_rules)
+    
+    live_matrix, new_matrix = live.compatibility_matrix, new.compatibility_matrix
+    for component_id in dict.fromkeys(live_matrix.constrained_ids() + new_matrix.constrained_ids()):
+        if (live_matrix.is_constrained(component_id) != new_matrix.is_constrained(component_id)
+                or set(live_matrix.row(component_id)) != set(new_matrix.row(component_id))):
+            diff.matrix_rows.append(component_id)
+    return diff
+
+
+def patch_catalog(live: Catalog, new: Catalog, diff: CatalogDiff) -> Catalog:
+    """
+    Apply diff to a copy of the live catalog
+    Snapshot-backed catalogs are immutable files, the new one is used as is
+    """
+    from catalog_snapshot import SnapshotCatalogData
+    
+    if isinstance(live.data, SnapshotCatalogData) or isinstance(new.data, SnapshotCatalogData):
+        new.data.advance_past(live.data)
+        return new
+    
+    draft = live.copy()
+    data = draft.data
+    moved = set(diff.removed) | set(diff.retyped)
+    for component_id in diff.removed:
+        del data.components[component_id]
+    if moved:
+        data.categories = {
+            component_type: [component_id for component_id in ids if component_id not in moved]
+            for component_type, ids in data.categories.items()
+        }
+    for component_id in diff.changed:
+        component = new.data.components[component_id]
+        data.components[component_id] = component
+        if component_id in moved:
+            data.categories.setdefault(component.component_type, []).append(component_id)
+    for component_id in diff.added:
+        data.add_component(new.data.components[component_id])
+    if diff.rules_changed:
+        data.compatibility_rules = list(new.data.compatibility_rules)
+    if diff.structural and data.version == live.data.version:
+        data.version += 1
+    data.advance_past(live.data)
+    
+    matrix = draft.compatibility_matrix
+    if len(diff.matrix_rows) > MATRIX_PATCH_LIMIT * max(len(new.compatibility_matrix), 1):
+        matrix = new.compatibility_matrix
+    else:
+        for component_id in diff.matrix_rows:
+            matrix.set_row(component_id, new.compatibility_matrix.row(component_id),
+                           constrained=new.compatibility_matrix.is_constrained(component_id))
+    return Catalog(data, matrix, new.load_stats, new.rule_analysis)
+
+
+class CatalogWatcher(threading.Thread):
+    """
+    Polls catalog files and reloads the publisher when they change
+    on_reload(diff) is called after every reload that changed something
+    """
+    
+    def __init__(self, publisher, paths: List[str], interval: float = 5.0,
+                 on_reload: Optional[Callable[[CatalogDiff], None]] = None):
+        super().__init__(name="catalog-watcher", daemon=True)
+        self.publisher = publisher
+        self.paths = paths
+        self.interval = interval
+        self.on_reload = on_reload
+        self.reloads = 0
+        self.last_error: Optional[Exception] = None
+        self._stop_event = threading.Event()
+        self._signature = self.signature()
+    
+    def signature(self) -> Tuple:
+        """Modification times and sizes of watched files (directories are listed)"""
+        entries = []
+        for path in self.paths:
+            names = sorted(os.listdir(path)) if os.path.isdir(path) else [""]
+            for name in names:
+                file_path = os.path.join(path, name) if name else path
+                try:
+                    stat = os.stat(file_path)
+                except FileNotFoundError:
+                    continue
+                entries.append((file_path, stat.st_mtime_ns, stat.st_size))
+        return tuple(entries)
+    
+    def check(self) -> Optional[CatalogDiff]:
+        """Reload if files changed since the last check, returns the diff"""
+        signature = self.signature()
+        if signature == self._signature:
+            return None
+        try:
+            diff = self.publisher.reload()
+        except Exception as e:  # keep serving the live catalog, retry on next poll
+            self.last_error = e
+            return None
+        self._signature = signature
+        self.last_error = None
+        self.reloads += 1
+        if diff and self.on_reload:
+            self.on_reload(diff)
+        return diff
+    
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.check()
+    
+    def stop(self) -> None:
+        """Stop polling"""
+        self._stop_event.set()
@@ -0,0 +1,626 @@
+"""
+Binary catalog snapshot for server configurator
+Versioned, memory-mapped format for fast startup with lazily decoded entries
+
+Layout (native byte order, recorded in the header):
+    header   magic, format version, byte order, catalog version, section table
+    STRS     string table: offsets + UTF-8 blob (all strings deduplicated)
+    COMP     fixed-size component records, in catalog order
+    ATTR     fixed-size attribute records
+    CIDX     component positions sorted by id (binary search lookup)
+    CATS     component positions grouped by ComponentType
+    RULE     compatibility rule records
+    RIDX     (component id, rule index) pairs sorted by component id
+    MTRX     compatibility matrix CSR arrays and transpose (see compatibility_matrix.py)
+    SRCH     lowercased name/manufacturer/model blob for substring search
+
+Opening maps the file and reads only the header; components are decoded on
+first access, so startup time does not depend on catalog size.
+
+For pre-fork servers, SharedSnapshot writes the snapshot once to shared memory
+(tmpfs); every worker maps the same pages read-only instead of building its
+own catalog.
+
+Usage: python catalog_snapshot.py <output.snap> [catalog_dir]
+"""
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_right
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from compatibility_matrix import CompatibilityMatrix
+from data_models import (
+    Component, ComponentType, ComponentAttribute,
+    CompatibilityRule, CompatibilityType, ServerConfiguratorData
+)
+
+MAGIC = b"SRVCFGSN"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<8sHcxII")           # magic, format version, byte order, catalog version, sections
+_SECTION = struct.Struct("<4sQQ")             # tag, offset, length
+_COMPONENT = struct.Struct("<IIIIIdBIII")     # id, name, type, manufacturer, model, price, available,
+                                              # description, first attribute, attribute count
+_ATTRIBUTE = struct.Struct("<IIIB")           # name, value, unit, is_required
+_RULE = struct.Struct("<IIIIIii")             # id, type, primary, secondary, condition, max, min
+_CATEGORY = struct.Struct("<III")             # type, first position, count
+
+SHARED_MEMORY_DIRECTORY = "/dev/shm"  # POSIX shared memory on Linux, tempdir elsewhere
+
+_NONE = 0xFFFFFFFF
+_NO_QUANTITY = -1
+_FIELD_SEPARATOR = "\x1f"
+_RECORD_SEPARATOR = "\x1e"
+
+
+class SnapshotError(ValueError):
+    """Invalid or incompatible snapshot file"""
+
+
+# Writing
+
+class _StringTable:
+    """Deduplicated string table builder"""
+    
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.strings: List[str] = []
+    
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return _NONE
+        if value not in self.index:
+            self.index[value] = len(self.strings)
+            self.strings.append(value)
+        return self.index[value]
+    
+    def encode(self) -> bytes:
+        blobs = [value.encode("utf-8") for value in self.strings]
+        offsets = array("I", [0])
+        for blob in blobs:
+            offsets.append(offsets[-1] + len(blob))
+        return struct.pack("<I", len(blobs)) + offsets.tobytes() + b"".join(blobs)
+
+
+def _quantity(value: Optional[int]) -> int:
+    return _NO_QUANTITY if value is None else value
+
+
+def write_snapshot(path: str, data: ServerConfiguratorData,
+                   matrix: Union[Dict[str, List[str]], CompatibilityMatrix, None] = None) -> None:
+    """Write a fully built catalog as a binary snapshot"""
+    strings = _StringTable()
+    components = list(data.components.values())
+    positions = {component.id: position for position, component in enumerate(components)}
+    
+    component_records = bytearray()
+    attribute_records = bytearray()
+    attribute_count = 0
+    search_blob = []
+    search_offsets = array("I")
+    search_size = 0
+    for component in components:
+        component_records += _COMPONENT.pack(
+            strings.add(component.id), strings.add(component.name),
+            strings.add(component.component_type.value),
+            strings.add(component.manufacturer), strings.add(component.model),
+            float("nan") if component.price is None else component.price,
+            1 if component.availability else 0,
+            strings.add(component.description), attribute_count, len(component.attributes)
+        )
+        for attr in component.attributes:
+            attribute_records += _ATTRIBUTE.pack(
+                strings.add(attr.name), strings.add(attr.value), strings.add(attr.unit),
+                1 if attr.is_required else 0
+            )
+        attribute_count += len(component.attributes)
+        
+        entry = (_FIELD_SEPARATOR.join((component.name.lower(), component.manufacturer.lower(),
+                                        component.model.lower())) + _RECORD_SEPARATOR).encode("utf-8")
+        search_offsets.append(search_size)
+        search_blob.append(entry)
+        search_size += len(entry)
+    search_offsets.append(search_size)
+    
+    id_index = array("I", sorted(range(len(components)), key=lambda position: components[position].id))
+    
+    category_headers = bytearray()
+    category_positions = array("I")
+    for component_type in ComponentType:
+        members = [positions[component.id] for component in data.get_components_by_type(component_type)]
+        if members:
+            category_headers += _CATEGORY.pack(strings.add(component_type.value),
+                                               len(category_positions), len(members))
+            category_positions.extend(members)
+    
+    rule_records = bytearray()
+    rule_index = []
+    for index, rule in enumerate(data.compatibility_rules):
+        rule_records += _RULE.pack(
+            strings.add(rule.id), strings.add(rule.rule_type.value),
+            strings.add(rule.primary_component_id), strings.add(rule.secondary_component_id),
+            strings.add(rule.condition), _quantity(rule.max_quantity), _quantity(rule.min_quantity)
+        )
+        for component_id in dict.fromkeys((rule.primary_component_id, rule.secondary_component_id)):
+            if component_id:
+                rule_index.append((component_id, index))
+    rule_index.sort()
+    rule_index_array = array("I")
+    for component_id, index in rule_index:
+        rule_index_array.extend((strings.add(component_id), index))
+    
+    if isinstance(matrix, dict):
+        matrix = CompatibilityMatrix.from_dict(matrix)
+    matrix = matrix or CompatibilityMatrix()
+    names, constrained, indptr, indices, lower_indptr, lower_indices = matrix.csr()
+    matrix_names = array("I", [strings.add(name) for name in names])
+    indptr = array("q", indptr)
+    while len(indptr) < len(names) + 1:
+        indptr.append(indptr[-1])
+    lower_indptr = array("q", lower_indptr)
+    while len(lower_indptr) < len(names) + 1:
+        lower_indptr.append(lower_indptr[-1])
+    name_order = array("I", sorted(range(len(names)), key=names.__getitem__))
+    
+    sections = [
+        (b"STRS", strings.encode()),
+        (b"COMP", struct.pack("<I", len(components)) + bytes(component_records)),
+        (b"ATTR", bytes(attribute_records)),
+        (b"CIDX", id_index.tobytes()),
+        (b"CATS", struct.pack("<I", len(category_headers) // _CATEGORY.size)
+         + bytes(category_headers) + category_positions.tobytes()),
+        (b"RULE", struct.pack("<I", len(data.compatibility_rules)) + bytes(rule_records)),
+        (b"RIDX", rule_index_array.tobytes()),
+        (b"MTRX", struct.pack("<QQQ", len(names), len(indices), len(lower_indices))
+         + matrix_names.tobytes() + name_order.tobytes()
+         + bytes(constrained) + b"\0" * (-len(constrained) % 8)
+         + indptr.tobytes() + lower_indptr.tobytes() + indices.tobytes() + lower_indices.tobytes()),
+        (b"SRCH", search_offsets.tobytes() + b"".join(search_blob)),
+    ]
+    
+    header_size = _HEADER.size + _SECTION.size * len(sections)
+    table = bytearray()
+    body = bytearray()
+    offset = header_size
+    for tag, payload in sections:
+        padding = -offset % 8
+        body += b"\0" * padding
+        offset += padding
+        table += _SECTION.pack(tag, offset, len(payload))
+        body += payload
+        offset += len(payload)
+    
+    # Written aside and renamed: processes mapping the old file keep a valid mapping
+    byte_order = b"L" if sys.byteorder == "little" else b"B"
+    with open(path + ".tmp", "wb") as stream:
+        stream.write(_HEADER.pack(MAGIC, FORMAT_VERSION, byte_order, data.version, len(sections)))
+        stream.write(table)
+        stream.write(body)
+    os.replace(path + ".tmp", path)
+
+
+# Reading
+
+class CatalogSnapshot:
+    """Memory-mapped snapshot with lazy decoding"""
+    
+    def __init__(self, path: str):
+        with open(path, "rb") as stream:
+            self._map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        
+        if len(self._map) < _HEADER.size:
+            raise SnapshotError(f"{path}: file too small")
+        magic, format_version, byte_order, self.catalog_version, section_count = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise SnapshotError(f"{path}: not a catalog snapshot")
+        if format_version != FORMAT_VERSION:
+            raise SnapshotError(f"{path}: unsupported snapshot version {format_version}")
+        if byte_order != (b"L" if sys.byteorder == "little" else b"B"):
+            raise SnapshotError(f"{path}: snapshot written with different byte order")
+        
+        self._sections: Dict[bytes, memoryview] = {}
+        self._offsets: Dict[bytes, int] = {}
+        for number in range(section_count):
+            tag, offset, length = _SECTION.unpack_from(self._map, _HEADER.size + number * _SECTION.size)
+            self._sections[tag] = view[offset:offset + length]
+            self._offsets[tag] = offset
+        
+        strings = self._sections[b"STRS"]
+        (string_count,) = struct.unpack_from("<I", strings)
+        self._string_offsets = strings[4:8 + 4 * string_count].cast("I")
+        self._string_blob = strings[8 + 4 * string_count:]
+        self._string_cache: Dict[int, str] = {}
+        
+        records = self._sections[b"COMP"]
+        (self.component_count,) = struct.unpack_from("<I", records)
+        self._components = records[4:]
+        self._attributes = self._sections[b"ATTR"]
+        self._id_index = self._sections[b"CIDX"].cast("I")
+        self._component_cache: Dict[int, Component] = {}
+        
+        categories = self._sections[b"CATS"]
+        (category_count,) = struct.unpack_from("<I", categories)
+        self._category_headers = categories[4:4 + category_count * _CATEGORY.size]
+        self._category_positions = categories[4 + category_count * _CATEGORY.size:].cast("I")
+        
+        self._rules = self._sections[b"RULE"]
+        self._rule_index = self._sections[b"RIDX"].cast("I")
+        
+        # Search blob is scanned with mmap.find, no decoding
+        search = self._sections[b"SRCH"]
+        self._search_offsets = search[:4 * (self.component_count + 1)].cast("I")
+        self._search_base = self._offsets[b"SRCH"] + 4 * (self.component_count + 1)
+        
+        matrix = self._sections[b"MTRX"]
+        self.matrix_size, pair_count, lower_count = struct.unpack_from("<QQQ", matrix)
+        size = self.matrix_size
+        position = 24
+        self.matrix_names = matrix[position:position + 4 * size].cast("I")
+        position += 4 * size
+        self.matrix_name_order = matrix[position:position + 4 * size].cast("I")
+        position += 4 * size
+        self.matrix_constrained = matrix[position:position + size]
+        position += size + (-size % 8)
+        self.matrix_indptr = matrix[position:position + 8 * (size + 1)].cast("q")
+        position += 8 * (size + 1)
+        self.matrix_lower_indptr = matrix[position:position + 8 * (size + 1)].cast("q")
+        position += 8 * (size + 1)
+        self.matrix_indices = matrix[position:position + 4 * pair_count].cast("i")
+        position += 4 * pair_count
+        self.matrix_lower_indices = matrix[position:position + 4 * lower_count].cast("i")
+    
+    def string(self, index: int) -> Optional[str]:
+        """Decode string table entry (cached)"""
+        if index == _NONE:
+            return None
+        value = self._string_cache.get(index)
+        if value is None:
+            value = str(self._string_blob[self._string_offsets[index]:self._string_offsets[index + 1]], "utf-8")
+            self._string_cache[index] = value
+        return value
+    
+    def component_id(self, position: int) -> str:
+        """Component id without decoding the whole record"""
+        return self.string(struct.unpack_from("<I", self._components, position * _COMPONENT.size)[0])
+    
+    def component(self, position: int) -> Component:
+        """Decode component record (cached)"""
+        component = self._component_cache.get(position)
+        if component is None:
+            (id_index, name, component_type, manufacturer, model, price, available,
+             description, first_attribute, attribute_count) = _COMPONENT.unpack_from(
+                self._components, position * _COMPONENT.size)
+            attributes = []
+            for number in range(first_attribute, first_attribute + attribute_count):
+                attr_name, value, unit, is_required = _ATTRIBUTE.unpack_from(
+                    self._attributes, number * _ATTRIBUTE.size)
+                attributes.append(ComponentAttribute(
+                    self.string(attr_name), self.string(value), self.string(unit), bool(is_required)
+                ))
+            component = Component(
+                id=self.string(id_index),
+                name=self.string(name),
+                component_type=ComponentType(self.string(component_type)),
+                manufacturer=self.string(manufacturer),
+                model=self.string(model),
+                attributes=attributes,
+                price=None if price != price else price,
+                availability=bool(available),
+                description=self.string(description)
+            )
+            self._component_cache[position] = component
+        return component
+    
+    def find_component(self, component_id: str) -> Optional[int]:
+        """Binary search component position by id"""
+        low, high = 0, self.component_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.component_id(self._id_index[middle]) < component_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.component_count and self.component_id(self._id_index[low]) == component_id:
+            return self._id_index[low]
+        return None
+    
+    def category_positions(self, component_type: ComponentType) -> List[int]:
+        """Positions of components of a type, in catalog order"""
+        for number in range(len(self._category_headers) // _CATEGORY.size):
+            type_index, first, count = _CATEGORY.unpack_from(self._category_headers, number * _CATEGORY.size)
+            if self.string(type_index) == component_type.value:
+                return list(self._category_positions[first:first + count])
+        return []
+    
+    def rules(self) -> List[CompatibilityRule]:
+        """Decode all compatibility rules"""
+        (count,) = struct.unpack_from("<I", self._rules)
+        rules = []
+        for number in range(count):
+            rule_id, rule_type, primary, secondary, condition, max_quantity, min_quantity = \
+                _RULE.unpack_from(self._rules, 4 + number * _RULE.size)
+            rules.append(CompatibilityRule(
+                id=self.string(rule_id),
+                rule_type=CompatibilityType(self.string(rule_type)),
+                primary_component_id=self.string(primary),
+                secondary_component_id=self.string(secondary),
+                condition=self.string(condition),
+                max_quantity=None if max_quantity == _NO_QUANTITY else max_quantity,
+                min_quantity=None if min_quantity == _NO_QUANTITY else min_quantity
+            ))
+        return rules
+    
+    def rule_numbers(self, component_id: str) -> List[int]:
+        """Indexes of rules referencing a component (binary search in RIDX)"""
+        pairs = len(self._rule_index) // 2
+        low, high = 0, pairs
+        while low < high:
+            middle = (low + high) // 2
+            if self.string(self._rule_index[2 * middle]) < component_id:
+                low = middle + 1
+            else:
+                high = middle
+        numbers = []
+        while low < pairs and self.string(self._rule_index[2 * low]) == component_id:
+            numbers.append(self._rule_index[2 * low + 1])
+            low += 1
+        return numbers
+    
+    def search(self, query: str) -> List[int]:
+        """Positions of components whose name, manufacturer or model contains query"""
+        needle = query.lower().encode("utf-8")
+        if _FIELD_SEPARATOR.encode() in needle or _RECORD_SEPARATOR.encode() in needle:
+            return []
+        positions = []
+        start, end = self._search_base, self._search_base + self._search_offsets[self.component_count]
+        while True:
+            hit = self._map.find(needle, start, end)
+            if hit < 0:
+                return positions
+            position = bisect_right(self._search_offsets, hit - self._search_base) - 1
+            positions.append(position)
+            start = self._search_base + self._search_offsets[position + 1]
+
+
+class SnapshotComponents(MutableMapping):
+    """
+    Component id -> Component mapping backed by a snapshot
+    Records are decoded on access; components added later live in an overlay
+    """
+    
+    def __init__(self, snapshot: CatalogSnapshot):
+        self._snapshot = snapshot
+        self._overlay: Dict[str, Component] = {}
+        self._added = 0  # overlay ids not present in the snapshot
+    
+    def __getitem__(self, component_id: str) -> Component:
+        if component_id in self._overlay:
+            return self._overlay[component_id]
+        position = self._snapshot.find_component(component_id)
+        if position is None:
+            raise KeyError(component_id)
+        return self._snapshot.component(position)
+    
+    def __contains__(self, component_id) -> bool:
+        return component_id in self._overlay or self._snapshot.find_component(component_id) is not None
+    
+    def __setitem__(self, component_id: str, component: Component) -> None:
+        if component_id not in self._overlay and self._snapshot.find_component(component_id) is None:
+            self._added += 1
+        self._overlay[component_id] = component
+    
+    def __delitem__(self, component_id: str) -> None:
+        raise TypeError("Snapshot components cannot be deleted")
+    
+    def __iter__(self) -> Iterator[str]:
+        for position in range(self._snapshot.component_count):
+            yield self._snapshot.component_id(position)
+        for component_id in self._overlay:
+            if self._snapshot.find_component(component_id) is None:
+                yield component_id
+    
+    def __len__(self) -> int:
+        return self._snapshot.component_count + self._added
+
+
+class SnapshotCompatibilityMatrix(CompatibilityMatrix):
+    """Read-only CompatibilityMatrix over the snapshot's CSR arrays (zero copy)"""
+    
+    def __init__(self, snapshot: CatalogSnapshot):
+        super().__init__()
+        self._snapshot = snapshot
+        self._ids = _SnapshotNameIndex(snapshot)
+        self._names = _SnapshotNames(snapshot)
+        self._constrained = snapshot.matrix_constrained
+        self._indptr = snapshot.matrix_indptr
+        self._indices = snapshot.matrix_indices
+        self._lower = (snapshot.matrix_lower_indptr, snapshot.matrix_lower_indices)
+    
+    def _intern(self, component_id: str) -> int:
+        raise TypeError("Snapshot matrix is read-only, copy it with CompatibilityMatrix.from_dict(to_dict())")
+
+
+class _SnapshotNames:
+    """Matrix index -> component id, decoded from the string table"""
+    
+    def __init__(self, snapshot: CatalogSnapshot):
+        self._snapshot = snapshot
+    
+    def __getitem__(self, index: int) -> str:
+        return self._snapshot.string(self._snapshot.matrix_names[index])
+    
+    def __len__(self) -> int:
+        return self._snapshot.matrix_size
+    
+    def __iter__(self) -> Iterator[str]:
+        return (self[index] for index in range(len(self)))
+
+
+class _SnapshotNameIndex:
+    """Component id -> matrix index by binary search over name order"""
+    
+    def __init__(self, snapshot: CatalogSnapshot):
+        self._snapshot = snapshot
+        self._names = _SnapshotNames(snapshot)
+    
+    def get(self, component_id: str, default=None):
+        order = self._snapshot.matrix_name_order
+        low, high = 0, len(order)
+        while low < high:
+            middle = (low + high) // 2
+            if self._names[order[middle]] < component_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(order) and self._names[order[low]] == component_id:
+            return order[low]
+        return default
+
+
+class SnapshotCatalogData(ServerConfiguratorData):
+    """ServerConfiguratorData whose catalog lives in a memory-mapped snapshot"""
+    
+    def __init__(self, snapshot: CatalogSnapshot):
+        super().__init__()
+        self.snapshot = snapshot
+        self.components = SnapshotComponents(snapshot)
+        self.compatibility_rules = snapshot.rules()
+        for rule in self.compatibility_rules:
+            if rule.rule_type == CompatibilityType.CONDITION:
+                from conditions import compile_condition
+                rule.compiled_condition = compile_condition(rule.condition or "")
+        # The rule index is valid while this list holds the snapshot rules unchanged:
+        # add_compatibility_rule sets _rules_changed, replacing the list breaks the identity
+        self._snapshot_rules = self.compatibility_rules
+        self._rules_changed = False
+        self.version = snapshot.catalog_version
+    
+    def copy(self) -> "SnapshotCatalogData":
+        """Writable copy over the same snapshot, components added since opening are copied"""
+        data = SnapshotCatalogData.__new__(SnapshotCatalogData)
+        ServerConfiguratorData.__init__(data)
+        data.snapshot = self.snapshot
+        data.components = SnapshotComponents(self.snapshot)
+        data.components._overlay = dict(self.components._overlay)
+        data.components._added = self.components._added
+        data.compatibility_rules = list(self.compatibility_rules)
+        data._snapshot_rules = data.compatibility_rules
+        data._rules_changed = self._rules_changed or self.compatibility_rules is not self._snapshot_rules
+        data.categories = {component_type: list(ids) for component_type, ids in self.categories.items()}
+        data.version = self.version
+        data.value_version = self.value_version
+        data.use_compiled_rules = self.use_compiled_rules
+        data._batch_validator = self._batch_validator
+        data._compiled_validator = self._compiled_validator
+        return data
+    
+    def add_compatibility_rule(self, rule: CompatibilityRule) -> None:
+        """Add compatibility rule, the snapshot rule index no longer covers it"""
+        super().add_compatibility_rule(rule)
+        self._rules_changed = True
+    
+    def get_components_by_type(self, component_type: ComponentType) -> List[Component]:
+        """Snapshot components of a type, then components added or replaced since opening"""
+        overlay = self.components._overlay
+        components = [self.snapshot.component(position)
+                      for position in self.snapshot.category_positions(component_type)
+                      if not overlay or self.snapshot.component_id(position) not in overlay]
+        return components + super().get_components_by_type(component_type)
+    
+    def search_components(self, query: str, component_type: Optional[ComponentType] = None) -> List[Component]:
+        """Search through the snapshot search index, then components added or replaced since opening"""
+        overlay = self.components._overlay
+        results = []
+        for position in self.snapshot.search(query):
+            if overlay and self.snapshot.component_id(position) in overlay:
+                continue  # replaced: matched on its current fields below
+            component = self.snapshot.component(position)
+            if not component_type or component.component_type == component_type:
+                results.append(component)
+        
+        query_lower = query.lower()
+        for component in overlay.values():
+            if component_type and component.component_type != component_type:
+                continue
+            if (query_lower in component.name.lower() or
+                    query_lower in component.manufacturer.lower() or
+                    query_lower in component.model.lower()):
+                results.append(component)
+        return results
+    
+    def rules_for_component(self, component_id: str) -> List[CompatibilityRule]:
+        """Rules referencing a component, through the snapshot rule index"""
+        if self._rules_changed or self.compatibility_rules is not self._snapshot_rules:
+            return super().rules_for_component(component_id)
+        return [self.compatibility_rules[number] for number in self.snapshot.rule_numbers(component_id)]
+
+
+def open_snapshot(path: str) -> Tuple[SnapshotCatalogData, SnapshotCompatibilityMatrix]:
+    """Open snapshot file, returns (data, compatibility matrix)"""
+    snapshot = CatalogSnapshot(path)
+    return SnapshotCatalogData(snapshot), SnapshotCompatibilityMatrix(snapshot)
+
+
+class SharedSnapshot:
+    """
+    Snapshot built once by the parent process and mapped by every worker
+    The file lives in shared memory (tmpfs), workers open it with open_snapshot()
+    or ServerConfigurator(snapshot_path=...) and share its pages zero-copy
+    """
+    
+    def __init__(self, data: ServerConfiguratorData,
+                 matrix: Union[Dict[str, List[str]], CompatibilityMatrix, None] = None,
+                 directory: Optional[str] = None):
+        if directory is None and os.path.isdir(SHARED_MEMORY_DIRECTORY):
+            directory = SHARED_MEMORY_DIRECTORY
+        descriptor, self.path = tempfile.mkstemp(prefix="catalog-", suffix=".snap", dir=directory)
+        os.close(descriptor)
+        try:
+            write_snapshot(self.path, data, matrix)
+        except BaseException:
+            os.remove(self.path)
+            raise
+        self.size = os.path.getsize(self.path)
+    
+    def open(self) -> Tuple[SnapshotCatalogData, SnapshotCompatibilityMatrix]:
+        """Map the shared snapshot (call in each worker)"""
+        return open_snapshot(self.path)
+    
+    def unlink(self) -> None:
+        """Remove the shared snapshot; workers that mapped it keep their mapping"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+    
+    def __enter__(self) -> "SharedSnapshot":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.unlink()
+
+
+def main(argv: List[str]) -> None:
+    """Build a snapshot from sample data or a catalog directory"""
+    if not argv:
+        print(__doc__)
+        return
+    if len(argv) > 1:
+        from catalog_loader import load_catalog_dir
+        data, matrix, _ = load_catalog_dir(argv[1])
+    else:
+        from sample_data import create_sample_data, create_compatibility_matrix
+        data, matrix = create_sample_data(), create_compatibility_matrix()
+    write_snapshot(argv[0], data, matrix)
+    print(f"Wrote {argv[0]}: {len(data.components)} components, {len(data.compatibility_rules)} rules")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,233 @@
+"""
+Change events for server configurator
+Pushes configuration mutations and price/availability changes to subscribers
+
+Publishers (session handlers, the catalog publisher) run in any thread and
+only put the event into the hub inbox, keyed by (topic, kind, key) so a burst
+for one configuration or component leaves one entry; the event loop then fans
+events out to subscribers. Publishing therefore costs the same whatever the
+number of subscribers.
+
+Each subscriber has its own bounded queue, also coalescing by (kind, key):
+the latest state of a configuration or a component replaces an undelivered
+older one. A subscriber that falls more than max_pending entries behind gets
+its queue replaced by one "resync" event and is expected to fetch the state
+again.
+
+Event kinds:
+    configuration   session configuration changed (data: configuration as in the API)
+    closed          session ended
+    component       price or availability of a catalog component changed (data: id, price, availability)
+    catalog         a new catalog was published (data: catalog_version)
+    resync          events were dropped, fetch the state again
+"""
+
+import asyncio
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+CATALOG_TOPIC = "catalog"
+MAX_PENDING = 1000      # undelivered events per subscriber before it is told to resync
+
+EventKey = Tuple[str, str]  # (kind, key)
+
+
+def session_topic(token: str) -> str:
+    """Topic of one session's configuration events"""
+    return f"session:{token}"
+
+
+@dataclass
+class Event:
+    """One change; id increases with every published event"""
+    id: int
+    topic: str
+    kind: str
+    key: str
+    data: Optional[Dict]
+    _encoded: Optional[bytes] = field(default=None, repr=False, compare=False)
+    
+    def sse(self) -> bytes:
+        """Server-Sent Events message, encoded once however many subscribers get it"""
+        if self._encoded is None:
+            self._encoded = f"id: {self.id}\nevent: {self.kind}\ndata: {json.dumps(self.data)}\n\n".encode("utf-8")
+        return self._encoded
+
+
+@dataclass
+class HubStats:
+    """Event hub counters"""
+    published: int = 0
+    coalesced: int = 0     # events merged in the hub inbox
+    dispatched: int = 0    # events handed to subscriber queues
+    dropped: int = 0       # subscriber queues replaced by a resync event
+    subscribers: int = 0
+    
+    def format(self) -> str:
+        """One-line summary"""
+        return (f"{self.published} published, {self.coalesced} coalesced, {self.dispatched} dispatched, "
+                f"{self.dropped} resyncs, {self.subscribers} subscribers")
+
+
+class Subscriber:
+    """
+    Bounded, coalescing queue of events for one client
+    Filled on the event loop by EventHub; read with next_events()
+    """
+    
+    def __init__(self, topics: Iterable[str], component_ids: Optional[Set[str]] = None,
+                 max_pending: int = MAX_PENDING):
+        self.topics = tuple(topics)
+        self.component_ids = component_ids  # component events only for these ids, all if None
+        self.max_pending = max_pending
+        self.coalesced = 0
+        self.dropped = 0
+        self.closed = False
+        self._pending: "OrderedDict[EventKey, Event]" = OrderedDict()
+        self._ready = asyncio.Event()
+    
+    def offer(self, event: Event) -> bool:
+        """Queue an event (latest wins per kind and key), returns False when the queue overflowed"""
+        if event.kind == "component" and self.component_ids is not None and event.key not in self.component_ids:
+            return True
+        key = (event.kind, event.key)
+        if key in self._pending:
+            del self._pending[key]
+            self.coalesced += 1
+        self._pending[key] = event
+        self._ready.set()
+        if len(self._pending) > self.max_pending:
+            self._pending.clear()
+            self._pending[("resync", "")] = Event(event.id, event.topic, "resync", "", None)
+            self.dropped += 1
+            return False
+        return True
+    
+    def __len__(self) -> int:
+        return len(self._pending)
+    
+    async def next_events(self, timeout: Optional[float] = None, delay: float = 0.0) -> List[Event]:
+        """
+        Wait for events and take all queued ones ([] on timeout or when closed)
+        delay lets a burst settle so it is delivered coalesced
+        """
+        if not self._pending and not self.closed:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+            if delay and not self.closed:
+                await asyncio.sleep(delay)
+        events = list(self._pending.values())
+        self._pending.clear()
+        self._ready.clear()
+        return events
+    
+    def close(self) -> None:
+        """Wake the reader, no more events will come"""
+        self.closed = True
+        self._ready.set()
+
+
+class EventHub:
+    """
+    Routes events from publishing threads to subscribers on one event loop
+    publish() is thread-safe and O(1); fan-out runs on the loop bound with bind()
+    """
+    
+    def __init__(self, max_pending: int = MAX_PENDING):
+        self.max_pending = max_pending
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._topics: Dict[str, Dict[Subscriber, None]] = {}  # insertion-ordered sets
+        self._inbox: Dict[Tuple[str, str, str], Event] = {}
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._next_id = 1
+        self._stats = HubStats()
+    
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Deliver on this loop (the one serving the subscribers)"""
+        self._loop = loop
+    
+    def subscribe(self, topics: Iterable[str], component_ids: Optional[Set[str]] = None) -> Subscriber:
+        """New subscriber to topics (call on the loop)"""
+        subscriber = Subscriber(topics, component_ids, self.max_pending)
+        for topic in subscriber.topics:
+            self._topics.setdefault(topic, {})[subscriber] = None
+        return subscriber
+    
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """Stop delivering to a subscriber (call on the loop)"""
+        for topic in subscriber.topics:
+            subscribers = self._topics.get(topic, {})
+            subscribers.pop(subscriber, None)
+            if not subscribers:
+                self._topics.pop(topic, None)
+        subscriber.close()
+    
+    def publish(self, topic: str, kind: str, key: str = "", data: Optional[Dict] = None) -> None:
+        """Publish an event from any thread; dropped at once if nobody listens to the topic"""
+        if topic not in self._topics or self._loop is None:
+            return
+        with self._lock:
+            event = Event(self._next_id, topic, kind, key, data)
+            self._next_id += 1
+            self._stats.published += 1
+            inbox_key = (topic, kind, key)
+            if inbox_key in self._inbox:
+                del self._inbox[inbox_key]
+                self._stats.coalesced += 1
+            self._inbox[inbox_key] = event
+            if self._scheduled:
+                return
+            self._scheduled = True
+        try:
+            self._loop.call_soon_threadsafe(self._dispatch)
+        except RuntimeError:  # loop closed
+            with self._lock:
+                self._inbox.clear()
+                self._scheduled = False
+    
+    def catalog_changed(self, catalog, changed: Optional[List[str]]) -> None:
+        """CatalogPublisher listener: component events for in-place updates, a catalog event otherwise"""
+        if CATALOG_TOPIC not in self._topics:
+            return
+        if changed is None:
+            self.publish(CATALOG_TOPIC, "catalog", "", {"catalog_version": catalog.data.catalog_version})
+            return
+        components = catalog.data.components
+        for component_id in changed:
+            component = components.get(component_id)
+            if component is not None:
+                self.publish(CATALOG_TOPIC, "component", component_id, {
+                    "id": component_id, "price": component.price, "availability": component.availability
+                })
+    
+    def _dispatch(self) -> None:
+        with self._lock:
+            events = list(self._inbox.values())
+            self._inbox.clear()
+            self._scheduled = False
+        for event in events:
+            for subscriber in list(self._topics.get(event.topic, ())):
+                self._stats.dispatched += 1
+                if not subscriber.offer(event):
+                    self._stats.dropped += 1
+    
+    def close(self) -> None:
+        """Wake every subscriber so its stream ends"""
+        for subscribers in list(self._topics.values()):
+            for subscriber in subscribers:
+                subscriber.close()
+        self._topics.clear()
+    
+    def stats(self) -> HubStats:
+        """Copy of the counters with the current subscriber count"""
+        with self._lock:
+            stats = HubStats(**vars(self._stats))
+        stats.subscribers = len({id(subscriber) for subscribers in self._topics.values()
+                                 for subscriber in subscribers})
+        return stats
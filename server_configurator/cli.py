@@ -4,6 +4,7 @@ Simple CLI for testing and demonstrating the configurator
 """
 
 from configurator import ServerConfigurator
+from currency import BASE_CURRENCY, check_currency, format_price
 from data_models import ComponentType
 
 
@@ -12,13 +13,20 @@ def print_separator():
     print("=" * 60)
 
 
-def print_component(component):
-    """Print component information"""
+def component_price(configurator, component, currency):
+    """Component price in currency (precomputed, see price_columns.py)"""
+    if currency == BASE_CURRENCY:
+        return component.price
+    return configurator.data.price_columns().price(component.id, currency)
+
+
+def print_component(component, configurator, currency=BASE_CURRENCY):
+    """Print component information, price in the session currency"""
     print(f"  ID: {component.id}")
     print(f"  Name: {component.name}")
     print(f"  Manufacturer: {component.manufacturer}")
     print(f"  Model: {component.model}")
-    print(f"  Price: ${component.price or 0:.2f}")
+    print(f"  Price: {format_price(component_price(configurator, component, currency), currency)}")
     if component.attributes:
         print("  Attributes:")
         for attr in component.attributes:
@@ -27,11 +35,11 @@ def print_component(component):
     print()
 
 
-def print_configuration(config):
+def print_configuration(config, configurator):
     """Print current configuration"""
     print_separator()
     print(f"CONFIGURATION: {config.name}")
-    print(f"Total Price: ${config.total_price:.2f}")
+    print(f"Total Price: {format_price(config.total_price, config.currency)}")
     print(f"Valid: {'✅' if config.is_valid else '❌'}")
     
     if config.validation_errors:
@@ -45,13 +53,15 @@ def print_configuration(config):
         if components:
             print(f"  {comp_type.value.upper()}:")
             for comp in components:
-                print(f"    - {comp.name} (${comp.price or 0:.2f})")
+                price = component_price(configurator, comp, config.currency)
+                print(f"    - {comp.name} ({format_price(price, config.currency)})")
     print_separator()
 
 
 def main():
     """Main CLI loop"""
     configurator = ServerConfigurator()
+    currency = BASE_CURRENCY
     
     print("🖥️  SERVER CONFIGURATOR")
     print("Type 'help' for available commands")
@@ -65,7 +75,7 @@ def main():
                 print_help()
             
             elif command == "list":
-                list_components(configurator)
+                list_components(configurator, currency)
             
             elif command.startswith("add "):
                 component_id = command[4:].strip()
@@ -76,8 +86,8 @@ def main():
                 remove_component(configurator, component_id)
             
             elif command == "config":
-                config = configurator.get_current_configuration()
-                print_configuration(config)
+                config = configurator.get_current_configuration(currency)
+                print_configuration(config, configurator)
             
             elif command == "clear":
                 configurator.clear_configuration()
@@ -91,8 +101,12 @@ def main():
                 component_id = command[7:].strip()
                 show_compatibility(configurator, component_id)
             
+            elif command.startswith("currency "):
+                currency = check_currency(command[9:].strip())
+                print(f"Prices in {currency}")
+            
             elif command == "export":
-                export_configuration(configurator)
+                export_configuration(configurator, currency)
             
             elif command == "quit" or command == "exit":
                 print("Goodbye!")
@@ -119,11 +133,12 @@ def print_help():
     print("  clear                   - Clear current configuration")
     print("  search <query>          - Search components")
     print("  compat <component_id>   - Show compatibility info")
+    print("  currency <code>         - Show prices in BYN, RUB, USD or EUR")
     print("  export                  - Export configuration")
     print("  quit/exit               - Exit program")
 
 
-def list_components(configurator):
+def list_components(configurator, currency=BASE_CURRENCY):
     """List all available components"""
     print_separator()
     print("AVAILABLE COMPONENTS:")
@@ -134,7 +149,8 @@ def list_components(configurator):
         if components:
             print(f"{comp_type.value.upper()}:")
             for comp in components:
-                print(f"  {comp.id}: {comp.name} (${comp.price or 0:.2f})")
+                price = component_price(configurator, comp, currency)
+                print(f"  {comp.id}: {comp.name} ({format_price(price, currency)})")
             print()
 
 
@@ -188,16 +204,16 @@ def show_compatibility(configurator, component_id):
     print(f"  Incompatible with: {', '.join(compat_info['incompatible_with']) or 'None'}")
 
 
-def export_configuration(configurator):
+def export_configuration(configurator, currency=BASE_CURRENCY):
     """Export current configuration"""
     try:
-        json_export = configurator.export_configuration("json")
+        json_export = configurator.export_configuration("json", currency)
         print("JSON Export:")
         print(json_export)
         
         print("\n" + "="*40 + "\n")
         
-        csv_export = configurator.export_configuration("csv")
+        csv_export = configurator.export_configuration("csv", currency)
         print("CSV Export:")
         print(csv_export)
         
@@ -0,0 +1,295 @@
+"""
+Symmetric compatibility matrix
+Stores each compatible pair once as an upper-triangular CSR structure
+
+Lookups work on plain arrays; building the CSR arrays (from_dict, compact,
+the transpose) is done with NumPy sorts over packed pair keys.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+_SHIFT = 32
+_MASK = (1 << _SHIFT) - 1
+
+
+def _numpy(values, dtype) -> np.ndarray:
+    """NumPy view of an array or memoryview (no copy)"""
+    return np.frombuffer(values, dtype=dtype)
+
+
+def _array(typecode: str, values: np.ndarray) -> array:
+    """Plain array holding NumPy values (the storage lookups read)"""
+    result = array(typecode)
+    result.frombytes(np.ascontiguousarray(values, dtype=np.int64 if typecode == "q" else np.int32).tobytes())
+    return result
+
+
+def _unique(keys: np.ndarray) -> np.ndarray:
+    """Sorted distinct keys (a plain sort, much faster than np.unique on packed pair keys)"""
+    keys = np.sort(keys)
+    return keys[np.concatenate(([True], keys[1:] != keys[:-1]))] if len(keys) else keys
+
+
+def _indptr(rows: np.ndarray, size: int) -> np.ndarray:
+    """CSR row pointers for sorted row numbers"""
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=size), out=indptr[1:])
+    return indptr
+
+
+class CompatibilityMatrix:
+    """
+    Symmetric compatibility relation over component ids
+    
+    Components are interned to ints; pair (i, j) with i <= j is stored once in
+    row i of a CSR structure (`_indptr`, `_indices`, sorted per row). Bulk
+    updates go to small added/removed sets merged by compact().
+    
+    Semantics match the dict-of-lists matrix checked in both directions:
+    components without a row are unconstrained, a constrained component is
+    compatible only with components its row lists.
+    """
+    
+    def __init__(self, compact_threshold: int = 4096):
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._constrained = bytearray()
+        self._indptr = array("q", [0])
+        self._indices = array("i")
+        self._added: Set[int] = set()
+        self._removed: Set[int] = set()
+        self._lower: Optional[Tuple[array, array]] = None  # transpose, built lazily for row()
+        self.compact_threshold = compact_threshold
+        self.frozen = False
+    
+    @classmethod
+    def from_dict(cls, matrix: Dict[str, List[str]]) -> "CompatibilityMatrix":
+        """Build from dict of component_id -> compatible component_ids"""
+        result = cls()
+        for component_id in matrix:
+            result._constrain(result._intern(component_id))
+        
+        ids = result._ids
+        sources: List[int] = []
+        targets: List[int] = []
+        for component_id, compatible in matrix.items():
+            compatible = set(compatible)
+            for other_id in compatible.difference(ids):
+                result._intern(other_id)
+            sources.extend([ids[component_id]] * len(compatible))
+            targets.extend(map(ids.__getitem__, compatible))
+        
+        sources = np.array(sources, dtype=np.int64)
+        targets = np.array(targets, dtype=np.int64)
+        keys = (np.minimum(sources, targets) << _SHIFT) | np.maximum(sources, targets)
+        # Pair between two constrained components must be listed both ways: its key appears
+        # twice (rows are sets). Listed one way, it counts if the other side has no row
+        ordered = np.sort(keys)
+        both_ways = ordered[1:][ordered[1:] == ordered[:-1]]
+        constrained = np.frombuffer(bytes(result._constrained), dtype=np.uint8).astype(bool)
+        one_way = keys[~constrained[targets] | (sources == targets)]
+        result._rebuild(_unique(np.concatenate((both_ways, one_way))))
+        return result
+    
+    def _intern(self, component_id: str) -> int:
+        """Get int id for component, assigning a new one if needed"""
+        if self.frozen:
+            raise TypeError("Compatibility matrix is frozen")
+        index = self._ids.get(component_id)
+        if index is None:
+            index = self._ids[component_id] = len(self._names)
+            self._names.append(component_id)
+            self._constrained.append(0)
+        return index
+    
+    def _constrain(self, index: int) -> None:
+        self._constrained[index] = 1
+    
+    @staticmethod
+    def _key(a: int, b: int) -> int:
+        """Pack unordered pair into one int"""
+        return (a << _SHIFT) | b if a <= b else (b << _SHIFT) | a
+    
+    def _base_contains(self, low: int, high: int) -> bool:
+        """Binary search for pair in compacted CSR"""
+        if low + 1 >= len(self._indptr):
+            return False
+        start, end = self._indptr[low], self._indptr[low + 1]
+        position = bisect_left(self._indices, high, start, end)
+        return position < end and self._indices[position] == high
+    
+    def _contains(self, a: int, b: int) -> bool:
+        key = self._key(a, b)
+        if key in self._removed:
+            return False
+        if key in self._added:
+            return True
+        return self._base_contains(key >> _SHIFT, key & ((1 << _SHIFT) - 1))
+    
+    def compatible(self, a: str, b: str) -> bool:
+        """Check if two components can be used together (single lookup)"""
+        ia = self._ids.get(a)
+        ib = self._ids.get(b)
+        constrained_a = ia is not None and self._constrained[ia]
+        constrained_b = ib is not None and self._constrained[ib]
+        if not constrained_a and not constrained_b:
+            return True
+        if ia is None or ib is None:
+            return False
+        return self._contains(ia, ib)
+    
+    def is_constrained(self, component_id: str) -> bool:
+        """Check if component has a compatibility row"""
+        index = self._ids.get(component_id)
+        return index is not None and bool(self._constrained[index])
+    
+    __contains__ = is_constrained
+    
+    def __len__(self) -> int:
+        """Number of constrained components"""
+        return sum(self._constrained)
+    
+    def row(self, component_id: str) -> List[str]:
+        """Ids of components compatible with component_id (listed pairs only)"""
+        index = self._ids.get(component_id)
+        if index is None:
+            return []
+        
+        neighbors = []
+        if index + 1 < len(self._indptr):
+            neighbors.extend(self._indices[self._indptr[index]:self._indptr[index + 1]])
+        lower_indptr, lower_indices = self._transpose()
+        if index + 1 < len(lower_indptr):
+            neighbors.extend(lower_indices[lower_indptr[index]:lower_indptr[index + 1]])
+        
+        if self._added or self._removed:
+            mask = (1 << _SHIFT) - 1
+            neighbors = [
+                other for other in neighbors
+                if self._key(index, other) not in self._removed
+            ]
+            for key in self._added:
+                low, high = key >> _SHIFT, key & mask
+                if low == index:
+                    neighbors.append(high)
+                elif high == index:
+                    neighbors.append(low)
+        
+        return [self._names[other] for other in sorted(set(neighbors))]
+    
+    def constrained_ids(self) -> List[str]:
+        """Ids of all components that have a compatibility row"""
+        return [name for name, flag in zip(self._names, self._constrained) if flag]
+    
+    def _transpose(self) -> Tuple[array, array]:
+        """Lower-triangular view (column -> rows) of the compacted CSR, cached"""
+        if self._lower is None:
+            rows, columns = self._pairs()
+            below = columns != rows
+            rows, columns = rows[below], columns[below]
+            order = np.argsort(columns, kind="stable")  # rows stay ascending within a column
+            self._lower = (_array("q", _indptr(columns[order], len(self._names))), _array("i", rows[order]))
+        return self._lower
+    
+    def _pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(row, column) of every pair of the compacted CSR, in storage order"""
+        indptr = _numpy(self._indptr, np.int64)
+        rows = np.repeat(np.arange(len(indptr) - 1, dtype=np.int64), np.diff(indptr))
+        return rows, _numpy(self._indices, np.int32).astype(np.int64)
+    
+    def copy(self) -> "CompatibilityMatrix":
+        """
+        Writable copy for copy-on-write updates
+        CSR arrays are shared: they are never changed in place, compact() replaces them
+        """
+        result = CompatibilityMatrix(self.compact_threshold)
+        result._names = list(self._names)
+        result._ids = {name: index for index, name in enumerate(result._names)}
+        result._constrained = bytearray(self._constrained)
+        result._indptr, result._indices = self._indptr, self._indices
+        result._added, result._removed = set(self._added), set(self._removed)
+        result._lower = self._lower
+        return result
+    
+    def freeze(self) -> None:
+        """Compact, build the transpose and reject further updates (safe to share)"""
+        self.compact()
+        self._transpose()
+        self.frozen = True
+    
+    # Bulk updates
+    
+    def add_pairs(self, pairs: Iterable[Tuple[str, str]]) -> None:
+        """Mark pairs compatible"""
+        for a, b in pairs:
+            key = self._key(self._intern(a), self._intern(b))
+            self._removed.discard(key)
+            self._added.add(key)
+        self._maybe_compact()
+    
+    def remove_pairs(self, pairs: Iterable[Tuple[str, str]]) -> None:
+        """Mark pairs incompatible"""
+        for a, b in pairs:
+            key = self._key(self._intern(a), self._intern(b))
+            self._added.discard(key)
+            self._removed.add(key)
+        self._maybe_compact()
+    
+    def set_row(self, component_id: str, compatible: Iterable[str], constrained: bool = True) -> None:
+        """Replace the compatibility row of a component (constrains it unless constrained=False)"""
+        compatible = set(compatible)
+        index = self._intern(component_id)
+        self._constrained[index] = 1 if constrained else 0
+        current = set(self.row(component_id))
+        self.remove_pairs((component_id, other_id) for other_id in current - compatible)
+        self.add_pairs((component_id, other_id) for other_id in compatible - current)
+    
+    def _maybe_compact(self) -> None:
+        if len(self._added) + len(self._removed) > self.compact_threshold:
+            self.compact()
+    
+    def _keys(self) -> np.ndarray:
+        """All pair keys of the compacted CSR, sorted"""
+        rows, columns = self._pairs()
+        return (rows << _SHIFT) | columns
+    
+    def compact(self) -> None:
+        """Merge pending updates into the CSR arrays"""
+        if not self._added and not self._removed:
+            return
+        keys = self._keys()
+        if self._removed:
+            keys = keys[~np.isin(keys, np.fromiter(self._removed, dtype=np.int64, count=len(self._removed)))]
+        if self._added:
+            keys = _unique(np.concatenate((keys, np.fromiter(self._added, dtype=np.int64, count=len(self._added)))))
+        self._rebuild(keys)
+    
+    def _rebuild(self, keys: np.ndarray) -> None:
+        """Rebuild CSR arrays from sorted, unique pair keys"""
+        self._indptr = _array("q", _indptr(keys >> _SHIFT, len(self._names)))
+        self._indices = _array("i", keys & _MASK)
+        self._added.clear()
+        self._removed.clear()
+        self._lower = None
+    
+    def csr(self) -> Tuple[List[str], bytearray, array, array, array, array]:
+        """Compacted storage: (names, constrained flags, indptr, indices, lower indptr, lower indices)"""
+        self.compact()
+        return (self._names, self._constrained, self._indptr, self._indices) + self._transpose()
+    
+    def to_dict(self) -> Dict[str, List[str]]:
+        """Export as dict of lists (both directions) for constrained components"""
+        return {component_id: self.row(component_id) for component_id in self.constrained_ids()}
+    
+    def memory_usage(self) -> int:
+        """Approximate bytes held by the pair storage"""
+        total = self._indptr.buffer_info()[1] * self._indptr.itemsize
+        total += self._indices.buffer_info()[1] * self._indices.itemsize
+        total += len(self._constrained)
+        if self._lower is not None:
+            total += sum(part.buffer_info()[1] * part.itemsize for part in self._lower)
+        return total
@@ -0,0 +1,493 @@
+"""
+Condition expressions for compatibility rules
+A small, safe expression language evaluated against configuration aggregates
+
+Examples:
+    count(type=memory) <= server.max_memory_slots
+    sum(capacity, type=memory) <= server.max_memory_gb
+    count(id=intel_xeon_3_0_604) + count(id=intel_xeon_3_2_604) <= 2
+
+Supported:
+    count(type=..., id=...)    number of components, optionally filtered
+    sum(attribute, type=...)   sum of a numeric attribute over components
+    <type>.<attribute>         attribute of the first component of that type
+    numbers, 'strings', + - * /, comparisons, and/or/not
+
+Expressions are parsed once into closures; evaluation never re-parses.
+The same expressions also compile to Python source for generated validators
+(condition_source) and to NumPy array operations over a whole batch of
+configurations (compile_batch_condition).
+"""
+
+import ast
+import operator
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from data_models import Component, ComponentType
+
+
+class ConditionError(ValueError):
+    """Invalid condition expression"""
+
+
+class MissingValue(Exception):
+    """Referenced component or attribute is absent from the configuration"""
+
+
+class ConditionContext:
+    """Aggregates of one configuration, computed on first use and reused by every condition"""
+    
+    def __init__(self, components: Dict[ComponentType, List[Component]]):
+        self.components = components
+        self._type_counts: Optional[Dict[ComponentType, int]] = None
+        self._id_counts: Optional[Dict[str, int]] = None
+        self._attributes: Dict[tuple, object] = {}
+    
+    def count(self, component_type: Optional[ComponentType] = None, component_id: Optional[str] = None) -> int:
+        """Count components by type and/or id"""
+        if component_id is not None:
+            if self._id_counts is None:
+                self._id_counts = {}
+                for components in self.components.values():
+                    for component in components:
+                        self._id_counts[component.id] = self._id_counts.get(component.id, 0) + 1
+            if component_type is None:
+                return self._id_counts.get(component_id, 0)
+            return sum(1 for c in self.components.get(component_type, []) if c.id == component_id)
+        
+        if self._type_counts is None:
+            self._type_counts = {t: len(components) for t, components in self.components.items()}
+        if component_type is None:
+            return sum(self._type_counts.values())
+        return self._type_counts.get(component_type, 0)
+    
+    def attribute(self, component_type: ComponentType, name: str):
+        """Attribute value of the first component of a type"""
+        key = (component_type, name)
+        if key not in self._attributes:
+            self._attributes[key] = first_attribute(self.components.get(component_type), name)
+        return self._attributes[key]
+    
+    def total(self, name: str, component_type: Optional[ComponentType] = None) -> float:
+        """
+        Sum of a numeric attribute, components without it count as zero
+        A value that is not a number makes the sum not applicable (MissingValue)
+        """
+        key = (component_type, name, "sum")
+        if key not in self._attributes:
+            if component_type is None:
+                groups = self.components.values()
+            else:
+                groups = [self.components.get(component_type, [])]
+            self._attributes[key] = sum(attribute_sum(components, name) for components in groups)
+        return self._attributes[key]
+
+
+# Number with an optional unit suffix, as vendor feeds write them: "16GB", "2.5 GHz", "1,5 TB"
+_NUMBER_WITH_UNIT = re.compile(r"\s*([-+]?\d+(?:[.,]\d+)?)\s*([A-Za-z]*)\s*")
+
+# Multiples of one unit family, so "1TB" sums correctly into a GB attribute
+_UNIT_SCALE = {"mb": 1 / 1024, "gb": 1, "tb": 1024}
+
+
+def _number(value: str, unit: Optional[str] = None):
+    """Convert attribute string to int/float when possible, the string itself otherwise"""
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    match = _NUMBER_WITH_UNIT.fullmatch(value)
+    if match is None:
+        return value
+    number = float(match.group(1).replace(",", "."))
+    suffix = match.group(2).lower()
+    if suffix in _UNIT_SCALE and unit and unit.lower() in _UNIT_SCALE:
+        number *= _UNIT_SCALE[suffix] / _UNIT_SCALE[unit.lower()]
+    return int(number) if number.is_integer() else number
+
+
+def attribute_value(component: Component, name: str):
+    """Attribute value with numeric conversion, MissingValue if the component has no such attribute"""
+    for attribute in component.attributes:
+        if attribute.name == name:
+            return _number(attribute.value, attribute.unit)
+    raise MissingValue(f"{component.id}.{name}")
+
+
+# Raised while evaluating a condition that does not apply to a configuration
+NOT_APPLICABLE = (MissingValue, ZeroDivisionError, TypeError)
+
+def first_attribute(components: Optional[List[Component]], name: str):
+    """Attribute value of the first of components, MissingValue if there are none"""
+    if not components:
+        raise MissingValue(name)
+    return attribute_value(components[0], name)
+
+
+def attribute_sum(components: List[Component], name: str):
+    """Sum of a numeric attribute over components, MissingValue if a value is not a number"""
+    total = 0
+    for component in components:
+        try:
+            value = attribute_value(component, name)
+        except MissingValue:
+            continue
+        if not isinstance(value, (int, float)):
+            raise MissingValue(f"{component.id}.{name} is not numeric")
+        total += value
+    return total
+
+
+_COMPONENT_TYPES = {component_type.value: component_type for component_type in ComponentType}
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+
+_COMPARE_OPERATORS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+
+
+def _component_type(node: ast.AST, expression: str) -> ComponentType:
+    """Resolve a bare name or string to a ComponentType"""
+    name = _symbol(node, expression)
+    if name not in _COMPONENT_TYPES:
+        raise ConditionError(f"Unknown component type '{name}' in: {expression}")
+    return _COMPONENT_TYPES[name]
+
+
+def _symbol(node: ast.AST, expression: str) -> str:
+    """Bare identifiers in argument position are plain strings"""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    raise ConditionError(f"Expected a name in: {expression}")
+
+
+def _aggregate(node: ast.Call, expression: str) -> tuple:
+    """Parse a count(...) / sum(...) call into ("count", type, id) or ("sum", type, attribute)"""
+    if not isinstance(node.func, ast.Name) or node.func.id not in ("count", "sum"):
+        raise ConditionError(f"Unknown function in: {expression}")
+    
+    keywords = {keyword.arg: keyword.value for keyword in node.keywords}
+    unknown = set(keywords) - {"type", "id"}
+    if unknown or None in keywords:
+        raise ConditionError(f"Unsupported arguments {sorted(map(str, unknown))} in: {expression}")
+    component_type = _component_type(keywords["type"], expression) if "type" in keywords else None
+    
+    if node.func.id == "count":
+        if node.args:
+            raise ConditionError(f"count() takes keyword arguments only: {expression}")
+        component_id = _symbol(keywords["id"], expression) if "id" in keywords else None
+        return "count", component_type, component_id
+    
+    if len(node.args) != 1 or "id" in keywords:
+        raise ConditionError(f"sum() takes an attribute name and optional type: {expression}")
+    return "sum", component_type, _symbol(node.args[0], expression)
+
+
+def _compile_call(node: ast.Call, expression: str) -> Callable:
+    """Compile count(...) / sum(...) aggregate calls"""
+    kind, component_type, argument = _aggregate(node, expression)
+    if kind == "count":
+        return lambda context: context.count(component_type, argument)
+    return lambda context: context.total(argument, component_type)
+
+
+def _compile_node(node: ast.AST, expression: str) -> Callable:
+    """Compile an AST node into a closure over ConditionContext"""
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, str)) \
+            and not isinstance(node.value, bool):
+        value = node.value
+        return lambda context: value
+    
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+        component_type = _component_type(node.value, expression)
+        name = node.attr
+        return lambda context: context.attribute(component_type, name)
+    
+    if isinstance(node, ast.Call):
+        return _compile_call(node, expression)
+    
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+        apply = _BINARY_OPERATORS[type(node.op)]
+        left = _compile_node(node.left, expression)
+        right = _compile_node(node.right, expression)
+        return lambda context: apply(left(context), right(context))
+    
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.USub)):
+        operand = _compile_node(node.operand, expression)
+        if isinstance(node.op, ast.Not):
+            return lambda context: not operand(context)
+        return lambda context: -operand(context)
+    
+    if isinstance(node, ast.BoolOp):
+        operands = [_compile_node(value, expression) for value in node.values]
+        if isinstance(node.op, ast.And):
+            return lambda context: all(operand(context) for operand in operands)
+        return lambda context: any(operand(context) for operand in operands)
+    
+    if isinstance(node, ast.Compare) and all(type(op) in _COMPARE_OPERATORS for op in node.ops):
+        operands = [_compile_node(node.left, expression)]
+        operands += [_compile_node(comparator, expression) for comparator in node.comparators]
+        comparisons = [_COMPARE_OPERATORS[type(op)] for op in node.ops]
+        
+        def compare(context):
+            left = operands[0](context)
+            for compare_op, operand in zip(comparisons, operands[1:]):
+                right = operand(context)
+                if not compare_op(left, right):
+                    return False
+                left = right
+            return True
+        
+        return compare
+    
+    raise ConditionError(f"Unsupported syntax '{type(node).__name__}' in: {expression}")
+
+
+def _parse(expression: str) -> ast.AST:
+    try:
+        return ast.parse(expression.strip(), mode="eval").body
+    except SyntaxError as e:
+        raise ConditionError(f"Invalid condition '{expression}': {e.msg}") from None
+
+
+def compile_condition(expression: str) -> Callable[[ConditionContext], Optional[bool]]:
+    """
+    Parse condition expression once into a closure
+    The closure returns True/False, or None when the expression references
+    a component or attribute the configuration does not have, or values that
+    cannot be compared (a text attribute in arithmetic)
+    """
+    evaluate = _compile_node(_parse(expression), expression)
+    
+    def condition(context: ConditionContext) -> Optional[bool]:
+        try:
+            return bool(evaluate(context))
+        except NOT_APPLICABLE:
+            return None
+    
+    condition.expression = expression
+    return condition
+
+
+_OPERATOR_SOURCE = {
+    ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.Div: "/",
+    ast.Eq: "==", ast.NotEq: "!=", ast.Lt: "<", ast.LtE: "<=", ast.Gt: ">", ast.GtE: ">=",
+}
+
+
+def _source_node(node: ast.AST, expression: str, group: Callable[[ComponentType], str]) -> str:
+    """Python source of an AST node, evaluated in the same order as _compile_node"""
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, str)) \
+            and not isinstance(node.value, bool):
+        return repr(node.value)
+    
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+        return f"first_attribute({group(_component_type(node.value, expression))}, {node.attr!r})"
+    
+    if isinstance(node, ast.Call):
+        kind, component_type, argument = _aggregate(node, expression)
+        if component_type is None:  # whole configuration, rare: through the context
+            return f"context.total({argument!r})" if kind == "sum" else f"context.count(None, {argument!r})"
+        if kind == "sum":
+            return f"attribute_sum({group(component_type)}, {argument!r})"
+        if argument is None:
+            return f"len({group(component_type)})"
+        return f"[c.id for c in {group(component_type)}].count({argument!r})"
+    
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+        left = _source_node(node.left, expression, group)
+        right = _source_node(node.right, expression, group)
+        return f"({left} {_OPERATOR_SOURCE[type(node.op)]} {right})"
+    
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.USub)):
+        operand = _source_node(node.operand, expression, group)
+        return f"(not {operand})" if isinstance(node.op, ast.Not) else f"(-{operand})"
+    
+    if isinstance(node, ast.BoolOp):
+        joiner = " and " if isinstance(node.op, ast.And) else " or "
+        return f"bool({joiner.join(_source_node(value, expression, group) for value in node.values)})"
+    
+    if isinstance(node, ast.Compare) and all(type(op) in _COMPARE_OPERATORS for op in node.ops):
+        parts = [_source_node(node.left, expression, group)]
+        for op, comparator in zip(node.ops, node.comparators):
+            parts += [_OPERATOR_SOURCE[type(op)], _source_node(comparator, expression, group)]
+        return f"({' '.join(parts)})"
+    
+    raise ConditionError(f"Unsupported syntax '{type(node).__name__}' in: {expression}")
+
+
+def condition_source(expression: str, group: Callable[[ComponentType], str]) -> str:
+    """
+    Python source of a condition for generated validators (see rule_compiler.py)
+    group(type) names the local holding the configuration's components of a type;
+    the source may also read `context` (a ConditionContext), first_attribute and
+    attribute_sum, and raises one of NOT_APPLICABLE where the compiled closure returns None
+    """
+    return _source_node(_parse(expression), expression, group)
+
+
+class BatchContext:
+    """
+    Aggregates of many configurations as arrays, one entry per configuration (see batch_validator.py)
+    values maps the keys listed by compile_batch_condition to (values, invalid rows or None)
+    """
+    
+    def __init__(self, size: int, values: Dict[tuple, tuple]):
+        self.size = size
+        self.values = values
+
+
+class _NoArrayForm(Exception):
+    """Expression part that only the per-configuration closure can evaluate (text)"""
+
+
+def _either(a, b):
+    """Union of two invalid-row masks, None meaning no invalid rows"""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return a | b
+
+
+def _batch_node(node: ast.AST, expression: str, keys: List[tuple]) -> Callable:
+    """
+    Compile an AST node into a closure over BatchContext returning (values, invalid rows or None)
+    Rows marked invalid are the ones where _compile_node raises MissingValue or ZeroDivisionError;
+    short-circuit operators only count operands the scalar closure would have evaluated
+    """
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) \
+            and not isinstance(node.value, bool):
+        value = np.float64(node.value)
+        return lambda context: (value, None)
+    
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+        key = ("attribute", _component_type(node.value, expression), node.attr)
+        keys.append(key)
+        return lambda context: context.values[key]
+    
+    if isinstance(node, ast.Call):
+        key = _aggregate(node, expression)
+        keys.append(key)
+        return lambda context: context.values[key]
+    
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+        apply = _BINARY_OPERATORS[type(node.op)]
+        divide = isinstance(node.op, ast.Div)
+        left = _batch_node(node.left, expression, keys)
+        right = _batch_node(node.right, expression, keys)
+        
+        def arithmetic(context):
+            left_values, left_invalid = left(context)
+            right_values, right_invalid = right(context)
+            invalid = _either(left_invalid, right_invalid)
+            if divide:
+                invalid = _either(invalid, np.broadcast_to(right_values == 0, (context.size,)))
+            return apply(left_values, right_values), invalid
+        
+        return arithmetic
+    
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.USub)):
+        operand = _batch_node(node.operand, expression, keys)
+        if isinstance(node.op, ast.Not):
+            def negation(context):
+                values, invalid = operand(context)
+                return (values == 0).astype(np.float64), invalid
+            return negation
+        
+        def minus(context):
+            values, invalid = operand(context)
+            return -values, invalid
+        return minus
+    
+    if isinstance(node, ast.BoolOp):
+        operands = [_batch_node(value, expression, keys) for value in node.values]
+        conjunction = isinstance(node.op, ast.And)
+        
+        def boolean(context):
+            # Rows still pending are the ones the scalar all()/any() has not decided yet
+            result = np.full(context.size, float(conjunction))
+            pending = np.ones(context.size, dtype=bool)
+            invalid = np.zeros(context.size, dtype=bool)
+            for operand in operands:
+                values, operand_invalid = operand(context)
+                if operand_invalid is not None:
+                    invalid |= pending & operand_invalid
+                    pending &= ~operand_invalid
+                decided = pending & ((values == 0) if conjunction else (values != 0))
+                result[decided] = float(not conjunction)
+                pending &= ~decided
+            return result, invalid
+        
+        return boolean
+    
+    if isinstance(node, ast.Compare) and all(type(op) in _COMPARE_OPERATORS for op in node.ops):
+        operands = [_batch_node(node.left, expression, keys)]
+        operands += [_batch_node(comparator, expression, keys) for comparator in node.comparators]
+        comparisons = [_COMPARE_OPERATORS[type(op)] for op in node.ops]
+        
+        def compare(context):
+            left, left_invalid = operands[0](context)
+            invalid = np.zeros(context.size, dtype=bool)
+            if left_invalid is not None:
+                invalid |= left_invalid
+            pending = ~invalid
+            result = np.ones(context.size)
+            for compare_op, operand in zip(comparisons, operands[1:]):
+                right, right_invalid = operand(context)
+                if right_invalid is not None:
+                    invalid |= pending & right_invalid
+                    pending &= ~right_invalid
+                failed = pending & ~compare_op(left, right)
+                result[failed] = 0.0
+                pending &= ~failed
+                left = right
+            return result, invalid
+        
+        return compare
+    
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        raise _NoArrayForm(expression)
+    raise ConditionError(f"Unsupported syntax '{type(node).__name__}' in: {expression}")
+
+
+def compile_batch_condition(expression: str) -> Optional[Tuple[Callable[[BatchContext], np.ndarray], List[tuple]]]:
+    """
+    Array form of a condition: (failed, keys), None for conditions on text (string constants)
+    keys are the aggregates it reads: ("count", type, id), ("sum", type, attribute) and
+    ("attribute", type, attribute), all with numeric values; failed(context) is a bool
+    array, True where the compiled closure returns False
+    """
+    keys: List[tuple] = []
+    try:
+        evaluate = _batch_node(_parse(expression), expression, keys)
+    except _NoArrayForm:
+        return None
+    
+    def failed(context: BatchContext) -> np.ndarray:
+        with np.errstate(all="ignore"):  # inf and nan only appear in rows marked invalid
+            values, invalid = evaluate(context)
+            result = np.broadcast_to(values == 0, (context.size,))
+        return result if invalid is None else result & ~invalid
+    
+    return failed, list(dict.fromkeys(keys))
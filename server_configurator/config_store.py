@@ -0,0 +1,277 @@
+"""
+Persistent configuration store for server configurator
+Saved configurations in a local SQLite database (WAL mode)
+
+A saved configuration is a multiset of component ids with a name, an owner,
+timestamps and a fingerprint (hash of the multiset, so equal configurations
+share it whatever the order of the ids). Components are stored one row per
+distinct id with a quantity and the position of its first occurrence, and are
+indexed by component id to answer "which saved configurations contain X",
+e.g. for price change notifications: the ids returned by PriceFeed.flush()
+go to containing_any(), PriceFeed itself does not know about the store.
+
+WAL mode lets other processes read while one writes; save_many() writes a
+whole batch in one transaction.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS configurations (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    owner TEXT,
+    fingerprint TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS configuration_components (
+    configuration_id INTEGER NOT NULL REFERENCES configurations(id) ON DELETE CASCADE,
+    component_id TEXT NOT NULL,
+    quantity INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (configuration_id, component_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS configurations_fingerprint ON configurations (fingerprint);
+CREATE INDEX IF NOT EXISTS configurations_owner ON configurations (owner, updated_at);
+CREATE INDEX IF NOT EXISTS configuration_components_component
+    ON configuration_components (component_id, configuration_id);
+"""
+
+BATCH_SIZE = 1000
+
+
+def configuration_fingerprint(component_ids: Iterable[str]) -> str:
+    """Hash of a multiset of component ids (order does not matter)"""
+    text = "\n".join(sorted(component_ids))
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class SavedConfiguration:
+    """Configuration as stored: component ids in the order they were added, repeated per unit"""
+    components: List[str]
+    name: str = ""
+    owner: Optional[str] = None
+    id: Optional[int] = None  # assigned on save
+    fingerprint: str = ""
+    created_at: float = 0.0
+    updated_at: float = 0.0
+    
+    @property
+    def quantities(self) -> Dict[str, int]:
+        """Component id -> quantity"""
+        return dict(Counter(self.components))
+    
+    @classmethod
+    def from_session(cls, configurator, name: str = "", owner: Optional[str] = None) -> "SavedConfiguration":
+        """Current configuration of a ServerConfigurator session (not saved yet)"""
+        return cls(configurator.get_state()["components"], name, owner)
+    
+    def to_state(self) -> Dict:
+        """Session state for ServerConfigurator.from_state() and bulk_quotes"""
+        return {"id": f"config_{self.id}", "configuration_id": self.id, "components": list(self.components)}
+
+
+class ConfigurationStore:
+    """
+    Saved configurations in a SQLite file (":memory:" for a private in-memory store)
+    One connection shared by threads, serialized by a lock; other processes may open the same file
+    """
+    
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.clock = clock
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")  # durable at checkpoints, safe with WAL
+            self._connection.execute("PRAGMA foreign_keys=ON")
+            self._connection.execute("PRAGMA cache_size=-65536")  # 64 MiB, keeps the component index in memory
+            self._connection.executescript(SCHEMA)
+    
+    @property
+    def journal_mode(self) -> str:
+        """SQLite journal mode ("wal" for files, "memory" for :memory:)"""
+        with self._lock:
+            return self._connection.execute("PRAGMA journal_mode").fetchone()[0]
+    
+    def save(self, configuration: SavedConfiguration) -> SavedConfiguration:
+        """Insert (id is None) or replace a configuration, returns it with id, fingerprint and timestamps set"""
+        return self.save_many([configuration])[0]
+    
+    def save_many(self, configurations: Iterable[SavedConfiguration],
+                  batch_size: int = BATCH_SIZE) -> List[SavedConfiguration]:
+        """Save configurations, one transaction per batch_size of them"""
+        saved = []
+        batch = []
+        for configuration in configurations:
+            batch.append(configuration)
+            if len(batch) >= batch_size:
+                saved.extend(self._write(batch))
+                batch = []
+        if batch:
+            saved.extend(self._write(batch))
+        return saved
+    
+    def _write(self, batch: List[SavedConfiguration]) -> List[SavedConfiguration]:
+        now = self.clock()
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                rows: Dict[int, List[Tuple[int, str, int, int]]] = {}  # last save of an id in the batch wins
+                for configuration in batch:
+                    configuration.fingerprint = configuration_fingerprint(configuration.components)
+                    configuration.updated_at = now
+                    if configuration.id is None:
+                        configuration.created_at = now
+                        cursor.execute(
+                            "INSERT INTO configurations (name, owner, fingerprint, created_at, updated_at) "
+                            "VALUES (?, ?, ?, ?, ?)",
+                            (configuration.name, configuration.owner, configuration.fingerprint, now, now)
+                        )
+                        configuration.id = cursor.lastrowid
+                    else:
+                        created = cursor.execute("SELECT created_at FROM configurations WHERE id = ?",
+                                                 (configuration.id,)).fetchone()
+                        if created is None:
+                            configuration.created_at = now
+                            cursor.execute(
+                                "INSERT INTO configurations (id, name, owner, fingerprint, created_at, updated_at) "
+                                "VALUES (?, ?, ?, ?, ?, ?)",
+                                (configuration.id, configuration.name, configuration.owner,
+                                 configuration.fingerprint, now, now)
+                            )
+                        else:
+                            configuration.created_at = created[0]
+                            cursor.execute(
+                                "UPDATE configurations SET name = ?, owner = ?, fingerprint = ?, updated_at = ? "
+                                "WHERE id = ?",
+                                (configuration.name, configuration.owner, configuration.fingerprint, now,
+                                 configuration.id)
+                            )
+                            cursor.execute("DELETE FROM configuration_components WHERE configuration_id = ?",
+                                           (configuration.id,))
+                    positions: Dict[str, int] = {}
+                    for component_id in configuration.components:
+                        positions.setdefault(component_id, len(positions))
+                    quantities = Counter(configuration.components)
+                    rows[configuration.id] = [(configuration.id, component_id, quantities[component_id], position)
+                                              for component_id, position in positions.items()]
+                cursor.executemany(
+                    "INSERT INTO configuration_components (configuration_id, component_id, quantity, position) "
+                    "VALUES (?, ?, ?, ?)", (row for group in rows.values() for row in group)
+                )
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+        return batch
+    
+    def get(self, configuration_id: int) -> Optional[SavedConfiguration]:
+        """Saved configuration by id, None if absent"""
+        found = self._load("WHERE id = ?", (configuration_id,))
+        return found[0] if found else None
+    
+    def delete(self, configuration_id: int) -> bool:
+        """Delete a configuration, returns True if it existed"""
+        with self._lock:
+            cursor = self._connection.execute("DELETE FROM configurations WHERE id = ?", (configuration_id,))
+            return cursor.rowcount > 0
+    
+    def find_by_fingerprint(self, fingerprint: str) -> List[SavedConfiguration]:
+        """Saved configurations with this fingerprint (same components), oldest first"""
+        return self._load("WHERE fingerprint = ? ORDER BY id", (fingerprint,))
+    
+    def by_owner(self, owner: str, limit: Optional[int] = None) -> List[SavedConfiguration]:
+        """Configurations of an owner, most recently updated first"""
+        return self._load("WHERE owner = ? ORDER BY updated_at DESC, id DESC LIMIT ?",
+                          (owner, -1 if limit is None else limit))
+    
+    def containing(self, component_id: str) -> List[int]:
+        """Ids of saved configurations containing a component"""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT configuration_id FROM configuration_components WHERE component_id = ? "
+                "ORDER BY configuration_id", (component_id,)
+            ).fetchall()
+        return [row[0] for row in rows]
+    
+    def containing_any(self, component_ids: Iterable[str]) -> Dict[str, List[int]]:
+        """Component id -> ids of saved configurations containing it, for components in at least one"""
+        result: Dict[str, List[int]] = {}
+        ids = list(dict.fromkeys(component_ids))
+        with self._lock:
+            for start in range(0, len(ids), 500):  # stay under SQLite's host parameter limit
+                chunk = ids[start:start + 500]
+                rows = self._connection.execute(
+                    "SELECT component_id, configuration_id FROM configuration_components "
+                    f"WHERE component_id IN ({', '.join('?' * len(chunk))}) "
+                    "ORDER BY component_id, configuration_id", chunk
+                ).fetchall()
+                for component_id, configuration_id in rows:
+                    result.setdefault(component_id, []).append(configuration_id)
+        return result
+    
+    def states(self, owner: Optional[str] = None) -> Iterator[Tuple[str, Dict]]:
+        """(name, session state) pairs of saved configurations, input for bulk_quotes.generate_quotes()"""
+        last_id = 0
+        while True:
+            clause, parameters = ("WHERE id > ?", (last_id,)) if owner is None else \
+                ("WHERE id > ? AND owner = ?", (last_id, owner))
+            page = self._load(clause + " ORDER BY id LIMIT ?", parameters + (BATCH_SIZE,))
+            if not page:
+                return
+            for configuration in page:
+                state = configuration.to_state()
+                yield state["id"], state
+            last_id = page[-1].id
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM configurations").fetchone()[0]
+    
+    def _load(self, clause: str, parameters: Tuple) -> List[SavedConfiguration]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, name, owner, fingerprint, created_at, updated_at FROM configurations " + clause,
+                parameters
+            ).fetchall()
+            if not rows:
+                return []
+            components: Dict[int, List[Tuple[int, str, int]]] = {}
+            ids = [row[0] for row in rows]
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                for configuration_id, component_id, quantity, position in self._connection.execute(
+                    "SELECT configuration_id, component_id, quantity, position FROM configuration_components "
+                    f"WHERE configuration_id IN ({', '.join('?' * len(chunk))})", chunk
+                ):
+                    components.setdefault(configuration_id, []).append((position, component_id, quantity))
+        return [
+            SavedConfiguration(
+                components=[component_id for _, component_id, quantity in sorted(components.get(row[0], []))
+                            for _ in range(quantity)],
+                name=row[1], owner=row[2], id=row[0], fingerprint=row[3], created_at=row[4], updated_at=row[5]
+            )
+            for row in rows
+        ]
+    
+    def close(self) -> None:
+        """Close the database"""
+        with self._lock:
+            self._connection.close()
+    
+    def __enter__(self) -> "ConfigurationStore":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -3,23 +3,99 @@ Main server configurator class
 Handles configuration logic and validation
 """
 
+import functools
+import hashlib
+import threading
 from typing import Dict, List, Optional, Tuple
 from data_models import (
     Component, ComponentType, ServerConfiguration, 
     ServerConfiguratorData, CompatibilityRule
 )
-from sample_data import create_sample_data, create_compatibility_matrix
+from catalog import Catalog, CatalogPublisher, shared_publisher
+from currency import BASE_CURRENCY, check_currency, current_rates
+from export_writer import FORMATS as EXPORT_FORMATS, iter_export, write_export, write_export_async
+from translations import DEFAULT_LANGUAGE, LANGUAGES, CompiledTranslations, compile_translations
+
+
+def session_operation(method):
+    """
+    Run a public method under the session lock on the latest published catalog
+    Concurrent calls on one session are serialized; the catalog stays the same
+    for the whole call even if a new one is published meanwhile
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            if self.source is not None and self.source.current is not self.catalog:
+                self._switch_catalog(self.source.current)
+            return method(self, *args, **kwargs)
+    return wrapper
 
 
 class ServerConfigurator:
-    """Main configurator class"""
+    """
+    Configurator session
+    The catalog is shared and read-only (see catalog.py), a session only holds
+    its current configuration. Sessions created from a CatalogPublisher (the
+    default) follow published catalog updates; a session given a Catalog keeps it.
+    Each session renders in its own language through a shared compiled table.
+    """
+    
+    __slots__ = ("catalog", "source", "current_configuration", "configuration_id",
+                 "missing_components", "translations", "_lock")
     
-    def __init__(self):
-        self.data = create_sample_data()
-        self.compatibility_matrix = create_compatibility_matrix()
+    def __init__(self, optimize_rules: bool = False, catalog_dir: Optional[str] = None,
+                 snapshot_path: Optional[str] = None, catalog: Optional[Catalog] = None,
+                 source: Optional[CatalogPublisher] = None, language: str = DEFAULT_LANGUAGE):
+        if catalog is None and source is None:
+            source = shared_publisher(optimize_rules, catalog_dir, snapshot_path)
+        self.source = source
+        self.catalog = source.current if source is not None else catalog
         self.current_configuration: Dict[ComponentType, List[Component]] = {}
         self.configuration_id = 1
-        
+        self.missing_components: List[Component] = []  # dropped because they left the catalog
+        self.translations: CompiledTranslations = compile_translations(language)  # shared, immutable
+        self._lock = threading.RLock()
+    
+    @property
+    def lock(self) -> threading.RLock:
+        """Session lock, held to run several operations as one (operations re-enter it)"""
+        return self._lock
+    
+    def _switch_catalog(self, catalog: Catalog) -> None:
+        """Move to a newly published catalog: refresh component objects, flag removed ones"""
+        configuration: Dict[ComponentType, List[Component]] = {}
+        for components in self.current_configuration.values():
+            for component in components:
+                current = catalog.data.components.get(component.id)
+                if current is None:
+                    self.missing_components.append(component)
+                else:
+                    configuration.setdefault(current.component_type, []).append(current)
+        self.current_configuration = configuration
+        self.catalog = catalog
+    
+    @property
+    def data(self) -> ServerConfiguratorData:
+        """Catalog data (shared)"""
+        return self.catalog.data
+    
+    @property
+    def compatibility_matrix(self):
+        """Compatibility matrix (shared)"""
+        return self.catalog.compatibility_matrix
+    
+    @property
+    def load_stats(self):
+        """Catalog file load stats, None unless loaded from catalog_dir"""
+        return self.catalog.load_stats
+    
+    @property
+    def rule_analysis(self):
+        """Rule analysis report, None unless optimize_rules was set"""
+        return self.catalog.rule_analysis
+    
+    @session_operation
     def add_component(self, component_id: str) -> Tuple[bool, List[str]]:
         """
         Add component to current configuration
@@ -49,6 +125,7 @@ class ServerConfigurator:
         
         return True, []
     
+    @session_operation
     def remove_component(self, component_id: str) -> bool:
         """Remove component from current configuration"""
         for component_type, components in self.current_configuration.items():
@@ -58,9 +135,14 @@ class ServerConfigurator:
                     return True
         return False
     
-    def get_available_components(self, component_type: ComponentType) -> List[Component]:
+    @session_operation
+    def get_available_components(self, component_type: ComponentType,
+                                 in_stock_only: bool = False) -> List[Component]:
         """Get components available for selection based on current configuration"""
-        all_components = self.data.get_components_by_type(component_type)
+        if in_stock_only:
+            all_components = self.data.get_available_components_by_type(component_type)
+        else:
+            all_components = self.data.get_components_by_type(component_type)
         available = []
         
         for component in all_components:
@@ -75,27 +157,13 @@ class ServerConfigurator:
         """Check if new component is compatible with current configuration"""
         errors = []
         
-        # Check against compatibility matrix
-        if new_component.id in self.compatibility_matrix:
-            compatible_with = self.compatibility_matrix[new_component.id]
-            
-            # Check if any existing component is incompatible
-            for component_type, components in self.current_configuration.items():
-                for existing_component in components:
-                    if existing_component.id not in compatible_with:
-                        errors.append(
-                            f"{new_component.name} is not compatible with {existing_component.name}"
-                        )
-        
-        # Also check reverse compatibility - if existing components are compatible with new component
+        # Check against compatibility matrix (symmetric, one lookup per pair)
         for component_type, components in self.current_configuration.items():
             for existing_component in components:
-                if existing_component.id in self.compatibility_matrix:
-                    compatible_with = self.compatibility_matrix[existing_component.id]
-                    if new_component.id not in compatible_with:
-                        errors.append(
-                            f"{existing_component.name} is not compatible with {new_component.name}"
-                        )
+                if not self.compatibility_matrix.compatible(new_component.id, existing_component.id):
+                    errors.append(
+                        f"{new_component.name} is not compatible with {existing_component.name}"
+                    )
         
         # Check compatibility rules
         rule_errors = self._check_compatibility_rules(new_component)
@@ -122,23 +190,31 @@ class ServerConfigurator:
         
         return errors
     
-    def get_current_configuration(self) -> ServerConfiguration:
-        """Get current configuration with validation"""
-        total_price = self._calculate_total_price()
+    @session_operation
+    def get_current_configuration(self, currency: Optional[str] = None) -> ServerConfiguration:
+        """Get current configuration with validation, total in currency (catalog currency by default)"""
+        total_price = self._calculate_total_price(currency)
         validation_errors = self._validate_current_configuration()
         is_valid = len(validation_errors) == 0
         
         return ServerConfiguration(
             id=f"config_{self.configuration_id}",
             name=f"Configuration {self.configuration_id}",
-            components=self.current_configuration.copy(),
+            components={t: list(components) for t, components in self.current_configuration.items()},
             total_price=total_price,
             is_valid=is_valid,
-            validation_errors=validation_errors
+            validation_errors=validation_errors,
+            currency=check_currency(currency) if currency else BASE_CURRENCY
         )
     
-    def _calculate_total_price(self) -> float:
+    def _calculate_total_price(self, currency: Optional[str] = None) -> float:
         """Calculate total price of current configuration"""
+        if currency:
+            # Precomputed per-currency prices (see price_columns.py)
+            return self.data.price_columns().total(
+                (component.id for components in self.current_configuration.values() for component in components),
+                currency
+            )
         total = 0.0
         for components in self.current_configuration.values():
             for component in components:
@@ -150,42 +226,70 @@ class ServerConfigurator:
         """Validate current configuration"""
         return self.data.validate_configuration(self.current_configuration)
     
+    @session_operation
     def clear_configuration(self) -> None:
         """Clear current configuration"""
         self.current_configuration = {}
+        self.missing_components = []
         self.configuration_id += 1
     
+    @session_operation
+    def get_state(self) -> Dict:
+        """Session state as plain data (component ids), for storing outside memory"""
+        return {
+            "configuration_id": self.configuration_id,
+            "language": self.translations.language,
+            "components": [
+                component.id
+                for components in self.current_configuration.values() for component in components
+            ]
+        }
+    
+    @classmethod
+    def from_state(cls, state: Dict, catalog: Optional[Catalog] = None,
+                   source: Optional[CatalogPublisher] = None) -> "ServerConfigurator":
+        """Restore session from get_state() output, components missing from the catalog are dropped"""
+        configurator = cls(catalog=catalog, source=source, language=state.get("language", DEFAULT_LANGUAGE))
+        configurator.configuration_id = state.get("configuration_id", 1)
+        for component_id in state.get("components", []):
+            component = configurator.data.components.get(component_id)
+            if component is not None:
+                configurator.current_configuration.setdefault(component.component_type, []).append(component)
+        return configurator
+    
+    @property
+    def language(self) -> str:
+        """Display language of this session"""
+        return self.translations.language
+    
+    def set_language(self, language: str) -> None:
+        """Switch this session to another language (other sessions are not affected)"""
+        if language not in LANGUAGES:
+            raise ValueError(f"Unknown language: {language}")
+        self.translations = compile_translations(language)
+    
+    @session_operation
     def get_component_details(self, component_id: str) -> Optional[Component]:
         """Get detailed information about a component"""
         return self.data.components.get(component_id)
     
+    @session_operation
     def search_components(self, query: str, component_type: Optional[ComponentType] = None) -> List[Component]:
         """Search components by name, manufacturer, or model"""
-        results = []
-        query_lower = query.lower()
-        
-        for component in self.data.components.values():
-            if component_type and component.component_type != component_type:
-                continue
-                
-            if (query_lower in component.name.lower() or 
-                query_lower in component.manufacturer.lower() or 
-                query_lower in component.model.lower()):
-                results.append(component)
-        
-        return results
+        return self.data.search_components(query, component_type)
     
+    @session_operation
     def get_compatibility_info(self, component_id: str) -> Dict:
         """Get compatibility information for a component"""
         if component_id not in self.compatibility_matrix:
             return {"compatible_with": [], "incompatible_with": []}
         
-        compatible_with = self.compatibility_matrix[component_id]
+        compatible_with = self.compatibility_matrix.row(component_id)
         incompatible_with = []
         
         # Find incompatible components
-        for other_id, other_compatible in self.compatibility_matrix.items():
-            if other_id != component_id and component_id not in other_compatible:
+        for other_id in self.compatibility_matrix.constrained_ids():
+            if other_id != component_id and not self.compatibility_matrix.compatible(component_id, other_id):
                 incompatible_with.append(other_id)
         
         return {
@@ -193,60 +297,54 @@ class ServerConfigurator:
             "incompatible_with": incompatible_with
         }
     
-    def export_configuration(self, format_type: str = "json") -> str:
-        """Export current configuration in specified format"""
-        config = self.get_current_configuration()
-        
-        if format_type == "json":
-            import json
-            return json.dumps({
-                "id": config.id,
-                "name": config.name,
-                "total_price": config.total_price,
-                "is_valid": config.is_valid,
-                "validation_errors": config.validation_errors,
-                "components": {
-                    comp_type.value: [
-                        {
-                            "id": comp.id,
-                            "name": comp.name,
-                            "manufacturer": comp.manufacturer,
-                            "model": comp.model,
-                            "price": comp.price,
-                            "attributes": [
-                                {
-                                    "name": attr.name,
-                                    "value": attr.value,
-                                    "unit": attr.unit
-                                } for attr in comp.attributes
-                            ]
-                        } for comp in components
-                    ] for comp_type, components in config.components.items()
-                }
-            }, indent=2)
-        
-        elif format_type == "csv":
-            import csv
-            import io
-            
-            output = io.StringIO()
-            writer = csv.writer(output)
-            
-            # Write header
-            writer.writerow(["Component Type", "Name", "Manufacturer", "Model", "Price"])
-            
-            # Write components
-            for comp_type, components in config.components.items():
-                for comp in components:
-                    writer.writerow([
-                        comp_type.value,
-                        comp.name,
-                        comp.manufacturer,
-                        comp.model,
-                        comp.price or 0
-                    ])
-            
-            return output.getvalue()
-        
-        else:
+    @session_operation
+    def _export_parts(self, currency: Optional[str]):
+        """Configuration snapshot and keyword arguments for export_writer functions"""
+        config = self.get_current_configuration(currency)
+        options = {"fragments": self.data.export_fragments()}
+        if currency:
+            columns = self.data.price_columns()
+            options.update(price=lambda comp: columns.price(comp.id, config.currency),
+                           price_header=f"Price ({config.currency})")
+        return config, options
+    
+    @session_operation
+    def export_etag(self, format_type: str = "json", currency: Optional[str] = None,
+                    compact: bool = False) -> str:
+        """
+        ETag of the export with these arguments, computed without building it
+        Equal tags mean equal output: the fingerprint covers the configuration,
+        the catalog version (prices, rules) and the exchange rate
+        """
+        fingerprint = (
+            self.configuration_id,
+            tuple((t.value, tuple(c.id for c in components)) for t, components in self.current_configuration.items()),
+            self.data.catalog_version,
+            (check_currency(currency), current_rates().rate(currency)) if currency else None,
+            format_type,
+            compact and format_type == "json"
+        )
+        return '"' + hashlib.blake2b(repr(fingerprint).encode(), digest_size=12).hexdigest() + '"'
+    
+    def export_configuration(self, format_type: str = "json", currency: Optional[str] = None,
+                             compact: bool = False) -> str:
+        """Export current configuration in specified format, prices in currency (catalog currency by default)"""
+        if format_type not in EXPORT_FORMATS:
             raise ValueError(f"Unsupported format: {format_type}")
+        config, options = self._export_parts(currency)
+        return "".join(iter_export(config, format_type, compact=compact, **options))
+    
+    def write_export(self, stream, format_type: str = "json", currency: Optional[str] = None,
+                     compact: bool = False) -> int:
+        """
+        Stream export to a file-like object (see export_writer.py)
+        The configuration is captured under the session lock, writing happens outside it
+        """
+        config, options = self._export_parts(currency)
+        return write_export(stream, config, format_type, compact=compact, **options)
+    
+    async def write_export_async(self, writer, format_type: str = "json", currency: Optional[str] = None,
+                                 compact: bool = False) -> int:
+        """Stream export to an async writer such as asyncio.StreamWriter"""
+        config, options = self._export_parts(currency)
+        return await write_export_async(writer, config, format_type, compact=compact, **options)
@@ -0,0 +1,79 @@
+"""
+Currencies for server configurator
+Catalog prices are stored in BASE_CURRENCY; quotes are given in any of CURRENCIES
+
+Converted prices are rounded to cents per component, so quote lines add up to
+the total. Catalog-wide conversions are precomputed in price_columns.py.
+"""
+
+from typing import Dict, Optional
+
+BASE_CURRENCY = "USD"
+CURRENCIES = ("BYN", "RUB", "USD", "EUR")
+SYMBOLS = {"BYN": "Br", "RUB": "₽", "USD": "$", "EUR": "€"}
+
+# Units of currency per 1 BASE_CURRENCY; replace with set_rates() from the bank feed
+DEFAULT_RATES = {"BYN": 3.27, "RUB": 81.5, "USD": 1.0, "EUR": 0.86}
+
+
+class CurrencyError(ValueError):
+    """Unknown currency or invalid rate"""
+
+
+class RateTable:
+    """Exchange rates from BASE_CURRENCY, immutable (set_rates() publishes a new table)"""
+    
+    def __init__(self, rates: Dict[str, float]):
+        rates = {code.upper(): float(rate) for code, rate in rates.items()}
+        if rates.get(BASE_CURRENCY, 1.0) != 1.0:
+            raise CurrencyError(f"Rate of base currency {BASE_CURRENCY} must be 1")
+        rates[BASE_CURRENCY] = 1.0
+        for code in CURRENCIES:
+            if code not in rates:
+                raise CurrencyError(f"Missing rate for {code}")
+            if not rates[code] > 0:
+                raise CurrencyError(f"Invalid rate for {code}: {rates[code]}")
+        self.rates = {code: rates[code] for code in CURRENCIES}
+    
+    def rate(self, currency: str) -> float:
+        """Units of currency per 1 BASE_CURRENCY"""
+        return self.rates[check_currency(currency)]
+    
+    def convert(self, amount: float, currency: str) -> float:
+        """Convert an amount in BASE_CURRENCY, rounded to cents"""
+        return round_cents(amount * self.rate(currency))
+
+
+_rates = RateTable(DEFAULT_RATES)
+
+
+def round_cents(amount: float) -> float:
+    """Round to cents the same way as numpy.round(amount, 2)"""
+    return round(amount * 100) / 100
+
+
+def check_currency(currency: str) -> str:
+    """Normalized currency code ("byn" -> "BYN")"""
+    code = currency.upper()
+    if code not in CURRENCIES:
+        raise CurrencyError(f"Unknown currency '{currency}', expected one of {', '.join(CURRENCIES)}")
+    return code
+
+
+def current_rates() -> RateTable:
+    """Process-wide rate table"""
+    return _rates
+
+
+def set_rates(rates: Dict[str, float]) -> RateTable:
+    """Publish new exchange rates; price columns are refreshed on their next use"""
+    global _rates
+    _rates = RateTable(rates)
+    return _rates
+
+
+def format_price(amount: Optional[float], currency: str = BASE_CURRENCY) -> str:
+    """Price with currency symbol ("$1500.00", "4905.00 Br")"""
+    code = check_currency(currency)
+    amount = amount or 0.0
+    return f"${amount:.2f}" if code == "USD" else f"{amount:.2f} {SYMBOLS[code]}"
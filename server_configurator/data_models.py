@@ -3,8 +3,8 @@ Data models for server configurator
 Defines the structure for categories, components, and compatibility
 """
 
-from dataclasses import dataclass
-from typing import List, Dict, Optional, Set
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Dict, Optional, Set, Tuple
 from enum import Enum
 
 
@@ -13,6 +13,7 @@ class ComponentType(Enum):
     SERVER = "server"
     PROCESSOR = "processor"
     MEMORY = "memory"
+    STORAGE = "storage"  # Generic storage (sample data)
     SSD = "ssd"  # Solid State Drives (SATA)
     NVME = "nvme"  # NVMe drives
     HDD_SAS_SATA = "hdd_sas_sata"  # SAS/SATA HDD
@@ -30,6 +31,7 @@ class CompatibilityType(Enum):
     EXCLUDED = "excluded"  # Component cannot be used together
     LIMITED = "limited"    # Limited quantity or specific models only
     OPTIONAL = "optional"  # Can be added but not required
+    CONDITION = "condition"  # Condition expression must hold (see conditions.py)
 
 
 @dataclass
@@ -62,9 +64,10 @@ class CompatibilityRule:
     rule_type: CompatibilityType
     primary_component_id: str
     secondary_component_id: Optional[str] = None
-    condition: Optional[str] = None  # Additional conditions
+    condition: Optional[str] = None  # Additional conditions (expression for CONDITION rules)
     max_quantity: Optional[int] = None
     min_quantity: Optional[int] = None
+    compiled_condition: Optional[Callable] = field(default=None, repr=False, compare=False)
 
 
 @dataclass
@@ -76,6 +79,7 @@ class ServerConfiguration:
     total_price: float
     is_valid: bool
     validation_errors: List[str]
+    currency: str = "USD"  # currency of total_price, see currency.py
 
 
 class ServerConfiguratorData:
@@ -85,10 +89,58 @@ class ServerConfiguratorData:
         self.components: Dict[str, Component] = {}
         self.compatibility_rules: List[CompatibilityRule] = []
         self.categories: Dict[ComponentType, List[str]] = {}
-        
+        self.version = 0  # Incremented on structural changes (components, rules), keys validator caches
+        self.value_version = 0  # Incremented on price/availability updates, see apply_updates()
+        self._batch_validator = None
+        self._compiled_validator = None
+        self._price_columns = None
+        self._export_fragments = None
+        self.use_compiled_rules = False  # Validate through compile_rules()
+        self.frozen = False  # Shared catalogs are frozen, see freeze()
+        self._available: Dict[ComponentType, Tuple[Tuple[int, int], List[Component]]] = {}
+        self._stock_versions: Dict[ComponentType, int] = {}  # per type, bumped when availability changes
+    
+    @property
+    def catalog_version(self) -> int:
+        """Monotonically increasing version covering structure and price/availability updates"""
+        return self.version + self.value_version
+    
+    def advance_past(self, other: "ServerConfiguratorData") -> None:
+        """Make catalog_version greater than other's (for a catalog replacing other)"""
+        if self.catalog_version <= other.catalog_version:
+            self.value_version += other.catalog_version + 1 - self.catalog_version
+    
+    def freeze(self) -> None:
+        """
+        Make catalog read-only so one instance can be shared by many sessions
+        Prices and availability can still be updated in place with apply_updates()
+        """
+        self.frozen = True
+    
+    def copy(self) -> "ServerConfiguratorData":
+        """Writable copy for copy-on-write updates (components and rules are shared)"""
+        data = ServerConfiguratorData()
+        data.components = dict(self.components)
+        data.compatibility_rules = list(self.compatibility_rules)
+        data.categories = {component_type: list(ids) for component_type, ids in self.categories.items()}
+        data.version = self.version
+        data.value_version = self.value_version
+        data.use_compiled_rules = self.use_compiled_rules
+        # Validators depend only on rules and component types, both tracked by version
+        data._batch_validator = self._batch_validator
+        data._compiled_validator = self._compiled_validator
+        return data
+    
+    def check_writable(self) -> None:
+        """Raise TypeError if frozen (for code changing the catalog outside these methods)"""
+        if self.frozen:
+            raise TypeError("Catalog is frozen, load a private copy with Catalog.load(freeze=False)")
+    
     def add_component(self, component: Component) -> None:
         """Add component to the database"""
+        self.check_writable()
         self.components[component.id] = component
+        self.version += 1
         
         # Update categories
         if component.component_type not in self.categories:
@@ -96,17 +148,96 @@ class ServerConfiguratorData:
         self.categories[component.component_type].append(component.id)
     
     def add_compatibility_rule(self, rule: CompatibilityRule) -> None:
-        """Add compatibility rule"""
+        """Add compatibility rule, CONDITION expressions are parsed here once"""
+        self.check_writable()
+        if rule.rule_type == CompatibilityType.CONDITION:
+            from conditions import compile_condition
+            rule.compiled_condition = compile_condition(rule.condition or "")
+        
         self.compatibility_rules.append(rule)
+        self.version += 1
+    
+    def apply_updates(self, updates: Iterable[Tuple[str, Optional[float], Optional[bool]]]) -> Tuple[List[str], List[str]]:
+        """
+        Apply (component_id, price, availability) updates in place, None keeps the current value
+        Only values change: validators stay cached, availability views are dropped for
+        affected types and value_version is bumped once per batch that changed something.
+        Returns (changed component ids, unknown component ids)
+        """
+        changed = []
+        unknown = []
+        restocked = set()
+        for component_id, price, availability in updates:
+            component = self.components.get(component_id)
+            if component is None:
+                unknown.append(component_id)
+                continue
+            updated = False
+            if price is not None and price != component.price:
+                component.price = price
+                updated = True
+            if availability is not None and availability != component.availability:
+                component.availability = availability
+                restocked.add(component.component_type)
+                updated = True
+            if updated:
+                changed.append(component_id)
+        
+        for component_type in restocked:
+            self._stock_versions[component_type] = self._stock_versions.get(component_type, 0) + 1
+        if changed:
+            columns = self._price_columns
+            if columns is not None and columns.catalog_version == self.catalog_version:
+                columns.update((component_id, self.components[component_id].price) for component_id in changed)
+                columns.catalog_version = self.catalog_version + 1
+            self.value_version += 1
+        return changed, unknown
     
     def get_components_by_type(self, component_type: ComponentType) -> List[Component]:
         """Get all components of specific type"""
         component_ids = self.categories.get(component_type, [])
         return [self.components[cid] for cid in component_ids if cid in self.components]
     
+    def get_available_components_by_type(self, component_type: ComponentType) -> List[Component]:
+        """Components of a type in stock, cached until the type's availability or the structure changes"""
+        stamp = (self.version, self._stock_versions.get(component_type, 0))
+        cached = self._available.get(component_type)
+        if cached is None or cached[0] != stamp:
+            cached = self._available[component_type] = (
+                stamp, [component for component in self.get_components_by_type(component_type) if component.availability]
+            )
+        return list(cached[1])
+    
+    def search_components(self, query: str, component_type: Optional[ComponentType] = None) -> List[Component]:
+        """Search components by name, manufacturer, or model"""
+        results = []
+        query_lower = query.lower()
+        
+        for component in self.components.values():
+            if component_type and component.component_type != component_type:
+                continue
+                
+            if (query_lower in component.name.lower() or 
+                query_lower in component.manufacturer.lower() or 
+                query_lower in component.model.lower()):
+                results.append(component)
+        
+        return results
+    
+    def rules_for_component(self, component_id: str) -> List[CompatibilityRule]:
+        """Get rules that reference a component"""
+        return [
+            rule for rule in self.compatibility_rules
+            if component_id in (rule.primary_component_id, rule.secondary_component_id)
+        ]
+    
     def validate_configuration(self, components: Dict[ComponentType, List[Component]]) -> List[str]:
         """Validate configuration against compatibility rules"""
+        if self.use_compiled_rules:
+            return self.compile_rules()(components)
+        
         errors = []
+        context = None
         
         for rule in self.compatibility_rules:
             if rule.rule_type == CompatibilityType.REQUIRED:
@@ -144,5 +275,69 @@ class ServerConfiguratorData:
                     
                     if rule.min_quantity and component_count < rule.min_quantity:
                         errors.append(f"Not enough {rule.primary_component_id} components (min: {rule.min_quantity})")
+            
+            elif rule.rule_type == CompatibilityType.CONDITION:
+                # Applies to every configuration, or only when primary component is present
+                if rule.primary_component_id:
+                    primary_component = self.components.get(rule.primary_component_id)
+                    if not primary_component or not any(
+                            c.id == rule.primary_component_id
+                            for c in components.get(primary_component.component_type, [])):
+                        continue
+                
+                if context is None:
+                    from conditions import ConditionContext
+                    context = ConditionContext(components)
+                if rule.compiled_condition(context) is False:
+                    errors.append(f"Condition {rule.id} failed: {rule.condition}")
         
         return errors
+
+    def price_columns(self):
+        """
+        Prices converted into every currency (see currency.py)
+        Built once per catalog version, refreshed in one pass when exchange rates change
+        """
+        from currency import current_rates
+        from price_columns import PriceColumns
+        
+        rates = current_rates()
+        columns = self._price_columns
+        if columns is None or columns.catalog_version != self.catalog_version:
+            columns = self._price_columns = PriceColumns(self, rates)
+        elif columns.rates is not rates:
+            columns.refresh(rates)
+        return columns
+    
+    def export_fragments(self):
+        """
+        Cache of serialized components for exports (see export_writer.py)
+        Kept for the structural version, prices are not part of the fragments
+        """
+        from export_writer import ExportFragments
+        
+        if self._export_fragments is None or self._export_fragments.version != self.version:
+            self._export_fragments = ExportFragments(self.version)
+        return self._export_fragments
+    
+    def compile_rules(self) -> Callable[[Dict[ComponentType, List[Component]]], List[str]]:
+        """
+        Get validator generated for the current rules
+        Compiled once per catalog version, returns same errors as validate_configuration
+        """
+        from rule_compiler import compile_validator
+        
+        if self._compiled_validator is None or self._compiled_validator.version != self.version:
+            self._compiled_validator = compile_validator(self)
+        return self._compiled_validator
+    
+    def validate_many(self, configurations: Iterable[Dict[ComponentType, List[Component]]]) -> List[List[str]]:
+        """
+        Validate many configurations at once (requires numpy)
+        Returns one error list per configuration, same as validate_configuration
+        """
+        from batch_validator import BatchValidator
+        
+        if self._batch_validator is None or self._batch_validator.version != self.version:
+            self._batch_validator = BatchValidator(self)
+        return self._batch_validator.validate(configurations)
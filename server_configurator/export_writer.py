@@ -0,0 +1,267 @@
+"""
+Streaming export of server configurations
+Writes JSON, NDJSON or CSV piece by piece to a file-like object or an async writer
+
+Output is produced per component and flushed in `buffer_size` chunks, so
+memory use does not grow with the number of components. Indented JSON is
+byte-for-byte what json.dumps(..., indent=2) produced; compact JSON drops
+the whitespace. NDJSON has one configuration line followed by one line per
+component.
+
+Component fields other than the price never change within a catalog
+version, so their serialized text is cached in ExportFragments (one per
+catalog, see ServerConfiguratorData.export_fragments) and an export only
+splices prices and the configuration header between cached fragments.
+"""
+
+import csv
+import inspect
+import json
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from data_models import Component, ServerConfiguration
+
+FORMATS = ("json", "ndjson", "csv")
+BUFFER_SIZE = 64 * 1024
+
+PriceFunction = Callable[[Component], Optional[float]]
+
+
+def component_record(component: Component, price: Optional[float]) -> Dict:
+    """Export fields of one component"""
+    return {
+        "id": component.id,
+        "name": component.name,
+        "manufacturer": component.manufacturer,
+        "model": component.model,
+        "price": price,
+        "attributes": [
+            {
+                "name": attr.name,
+                "value": attr.value,
+                "unit": attr.unit
+            } for attr in component.attributes
+        ]
+    }
+
+
+def component_json(component: Component) -> Dict:
+    """API and static catalog fields of a component (or its localized view)"""
+    return {
+        "id": component.id,
+        "name": component.name,
+        "component_type": component.component_type.value,
+        "manufacturer": component.manufacturer,
+        "model": component.model,
+        "price": component.price,
+        "availability": component.availability,
+        "description": component.description,
+        "attributes": [
+            {"name": attr.name, "value": attr.value, "unit": attr.unit} for attr in component.attributes
+        ]
+    }
+
+
+def configuration_header(configuration: ServerConfiguration) -> Dict:
+    """Export fields of a configuration without its components"""
+    return {
+        "id": configuration.id,
+        "name": configuration.name,
+        "total_price": configuration.total_price,
+        "currency": configuration.currency,
+        "is_valid": configuration.is_valid,
+        "validation_errors": configuration.validation_errors,
+    }
+
+
+def _dump(value, indent: Optional[int], level: int) -> str:
+    """json.dumps of a nested value as it appears at nesting level"""
+    if indent is None:
+        return json.dumps(value, separators=(",", ":"))
+    return json.dumps(value, indent=indent).replace("\n", "\n" + " " * (indent * level))
+
+
+class _Lines:
+    """File-like target for csv.writer that keeps only the last row"""
+    
+    def __init__(self):
+        self.parts: List[str] = []
+    
+    def write(self, text: str) -> None:
+        self.parts.append(text)
+    
+    def take(self) -> str:
+        text = "".join(self.parts)
+        self.parts.clear()
+        return text
+
+
+class ExportFragments:
+    """
+    Serialized components with a gap for the price, one cache per catalog version
+    Entries are checked against the component object, so a replaced component is reserialized
+    """
+    
+    KINDS = ("json", "compact", "ndjson", "csv")
+    
+    def __init__(self, version: int):
+        self.version = version
+        self._cache: Dict[str, Dict[str, Tuple[Component, str, str]]] = {kind: {} for kind in self.KINDS}
+    
+    def get(self, component: Component, kind: str) -> Tuple[str, str]:
+        """(text before price, text after price) of a component"""
+        entry = self._cache[kind].get(component.id)
+        if entry is None or entry[0] is not component:
+            entry = (component,) + fragment(component, kind)
+            self._cache[kind][component.id] = entry
+        return entry[1], entry[2]
+
+
+def fragment(component: Component, kind: str) -> Tuple[str, str]:
+    """Serialize a component without its price: (text before price, text after price)"""
+    if kind == "csv":
+        lines = _Lines()
+        csv.writer(lines).writerow([
+            component.component_type.value, component.name, component.manufacturer, component.model, ""
+        ])
+        row = lines.take()
+        return row[:-2], row[-2:]  # the price goes before "\r\n"
+    
+    record = component_record(component, None)
+    if kind == "json":
+        head, _, tail = _dump(record, 2, 3).partition('"price": null')
+        return head + '"price": ', tail
+    if kind == "ndjson":
+        record = dict(record, record="component", component_type=component.component_type.value)
+    head, _, tail = json.dumps(record, separators=(",", ":")).partition('"price":null')
+    return head + '"price":', tail + ("\n" if kind == "ndjson" else "")
+
+
+def _iter_json(header: Dict, groups: Iterable[Tuple[str, Iterable[str]]], indent: Optional[int]) -> Iterator[str]:
+    def newline(level):
+        return "\n" + " " * (indent * level) if indent is not None else ""
+    colon = ": " if indent is not None else ":"
+    
+    yield "{"
+    for key, value in header.items():
+        yield newline(1) + json.dumps(key) + colon + _dump(value, indent, 1) + ","
+    yield newline(1) + '"components"' + colon + "{"
+    group_count = 0
+    for type_value, records in groups:
+        yield ("," if group_count else "") + newline(2) + json.dumps(type_value) + colon + "["
+        count = 0
+        for record in records:
+            yield ("," if count else "") + newline(3) + record
+            count += 1
+        yield (newline(2) if count else "") + "]"
+        group_count += 1
+    yield (newline(1) if group_count else "") + "}"
+    yield newline(0) + "}"
+
+
+def _iter_ndjson(header: Dict, groups: Iterable[Tuple[str, Iterable[str]]]) -> Iterator[str]:
+    yield json.dumps(dict(header, record="configuration"), separators=(",", ":")) + "\n"
+    for _, records in groups:
+        yield from records
+
+
+def _iter_csv(price_header: str, groups: Iterable[Tuple[str, Iterable[str]]]) -> Iterator[str]:
+    lines = _Lines()
+    csv.writer(lines).writerow(["Component Type", "Name", "Manufacturer", "Model", price_header])
+    yield lines.take()
+    for _, rows in groups:
+        yield from rows
+
+
+def iter_export(configuration: ServerConfiguration, format_type: str = "json",
+                price: Optional[PriceFunction] = None, price_header: str = "Price",
+                compact: bool = False, fragments: Optional[ExportFragments] = None) -> Iterator[str]:
+    """
+    Export as a sequence of text pieces (one per component or smaller)
+    price(component) gives the exported price, catalog price by default;
+    components are taken from fragments when given, otherwise serialized on the fly
+    """
+    if format_type not in FORMATS:
+        raise ValueError(f"Unsupported format: {format_type}")
+    price = price or (lambda component: component.price)
+    kind = "compact" if format_type == "json" and compact else format_type
+    get = fragments.get if fragments is not None else fragment
+    if kind == "csv":
+        def text(component):
+            head, tail = get(component, kind)
+            return head + str(price(component) or 0) + tail
+    else:
+        def text(component):
+            head, tail = get(component, kind)
+            return head + json.dumps(price(component)) + tail
+    
+    groups = (
+        (component_type.value, (text(component) for component in components))
+        for component_type, components in configuration.components.items()
+    )
+    if format_type == "csv":
+        return _iter_csv(price_header, groups)
+    header = configuration_header(configuration)
+    if format_type == "ndjson":
+        return _iter_ndjson(header, groups)
+    return _iter_json(header, groups, None if compact else 2)
+
+
+def _chunks(pieces: Iterable[str], buffer_size: int) -> Iterator[str]:
+    """Join pieces into chunks of about buffer_size characters"""
+    buffer: List[str] = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= buffer_size:
+            yield "".join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def write_export(stream, configuration: ServerConfiguration, format_type: str = "json",
+                 price: Optional[PriceFunction] = None, price_header: str = "Price",
+                 compact: bool = False, buffer_size: int = BUFFER_SIZE, encoding: str = "utf-8",
+                 fragments: Optional[ExportFragments] = None) -> int:
+    """
+    Write export to a text or binary file-like object, returns characters written
+    Binary streams (anything whose write() rejects str) get encoded chunks
+    """
+    written = 0
+    binary = False
+    for chunk in _chunks(iter_export(configuration, format_type, price, price_header, compact, fragments),
+                         buffer_size):
+        if not binary:
+            try:
+                stream.write(chunk)
+            except TypeError:
+                binary = True
+        if binary:
+            stream.write(chunk.encode(encoding))
+        written += len(chunk)
+    return written
+
+
+async def write_export_async(writer, configuration: ServerConfiguration, format_type: str = "json",
+                             price: Optional[PriceFunction] = None, price_header: str = "Price",
+                             compact: bool = False, buffer_size: int = BUFFER_SIZE,
+                             encoding: str = "utf-8", fragments: Optional[ExportFragments] = None) -> int:
+    """
+    Write export to an async writer, returns characters written
+    Accepts asyncio.StreamWriter (write() + drain() per chunk for backpressure)
+    or objects with a coroutine write() taking bytes
+    """
+    written = 0
+    drain = getattr(writer, "drain", None)
+    for chunk in _chunks(iter_export(configuration, format_type, price, price_header, compact, fragments),
+                         buffer_size):
+        result = writer.write(chunk.encode(encoding))
+        if inspect.isawaitable(result):
+            await result
+        if drain is not None:
+            await drain()
+        written += len(chunk)
+    return written
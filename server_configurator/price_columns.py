@@ -0,0 +1,74 @@
+"""
+Precomputed per-currency prices for server configurator
+Every catalog price converted into every currency, one column per currency
+
+Columns are computed in one vectorized pass (NumPy) when the catalog or the
+rate table changes and patched row by row for in-place price updates
+(see ServerConfiguratorData.apply_updates). A quote in any currency is then
+a list lookup per component.
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from currency import CURRENCIES, RateTable, check_currency
+
+
+class PriceColumns:
+    """Catalog prices in every currency, rows in catalog order, None for unpriced components"""
+    
+    def __init__(self, data, rates: RateTable):
+        self.catalog_version = data.catalog_version
+        self.index: Dict[str, int] = {}
+        base = []
+        for row, (component_id, component) in enumerate(data.components.items()):
+            self.index[component_id] = row
+            base.append(np.nan if component.price is None else component.price)
+        self.base = np.array(base, dtype=np.float64)
+        self._lock = threading.Lock()  # serializes refresh() and update(), readers do not lock
+        self.refresh(rates)
+    
+    def refresh(self, rates: RateTable) -> None:
+        """Recompute all columns for new rates in one pass"""
+        with self._lock:
+            vector = np.array([rates.rates[code] for code in CURRENCIES])
+            table = np.round(np.outer(vector, self.base), 2)
+            self.columns: Dict[str, List[Optional[float]]] = {
+                code: [None if value != value else value for value in table[position].tolist()]
+                for position, code in enumerate(CURRENCIES)
+            }
+            self.rates = rates
+    
+    def update(self, prices: Iterable[Tuple[str, Optional[float]]]) -> None:
+        """Patch rows of components whose base price changed"""
+        rows, values = [], []
+        for component_id, price in prices:
+            row = self.index.get(component_id)
+            if row is not None:
+                rows.append(row)
+                values.append(np.nan if price is None else price)
+        if not rows:
+            return
+        with self._lock:
+            self.base[rows] = values
+            for code in CURRENCIES:
+                column = self.columns[code]
+                for row, value in zip(rows, np.round(np.array(values) * self.rates.rates[code], 2).tolist()):
+                    column[row] = None if value != value else value
+    
+    def price(self, component_id: str, currency: str) -> Optional[float]:
+        """Converted price of one component"""
+        row = self.index.get(component_id)
+        return None if row is None else self.columns[check_currency(currency)][row]
+    
+    def total(self, component_ids: Iterable[str], currency: str) -> float:
+        """Sum of converted prices, unpriced components count as 0"""
+        column, index = self.columns[check_currency(currency)], self.index
+        total = 0.0
+        for component_id in component_ids:
+            row = index.get(component_id)
+            if row is not None and column[row]:
+                total += column[row]
+        return round(total, 2)
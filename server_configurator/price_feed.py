@@ -0,0 +1,189 @@
+"""
+Price and availability feed for server configurator
+Applies ERP deltas to the published catalog in batches, without reloading it
+
+Deltas are records like {"id": "cpu_1", "price": 1250.0, "availability": false};
+price or availability may be omitted. Pending deltas are coalesced per component
+(the latest value wins) and applied when `batch_size` components are pending or
+`max_delay` seconds after the first one, whichever comes first.
+
+Updates change component values in place (see ServerConfiguratorData.apply_updates):
+no catalog copy is made, validators and the compatibility matrix stay cached,
+and catalog_version is bumped once per applied batch.
+"""
+
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, IO, Iterable, List, Optional, Tuple
+
+from catalog import CatalogPublisher
+
+MAX_REPORTED_ERRORS = 20
+
+
+class FeedError(ValueError):
+    """Malformed feed record"""
+
+
+@dataclass
+class FeedStats:
+    """Counters of a price feed"""
+    received: int = 0
+    coalesced: int = 0  # deltas merged into a pending delta for the same component
+    batches: int = 0
+    changed: int = 0    # component updates that changed price or availability
+    unknown: int = 0    # deltas for components not in the catalog
+    rejected: int = 0   # malformed records
+    errors: List[str] = field(default_factory=list)  # first MAX_REPORTED_ERRORS messages
+    
+    def format(self) -> str:
+        """One-line summary"""
+        return (f"{self.received} deltas: {self.batches} batches, {self.changed} changed, "
+                f"{self.coalesced} coalesced, {self.unknown} unknown, {self.rejected} rejected")
+
+
+def parse_delta(record: Dict) -> Tuple[str, Optional[float], Optional[bool]]:
+    """(component_id, price, availability) from a feed record"""
+    if not isinstance(record, dict):
+        raise FeedError(f"Record must be an object, got {type(record).__name__}")
+    component_id = record.get("id", record.get("component_id"))
+    if not isinstance(component_id, str) or not component_id:
+        raise FeedError("Record without component id")
+    
+    price = record.get("price")
+    if price is not None:
+        if isinstance(price, bool) or not isinstance(price, (int, float)) or price < 0:
+            raise FeedError(f"{component_id}: invalid price {price!r}")
+        price = float(price)
+    availability = record.get("availability")
+    if availability is not None and not isinstance(availability, bool):
+        raise FeedError(f"{component_id}: invalid availability {availability!r}")
+    if price is None and availability is None:
+        raise FeedError(f"{component_id}: neither price nor availability given")
+    return component_id, price, availability
+
+
+class PriceFeed:
+    """
+    Batches price/availability deltas and applies them to a CatalogPublisher
+    submit() may be called from any thread; start() adds a thread flushing after max_delay
+    """
+    
+    def __init__(self, publisher: CatalogPublisher, batch_size: int = 1000, max_delay: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.publisher = publisher
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.clock = clock
+        self._pending: Dict[str, Tuple[Optional[float], Optional[bool]]] = {}
+        self._pending_since: Optional[float] = None
+        self._stats = FeedStats()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def submit(self, component_id: str, price: Optional[float] = None,
+               availability: Optional[bool] = None) -> None:
+        """Queue one delta, applying the batch if it is full or overdue"""
+        with self._lock:
+            self._stats.received += 1
+            pending = self._pending.get(component_id)
+            if pending is None:
+                self._pending[component_id] = (price, availability)
+                if self._pending_since is None:
+                    self._pending_since = self.clock()
+            else:
+                self._stats.coalesced += 1
+                self._pending[component_id] = (
+                    pending[0] if price is None else price,
+                    pending[1] if availability is None else availability
+                )
+            if len(self._pending) >= self.batch_size or self._overdue():
+                self._flush()
+    
+    def submit_records(self, records: Iterable[Dict]) -> int:
+        """Queue feed records, malformed ones are counted and skipped; returns number queued"""
+        queued = 0
+        for record in records:
+            try:
+                component_id, price, availability = parse_delta(record)
+            except FeedError as e:
+                self._reject(str(e))
+                continue
+            self.submit(component_id, price, availability)
+            queued += 1
+        return queued
+    
+    def read_ndjson(self, stream: IO[str]) -> int:
+        """Queue records from newline-delimited JSON, returns number queued"""
+        queued = 0
+        for number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                self._reject(f"line {number}: {e}")
+                continue
+            queued += self.submit_records([record])
+        return queued
+    
+    def flush(self) -> List[str]:
+        """Apply pending deltas now, returns ids of components that changed"""
+        with self._lock:
+            return self._flush()
+    
+    def stats(self) -> FeedStats:
+        """Copy of the counters"""
+        with self._lock:
+            stats = FeedStats(**vars(self._stats))
+            stats.errors = list(self._stats.errors)
+            return stats
+    
+    def start(self) -> "PriceFeed":
+        """Start a thread applying pending deltas at most max_delay after they arrive"""
+        if self._thread is None:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="price-feed", daemon=True)
+            self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        """Stop the flush thread and apply what is pending"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+    
+    def _overdue(self) -> bool:
+        return self._pending_since is not None and self.clock() - self._pending_since >= self.max_delay
+    
+    def _flush(self) -> List[str]:
+        if not self._pending:
+            return []
+        updates = [(component_id, price, availability)
+                   for component_id, (price, availability) in self._pending.items()]
+        self._pending = {}
+        self._pending_since = None
+        changed, unknown = self.publisher.apply_updates(updates)
+        self._stats.batches += 1
+        self._stats.changed += len(changed)
+        self._stats.unknown += len(unknown)
+        return changed
+    
+    def _reject(self, message: str) -> None:
+        with self._lock:
+            self._stats.received += 1
+            self._stats.rejected += 1
+            if len(self._stats.errors) < MAX_REPORTED_ERRORS:
+                self._stats.errors.append(message)
+    
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.max_delay / 4):
+            with self._lock:
+                if self._overdue():
+                    self._flush()
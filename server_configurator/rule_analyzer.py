@@ -0,0 +1,188 @@
+"""
+Rule set analyzer for server configurator
+Finds redundant and contradictory compatibility rules and matrix asymmetries
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from data_models import CompatibilityRule, CompatibilityType, ServerConfiguratorData
+
+
+@dataclass
+class RuleAnalysis:
+    """Result of analyzing a rule set: minimized rules plus report"""
+    minimized_rules: List[CompatibilityRule]
+    duplicates: List[Tuple[str, str]] = field(default_factory=list)  # (dropped rule id, kept rule id)
+    subsumed: List[Tuple[str, str]] = field(default_factory=list)    # (dropped rule id, tighter rule id)
+    dead: List[Tuple[str, str]] = field(default_factory=list)        # (dropped rule id, reason)
+    contradictions: List[str] = field(default_factory=list)
+    asymmetric_pairs: List[Tuple[str, str]] = field(default_factory=list)  # a lists b, b does not list a
+    unknown_matrix_ids: List[str] = field(default_factory=list)
+    symmetric_matrix: Optional[Dict[str, List[str]]] = None
+    original_rule_count: int = 0
+    
+    @property
+    def removed_count(self) -> int:
+        """Number of rules dropped from the hot path"""
+        return self.original_rule_count - len(self.minimized_rules)
+    
+    def apply(self, data: ServerConfiguratorData, matrix: Optional[Dict[str, List[str]]] = None) -> None:
+        """Replace rules (and matrix rows) with the minimized versions, data must not be frozen"""
+        data.check_writable()
+        data.compatibility_rules = list(self.minimized_rules)
+        data.version += 1
+        if matrix is not None and self.symmetric_matrix is not None:
+            matrix.clear()
+            matrix.update(self.symmetric_matrix)
+    
+    def format_report(self) -> str:
+        """Human readable report"""
+        lines = [f"Rules: {self.original_rule_count} -> {len(self.minimized_rules)}"]
+        for dropped, kept in self.duplicates:
+            lines.append(f"  duplicate: {dropped} (same as {kept})")
+        for dropped, tighter in self.subsumed:
+            lines.append(f"  subsumed: {dropped} (by {tighter})")
+        for dropped, reason in self.dead:
+            lines.append(f"  dead: {dropped} ({reason})")
+        for contradiction in self.contradictions:
+            lines.append(f"  CONTRADICTION: {contradiction}")
+        if self.symmetric_matrix is not None:
+            lines.append(f"Matrix: {len(self.asymmetric_pairs)} asymmetric pairs")
+            for a, b in self.asymmetric_pairs:
+                lines.append(f"  {a} lists {b}, but {b} does not list {a}")
+            for component_id in self.unknown_matrix_ids:
+                lines.append(f"  unknown component in matrix: {component_id}")
+        return "\n".join(lines)
+
+
+def _rule_key(rule: CompatibilityRule) -> tuple:
+    """Identity of a rule's effect, ignoring id and description"""
+    if rule.rule_type == CompatibilityType.EXCLUDED:
+        # Exclusion is symmetric: (a, b) and (b, a) forbid the same configurations
+        return (rule.rule_type, frozenset((rule.primary_component_id, rule.secondary_component_id)))
+    if rule.rule_type == CompatibilityType.CONDITION:
+        return (rule.rule_type, rule.primary_component_id, (rule.condition or "").strip())
+    return (rule.rule_type, rule.primary_component_id, rule.max_quantity, rule.min_quantity)
+
+
+def _dead_reason(rule: CompatibilityRule, data: ServerConfiguratorData) -> Optional[str]:
+    """Why a rule can never produce an error, None if it can"""
+    if rule.rule_type == CompatibilityType.OPTIONAL:
+        return "optional rules are not checked"
+    if rule.rule_type == CompatibilityType.CONDITION:
+        if rule.primary_component_id and rule.primary_component_id not in data.components:
+            return f"unknown component {rule.primary_component_id}"
+        return None
+    if rule.primary_component_id not in data.components:
+        return f"unknown component {rule.primary_component_id}"
+    if rule.rule_type == CompatibilityType.EXCLUDED and rule.secondary_component_id not in data.components:
+        return f"unknown component {rule.secondary_component_id}"
+    if rule.rule_type == CompatibilityType.LIMITED and not rule.max_quantity and not rule.min_quantity:
+        return "no quantity limits"
+    return None
+
+
+def analyze_matrix(matrix: Dict[str, List[str]], data: ServerConfiguratorData,
+                   analysis: RuleAnalysis) -> None:
+    """
+    Flag asymmetric matrix rows and build a symmetric matrix
+    The configurator rejects a pair if either row omits the other, so the
+    symmetric matrix keeps only pairs listed in both directions (same behavior)
+    """
+    symmetric: Dict[str, List[str]] = {}
+    for component_id, compatible in matrix.items():
+        if component_id not in data.components:
+            analysis.unknown_matrix_ids.append(component_id)
+        row = []
+        for other_id in dict.fromkeys(compatible):
+            if other_id in matrix and component_id not in matrix[other_id]:
+                analysis.asymmetric_pairs.append((component_id, other_id))
+                continue
+            row.append(other_id)
+        symmetric[component_id] = row
+    analysis.symmetric_matrix = symmetric
+
+
+def analyze_rules(data: ServerConfiguratorData, matrix: Optional[Dict[str, List[str]]] = None) -> RuleAnalysis:
+    """
+    Analyze loaded rules (and optionally the compatibility matrix)
+    Minimized rules keep the original order of the surviving rules
+    """
+    rules = data.compatibility_rules
+    analysis = RuleAnalysis(minimized_rules=[], original_rule_count=len(rules))
+    
+    # Tightest quantity bounds per component across LIMITED rules
+    tightest_max: Dict[str, CompatibilityRule] = {}
+    tightest_min: Dict[str, CompatibilityRule] = {}
+    for rule in rules:
+        if rule.rule_type != CompatibilityType.LIMITED:
+            continue
+        component_id = rule.primary_component_id
+        if rule.max_quantity and (component_id not in tightest_max
+                                  or rule.max_quantity < tightest_max[component_id].max_quantity):
+            tightest_max[component_id] = rule
+        if rule.min_quantity and (component_id not in tightest_min
+                                  or rule.min_quantity > tightest_min[component_id].min_quantity):
+            tightest_min[component_id] = rule
+    
+    seen: Dict[tuple, CompatibilityRule] = {}
+    for rule in rules:
+        reason = _dead_reason(rule, data)
+        if reason:
+            analysis.dead.append((rule.id, reason))
+            continue
+        
+        key = _rule_key(rule)
+        if key in seen:
+            analysis.duplicates.append((rule.id, seen[key].id))
+            continue
+        seen[key] = rule
+        
+        if rule.rule_type == CompatibilityType.LIMITED:
+            component_id = rule.primary_component_id
+            keeps_max = rule.max_quantity and tightest_max[component_id] is rule
+            keeps_min = rule.min_quantity and tightest_min[component_id] is rule
+            if not keeps_max and not keeps_min:
+                tighter = tightest_max.get(component_id) or tightest_min[component_id]
+                analysis.subsumed.append((rule.id, tighter.id))
+                continue
+        
+        analysis.minimized_rules.append(rule)
+    
+    # Contradictions: no configuration can satisfy these rules together
+    for component_id, max_rule in tightest_max.items():
+        min_rule = tightest_min.get(component_id)
+        if min_rule and min_rule.min_quantity > max_rule.max_quantity:
+            analysis.contradictions.append(
+                f"{min_rule.id} requires at least {min_rule.min_quantity} {component_id}, "
+                f"{max_rule.id} allows at most {max_rule.max_quantity}"
+            )
+    
+    required = {rule.primary_component_id: rule for rule in analysis.minimized_rules
+                if rule.rule_type == CompatibilityType.REQUIRED}
+    for rule in analysis.minimized_rules:
+        if rule.rule_type != CompatibilityType.EXCLUDED:
+            continue
+        if rule.primary_component_id in required and rule.secondary_component_id in required:
+            analysis.contradictions.append(
+                f"{rule.id} excludes {rule.primary_component_id} with {rule.secondary_component_id}, "
+                f"but both are required ({required[rule.primary_component_id].id}, "
+                f"{required[rule.secondary_component_id].id})"
+            )
+    
+    if matrix is not None:
+        analyze_matrix(matrix, data, analysis)
+        for component_id, rule in required.items():
+            row = analysis.symmetric_matrix.get(component_id)
+            if row is None:
+                continue
+            for other_id, other_rule in required.items():
+                if other_id != component_id and other_id in analysis.symmetric_matrix and other_id not in row:
+                    if component_id < other_id:
+                        analysis.contradictions.append(
+                            f"{rule.id} and {other_rule.id} require {component_id} and {other_id}, "
+                            f"which the matrix marks incompatible"
+                        )
+    
+    return analysis
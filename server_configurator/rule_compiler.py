@@ -0,0 +1,113 @@
+"""
+Rule compiler for server configurator
+Generates a Python validator specialized for the loaded compatibility rules
+"""
+
+from typing import Callable, Dict, List
+
+from conditions import NOT_APPLICABLE, ConditionContext, attribute_sum, condition_source, first_attribute
+from data_models import Component, ComponentType, CompatibilityType, ServerConfiguratorData
+
+
+def generate_validator_source(data: ServerConfiguratorData) -> str:
+    """
+    Generate source of a validate(components) function for the current rules
+    Rule lookups are resolved at generation time: component ids, types,
+    limits and error messages are inlined as constants. Checks are emitted in
+    rule order so errors match validate_configuration exactly.
+    CONDITION expressions are inlined as Python expressions (see condition_source);
+    the ones that do not apply to a configuration raise NOT_APPLICABLE.
+    """
+    type_lists: Dict[ComponentType, str] = {}
+    groups: Dict[ComponentType, str] = {}
+    checks: List[str] = []
+    
+    def ids_of(component: Component) -> str:
+        """Name of the local holding ids present for the component's type"""
+        if component.component_type not in type_lists:
+            type_lists[component.component_type] = f"ids_{component.component_type.name.lower()}"
+        return type_lists[component.component_type]
+    
+    def group(component_type: ComponentType) -> str:
+        """Name of the local holding the components of a type, for conditions"""
+        if component_type not in groups:
+            groups[component_type] = f"group_{component_type.name.lower()}"
+        return groups[component_type]
+    
+    for rule in data.compatibility_rules:
+        primary = data.components.get(rule.primary_component_id)
+        primary_id = rule.primary_component_id
+        
+        if rule.rule_type == CompatibilityType.REQUIRED:
+            if primary:
+                message = f"Required component {primary_id} is missing"
+                checks.append(f"    if {primary_id!r} not in {ids_of(primary)}:")
+                checks.append(f"        errors.append({message!r})")
+        
+        elif rule.rule_type == CompatibilityType.EXCLUDED:
+            secondary = data.components.get(rule.secondary_component_id) if rule.secondary_component_id else None
+            if primary and secondary:
+                secondary_id = rule.secondary_component_id
+                message = f"Components {primary_id} and {secondary_id} are incompatible"
+                checks.append(
+                    f"    if {primary_id!r} in {ids_of(primary)} and {secondary_id!r} in {ids_of(secondary)}:"
+                )
+                checks.append(f"        errors.append({message!r})")
+        
+        elif rule.rule_type == CompatibilityType.LIMITED:
+            if primary and (rule.max_quantity or rule.min_quantity):
+                checks.append(f"    count = {ids_of(primary)}.count({primary_id!r})")
+                if rule.max_quantity:
+                    message = f"Too many {primary_id} components (max: {rule.max_quantity})"
+                    checks.append(f"    if count > {rule.max_quantity!r}:")
+                    checks.append(f"        errors.append({message!r})")
+                if rule.min_quantity:
+                    message = f"Not enough {primary_id} components (min: {rule.min_quantity})"
+                    checks.append(f"    if count < {rule.min_quantity!r}:")
+                    checks.append(f"        errors.append({message!r})")
+        
+        elif rule.rule_type == CompatibilityType.CONDITION:
+            if primary or not primary_id:
+                message = f"Condition {rule.id} failed: {rule.condition}"
+                indent = "    "
+                if primary:
+                    checks.append(f"    if {primary_id!r} in {ids_of(primary)}:")
+                    indent += "    "
+                checks.append(f"{indent}try:")
+                checks.append(f"{indent}    if not {condition_source(rule.condition or '', group)}:")
+                checks.append(f"{indent}        errors.append({message!r})")
+                checks.append(f"{indent}except NOT_APPLICABLE:")
+                checks.append(f"{indent}    pass")
+    
+    lines = [
+        "def validate(components):",
+        "    errors = []",
+        "    get = components.get",
+    ]
+    # Each component type list is scanned once, whatever the number of rules on it
+    for component_type, name in type_lists.items():
+        lines.append(f"    {name} = [c.id for c in get({component_type.name}, ())]")
+    for component_type, name in groups.items():
+        lines.append(f"    {name} = get({component_type.name}, ())")
+    if any("context." in check for check in checks):
+        lines.append("    context = ConditionContext(components)")
+    lines.extend(checks)
+    lines.append("    return errors")
+    return "\n".join(lines) + "\n"
+
+
+def compile_validator(data: ServerConfiguratorData) -> Callable[[Dict[ComponentType, List[Component]]], List[str]]:
+    """
+    Compile a validator for the current catalog version
+    The returned function carries `version` and `source` attributes
+    """
+    source = generate_validator_source(data)
+    namespace = {component_type.name: component_type for component_type in ComponentType}
+    namespace.update(ConditionContext=ConditionContext, NOT_APPLICABLE=NOT_APPLICABLE,
+                     first_attribute=first_attribute, attribute_sum=attribute_sum)
+    exec(compile(source, f"<compiled rules v{data.version}>", "exec"), namespace)
+    
+    validate = namespace["validate"]
+    validate.version = data.version
+    validate.source = source
+    return validate
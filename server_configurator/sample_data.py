@@ -53,6 +53,25 @@ def create_sample_data() -> ServerConfiguratorData:
             ],
             price=2000.00,
             description="Mid-range rack server with high memory capacity"
+        ),
+        Component(
+            id="ibm_x3650_m3",
+            name="IBM System x3650 M3",
+            component_type=ComponentType.SERVER,
+            manufacturer="IBM",
+            model="x3650 M3",
+            attributes=[
+                ComponentAttribute("form_factor", "2U Rack"),
+                ComponentAttribute("max_processors", "2"),
+                ComponentAttribute("max_memory_slots", "18"),
+                ComponentAttribute("max_memory_gb", "192"),
+                ComponentAttribute("storage_bays", "8"),
+                ComponentAttribute("power_supply_slots", "2"),
+                ComponentAttribute("socket_type", "Socket 1366"),
+                ComponentAttribute("chipset", "Intel 5520")
+            ],
+            price=2500.00,
+            description="High-performance rack server for mission-critical workloads"
         )
     ]
     
@@ -102,6 +121,21 @@ def create_sample_data() -> ServerConfiguratorData:
                 ComponentAttribute("tdp", "80", "W")
             ],
             price=300.00
+        ),
+        Component(
+            id="intel_xeon_x5670",
+            name="Intel Xeon X5670",
+            component_type=ComponentType.PROCESSOR,
+            manufacturer="Intel",
+            model="X5670",
+            attributes=[
+                ComponentAttribute("frequency", "2.93", "GHz"),
+                ComponentAttribute("cores", "6"),
+                ComponentAttribute("socket", "1366"),
+                ComponentAttribute("cache", "12", "MB"),
+                ComponentAttribute("tdp", "95", "W")
+            ],
+            price=450.00
         )
     ]
     
@@ -151,6 +185,21 @@ def create_sample_data() -> ServerConfiguratorData:
                 ComponentAttribute("voltage", "1.5", "V")
             ],
             price=80.00
+        ),
+        Component(
+            id="crucial_8gb_ddr3_1600",
+            name="Crucial 8GB DDR3-1600",
+            component_type=ComponentType.MEMORY,
+            manufacturer="Crucial",
+            model="8GB DDR3-1600",
+            attributes=[
+                ComponentAttribute("capacity", "8", "GB"),
+                ComponentAttribute("type", "DDR3"),
+                ComponentAttribute("speed", "1600", "MHz"),
+                ComponentAttribute("form_factor", "DIMM"),
+                ComponentAttribute("voltage", "1.5", "V")
+            ],
+            price=150.00
         )
     ]
     
@@ -185,6 +234,21 @@ def create_sample_data() -> ServerConfiguratorData:
                 ComponentAttribute("cache", "64", "MB")
             ],
             price=100.00
+        ),
+        Component(
+            id="intel_ssd_240gb",
+            name="Intel SSD 240GB SATA",
+            component_type=ComponentType.STORAGE,
+            manufacturer="Intel",
+            model="240GB SSD",
+            attributes=[
+                ComponentAttribute("capacity", "240", "GB"),
+                ComponentAttribute("interface", "SATA 3.0"),
+                ComponentAttribute("type", "SSD"),
+                ComponentAttribute("form_factor", "2.5"),
+                ComponentAttribute("read_speed", "550", "MB/s")
+            ],
+            price=180.00
         )
     ]
     
@@ -217,6 +281,20 @@ def create_sample_data() -> ServerConfiguratorData:
                 ComponentAttribute("modular", "No")
             ],
             price=180.00
+        ),
+        Component(
+            id="ibm_835w_psu",
+            name="IBM 835W Power Supply",
+            component_type=ComponentType.POWER_SUPPLY,
+            manufacturer="IBM",
+            model="835W PSU",
+            attributes=[
+                ComponentAttribute("power", "835", "W"),
+                ComponentAttribute("efficiency", "80+ Platinum"),
+                ComponentAttribute("form_factor", "Standard"),
+                ComponentAttribute("modular", "No")
+            ],
+            price=220.00
         )
     ]
     
@@ -242,6 +320,13 @@ def create_sample_data() -> ServerConfiguratorData:
             secondary_component_id="intel_xeon_3_0_604",
             condition="Socket 1366 vs Socket 604"
         ),
+        CompatibilityRule(
+            id="socket_1366_compatibility_hp",
+            rule_type=CompatibilityType.EXCLUDED,
+            primary_component_id="hp_ml350g4p",
+            secondary_component_id="intel_xeon_x5670",
+            condition="Socket 604 vs Socket 1366"
+        ),
         
         # Memory type compatibility
         CompatibilityRule(
@@ -258,6 +343,13 @@ def create_sample_data() -> ServerConfiguratorData:
             secondary_component_id="kingston_1gb_ddr2_400",
             condition="DDR3 and DDR2 cannot be mixed"
         ),
+        CompatibilityRule(
+            id="ddr2_ddr3_incompatible_crucial",
+            rule_type=CompatibilityType.EXCLUDED,
+            primary_component_id="corsair_2gb_ddr2_533",
+            secondary_component_id="crucial_8gb_ddr3_1600",
+            condition="DDR2 and DDR3 cannot be mixed"
+        ),
         
         # Quantity limits
         CompatibilityRule(
@@ -282,6 +374,26 @@ def create_sample_data() -> ServerConfiguratorData:
             condition="Dell R710 has 18 memory slots"
         ),
         
+        # Server capacity conditions (checked against the server in configuration)
+        CompatibilityRule(
+            id="server_memory_slots",
+            rule_type=CompatibilityType.CONDITION,
+            primary_component_id="",
+            condition="count(type=memory) <= server.max_memory_slots"
+        ),
+        CompatibilityRule(
+            id="server_memory_capacity",
+            rule_type=CompatibilityType.CONDITION,
+            primary_component_id="",
+            condition="sum(capacity, type=memory) <= server.max_memory_gb"
+        ),
+        CompatibilityRule(
+            id="server_processor_sockets",
+            rule_type=CompatibilityType.CONDITION,
+            primary_component_id="",
+            condition="count(type=processor) <= server.max_processors"
+        ),
+        
         # Required components - these rules are too restrictive, removing them
         # CompatibilityRule(
         #     id="require_server",
@@ -313,39 +425,51 @@ def create_compatibility_matrix() -> dict:
         "hp_ml350g4p": [
             "intel_xeon_3_0_604", "intel_xeon_3_2_604",
             "kingston_1gb_ddr2_400", "corsair_2gb_ddr2_533",
-            "seagate_500gb_sata", "wd_1tb_sata",
+            "seagate_500gb_sata", "wd_1tb_sata", "intel_ssd_240gb",
             "hp_460w_psu"
         ],
         
         # Dell R710 compatibility - server is compatible with all its components
         "dell_poweredge_r710": [
-            "intel_xeon_e5620",
-            "samsung_4gb_ddr3_1333",
-            "seagate_500gb_sata", "wd_1tb_sata",
+            "intel_xeon_e5620", "intel_xeon_x5670",
+            "samsung_4gb_ddr3_1333", "crucial_8gb_ddr3_1600",
+            "seagate_500gb_sata", "wd_1tb_sata", "intel_ssd_240gb",
             "dell_750w_psu"
         ],
         
+        # IBM x3650 M3 compatibility - Socket 1366, DDR3
+        "ibm_x3650_m3": [
+            "intel_xeon_e5620", "intel_xeon_x5670",
+            "samsung_4gb_ddr3_1333", "crucial_8gb_ddr3_1600",
+            "seagate_500gb_sata", "wd_1tb_sata", "intel_ssd_240gb",
+            "ibm_835w_psu"
+        ],
+        
         # Socket 604 processors - compatible with HP server and other Socket 604 components
-        "intel_xeon_3_0_604": ["hp_ml350g4p", "intel_xeon_3_2_604", "kingston_1gb_ddr2_400", "corsair_2gb_ddr2_533", "seagate_500gb_sata", "wd_1tb_sata", "hp_460w_psu"],
-        "intel_xeon_3_2_604": ["hp_ml350g4p", "intel_xeon_3_0_604", "kingston_1gb_ddr2_400", "corsair_2gb_ddr2_533", "seagate_500gb_sata", "wd_1tb_sata", "hp_460w_psu"],
+        "intel_xeon_3_0_604": ["hp_ml350g4p", "intel_xeon_3_2_604", "kingston_1gb_ddr2_400", "corsair_2gb_ddr2_533", "seagate_500gb_sata", "wd_1tb_sata", "intel_ssd_240gb", "hp_460w_psu"],
+        "intel_xeon_3_2_604": ["hp_ml350g4p", "intel_xeon_3_0_604", "kingston_1gb_ddr2_400", "corsair_2gb_ddr2_533", "seagate_500gb_sata", "wd_1tb_sata", "intel_ssd_240gb", "hp_460w_psu"],
         
-        # Socket 1366 processors - compatible with Dell server and other Socket 1366 components
-        "intel_xeon_e5620": ["dell_poweredge_r710", "samsung_4gb_ddr3_1333", "seagate_500gb_sata", "wd_1tb_sata", "dell_750w_psu"],
+        # Socket 1366 processors - compatible with Dell and IBM servers and other Socket 1366 components
+        "intel_xeon_e5620": ["dell_poweredge_r710", "ibm_x3650_m3", "intel_xeon_x5670", "samsung_4gb_ddr3_1333", "crucial_8gb_ddr3_1600", "seagate_500gb_sata", "wd_1tb_sata", "intel_ssd_240gb", "dell_750w_psu", "ibm_835w_psu"],
+        "intel_xeon_x5670": ["dell_poweredge_r710", "ibm_x3650_m3", "intel_xeon_e5620", "samsung_4gb_ddr3_1333", "crucial_8gb_ddr3_1600", "seagate_500gb_sata", "wd_1tb_sata", "intel_ssd_240gb", "dell_750w_psu", "ibm_835w_psu"],
         
         # DDR2 memory - compatible with HP server and Socket 604 processors
-        "kingston_1gb_ddr2_400": ["hp_ml350g4p", "intel_xeon_3_0_604", "intel_xeon_3_2_604", "corsair_2gb_ddr2_533", "seagate_500gb_sata", "wd_1tb_sata", "hp_460w_psu"],
-        "corsair_2gb_ddr2_533": ["hp_ml350g4p", "intel_xeon_3_0_604", "intel_xeon_3_2_604", "kingston_1gb_ddr2_400", "seagate_500gb_sata", "wd_1tb_sata", "hp_460w_psu"],
+        "kingston_1gb_ddr2_400": ["hp_ml350g4p", "intel_xeon_3_0_604", "intel_xeon_3_2_604", "corsair_2gb_ddr2_533", "seagate_500gb_sata", "wd_1tb_sata", "intel_ssd_240gb", "hp_460w_psu"],
+        "corsair_2gb_ddr2_533": ["hp_ml350g4p", "intel_xeon_3_0_604", "intel_xeon_3_2_604", "kingston_1gb_ddr2_400", "seagate_500gb_sata", "wd_1tb_sata", "intel_ssd_240gb", "hp_460w_psu"],
         
-        # DDR3 memory - compatible with Dell server and Socket 1366 processors
-        "samsung_4gb_ddr3_1333": ["dell_poweredge_r710", "intel_xeon_e5620", "seagate_500gb_sata", "wd_1tb_sata", "dell_750w_psu"],
+        # DDR3 memory - compatible with Dell and IBM servers and Socket 1366 processors
+        "samsung_4gb_ddr3_1333": ["dell_poweredge_r710", "ibm_x3650_m3", "intel_xeon_e5620", "intel_xeon_x5670", "crucial_8gb_ddr3_1600", "seagate_500gb_sata", "wd_1tb_sata", "intel_ssd_240gb", "dell_750w_psu", "ibm_835w_psu"],
+        "crucial_8gb_ddr3_1600": ["dell_poweredge_r710", "ibm_x3650_m3", "intel_xeon_e5620", "intel_xeon_x5670", "samsung_4gb_ddr3_1333", "seagate_500gb_sata", "wd_1tb_sata", "intel_ssd_240gb", "dell_750w_psu", "ibm_835w_psu"],
         
         # Storage (compatible with all servers and processors)
-        "seagate_500gb_sata": ["hp_ml350g4p", "dell_poweredge_r710", "intel_xeon_3_0_604", "intel_xeon_3_2_604", "intel_xeon_e5620", "kingston_1gb_ddr2_400", "corsair_2gb_ddr2_533", "samsung_4gb_ddr3_1333", "wd_1tb_sata", "hp_460w_psu", "dell_750w_psu"],
-        "wd_1tb_sata": ["hp_ml350g4p", "dell_poweredge_r710", "intel_xeon_3_0_604", "intel_xeon_3_2_604", "intel_xeon_e5620", "kingston_1gb_ddr2_400", "corsair_2gb_ddr2_533", "samsung_4gb_ddr3_1333", "seagate_500gb_sata", "hp_460w_psu", "dell_750w_psu"],
+        "seagate_500gb_sata": ["hp_ml350g4p", "dell_poweredge_r710", "ibm_x3650_m3", "intel_xeon_3_0_604", "intel_xeon_3_2_604", "intel_xeon_e5620", "intel_xeon_x5670", "kingston_1gb_ddr2_400", "corsair_2gb_ddr2_533", "samsung_4gb_ddr3_1333", "crucial_8gb_ddr3_1600", "wd_1tb_sata", "intel_ssd_240gb", "hp_460w_psu", "dell_750w_psu", "ibm_835w_psu"],
+        "wd_1tb_sata": ["hp_ml350g4p", "dell_poweredge_r710", "ibm_x3650_m3", "intel_xeon_3_0_604", "intel_xeon_3_2_604", "intel_xeon_e5620", "intel_xeon_x5670", "kingston_1gb_ddr2_400", "corsair_2gb_ddr2_533", "samsung_4gb_ddr3_1333", "crucial_8gb_ddr3_1600", "seagate_500gb_sata", "intel_ssd_240gb", "hp_460w_psu", "dell_750w_psu", "ibm_835w_psu"],
+        "intel_ssd_240gb": ["hp_ml350g4p", "dell_poweredge_r710", "ibm_x3650_m3", "intel_xeon_3_0_604", "intel_xeon_3_2_604", "intel_xeon_e5620", "intel_xeon_x5670", "kingston_1gb_ddr2_400", "corsair_2gb_ddr2_533", "samsung_4gb_ddr3_1333", "crucial_8gb_ddr3_1600", "seagate_500gb_sata", "wd_1tb_sata", "hp_460w_psu", "dell_750w_psu", "ibm_835w_psu"],
         
         # Power supplies - compatible with their respective servers and all components
-        "hp_460w_psu": ["hp_ml350g4p", "intel_xeon_3_0_604", "intel_xeon_3_2_604", "kingston_1gb_ddr2_400", "corsair_2gb_ddr2_533", "seagate_500gb_sata", "wd_1tb_sata"],
-        "dell_750w_psu": ["dell_poweredge_r710", "intel_xeon_e5620", "samsung_4gb_ddr3_1333", "seagate_500gb_sata", "wd_1tb_sata"]
+        "hp_460w_psu": ["hp_ml350g4p", "intel_xeon_3_0_604", "intel_xeon_3_2_604", "kingston_1gb_ddr2_400", "corsair_2gb_ddr2_533", "seagate_500gb_sata", "wd_1tb_sata", "intel_ssd_240gb"],
+        "dell_750w_psu": ["dell_poweredge_r710", "intel_xeon_e5620", "intel_xeon_x5670", "samsung_4gb_ddr3_1333", "crucial_8gb_ddr3_1600", "seagate_500gb_sata", "wd_1tb_sata", "intel_ssd_240gb"],
+        "ibm_835w_psu": ["ibm_x3650_m3", "intel_xeon_e5620", "intel_xeon_x5670", "samsung_4gb_ddr3_1333", "crucial_8gb_ddr3_1600", "seagate_500gb_sata", "wd_1tb_sata", "intel_ssd_240gb"]
     }
     
     return matrix
@@ -0,0 +1,288 @@
+"""
+Session manager for server configurator
+One ServerConfigurator per visitor, looked up by token, with bounded memory
+
+Sessions live in memory in least-recently-used order. Idle sessions expire
+after `ttl` seconds; when more than `max_sessions` are live, the least recently
+used one is evicted. With a SessionStore, evicted sessions are spilled there
+and restored transparently on the next lookup; expire() sweeps stored states
+idle for longer than `ttl` as well. Listeners learn about every session that
+ends (removed, expired, or evicted with nowhere to spill it).
+"""
+
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from catalog import Catalog, CatalogPublisher, shared_publisher
+from configurator import ServerConfigurator
+from translations import DEFAULT_LANGUAGE
+
+_TOKEN = re.compile(r"[A-Za-z0-9_-]{8,64}")  # used with fullmatch: no trailing newline
+
+
+@dataclass
+class SessionStats:
+    """Session manager counters"""
+    live: int = 0
+    created: int = 0
+    hits: int = 0
+    misses: int = 0
+    evicted: int = 0   # dropped for max_sessions (least recently used)
+    expired: int = 0   # dropped after ttl
+    spilled: int = 0   # evicted sessions written to the store
+    restored: int = 0  # sessions loaded back from the store
+    
+    def format(self) -> str:
+        """One-line summary"""
+        return (f"{self.live} live, {self.created} created, {self.hits} hits, {self.misses} misses, "
+                f"{self.evicted} evicted, {self.expired} expired, {self.spilled} spilled, "
+                f"{self.restored} restored")
+
+
+class SessionStore(ABC):
+    """Where evicted sessions are spilled: token -> session state"""
+    
+    @abstractmethod
+    def save(self, token: str, state: Dict) -> None:
+        """Store session state (its "last_access" time is kept for expire())"""
+    
+    @abstractmethod
+    def load(self, token: str) -> Optional[Dict]:
+        """Stored session state, None if absent"""
+    
+    @abstractmethod
+    def delete(self, token: str) -> None:
+        """Forget session state"""
+    
+    @abstractmethod
+    def expire(self, before: float) -> List[str]:
+        """Forget states last accessed before a time, returns their tokens"""
+
+
+class FileSessionStore(SessionStore):
+    """One JSON file per spilled session in a local directory"""
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+    
+    def _path(self, token: str) -> str:
+        return os.path.join(self.directory, f"{token}.json")
+    
+    def save(self, token: str, state: Dict) -> None:
+        path = self._path(token)
+        with open(path + ".tmp", "w", encoding="utf-8") as stream:
+            json.dump(state, stream)
+        if "last_access" in state:  # the file time is the last access, so expire() needs no reads
+            os.utime(path + ".tmp", (state["last_access"], state["last_access"]))
+        os.replace(path + ".tmp", path)
+    
+    def load(self, token: str) -> Optional[Dict]:
+        try:
+            with open(self._path(token), "r", encoding="utf-8") as stream:
+                return json.load(stream)
+        except (FileNotFoundError, ValueError):
+            return None
+    
+    def delete(self, token: str) -> None:
+        try:
+            os.remove(self._path(token))
+        except FileNotFoundError:
+            pass
+    
+    def expire(self, before: float) -> List[str]:
+        expired = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    if entry.stat().st_mtime < before:
+                        os.remove(entry.path)
+                        expired.append(entry.name[:-len(".json")])
+                except FileNotFoundError:  # restored or removed meanwhile
+                    pass
+        return expired
+
+
+class SessionManager:
+    """Creates, looks up and expires configurator sessions by token"""
+    
+    def __init__(self, max_sessions: int = 10_000, ttl: Optional[float] = 1800.0,
+                 store: Optional[SessionStore] = None, catalog: Optional[Catalog] = None,
+                 clock: Callable[[], float] = time.time, source: Optional[CatalogPublisher] = None):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.store = store
+        self.catalog = catalog  # fixed catalog for all sessions, otherwise they follow source
+        self.source = source or (shared_publisher() if catalog is None else None)
+        self.clock = clock
+        # token -> (session, last access time), least recently used first
+        self._sessions: "OrderedDict[str, Tuple[ServerConfigurator, float]]" = OrderedDict()
+        self._stats = SessionStats()
+        self._lock = threading.RLock()
+        self._listeners: List[Callable[[str], None]] = []
+        self._ended: List[str] = []  # tokens to hand to listeners once the lock is released
+    
+    def __len__(self) -> int:
+        return len(self._sessions)
+    
+    def __contains__(self, token: str) -> bool:
+        return token in self._sessions
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._sessions))
+    
+    def add_listener(self, listener: Callable[[str], None]) -> None:
+        """Call listener(token) when a session ends, outside the manager lock"""
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[str], None]) -> None:
+        """Stop calling listener"""
+        self._listeners.remove(listener)
+    
+    def _notify(self) -> None:
+        if not self._ended:  # the common case, without taking the lock again
+            return
+        with self._lock:
+            ended, self._ended = self._ended, []
+        for token in ended:
+            for listener in list(self._listeners):
+                listener(token)
+    
+    def create(self, language: str = DEFAULT_LANGUAGE) -> Tuple[str, ServerConfigurator]:
+        """Start a new session, returns (token, configurator)"""
+        token = secrets.token_urlsafe(16)
+        session = ServerConfigurator(catalog=self.catalog, source=self.source, language=language)
+        with self._lock:
+            self._stats.created += 1
+            self._put(token, session)
+        self._notify()
+        return token, session
+    
+    def get(self, token: str) -> Optional[ServerConfigurator]:
+        """Session for token (restored from the store if spilled), None if unknown or expired"""
+        try:
+            return self._get(token)
+        finally:
+            self._notify()
+    
+    def _get(self, token: str) -> Optional[ServerConfigurator]:
+        with self._lock:
+            now = self.clock()
+            entry = self._sessions.get(token)
+            if entry is not None:
+                session, last_access = entry
+                if self._is_expired(last_access, now):
+                    del self._sessions[token]
+                    self._ended.append(token)
+                    self._stats.expired += 1
+                    self._stats.misses += 1
+                    return None
+                self._sessions[token] = (session, now)
+                self._sessions.move_to_end(token)
+                self._stats.hits += 1
+                return session
+            
+            session = self._restore(token, now)
+            if session is None:
+                self._stats.misses += 1
+                return None
+            self._stats.hits += 1
+            self._put(token, session)
+            return session
+    
+    def remove(self, token: str) -> bool:
+        """End a session, returns True if it existed"""
+        with self._lock:
+            found = self._sessions.pop(token, None) is not None
+            if self.store is not None and _TOKEN.fullmatch(token):
+                found = found or self.store.load(token) is not None
+                self.store.delete(token)
+            if found:
+                self._ended.append(token)
+        self._notify()
+        return found
+    
+    def expire(self) -> int:
+        """Drop sessions idle for longer than ttl, in memory and in the store, returns number dropped"""
+        if self.ttl is None:
+            return 0
+        with self._lock:
+            now = self.clock()
+            dropped = 0
+            ended = []
+            while self._sessions:
+                token, (_, last_access) = next(iter(self._sessions.items()))
+                if not self._is_expired(last_access, now):
+                    break  # access order: everything after is newer
+                del self._sessions[token]
+                ended.append(token)
+            if self.store is not None:
+                ended.extend(self.store.expire(now - self.ttl))
+            self._stats.expired += len(ended)
+            self._ended.extend(ended)
+        self._notify()
+        return len(ended)
+    
+    def stats(self) -> SessionStats:
+        """Copy of the counters with the current live count"""
+        with self._lock:
+            stats = SessionStats(**vars(self._stats))
+            stats.live = len(self._sessions)
+            return stats
+    
+    def _is_expired(self, last_access: float, now: float) -> bool:
+        return self.ttl is not None and now - last_access > self.ttl
+    
+    def _put(self, token: str, session: ServerConfigurator) -> None:
+        """Insert as most recently used, evicting the least recently used over the limit"""
+        self._sessions[token] = (session, self.clock())
+        self._sessions.move_to_end(token)
+        while len(self._sessions) > self.max_sessions:
+            evicted_token, (evicted, last_access) = self._sessions.popitem(last=False)
+            self._stats.evicted += 1
+            if self.store is not None:
+                state = evicted.get_state()
+                state["last_access"] = last_access
+                self.store.save(evicted_token, state)
+                self._stats.spilled += 1
+            else:
+                self._ended.append(evicted_token)
+    
+    def _restore(self, token: str, now: float) -> Optional[ServerConfigurator]:
+        """
+        Load a spilled session back, None if absent, expired or unreadable
+        An unreadable state is counted as expired but left in the store (expire() sweeps it),
+        the state is only deleted once the session is restored.
+        """
+        if self.store is None or not _TOKEN.fullmatch(token):
+            return None
+        state = self.store.load(token)
+        if state is None:
+            return None
+        try:
+            if not isinstance(state, dict):
+                raise TypeError(f"session state is {type(state).__name__}, not dict")
+            if self._is_expired(state.get("last_access", now), now):
+                self.store.delete(token)
+                session = None
+            else:
+                session = ServerConfigurator.from_state(state, self.catalog, self.source)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            session = None
+        if session is None:
+            self._stats.expired += 1
+            self._ended.append(token)
+            return None
+        self.store.delete(token)
+        self._stats.restored += 1
+        return session
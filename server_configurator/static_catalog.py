@@ -0,0 +1,238 @@
+"""
+Static catalog build for the web pages
+Content-hashed JSON shards per category and per server, precompressed, with a manifest
+
+Output directory:
+    manifest.json                              shard names by category/language and server (revalidated)
+    components.<type>.<language>.<hash>.json   components of one category (export_writer.component_json)
+    server.<id>.<hash>.json                    components that cannot go with one server, ids by category
+    *.json.gz, *.json.br                       precompressed variants (.br if the brotli package is installed)
+
+A shard name changes whenever its content does, so shards can be served with
+"Cache-Control: public, max-age=31536000, immutable"; only manifest.json is
+revalidated. A page fetches the manifest, then only the shard it shows.
+Unchanged shards are not rewritten. Shards of the previous manifest are kept
+for pages that loaded it before the build, older ones are removed.
+
+Usage: python static_catalog.py <output dir> [catalog_dir] [--languages ru,en]
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from catalog import Catalog
+from configurator import ServerConfigurator
+from data_models import ComponentType
+from export_writer import component_json
+from translations import LANGUAGES, localizer
+
+try:
+    import brotli
+except ImportError:  # optional, only .gz variants are written without it
+    brotli = None
+
+MANIFEST = "manifest.json"
+HASH_LENGTH = 12          # hex digits of the content hash in shard names
+MIN_COMPRESS_SIZE = 256   # smaller shards are not worth a compressed variant
+
+
+@dataclass
+class BuildStats:
+    """Counters of a static catalog build"""
+    shards: int = 0
+    written: int = 0      # new or changed shards
+    unchanged: int = 0    # shards already present with the same content
+    removed: int = 0      # stale files deleted
+    bytes: int = 0        # uncompressed shard sizes
+    gzip_bytes: int = 0
+    brotli_bytes: int = 0
+    seconds: float = 0.0
+    
+    def format(self) -> str:
+        """One-line summary"""
+        brotli_part = f", br {self.brotli_bytes / 1024:.1f} KiB" if self.brotli_bytes else ""
+        return (f"{self.shards} shards ({self.written} written, {self.unchanged} unchanged, "
+                f"{self.removed} stale files removed): {self.bytes / 1024:.1f} KiB, "
+                f"gzip {self.gzip_bytes / 1024:.1f} KiB{brotli_part} in {self.seconds:.3f}s")
+
+
+def _encode(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _write_file(path: str, content: bytes) -> None:
+    with open(path + ".tmp", "wb") as stream:
+        stream.write(content)
+    os.replace(path + ".tmp", path)
+
+
+class _ShardWriter:
+    """Writes content-addressed shards with their compressed variants into one directory"""
+    
+    def __init__(self, directory: str, stats: BuildStats, compress: bool):
+        self.directory = directory
+        self.stats = stats
+        self.compress = compress
+        self.names: List[str] = []  # every file of this build
+    
+    def write(self, prefix: str, value) -> str:
+        """Write a shard unless present, returns its file name"""
+        content = _encode(value)
+        digest = hashlib.blake2b(content, digest_size=HASH_LENGTH // 2).hexdigest()
+        name = f"{prefix}.{digest}.json"
+        variants = [(name, lambda: content)] + (compressed_variants(name, content) if self.compress else [])
+        
+        self.stats.shards += 1
+        self.stats.bytes += len(content)
+        present = all(os.path.exists(os.path.join(self.directory, variant)) for variant, _ in variants)
+        for variant, make in variants:
+            path = os.path.join(self.directory, variant)
+            data = make() if not present else None
+            if data is not None:
+                _write_file(path, data)
+            size = len(data) if data is not None else os.path.getsize(path)
+            if variant.endswith(".gz"):
+                self.stats.gzip_bytes += size
+            elif variant.endswith(".br"):
+                self.stats.brotli_bytes += size
+            self.names.append(variant)
+        if present:
+            self.stats.unchanged += 1
+        else:
+            self.stats.written += 1
+        return name
+
+
+def compressed_variants(name: str, content: bytes) -> List[Tuple[str, Callable[[], bytes]]]:
+    """(file name, compress function) of the precompressed variants of a file"""
+    if len(content) < MIN_COMPRESS_SIZE:
+        return []
+    # mtime=0 keeps the .gz bytes a function of the content
+    variants = [(name + ".gz", lambda: gzip.compress(content, 9, mtime=0))]
+    if brotli is not None:
+        variants.append((name + ".br", lambda: brotli.compress(content, quality=11)))
+    return variants
+
+
+def _manifest_shards(manifest: Dict) -> List[str]:
+    """Shard names listed in a manifest"""
+    names = list(manifest.get("servers", {}).values())
+    for by_language in manifest.get("categories", {}).values():
+        names.extend(by_language.values())
+    return names
+
+
+def server_exclusions(catalog: Catalog, server_id: str,
+                      component_types: Sequence[ComponentType]) -> Dict[str, List[str]]:
+    """
+    Ids of components that cannot be added to a configuration holding only this server, by category
+    Stored instead of the compatible ones: constraints are sparse, so this list is the short one
+    Raises ValueError if the server cannot be configured on its own
+    """
+    configurator = ServerConfigurator(catalog=catalog)
+    added, errors = configurator.add_component(server_id)
+    if not added:
+        raise ValueError(f"Server {server_id} cannot be configured: {'; '.join(errors)}")
+    exclusions = {}
+    for component_type in component_types:
+        if component_type == ComponentType.SERVER:
+            continue
+        available = {component.id for component in configurator.get_available_components(component_type)}
+        excluded = [component.id for component in catalog.data.get_components_by_type(component_type)
+                    if component.id not in available]
+        if excluded:
+            exclusions[component_type.value] = excluded
+    return exclusions
+
+
+def build_static_catalog(output: str, catalog: Optional[Catalog] = None, languages: Sequence[str] = ("ru", "en"),
+                         compress: bool = True, prune: bool = True) -> Tuple[Dict, BuildStats]:
+    """Build shards and manifest into output, returns (manifest, stats)"""
+    start = time.perf_counter()
+    for language in languages:
+        if language not in LANGUAGES:
+            raise ValueError(f"Unknown language: {language}")
+    catalog = catalog or Catalog.load()
+    data = catalog.data
+    os.makedirs(output, exist_ok=True)
+    try:
+        with open(os.path.join(output, MANIFEST), "r", encoding="utf-8") as stream:
+            previous = _manifest_shards(json.load(stream))
+    except (FileNotFoundError, ValueError):
+        previous = []
+    stats = BuildStats()
+    writer = _ShardWriter(output, stats, compress)
+    
+    categories: Dict[str, Dict[str, str]] = {}
+    component_types = []
+    for component_type in ComponentType:
+        components = data.get_components_by_type(component_type)
+        if not components:
+            continue
+        component_types.append(component_type)
+        categories[component_type.value] = {
+            language: writer.write(
+                f"components.{component_type.value}.{language}",
+                [component_json(view) for view in localizer(language).components(components, data.version)]
+            )
+            for language in languages
+        }
+    servers = {
+        server.id: writer.write(f"server.{server.id}", {
+            "server": server.id, "excluded": server_exclusions(catalog, server.id, component_types)
+        })
+        for server in data.get_components_by_type(ComponentType.SERVER)
+    }
+    
+    manifest = {
+        "catalog_version": data.catalog_version,
+        "languages": list(languages),
+        "encodings": (["gzip"] + (["br"] if brotli is not None else [])) if compress else [],
+        "categories": categories,
+        "servers": servers,
+    }
+    # Shards first, manifest last: a page never sees a manifest naming a missing shard
+    content = _encode(manifest)
+    variants = compressed_variants(MANIFEST, content) if compress else []
+    for name, make in variants:
+        _write_file(os.path.join(output, name), make())
+    for suffix in (".gz", ".br"):  # a stale variant would be served instead of the new manifest
+        if MANIFEST + suffix not in dict(variants) and os.path.exists(os.path.join(output, MANIFEST + suffix)):
+            os.remove(os.path.join(output, MANIFEST + suffix))
+    _write_file(os.path.join(output, MANIFEST), content)
+    
+    if prune:
+        keep = set(writer.names) | {MANIFEST} | {name + suffix for name in previous for suffix in ("", ".gz", ".br")}
+        for file_name in os.listdir(output):
+            if file_name not in keep and file_name.startswith(("components.", "server.")) and ".json" in file_name:
+                os.remove(os.path.join(output, file_name))
+                stats.removed += 1
+    stats.seconds = time.perf_counter() - start
+    return manifest, stats
+
+
+def main(argv: List[str]) -> None:
+    """Build the static catalog from sample data or a catalog directory"""
+    paths, options = [], {}
+    arguments = iter(argv)
+    for argument in arguments:
+        if argument.startswith("--"):
+            options[argument] = next(arguments, None)
+        else:
+            paths.append(argument)
+    if not paths:
+        print(__doc__)
+        return
+    catalog = Catalog.load(catalog_dir=paths[1]) if len(paths) > 1 else None
+    _, stats = build_static_catalog(paths[0], catalog, options.get("--languages", "ru,en").split(","))
+    print(stats.format())
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
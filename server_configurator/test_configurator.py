@@ -2,9 +2,32 @@
 Tests for server configurator
 """
 
+import os
+
 import pytest
 from configurator import ServerConfigurator
-from data_models import ComponentType
+from catalog import Catalog, CatalogPublisher, shared_publisher
+from catalog_reload import CatalogWatcher
+from price_feed import FeedError, PriceFeed, parse_delta
+from translations import CatalogLocalizer, compile_translations, localize, localizer, set_language, t
+from export_writer import iter_export, write_export
+from bulk_quotes import QuoteError, generate_quotes, read_states
+from currency import DEFAULT_RATES, CurrencyError, current_rates, format_price, set_rates
+from sessions import FileSessionStore, SessionManager
+from api_server import ApiServer, load_test, read_response
+from change_events import CATALOG_TOPIC, EventHub, session_topic
+from static_catalog import build_static_catalog, server_exclusions
+from config_store import ConfigurationStore, SavedConfiguration, configuration_fingerprint
+from data_models import Component, ComponentAttribute, ComponentType, CompatibilityRule, CompatibilityType
+from sample_data import create_sample_data, create_compatibility_matrix
+from rule_analyzer import analyze_rules
+from compatibility_matrix import CompatibilityMatrix
+from catalog_snapshot import SharedSnapshot, SnapshotError, open_snapshot, write_snapshot
+from catalog_db import CatalogDatabaseError, open_catalog_db, write_catalog_db
+from catalog_loader import CatalogLoadError, dump_catalog, load_catalog, load_catalog_dir
+from conditions import ConditionContext, ConditionError, compile_condition
+from vendor_import import (VendorImportError, component_type_for, dedup_key, import_vendor_files,
+                           merge_component, normalize_manufacturer, parse_price)
 
 
 class TestServerConfigurator:
@@ -174,6 +197,1851 @@ class TestServerConfigurator:
         assert "intel_xeon_e5620" in compat_info["incompatible_with"]
 
 
+def _shared_snapshot_worker(path):
+    """Worker process: open shared snapshot through the configurator"""
+    configurator = ServerConfigurator(snapshot_path=path)
+    configurator.add_component("hp_ml350g4p")
+    return (len(configurator.data.components), configurator.get_component_details("intel_xeon_e5620").name,
+            configurator.add_component("intel_xeon_e5620")[0])
+
+
+class TestSharedCatalog:
+    """Test cases for the process-wide shared catalog"""
+    
+    def test_sessions_share_one_catalog(self):
+        """Test sessions reuse the catalog but keep separate configurations"""
+        first, second = ServerConfigurator(), ServerConfigurator()
+        assert first.data is second.data
+        assert first.compatibility_matrix is second.compatibility_matrix
+        assert ServerConfigurator(optimize_rules=True).data is not first.data
+        
+        first.add_component("hp_ml350g4p")
+        assert second.current_configuration == {}
+        assert not hasattr(first, "__dict__")
+    
+    def test_shared_catalog_is_frozen(self):
+        """Test shared catalog rejects changes, private copies accept them"""
+        configurator = ServerConfigurator()
+        extra = Component("extra_psu", "Extra PSU", ComponentType.POWER_SUPPLY, "X", "PSU", [], 10.0)
+        with pytest.raises(TypeError):
+            configurator.data.add_component(extra)
+        with pytest.raises(TypeError):
+            configurator.data.add_compatibility_rule(CompatibilityRule("r", CompatibilityType.REQUIRED, "extra_psu"))
+        with pytest.raises(TypeError):
+            configurator.compatibility_matrix.add_pairs([("hp_ml350g4p", "intel_xeon_e5620")])
+        assert "extra_psu" not in configurator.data.components
+        
+        private = ServerConfigurator(catalog=Catalog.load(freeze=False))
+        private.data.add_component(extra)
+        assert private.add_component("extra_psu")[0]
+        assert "extra_psu" not in configurator.data.components
+    
+    def test_copy_on_write_publish(self):
+        """Test published updates reach sessions without touching the old catalog"""
+        publisher = CatalogPublisher(Catalog.load())
+        old = publisher.current
+        session = ServerConfigurator(source=publisher)
+        pinned = ServerConfigurator(catalog=old)
+        extra = Component("extra_psu", "Extra PSU", ComponentType.POWER_SUPPLY, "X", "PSU", [], 10.0)
+        
+        def change(data, matrix):
+            data.add_component(extra)
+            matrix.set_row("extra_psu", ["hp_ml350g4p"])
+        
+        new = publisher.update(change)
+        assert publisher.current is new and new.data.frozen
+        assert "extra_psu" not in old.data.components and "extra_psu" not in old.compatibility_matrix
+        assert old.data.get_components_by_type(ComponentType.POWER_SUPPLY) != \
+            new.data.get_components_by_type(ComponentType.POWER_SUPPLY)
+        
+        assert session.add_component("extra_psu")[0]
+        assert not pinned.add_component("extra_psu")[0]
+        assert not session.add_component("dell_poweredge_r710")[0]
+    
+    def test_concurrent_sessions_and_updates(self):
+        """Test threads sharing sessions while the catalog is republished"""
+        import threading
+        
+        publisher = CatalogPublisher(Catalog.load())
+        sessions = [ServerConfigurator(source=publisher) for _ in range(4)]
+        failures = []
+        
+        def worker(session):
+            try:
+                for _ in range(200):
+                    session.add_component("hp_ml350g4p")
+                    session.get_available_components(ComponentType.PROCESSOR)
+                    session.get_current_configuration()
+                    session.remove_component("hp_ml350g4p")
+            except Exception as e:  # collected for the main thread
+                failures.append(e)
+        
+        def writer():
+            for i in range(50):
+                component = Component(f"psu_{i}", f"PSU {i}", ComponentType.POWER_SUPPLY, "X", "PSU", [], 1.0)
+                publisher.update(lambda data, matrix: data.add_component(component))
+        
+        threads = [threading.Thread(target=worker, args=(sessions[i % 4],)) for i in range(8)]
+        threads.append(threading.Thread(target=writer))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert failures == []
+        assert all(session.get_state()["components"] == [] for session in sessions)
+        assert len(publisher.current.data.components) == 67
+
+
+class TestSessionManager:
+    """Test cases for per-visitor configurator sessions"""
+    
+    def setup_method(self):
+        """Setup manager with a controllable clock"""
+        self.now = 1000.0
+        self.clock = lambda: self.now
+    
+    def test_sessions_by_token(self):
+        """Test sessions are independent and found by token"""
+        manager = SessionManager(clock=self.clock)
+        first_token, first = manager.create()
+        second_token, second = manager.create()
+        
+        first.add_component("hp_ml350g4p")
+        assert manager.get(first_token) is first
+        assert manager.get(second_token).current_configuration == {}
+        assert manager.get("unknown") is None
+        assert manager.remove(second_token)
+        assert manager.get(second_token) is None
+        
+        stats = manager.stats()
+        assert (stats.live, stats.created, stats.hits, stats.misses) == (1, 2, 2, 2)
+    
+    def test_ttl_expiry(self):
+        """Test idle sessions expire, active ones stay"""
+        manager = SessionManager(ttl=60, clock=self.clock)
+        idle, _ = manager.create()
+        active, _ = manager.create()
+        self.now += 50
+        manager.get(active)
+        self.now += 20
+        
+        assert manager.expire() == 1
+        assert idle not in manager and active in manager
+        self.now += 61
+        assert manager.get(active) is None
+        assert manager.stats().expired == 2
+    
+    def test_lru_eviction_spills_to_store(self, tmp_path):
+        """Test least recently used sessions are spilled and restored"""
+        manager = SessionManager(max_sessions=2, ttl=600, store=FileSessionStore(str(tmp_path)), clock=self.clock)
+        first_token, first = manager.create()
+        first.add_component("hp_ml350g4p")
+        first.clear_configuration()
+        first.add_component("dell_poweredge_r710")
+        second_token, _ = manager.create()
+        manager.get(first_token)
+        third_token, _ = manager.create()
+        assert len(manager) == 2 and second_token not in manager
+        
+        assert manager.get(second_token).current_configuration == {}  # evicts first
+        restored = manager.get(first_token)  # evicts third
+        assert restored is not first
+        assert restored.get_state() == {"configuration_id": 2, "language": "ru", "components": ["dell_poweredge_r710"]}
+        
+        stats = manager.stats()
+        assert (stats.live, stats.evicted, stats.spilled, stats.restored) == (2, 3, 3, 2)
+        
+        self.now += 601
+        assert manager.get(third_token) is None
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_listeners_see_ended_sessions(self):
+        """Test removed, expired and evicted sessions are reported to listeners"""
+        manager = SessionManager(max_sessions=2, ttl=60, clock=self.clock)
+        ended = []
+        manager.add_listener(ended.append)
+        first, _ = manager.create()
+        second, _ = manager.create()
+        third, _ = manager.create()  # evicts first, nowhere to spill it
+        assert manager.remove(second) and not manager.remove(second)
+        self.now += 61
+        assert manager.expire() == 1
+        assert ended == [first, second, third]
+    
+    def test_expire_sweeps_store(self, tmp_path):
+        """Test expire() drops spilled sessions idle for longer than ttl, tokens are matched whole"""
+        manager = SessionManager(max_sessions=1, ttl=600, store=FileSessionStore(str(tmp_path)), clock=self.clock)
+        old_token, _ = manager.create()
+        self.now += 300
+        recent_token, _ = manager.create()  # spills old_token
+        self.now += 1                       # the live session is not idle yet
+        manager.create()                    # spills recent_token
+        self.now += 400
+        
+        assert manager.expire() == 1
+        assert sorted(path.name for path in tmp_path.iterdir()) == [f"{recent_token}.json"]
+        assert manager.get(recent_token + "\n") is None and not manager.remove(recent_token + "\n")
+        assert manager.get(recent_token) is not None
+    
+    def test_unreadable_spilled_state(self, tmp_path):
+        """Test states that cannot be restored count as expired and stay in the store"""
+        import json
+        
+        manager = SessionManager(ttl=600, store=FileSessionStore(str(tmp_path)), clock=self.clock)
+        ended = []
+        manager.add_listener(ended.append)
+        states = {"notadict01": [1, 2], "badlist001": {"components": 5}, "badclock01": {"last_access": "soon"}}
+        for token, state in states.items():
+            (tmp_path / f"{token}.json").write_text(json.dumps(state))
+        
+        for token in states:
+            assert manager.get(token) is None
+        stats = manager.stats()
+        assert (stats.expired, stats.restored, stats.misses) == (3, 0, 3)
+        assert ended == list(states)
+        assert sorted(path.name for path in tmp_path.iterdir()) == sorted(f"{token}.json" for token in states)
+
+class TestCatalogReload:
+    """Test cases for hot catalog reload"""
+    
+    def setup_method(self):
+        """Setup publisher and a modified catalog to reload"""
+        import dataclasses
+        
+        self.publisher = CatalogPublisher(Catalog.load())
+        self.new = Catalog.load(freeze=False)
+        components = self.new.data.components
+        components["hp_ml350g4p"] = dataclasses.replace(components["hp_ml350g4p"], price=999.0)
+        self.replace = dataclasses.replace
+    
+    def test_value_changes_keep_validator_caches(self):
+        """Test price-only reload patches components and keeps compiled rules"""
+        live = self.publisher.current
+        validate = live.data.compile_rules()
+        
+        diff = self.publisher.reload(self.new)
+        assert (diff.changed, diff.added, diff.removed, diff.structural) == (["hp_ml350g4p"], [], [], False)
+        current = self.publisher.current
+        assert current.data.components["hp_ml350g4p"].price == 999.0
+        assert live.data.components["hp_ml350g4p"].price != 999.0
+        assert current.data.compile_rules() is validate
+        assert current.compatibility_matrix._indices is live.compatibility_matrix._indices
+        assert not self.publisher.reload(self.new)
+        assert self.publisher.current is current
+    
+    def test_structural_changes(self):
+        """Test added/removed components, rules and matrix rows are patched"""
+        data = self.new.data
+        del data.components["wd_1tb_sata"]
+        data.add_component(self.replace(data.components["hp_460w_psu"], id="hp_1000w_psu", price=300.0))
+        data.compatibility_rules = data.compatibility_rules[:-1]
+        self.new.compatibility_matrix.set_row("hp_460w_psu", [])
+        live_version = self.publisher.current.data.version
+        
+        diff = self.publisher.reload(self.new)
+        assert diff.added == ["hp_1000w_psu"] and diff.removed == ["wd_1tb_sata"]
+        assert diff.rules_changed and "hp_460w_psu" in diff.matrix_rows
+        
+        current = self.publisher.current
+        assert current.data.version > live_version
+        assert "wd_1tb_sata" not in [c.id for c in current.data.get_components_by_type(ComponentType.STORAGE)]
+        assert "hp_1000w_psu" in [c.id for c in current.data.get_components_by_type(ComponentType.POWER_SUPPLY)]
+        assert current.data.compatibility_rules == data.compatibility_rules
+        for component_id in self.new.compatibility_matrix.constrained_ids():
+            assert sorted(current.compatibility_matrix.row(component_id)) == \
+                sorted(self.new.compatibility_matrix.row(component_id))
+        assert not current.compatibility_matrix.compatible("hp_460w_psu", "hp_ml350g4p")
+    
+    def test_sessions_flag_missing_components(self):
+        """Test in-flight sessions keep working and flag removed components"""
+        session = ServerConfigurator(source=self.publisher)
+        session.add_component("hp_ml350g4p")
+        session.add_component("wd_1tb_sata")
+        del self.new.data.components["wd_1tb_sata"]
+        self.publisher.reload(self.new)
+        
+        configuration = session.get_current_configuration()
+        assert [c.id for c in session.missing_components] == ["wd_1tb_sata"]
+        assert configuration.total_price == 999.0
+        session.clear_configuration()
+        assert session.missing_components == []
+    
+    def test_watcher_reloads_changed_files(self, tmp_path):
+        """Test file watcher reloads catalog directory after changes"""
+        dump_catalog(create_sample_data(), create_compatibility_matrix(), str(tmp_path))
+        publisher = shared_publisher(catalog_dir=str(tmp_path))
+        watcher = CatalogWatcher(publisher, publisher.paths, interval=3600)
+        assert watcher.check() is None
+        
+        dump_catalog(self.new.data, create_compatibility_matrix(), str(tmp_path))
+        for path in tmp_path.iterdir():
+            os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+        diff = watcher.check()
+        assert diff.changed == ["hp_ml350g4p"] and watcher.reloads == 1
+        assert ServerConfigurator(catalog_dir=str(tmp_path)).data.components["hp_ml350g4p"].price == 999.0
+
+
+
+class TestPriceFeed:
+    """Test cases for in-place price and availability updates"""
+    
+    def setup_method(self):
+        """Setup publisher with a private catalog"""
+        self.publisher = CatalogPublisher(Catalog.load())
+        self.data = self.publisher.current.data
+    
+    def test_apply_updates_in_place(self):
+        """Test updates change values, keep caches and bump catalog version once"""
+        validate = self.data.compile_rules()
+        version, catalog_version = self.data.version, self.data.catalog_version
+        session = ServerConfigurator(source=self.publisher)
+        session.add_component("hp_ml350g4p")
+        
+        changed, unknown = self.publisher.apply_updates([
+            ("hp_ml350g4p", 999.0, None), ("wd_1tb_sata", None, False), ("no_such_part", 1.0, None),
+            ("intel_xeon_3_0_604", self.data.components["intel_xeon_3_0_604"].price, True)
+        ])
+        assert (changed, unknown) == (["hp_ml350g4p", "wd_1tb_sata"], ["no_such_part"])
+        assert self.publisher.current.data is self.data
+        assert self.data.version == version and self.data.catalog_version == catalog_version + 1
+        assert self.data.compile_rules() is validate
+        assert session.get_current_configuration().total_price == 999.0
+        assert self.publisher.apply_updates([("hp_ml350g4p", 999.0, True)]) == ([], [])
+        assert self.data.catalog_version == catalog_version + 1
+    
+    def test_availability_view_invalidated_per_type(self):
+        """Test in-stock views are rebuilt only for types whose availability changed"""
+        storage = self.data.get_available_components_by_type(ComponentType.STORAGE)
+        assert "wd_1tb_sata" in [c.id for c in storage]
+        self.data.get_available_components_by_type(ComponentType.SERVER)
+        servers = self.data._available[ComponentType.SERVER]
+        
+        self.publisher.apply_updates([("wd_1tb_sata", None, False), ("hp_ml350g4p", 1.0, None)])
+        self.data.get_available_components_by_type(ComponentType.SERVER)
+        assert self.data._available[ComponentType.SERVER] is servers
+        assert "wd_1tb_sata" not in [c.id for c in self.data.get_available_components_by_type(ComponentType.STORAGE)]
+        session = ServerConfigurator(source=self.publisher)
+        assert "wd_1tb_sata" not in [c.id for c in session.get_available_components(ComponentType.STORAGE, True)]
+        assert "wd_1tb_sata" in [c.id for c in session.get_available_components(ComponentType.STORAGE)]
+    
+    def test_catalog_version_monotonic_across_reloads(self):
+        """Test published and reloaded catalogs never go back in catalog_version"""
+        self.publisher.apply_updates([("hp_ml350g4p", 999.0, None)])
+        versions = [self.data.catalog_version]
+        self.publisher.update(lambda data, matrix: None)
+        versions.append(self.publisher.current.data.catalog_version)
+        self.publisher.reload(Catalog.load(freeze=False))
+        versions.append(self.publisher.current.data.catalog_version)
+        for _ in range(5):
+            self.publisher.apply_updates([("hp_ml350g4p", 998.0 - len(versions), None)])
+            versions.append(self.publisher.current.data.catalog_version)
+        self.publisher.publish(Catalog.load(freeze=False))
+        versions.append(self.publisher.current.data.catalog_version)
+        assert versions == sorted(set(versions))
+    
+    def test_feed_batches_and_coalesces(self):
+        """Test deltas are coalesced per component and applied per batch"""
+        feed = PriceFeed(self.publisher, batch_size=2, max_delay=3600)
+        feed.submit("hp_ml350g4p", price=10.0)
+        feed.submit("hp_ml350g4p", availability=False)
+        assert self.data.components["hp_ml350g4p"].price != 10.0
+        feed.submit("wd_1tb_sata", price=20.0)
+        component = self.data.components["hp_ml350g4p"]
+        assert (component.price, component.availability) == (10.0, False)
+        
+        queued = feed.submit_records([{"id": "wd_1tb_sata", "price": 30}, {"id": "x", "price": "cheap"}, {"price": 1}])
+        feed.flush()
+        stats = feed.stats()
+        assert queued == 1 and self.data.components["wd_1tb_sata"].price == 30.0
+        assert (stats.received, stats.coalesced, stats.batches, stats.changed, stats.rejected) == (6, 1, 2, 3, 2)
+    
+    def test_feed_reads_ndjson(self):
+        """Test NDJSON feed with a malformed line and unknown component"""
+        import io
+        
+        feed = PriceFeed(self.publisher)
+        stream = io.StringIO('{"id": "hp_ml350g4p", "availability": false}\nnot json\n\n{"id": "nope", "price": 1}\n')
+        assert feed.read_ndjson(stream) == 2
+        feed.stop()
+        stats = feed.stats()
+        assert not self.data.components["hp_ml350g4p"].availability
+        assert (stats.unknown, stats.rejected, len(stats.errors)) == (1, 1, 1)
+    
+    def test_parse_delta(self):
+        """Test feed record validation"""
+        assert parse_delta({"component_id": "a", "price": 5}) == ("a", 5.0, None)
+        for record in ({"id": "a"}, {"id": "a", "price": -1}, {"id": "a", "availability": "yes"}, ["a"]):
+            with pytest.raises(FeedError):
+                parse_delta(record)
+
+
+class TestCurrency:
+    """Test cases for multi-currency prices"""
+    
+    def setup_method(self):
+        """Setup session on a private catalog"""
+        self.publisher = CatalogPublisher(Catalog.load())
+        self.configurator = ServerConfigurator(source=self.publisher)
+        self.configurator.add_component("hp_ml350g4p")
+        self.configurator.add_component("intel_xeon_3_0_604")
+    
+    def teardown_method(self):
+        """Restore default rates"""
+        set_rates(DEFAULT_RATES)
+    
+    def test_totals_in_any_currency(self):
+        """Test totals are sums of per-component prices rounded to cents"""
+        configuration = self.configurator.get_current_configuration()
+        assert (configuration.total_price, configuration.currency) == (1650.0, "USD")
+        rates = current_rates()
+        for currency in ("BYN", "rub", "EUR", "USD"):
+            configuration = self.configurator.get_current_configuration(currency)
+            expected = rates.convert(1500.0, currency) + rates.convert(150.0, currency)
+            assert configuration.total_price == round(expected, 2)
+            assert configuration.currency == currency.upper()
+        with pytest.raises(CurrencyError):
+            self.configurator.get_current_configuration("GBP")
+    
+    def test_rate_change_refreshes_columns(self):
+        """Test new rates refresh the same columns in place, catalog changes rebuild them"""
+        data = self.publisher.current.data
+        columns = data.price_columns()
+        set_rates({"BYN": 3.0, "RUB": 90.0, "EUR": 0.9})
+        assert data.price_columns() is columns
+        assert self.configurator.get_current_configuration("BYN").total_price == 4950.0
+        
+        self.publisher.apply_updates([("hp_ml350g4p", 2000.0, None)])
+        assert data.price_columns() is columns
+        assert columns.price("hp_ml350g4p", "EUR") == 1800.0
+        self.publisher.update(lambda data, matrix: None)
+        assert self.publisher.current.data.price_columns() is not columns
+    
+    def test_export_in_currency(self):
+        """Test JSON and CSV exports carry converted prices and the currency"""
+        import json
+        
+        exported = json.loads(self.configurator.export_configuration("json", "EUR"))
+        assert exported["currency"] == "EUR"
+        assert exported["components"]["server"][0]["price"] == current_rates().convert(1500.0, "EUR")
+        assert json.loads(self.configurator.export_configuration())["currency"] == "USD"
+        assert "Price (BYN)" in self.configurator.export_configuration("csv", "BYN")
+    
+    def test_rate_table_validation(self):
+        """Test rate tables need every currency and base rate 1"""
+        for rates in ({"BYN": 3.0, "RUB": 90.0}, {"BYN": 3.0, "RUB": 90.0, "EUR": 0}, dict(DEFAULT_RATES, USD=2.0)):
+            with pytest.raises(CurrencyError):
+                set_rates(rates)
+        assert format_price(1500, "BYN") == "1500.00 Br" and format_price(None) == "$0.00"
+
+
+class TestCatalogLocalization:
+    """Test cases for the per-language catalog overlay"""
+    
+    def setup_method(self):
+        """Setup publisher with a private catalog"""
+        self.publisher = CatalogPublisher(Catalog.load())
+        self.components = self.publisher.current.data.components
+    
+    # Names and attributes of the former Russian sample dataset (sample_data_ru.py)
+    RUSSIAN_DATASET = {
+        "hp_ml350g4p": ("HP ProLiant ML350 G4p", [
+            ("Форм-фактор", "4U Стойка", None), ("Макс. процессоров", "2", None), ("Слотов памяти", "8", None),
+            ("Макс. памяти", "32", "ГБ"), ("Отсеков для дисков", "6", None), ("Слотов БП", "2", None),
+            ("Сокет", "Socket 604", None), ("Чипсет", "Intel E7520", None)]),
+        "intel_xeon_x5670": ("Intel Xeon X5670", [
+            ("Частота", "2.93", "ГГц"), ("Ядер", "6", None), ("Сокет", "1366", None), ("Кэш", "12", "МБ"),
+            ("TDP", "95", "Вт")]),
+        "kingston_1gb_ddr2_400": ("Kingston 1 ГБ DDR2-400", [
+            ("Объем", "1", "ГБ"), ("Тип", "DDR2", None), ("Частота", "400", "МГц"), ("Форм-фактор", "DIMM", None),
+            ("Напряжение", "1.8", "В")]),
+        "seagate_500gb_sata": ("Seagate 500 ГБ SATA", [
+            ("Объем", "500", "ГБ"), ("Интерфейс", "SATA", None), ("Скорость", "7200", "об/мин"),
+            ("Форм-фактор", '3.5"', None), ("Кэш", "16", "МБ")]),
+        "intel_ssd_240gb": ("Intel SSD 240 ГБ SATA", [
+            ("Объем", "240", "ГБ"), ("Интерфейс", "SATA 3.0", None), ("Тип", "SSD", None),
+            ("Форм-фактор", '2.5"', None), ("Скорость чтения", "550", "МБ/с")]),
+        "hp_460w_psu": ("HP Блок питания 460 Вт", [
+            ("Мощность", "460", "Вт"), ("КПД", "80+", None), ("Форм-фактор", "Стандартный", None),
+            ("Модульный", "Нет", None)]),
+    }
+    
+    def test_overlay_matches_russian_dataset(self):
+        """Test the overlay renders what the former Russian dataset held, units included"""
+        for component_id, (name, attributes) in self.RUSSIAN_DATASET.items():
+            view = localize(self.components[component_id], "ru")
+            assert (view.name, [(a.name, a.value, a.unit) for a in view.attributes]) == (name, attributes)
+        english = localize(self.components["hp_ml350g4p"], "en").attributes[3]
+        assert (english.name, english.unit) == ("Max Memory (GB)", None)
+    
+    def test_overlay_strings(self):
+        """Test names, descriptions, attributes and units come from the overlay"""
+        view = localize(self.components["hp_460w_psu"], "ru")
+        assert view.name == "HP Блок питания 460 Вт"
+        assert view.description == "Блок питания для серверов HP"
+        assert [(a.name, a.value, a.unit) for a in view.attributes][:3] == [
+            ("Мощность", "460", "Вт"), ("КПД", "80+", None), ("Форм-фактор", "Стандартный", None)
+        ]
+        assert (view.id, view.price, view.component_type) == ("hp_460w_psu", 120.0, ComponentType.POWER_SUPPLY)
+        
+        server = localize(self.components["hp_ml350g4p"], "ru")
+        assert server.name == "HP ProLiant ML350 G4p"  # not in overlay: catalog string
+        assert self.components["hp_460w_psu"].name == "HP 460W Power Supply"
+        assert localize(self.components["intel_xeon_3_0_604"], "en").attributes[0].name == "Frequency"
+    
+    def test_views_cached_per_language(self):
+        """Test views are built once per component and follow catalog changes"""
+        import dataclasses
+        
+        ru = CatalogLocalizer("ru")
+        component = self.components["wd_1tb_sata"]
+        view = ru.component(component)
+        assert ru.component(component) is view
+        assert localizer("ru") is localizer("ru") and localizer("ru") is not localizer("en")
+        
+        self.publisher.apply_updates([("wd_1tb_sata", 90.0, False)])
+        assert (view.price, view.availability) == (90.0, False)
+        assert ru.component(dataclasses.replace(component, name="WD 1TB")) is not view
+        
+        # In-place edits (vendor import) show up once the catalog version moves on
+        data = create_sample_data()
+        ssd = data.components["intel_ssd_240gb"]
+        view = ru.component(ssd, data.version)
+        assert view.name == "Intel SSD 240 ГБ SATA" and view.attributes[-1].unit == "МБ/с"
+        merge_component(ssd, dataclasses.replace(ssd, attributes=[ComponentAttribute("capacity", "480", "GB")]))
+        data.version += 1
+        assert ru.component(ssd, data.version).attributes[0].value == "480"
+    
+    def test_compiled_tables_merge_fallbacks(self):
+        """Test compiled tables are shared, immutable and fall back to English once"""
+        import translations
+        
+        ru = compile_translations("ru")
+        assert compile_translations("ru") is ru
+        with pytest.raises(AttributeError):
+            ru.language = "en"
+        with pytest.raises(TypeError):
+            ru.table["price"] = "x"
+        
+        translations.RUSSIAN.pop("attr_socket")
+        translations._compiled.pop("ru")
+        try:
+            patched = compile_translations("ru")
+            assert patched.get("attr_socket") == "Socket" and patched["no_such_key"] == "no_such_key"
+        finally:
+            translations.RUSSIAN["attr_socket"] = "Сокет"
+            translations._compiled["ru"] = ru
+        assert ru.translate_many(["price", "total_price", "missing"]) == ["Цена", "Общая стоимость", "missing"]
+        assert compile_translations("de").get("price") == "Price"
+        assert compile_translations("de") is compile_translations("en") and "de" not in translations._compiled
+        assert ru.get("no_such_key") is None and ru.get("no_such_key", "x") == "x" and t("no_such_key") == "no_such_key"
+    
+    def test_sessions_render_in_own_language(self):
+        """Test sessions switch language independently of each other and of t()"""
+        russian = ServerConfigurator(source=self.publisher)
+        english = ServerConfigurator(source=self.publisher, language="en")
+        english.add_component("hp_460w_psu")
+        assert russian.translations.get("price") == "Цена" and english.translations.get("price") == "Price"
+        assert [c.name for c in russian.translations.components(
+            english.get_current_configuration().components[ComponentType.POWER_SUPPLY])] == ["HP Блок питания 460 Вт"]
+        
+        set_language("en")
+        try:
+            assert t("price") == "Price" and russian.language == "ru"
+        finally:
+            set_language("ru")
+        english.set_language("ru")
+        assert english.language == "ru"
+        with pytest.raises(ValueError):
+            english.set_language("de")
+        assert english.language == "ru"
+        restored = ServerConfigurator.from_state(english.get_state(), source=self.publisher)
+        assert restored.translations is compile_translations("ru")
+
+
+class TestExportWriter:
+    """Test cases for streaming configuration export"""
+    
+    def setup_method(self):
+        """Setup configurator with a few components"""
+        self.configurator = ServerConfigurator(source=CatalogPublisher(Catalog.load()))
+        for component_id in ("hp_ml350g4p", "intel_xeon_3_0_604", "kingston_1gb_ddr2_400"):
+            self.configurator.add_component(component_id)
+    
+    def test_json_matches_json_dumps(self):
+        """Test streamed JSON equals json.dumps output, compact JSON parses the same"""
+        import json
+        
+        pretty = self.configurator.export_configuration("json")
+        document = json.loads(pretty)
+        assert pretty == json.dumps(document, indent=2)
+        compact = self.configurator.export_configuration("json", compact=True)
+        assert json.loads(compact) == document and "\n" not in compact
+        empty = ServerConfigurator(source=CatalogPublisher(Catalog.load())).get_current_configuration()
+        assert "".join(iter_export(empty)) == json.dumps(json.loads("".join(iter_export(empty))), indent=2)
+        with pytest.raises(ValueError):
+            self.configurator.export_configuration("xml")
+    
+    def test_ndjson_lines(self):
+        """Test NDJSON has a configuration line and one line per component"""
+        import json
+        
+        lines = [json.loads(line) for line in self.configurator.export_configuration("ndjson", "EUR").splitlines()]
+        assert lines[0]["record"] == "configuration" and lines[0]["currency"] == "EUR"
+        assert [(line["component_type"], line["id"]) for line in lines[1:]] == [
+            ("server", "hp_ml350g4p"), ("processor", "intel_xeon_3_0_604"), ("memory", "kingston_1gb_ddr2_400")
+        ]
+    
+    def test_write_to_text_and_binary_streams(self):
+        """Test streams get buffered chunks; binary streams get encoded bytes"""
+        import io
+        
+        class Recorder(io.BytesIO):
+            sizes = []
+            
+            def write(self, data):
+                self.sizes.append(len(data))
+                return super().write(data)
+        
+        text = io.StringIO()
+        written = self.configurator.write_export(text, "csv")
+        assert text.getvalue() == self.configurator.export_configuration("csv") and written == len(text.getvalue())
+        
+        binary = Recorder()
+        configuration = self.configurator.get_current_configuration()
+        write_export(binary, configuration, buffer_size=256)
+        assert binary.getvalue().decode() == self.configurator.export_configuration()
+        assert len(binary.sizes) > 1 and all(size >= 256 for size in binary.sizes[:-1])
+    
+    def test_cached_fragments(self):
+        """Test exports from cached fragments match fresh serialization and follow price updates"""
+        data = self.configurator.data
+        configuration = self.configurator.get_current_configuration()
+        for format_type in ("json", "ndjson", "csv"):
+            assert self.configurator.export_configuration(format_type) == "".join(iter_export(configuration, format_type))
+        fragments = data.export_fragments()
+        assert data.export_fragments() is fragments
+        
+        self.configurator.source.apply_updates([("hp_ml350g4p", 1234.5, None)])
+        assert data.export_fragments() is fragments
+        assert '"price": 1234.5' in self.configurator.export_configuration()
+        assert ",1234.5\r\n" in self.configurator.export_configuration("csv")
+    
+    def test_etag(self):
+        """Test ETag changes exactly when the export output changes"""
+        etag = self.configurator.export_etag()
+        assert etag == self.configurator.export_etag() and etag.startswith('"')
+        assert etag != self.configurator.export_etag("csv")
+        assert etag != self.configurator.export_etag(compact=True)
+        assert self.configurator.export_etag("csv", compact=True) == self.configurator.export_etag("csv")
+        assert etag != self.configurator.export_etag(currency="BYN")
+        
+        self.configurator.source.apply_updates([("hp_ml350g4p", 999.0, None)])
+        updated = self.configurator.export_etag()
+        assert updated != etag
+        self.configurator.remove_component("kingston_1gb_ddr2_400")
+        assert self.configurator.export_etag() != updated
+    
+    def test_async_writer(self):
+        """Test async export drains a StreamWriter-like object"""
+        import asyncio
+        
+        class Writer:
+            def __init__(self):
+                self.data, self.drains = bytearray(), 0
+            
+            def write(self, data):
+                self.data += data
+            
+            async def drain(self):
+                self.drains += 1
+        
+        writer = Writer()
+        asyncio.run(self.configurator.write_export_async(writer, "json", "BYN", compact=True))
+        assert writer.data.decode() == self.configurator.export_configuration("json", "BYN", compact=True)
+        assert writer.drains >= 1
+
+
+
+class TestApiServer:
+    """Test cases for the HTTP JSON API"""
+    
+    def setup_method(self):
+        """Setup test environment"""
+        self.publisher = CatalogPublisher(Catalog.load())
+        self.catalog = self.publisher.current
+        self.server = ApiServer(SessionManager(source=self.publisher), workers=2)
+    
+    def run(self, scenario):
+        """Run scenario(request) against the server on a free port, one keep-alive connection"""
+        import asyncio
+        import json
+        
+        async def main():
+            await self.server.start("127.0.0.1", 0)
+            reader, writer = await asyncio.open_connection("127.0.0.1", self.server.port)
+            
+            async def request(method, path, body=None, headers=None):
+                data = json.dumps(body).encode() if body is not None else b""
+                extra = "".join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+                writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(data)}\r\n"
+                             f"{extra}\r\n".encode() + data)
+                status, response_headers, content = await read_response(reader)
+                return status, response_headers, content
+            
+            try:
+                return await scenario(request)
+            finally:
+                writer.close()
+                await self.server.close()
+        
+        return asyncio.run(main())
+    
+    def test_catalog_endpoints_and_etags(self):
+        """Test listing, search and availability with ETag revalidation on one connection"""
+        import json
+        
+        async def scenario(request):
+            status, headers, body = await request("GET", "/api/catalog?type=processor&lang=en")
+            assert status == 200 and "app;dur=" in headers["server-timing"]
+            listing = json.loads(body)
+            assert [c["id"] for c in listing["components"]] == \
+                [c.id for c in self.catalog.data.get_components_by_type(ComponentType.PROCESSOR)]
+            
+            etag = headers["etag"]
+            status, _, body = await request("GET", "/api/catalog?type=processor&lang=en",
+                                            headers={"If-None-Match": etag})
+            assert (status, body) == (304, b"")
+            
+            status, _, body = await request("GET", "/api/search?q=xeon")
+            assert [c["id"] for c in json.loads(body)["components"]] == \
+                [c.id for c in self.catalog.data.search_components("xeon")]
+            status, _, body = await request("GET", "/api/components/hp_ml350g4p")
+            assert json.loads(body)["id"] == "hp_ml350g4p"
+            
+            # A price update changes the catalog version, so the old tag no longer matches
+            self.catalog.data.apply_updates([("intel_xeon_e5620", 1.5, False)])
+            status, headers, body = await request("GET", "/api/catalog?type=processor&lang=en",
+                                                  headers={"If-None-Match": etag})
+            assert status == 200 and headers["etag"] != etag
+            status, _, body = await request("GET", "/api/availability?ids=intel_xeon_e5620,missing")
+            assert json.loads(body)["components"] == {
+                "intel_xeon_e5620": {"price": 1.5, "availability": False}, "missing": None
+            }
+            
+            assert (await request("GET", "/api/components/missing"))[0] == 404
+            assert (await request("GET", "/api/catalog?type=gpu"))[0] == 400
+            status, headers, _ = await request("POST", "/api/catalog")
+            assert (status, headers["allow"]) == (405, "GET")
+            assert (await request("GET", "/nothing"))[0] == 404
+        
+        self.run(scenario)
+        routes = self.server.stats.routes
+        assert routes["catalog"].requests == 4 and routes["catalog"].not_modified == 1
+    
+    def test_session_flow_and_export(self):
+        """Test session create, add, conflict, remove and streamed export with ETag"""
+        import json
+        
+        async def scenario(request):
+            status, _, body = await request("POST", "/api/sessions", {"language": "en"})
+            assert status == 201
+            token = json.loads(body)["token"]
+            
+            status, _, body = await request("POST", f"/api/sessions/{token}/components", {"id": "hp_ml350g4p"})
+            assert status == 200 and json.loads(body)["added"]
+            status, _, body = await request("POST", f"/api/sessions/{token}/components", {"id": "intel_xeon_e5620"})
+            assert status == 409 and json.loads(body)["errors"]
+            assert (await request("POST", f"/api/sessions/{token}/components", {"id": "missing"}))[0] == 404
+            assert (await request("POST", f"/api/sessions/{token}/components", [1]))[0] == 400
+            
+            status, _, body = await request("GET", f"/api/sessions/{token}/available?type=memory")
+            session = self.server.sessions.get(token)
+            assert [c["id"] for c in json.loads(body)["components"]] == \
+                [c.id for c in session.get_available_components(ComponentType.MEMORY)]
+            
+            status, headers, body = await request("GET", f"/api/sessions/{token}/export?format=csv&currency=BYN")
+            assert status == 200 and headers["transfer-encoding"] == "chunked"
+            assert body.decode() == session.export_configuration("csv", "BYN")
+            assert headers["etag"] == session.export_etag("csv", "BYN")
+            status, _, _ = await request("GET", f"/api/sessions/{token}/export?format=csv&currency=BYN",
+                                         headers={"If-None-Match": headers["etag"]})
+            assert status == 304
+            
+            status, _, body = await request("DELETE", f"/api/sessions/{token}/components/hp_ml350g4p")
+            assert status == 200 and not any(json.loads(body)["configuration"]["components"].values())
+            assert (await request("DELETE", f"/api/sessions/{token}"))[0] == 200
+            assert (await request("GET", f"/api/sessions/{token}"))[0] == 404
+        
+        self.run(scenario)
+    
+    def test_failed_export_closes_connection(self, monkeypatch):
+        """Test an export failing after its headers ends the connection instead of writing a 500"""
+        import asyncio
+        import json
+        
+        async def scenario(request):
+            token = json.loads((await request("POST", "/api/sessions", {}))[2])["token"]
+            
+            async def broken_export(session, stream, *args):
+                stream.write(b"partial")
+                raise OSError("disk gone")
+            
+            monkeypatch.setattr(ServerConfigurator, "write_export_async", broken_export)
+            with pytest.raises(asyncio.IncompleteReadError):
+                await request("GET", f"/api/sessions/{token}/export?format=csv")
+        
+        self.run(scenario)
+        assert self.server.stats.routes["export"].errors == 1
+    
+    def test_event_stream(self):
+        """Test a session stream gets configuration changes, filtered price updates and the end"""
+        import asyncio
+        import json
+        
+        async def scenario(request):
+            token = json.loads((await request("POST", "/api/sessions", {}))[2])["token"]
+            reader, writer = await asyncio.open_connection("127.0.0.1", self.server.port)
+            writer.write(f"GET /api/sessions/{token}/events?catalog=1&ids=intel_xeon_e5620 HTTP/1.1\r\n"
+                         "Host: test\r\n\r\n".encode())
+            status, headers, _ = await read_response(reader)
+            assert status == 200 and headers["content-type"].startswith("text/event-stream")
+            
+            async def next_event():
+                fields = {}
+                while True:
+                    line = (await reader.readline()).decode()
+                    if not line:
+                        return None
+                    if line == "\n":
+                        if "event" in fields:
+                            return fields["event"], json.loads(fields["data"])
+                        fields = {}
+                        continue
+                    name, _, value = line.rstrip("\n").partition(": ")
+                    fields[name] = value
+            
+            def receive():
+                return asyncio.wait_for(next_event(), 5)
+            
+            kind, first = await receive()
+            assert (kind, first["components"]) == ("configuration", {})
+            await request("POST", f"/api/sessions/{token}/components", {"id": "hp_ml350g4p"})
+            await request("POST", f"/api/sessions/{token}/components", {"id": "kingston_1gb_ddr2_400"})
+            components = {}
+            while sum(map(len, components.values())) < 2:
+                kind, data = await receive()
+                assert kind == "configuration"
+                components = data["components"]
+            
+            self.publisher.apply_updates([("wd_1tb_sata", 2.0, None), ("intel_xeon_e5620", 1.5, False)])
+            assert await receive() == ("component", {"id": "intel_xeon_e5620", "price": 1.5, "availability": False})
+            
+            await request("DELETE", f"/api/sessions/{token}")
+            assert (await receive())[0] == "closed"
+            assert await asyncio.wait_for(reader.read(), 5) == b""
+            writer.close()
+            
+            # A session dropped after ttl ends its stream as well
+            token = json.loads((await request("POST", "/api/sessions", {}))[2])["token"]
+            reader, writer = await asyncio.open_connection("127.0.0.1", self.server.port)
+            writer.write(f"GET /api/sessions/{token}/events HTTP/1.1\r\nHost: test\r\n\r\n".encode())
+            await read_response(reader)
+            assert (await receive())[0] == "configuration"
+            self.server.sessions.ttl = 0
+            await asyncio.sleep(0.01)
+            self.server.sessions.expire()
+            assert (await receive())[0] == "closed"
+            writer.close()
+        
+        self.run(scenario)
+        assert self.server.events.stats().subscribers == 0
+    
+    def test_load_test(self):
+        """Test load test client over several keep-alive connections"""
+        import asyncio
+        
+        async def main():
+            await self.server.start("127.0.0.1", 0)
+            try:
+                return await load_test("127.0.0.1", self.server.port,
+                                       ["/api/catalog?type=memory", "/api/search?q=hp",
+                                        ("POST", "/api/sessions", {"language": "ru"})],
+                                       connections=4, requests=120, revalidate=True)
+            finally:
+                await self.server.close()
+        
+        stats = asyncio.run(main())
+        assert (stats.requests, stats.errors) == (120, 0)
+        assert stats.not_modified > 0 and stats.requests_per_second > 0
+
+
+class TestChangeEvents:
+    """Test cases for the change event hub"""
+    
+    def test_coalescing_and_bounded_queues(self):
+        """Test bursts coalesce, filters apply and a lagging subscriber is told to resync"""
+        import asyncio
+        
+        async def main():
+            hub = EventHub(max_pending=3)
+            hub.publish(CATALOG_TOPIC, "component", "a", {"price": 0})  # nobody listens yet
+            hub.bind(asyncio.get_running_loop())
+            everything = hub.subscribe([CATALOG_TOPIC])
+            filtered = hub.subscribe([CATALOG_TOPIC, session_topic("t")], {"a"})
+            
+            def burst():
+                for price in (1, 2, 3):
+                    hub.publish(CATALOG_TOPIC, "component", "a", {"price": price})
+                hub.publish(CATALOG_TOPIC, "component", "b", {"price": 1})
+                hub.publish(session_topic("t"), "configuration", "t", {"components": {}})
+            
+            await asyncio.get_running_loop().run_in_executor(None, burst)  # publishers are other threads
+            events = await everything.next_events(1)
+            assert [(e.key, e.data) for e in events] == [("a", {"price": 3}), ("b", {"price": 1})]
+            assert [(e.kind, e.key) for e in await filtered.next_events(1)] == \
+                [("component", "a"), ("configuration", "t")]
+            
+            for key in "cdef":
+                hub.publish(CATALOG_TOPIC, "component", key, {"price": 1})
+            assert [e.kind for e in await everything.next_events(1)] == ["resync"]
+            assert await filtered.next_events(0.01) == []
+            
+            hub.unsubscribe(filtered)
+            hub.close()
+            assert everything.closed and await everything.next_events(1) == []
+            return hub.stats(), everything
+        
+        stats, everything = asyncio.run(main())
+        assert (stats.published, stats.dropped, stats.subscribers) == (9, 1, 0)
+        # The burst is merged in the hub inbox or in the queue, depending on when the loop dispatched
+        assert stats.coalesced + everything.coalesced == 2
+
+
+class TestStaticCatalog:
+    """Test cases for the static catalog build"""
+    
+    def test_shards_and_manifest(self, tmp_path):
+        """Test shards are content-hashed, localized, precompressed and listed in the manifest"""
+        import gzip
+        import hashlib
+        import json
+        from export_writer import component_json
+        
+        catalog = Catalog.load()
+        manifest, stats = build_static_catalog(str(tmp_path), catalog, ["ru", "en"])
+        assert json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8")) == manifest
+        assert stats.shards == stats.written == len(manifest["categories"]) * 2 + len(manifest["servers"])
+        
+        processors = catalog.data.get_components_by_type(ComponentType.PROCESSOR)
+        for language in ("ru", "en"):
+            name = manifest["categories"]["processor"][language]
+            content = (tmp_path / name).read_bytes()
+            assert name.split(".")[-2] == hashlib.blake2b(content, digest_size=6).hexdigest()
+            assert json.loads(content) == [component_json(view) for view in localizer(language).components(processors)]
+            assert gzip.decompress((tmp_path / (name + ".gz")).read_bytes()) == content
+        
+        server = json.loads((tmp_path / manifest["servers"]["hp_ml350g4p"]).read_text(encoding="utf-8"))
+        configurator = ServerConfigurator(catalog=catalog)
+        configurator.add_component("hp_ml350g4p")
+        available = configurator.get_available_components(ComponentType.PROCESSOR)
+        assert server["excluded"]["processor"] == [c.id for c in processors if c not in available]
+        assert "intel_xeon_e5620" in server["excluded"]["processor"]
+        with pytest.raises(ValueError):
+            server_exclusions(catalog, "no_such_server", [ComponentType.PROCESSOR])
+    
+    def test_incremental_build(self, tmp_path):
+        """Test only changed shards are rewritten and stale ones outlive one manifest"""
+        catalog = Catalog.load(freeze=False)
+        first, _ = build_static_catalog(str(tmp_path), catalog)
+        _, stats = build_static_catalog(str(tmp_path), catalog)
+        assert (stats.written, stats.unchanged) == (0, stats.shards)
+        
+        catalog.data.apply_updates([("wd_1tb_sata", 99.0, None)])
+        second, stats = build_static_catalog(str(tmp_path), catalog)
+        assert stats.written == 2  # storage shard in both languages
+        old = first["categories"]["storage"]["ru"]
+        assert second["categories"]["storage"]["ru"] != old and (tmp_path / old).exists()
+        
+        _, stats = build_static_catalog(str(tmp_path), catalog)
+        assert not (tmp_path / old).exists() and not (tmp_path / (old + ".gz")).exists()
+        assert stats.removed == 4
+
+class TestBulkQuotes:
+    """Test cases for bulk quote generation"""
+    
+    STATES = [
+        {"id": "valid", "configuration_id": 1, "components": ["hp_ml350g4p", "intel_xeon_3_0_604"]},
+        {"id": "invalid", "configuration_id": 2, "components": ["hp_ml350g4p", "intel_xeon_e5620"]},
+        {"id": "missing", "configuration_id": 3, "components": ["hp_ml350g4p", "retired_cpu"]},
+        {"components": "hp_ml350g4p"},
+    ]
+    
+    def test_quotes_to_directory(self, tmp_path):
+        """Test quotes per format and language, validation and missing components counted"""
+        stats = generate_quotes(self.STATES, str(tmp_path / "quotes"), currency="BYN", workers=1)
+        
+        assert (stats.configurations, stats.quotes, stats.invalid, stats.missing, stats.skipped) == (3, 12, 1, 1, 1)
+        assert stats.errors == ["quote_000004: not a saved configuration"]
+        assert sorted(os.listdir(tmp_path / "quotes"))[:4] == [
+            "invalid.en.csv", "invalid.en.json", "invalid.ru.csv", "invalid.ru.json"
+        ]
+        russian = (tmp_path / "quotes" / "valid.ru.csv").read_text(encoding="utf-8")
+        assert "Price (BYN)" in russian and "ГГц" in russian
+        assert "ГГц" not in (tmp_path / "quotes" / "valid.en.csv").read_text(encoding="utf-8")
+        with pytest.raises(QuoteError):
+            generate_quotes([], str(tmp_path / "other"), formats=["xml"])
+    
+    def test_malformed_states_and_repeated_names(self, tmp_path):
+        """Test a malformed state is skipped, not fatal, and repeated ids get distinct files"""
+        import zipfile
+        
+        states = [self.STATES[0], {"components": [["x"]]}, self.STATES[0], {"id": "valid_2", "components": []}]
+        for output, workers in [("quotes", 1), ("quotes.zip", 2)]:
+            stats = generate_quotes(states, str(tmp_path / output), formats=["json"], languages=["en"],
+                                    workers=workers, batch_size=1)
+            assert (stats.configurations, stats.skipped) == (3, 1)
+            assert stats.errors == ["quote_000002: not a saved configuration"]
+        assert sorted(os.listdir(tmp_path / "quotes")) == ["valid.en.json", "valid_2.en.json", "valid_2_2.en.json"]
+        with zipfile.ZipFile(tmp_path / "quotes.zip") as archive:
+            assert archive.namelist() == ["valid.en.json", "valid_2.en.json", "valid_2_2.en.json"]
+    
+    def test_parallel_archive_matches_serial(self, tmp_path):
+        """Test process pool quotes in a zip archive equal serial quotes"""
+        import zipfile
+        
+        states = [dict(state, id=f"{state.get('id')}_{i}") for i in range(10) for state in self.STATES[:3]]
+        serial = generate_quotes(states, str(tmp_path / "serial"), workers=1, batch_size=4)
+        parallel = generate_quotes(states, str(tmp_path / "quotes.zip"), workers=2, batch_size=4)
+        
+        assert parallel.format().split(" in ")[0] == serial.format().split(" in ")[0]
+        with zipfile.ZipFile(tmp_path / "quotes.zip") as archive:
+            assert archive.namelist()[:2] == ["valid_0.ru.json", "valid_0.ru.csv"]
+            for name in archive.namelist():
+                assert archive.read(name) == (tmp_path / "serial" / name).read_bytes()
+    
+    def test_read_spilled_sessions(self, tmp_path):
+        """Test saved configurations are read from a session store directory"""
+        store = FileSessionStore(str(tmp_path / "sessions"))
+        store.save("abc", self.STATES[0])
+        (tmp_path / "states.ndjson").write_text('{"components": []}\nnot json\n', encoding="utf-8")
+        
+        assert list(read_states(str(tmp_path / "sessions"))) == [("abc", self.STATES[0])]
+        assert list(read_states(str(tmp_path / "states.ndjson"))) == [
+            ("quote_000001", {"components": []}), ("quote_000002", None)
+        ]
+
+
+class TestConfigurationStore:
+    """Test cases for the SQLite configuration store"""
+    
+    def setup_method(self):
+        self.now = 1000.0
+        self.clock = lambda: self.now
+    
+    def test_save_and_reopen(self, tmp_path):
+        """Test configurations persist with quantities, fingerprint and timestamps"""
+        path = str(tmp_path / "configurations.db")
+        with ConfigurationStore(path, clock=self.clock) as store:
+            assert store.journal_mode == "wal"
+            saved = store.save(SavedConfiguration(["hp_ml350g4p", "kingston_1gb_ddr2_400", "hp_ml350g4p"],
+                                                  "Office", "anna"))
+            self.now = 2000.0
+            saved.name = "Office v2"
+            store.save(saved)
+        
+        with ConfigurationStore(path) as store:
+            loaded = store.get(saved.id)
+            assert loaded.components == ["hp_ml350g4p", "hp_ml350g4p", "kingston_1gb_ddr2_400"]
+            assert loaded.quantities == {"hp_ml350g4p": 2, "kingston_1gb_ddr2_400": 1}
+            assert (loaded.name, loaded.owner, loaded.created_at, loaded.updated_at) == ("Office v2", "anna",
+                                                                                          1000.0, 2000.0)
+            assert loaded.fingerprint == configuration_fingerprint(
+                ["kingston_1gb_ddr2_400", "hp_ml350g4p", "hp_ml350g4p"])
+            assert store.find_by_fingerprint(loaded.fingerprint) == [loaded]
+            assert store.delete(saved.id) and store.get(saved.id) is None and len(store) == 0
+    
+    def test_batched_writes_and_lookups(self):
+        """Test save_many, owner lookup and session states for bulk quotes"""
+        store = ConfigurationStore(":memory:", clock=self.clock)
+        configurator = ServerConfigurator(catalog=Catalog.load())
+        configurator.add_component("hp_ml350g4p")
+        store.save(SavedConfiguration.from_session(configurator, "From session", "boris"))
+        saved = store.save_many((SavedConfiguration(["intel_xeon_3_0_604"], f"Quote {i}", "anna")
+                                 for i in range(25)), batch_size=10)
+        
+        assert [c.id for c in saved] == list(range(2, 27)) and len(store) == 26
+        assert [c.name for c in store.by_owner("anna", limit=2)] == ["Quote 24", "Quote 23"]
+        assert list(store.states("boris")) == [
+            ("config_1", {"id": "config_1", "configuration_id": 1, "components": ["hp_ml350g4p"]})
+        ]
+        assert len(list(store.states())) == 26
+    
+    def test_price_change_notifications(self):
+        """Test which saved configurations contain components changed by the price feed"""
+        store = ConfigurationStore(":memory:")
+        first, second = store.save_many([
+            SavedConfiguration(["hp_ml350g4p", "intel_xeon_3_0_604"]),
+            SavedConfiguration(["dell_poweredge_r710", "intel_xeon_3_0_604"]),
+        ])
+        publisher = CatalogPublisher(Catalog.load())
+        feed = PriceFeed(publisher)
+        feed.submit("intel_xeon_3_0_604", price=1.0)
+        feed.submit("dell_poweredge_r710", availability=False)
+        feed.submit("samsung_4gb_ddr3_1333", price=2.0)
+        
+        assert store.containing("hp_ml350g4p") == [first.id]
+        assert store.containing_any(feed.flush()) == {
+            "intel_xeon_3_0_604": [first.id, second.id], "dell_poweredge_r710": [second.id]
+        }
+
+class RuleCatalogCase:
+    """Shared setup: sample catalog extended with every rule type"""
+    
+    def setup_method(self):
+        """Setup catalog with every rule type"""
+        self.data = create_sample_data()
+        self.data.add_compatibility_rule(CompatibilityRule(
+            id="require_psu",
+            rule_type=CompatibilityType.REQUIRED,
+            primary_component_id="hp_460w_psu"
+        ))
+        self.data.add_compatibility_rule(CompatibilityRule(
+            id="min_memory",
+            rule_type=CompatibilityType.LIMITED,
+            primary_component_id="corsair_2gb_ddr2_533",
+            min_quantity=2
+        ))
+    
+    def _configuration(self, *component_ids):
+        """Build configuration dict from component ids"""
+        configuration = {}
+        for component_id in component_ids:
+            component = self.data.components[component_id]
+            configuration.setdefault(component.component_type, []).append(component)
+        return configuration
+
+
+class TestBatchValidation(RuleCatalogCase):
+    """Test cases for vectorized validate_many"""
+    
+    def test_matches_scalar_validation(self):
+        """Test batch errors are identical to validate_configuration"""
+        import random
+        
+        rng = random.Random(42)
+        component_ids = list(self.data.components)
+        configurations = [
+            self._configuration(*rng.choices(component_ids, k=rng.randint(0, 12)))
+            for _ in range(500)
+        ]
+        configurations.append(self._configuration(*["kingston_1gb_ddr2_400"] * 9))
+        configurations.append(self._configuration("kingston_1gb_ddr2_400", "samsung_4gb_ddr3_1333"))
+        
+        expected = [self.data.validate_configuration(c) for c in configurations]
+        assert self.data.validate_many(configurations) == expected
+        assert any(len(errors) > 2 for errors in expected)
+    
+    def test_rebuilds_after_catalog_change(self):
+        """Test validator picks up rules added after first use"""
+        configuration = self._configuration("hp_460w_psu")
+        assert self.data.validate_many([configuration]) == [[
+            "Not enough corsair_2gb_ddr2_533 components (min: 2)"
+        ]]
+        
+        self.data.add_compatibility_rule(CompatibilityRule(
+            id="psu_excluded",
+            rule_type=CompatibilityType.EXCLUDED,
+            primary_component_id="hp_460w_psu",
+            secondary_component_id="hp_460w_psu"
+        ))
+        errors = self.data.validate_many([configuration])[0]
+        assert errors[-1] == "Components hp_460w_psu and hp_460w_psu are incompatible"
+    
+    def test_empty_batch(self):
+        """Test empty input returns empty result"""
+        assert self.data.validate_many([]) == []
+
+
+class TestCompiledRules(RuleCatalogCase):
+    """Test cases for the code-generated rule validator"""
+    
+    def test_matches_scalar_validation(self):
+        """Test compiled validator is equivalent to the interpreted one"""
+        import random
+        
+        validate = self.data.compile_rules()
+        rng = random.Random(7)
+        component_ids = list(self.data.components)
+        for _ in range(500):
+            configuration = self._configuration(*rng.choices(component_ids, k=rng.randint(0, 20)))
+            assert validate(configuration) == self.data.validate_configuration(configuration)
+    
+    def test_rebuilds_after_catalog_change(self):
+        """Test validator is cached per catalog version"""
+        validate = self.data.compile_rules()
+        assert self.data.compile_rules() is validate
+        
+        self.data.add_compatibility_rule(CompatibilityRule(
+            id="require_server",
+            rule_type=CompatibilityType.REQUIRED,
+            primary_component_id="hp_ml350g4p"
+        ))
+        recompiled = self.data.compile_rules()
+        assert recompiled is not validate
+        assert "Required component hp_ml350g4p is missing" in recompiled({})
+    
+    def test_validate_configuration_uses_compiled_rules(self):
+        """Test opt-in switch routes validate_configuration through compiled code"""
+        configuration = self._configuration(*["kingston_1gb_ddr2_400"] * 9)
+        expected = self.data.validate_configuration(configuration)
+        
+        self.data.use_compiled_rules = True
+        assert self.data.validate_configuration(configuration) == expected
+        assert self.data._compiled_validator is not None
+    
+    def test_unknown_components_skipped(self):
+        """Test rules without catalog components compile to no checks"""
+        self.data.add_compatibility_rule(CompatibilityRule(
+            id="unknown",
+            rule_type=CompatibilityType.REQUIRED,
+            primary_component_id="missing_component"
+        ))
+        assert "missing_component" not in self.data.compile_rules().source
+
+
+class TestConditions:
+    """Test cases for CONDITION rule expressions"""
+    
+    def setup_method(self):
+        """Setup test environment"""
+        self.data = create_sample_data()
+        self.server = self.data.components["hp_ml350g4p"]
+        self.memory = self.data.components["corsair_2gb_ddr2_533"]
+    
+    def test_expression_evaluation(self):
+        """Test aggregates, attributes and operators"""
+        context = ConditionContext({
+            ComponentType.SERVER: [self.server],
+            ComponentType.MEMORY: [self.memory] * 3
+        })
+        assert compile_condition("count(type=memory) <= server.max_memory_slots")(context)
+        assert compile_condition("sum(capacity, type=memory) == 6")(context)
+        assert compile_condition("count(id=corsair_2gb_ddr2_533) * 2 + 1 > 6 and not count() < 4")(context)
+        assert compile_condition("server.socket_type == 'Socket 604'")(context)
+        assert not compile_condition("count(type=memory) > server.max_memory_slots")(context)
+    
+    def test_missing_component_not_applicable(self):
+        """Test conditions on absent components evaluate to None"""
+        context = ConditionContext({ComponentType.MEMORY: [self.memory]})
+        assert compile_condition("count(type=memory) <= server.max_memory_slots")(context) is None
+    
+    def test_unit_suffixed_and_text_values(self):
+        """Test vendor-style values with units sum as numbers, text values are not applicable"""
+        server = self.data.components["dell_poweredge_r710"]
+        imported = Component(
+            id="vendor_16gb", name="16GB DDR3", component_type=ComponentType.MEMORY,
+            manufacturer="Vendor", model="16GB DDR3", price=100.0,
+            attributes=[ComponentAttribute("capacity", "16GB")]
+        )
+        large = Component(
+            id="vendor_1tb", name="1TB DDR3", component_type=ComponentType.MEMORY,
+            manufacturer="Vendor", model="1TB DDR3", price=100.0,
+            attributes=[ComponentAttribute("capacity", "1 TB", "GB")]
+        )
+        rule = compile_condition("sum(capacity, type=memory) <= server.max_memory_gb")
+        context = ConditionContext({ComponentType.SERVER: [server], ComponentType.MEMORY: [imported] * 2})
+        assert context.total("capacity", ComponentType.MEMORY) == 32
+        assert rule(context) is True
+        context = ConditionContext({ComponentType.SERVER: [server], ComponentType.MEMORY: [large]})
+        assert context.total("capacity", ComponentType.MEMORY) == 1024
+        assert rule(context) is False
+        
+        imported.attributes[0] = ComponentAttribute("capacity", "sixteen")
+        configuration = {ComponentType.SERVER: [server], ComponentType.MEMORY: [imported]}
+        assert rule(ConditionContext(configuration)) is None
+        assert compile_condition("server.socket_type > 3")(ConditionContext(configuration)) is None
+        assert not any("server_memory_capacity" in error
+                       for error in self.data.validate_configuration(configuration))
+    
+    def test_invalid_expressions_rejected_at_add_time(self):
+        """Test parsing errors surface from add_compatibility_rule"""
+        for expression in ["count(type=memory", "__import__('os')", "count(type=gpu) < 2",
+                           "server.slots.x > 1", "lambda: 1"]:
+            with pytest.raises(ConditionError):
+                self.data.add_compatibility_rule(CompatibilityRule(
+                    id="bad",
+                    rule_type=CompatibilityType.CONDITION,
+                    primary_component_id="",
+                    condition=expression
+                ))
+    
+    def test_condition_rule_validation(self):
+        """Test condition rules in validate_configuration and fast paths"""
+        self.data.add_compatibility_rule(CompatibilityRule(
+            id="hp_two_modules",
+            rule_type=CompatibilityType.CONDITION,
+            primary_component_id="hp_ml350g4p",
+            condition="count(type=memory) <= 2"
+        ))
+        configuration = {
+            ComponentType.SERVER: [self.server],
+            ComponentType.MEMORY: [self.memory] * 9
+        }
+        expected = [
+            "Condition server_memory_slots failed: count(type=memory) <= server.max_memory_slots",
+            "Condition hp_two_modules failed: count(type=memory) <= 2"
+        ]
+        assert self.data.validate_configuration(configuration) == expected
+        assert self.data.compile_rules()(configuration) == expected
+        assert self.data.validate_many([configuration, {}]) == [expected, []]
+    
+    def test_batch_and_compiled_paths_match_closures(self):
+        """Test array and generated-source conditions agree with the closures, text and missing values included"""
+        import random
+        
+        expressions = [
+            "count(type=memory) / count(type=processor) <= 4",
+            "server.max_processors >= 2 and count(type=processor) == 2 or count(id=hp_460w_psu) > 0",
+            "not (sum(capacity) > 8) or 1 < server.max_processors <= count(type=memory, id=corsair_2gb_ddr2_533)",
+            "-sum(capacity, type=storage) < count() * 100",
+            "server.form_factor == '4U Rack'",
+            "server.chipset * 2 > 0",
+        ]
+        for number, expression in enumerate(expressions):
+            self.data.add_compatibility_rule(CompatibilityRule(
+                id=f"extra_{number}", rule_type=CompatibilityType.CONDITION,
+                primary_component_id="" if number % 2 else "hp_ml350g4p", condition=expression
+            ))
+        text = Component(
+            id="text_memory", name="Odd DIMM", component_type=ComponentType.MEMORY,
+            manufacturer="Vendor", model="Odd", price=1.0, attributes=[ComponentAttribute("capacity", "big")]
+        )
+        rng = random.Random(5)
+        components = list(self.data.components.values()) + [text]
+        configurations = []
+        for _ in range(500):
+            configuration = {}
+            for component in rng.choices(components, k=rng.randint(0, 10)):
+                configuration.setdefault(component.component_type, []).append(component)
+            configurations.append(configuration)
+        
+        expected = [self.data.validate_configuration(c) for c in configurations]
+        assert any(any("extra_" in error for error in errors) for errors in expected)
+        assert self.data.validate_many(configurations) == expected
+        validate = self.data.compile_rules()
+        assert [validate(c) for c in configurations] == expected
+    
+    def test_configurator_enforces_memory_slots(self):
+        """Test sample condition rule limits memory to server slots"""
+        configurator = ServerConfigurator()
+        configurator.add_component("hp_ml350g4p")
+        configurator.current_configuration[ComponentType.MEMORY] = [self.memory] * 8
+        
+        success, errors = configurator.add_component("kingston_1gb_ddr2_400")
+        assert not success
+        assert any("server_memory_slots" in error for error in errors)
+
+
+class TestRuleAnalyzer(RuleCatalogCase):
+    """Test cases for the rule set analyzer"""
+    
+    def _add_rule(self, rule_id, rule_type, primary, secondary=None, **kwargs):
+        """Add rule to catalog"""
+        self.data.add_compatibility_rule(CompatibilityRule(
+            id=rule_id,
+            rule_type=rule_type,
+            primary_component_id=primary,
+            secondary_component_id=secondary,
+            **kwargs
+        ))
+    
+    def test_sample_data_reverse_exclusion_is_duplicate(self):
+        """Test symmetric EXCLUDED pair is reported once"""
+        analysis = analyze_rules(self.data)
+        assert ("ddr2_ddr3_incompatible_reverse", "ddr2_ddr3_incompatible") in analysis.duplicates
+        assert analysis.removed_count == 1
+        assert not analysis.contradictions
+    
+    def test_duplicate_subsumed_dead_and_contradictory_rules(self):
+        """Test every category of finding"""
+        self._add_rule("hp_cpu_limit_copy", CompatibilityType.LIMITED, "intel_xeon_3_0_604", max_quantity=2)
+        self._add_rule("hp_cpu_loose", CompatibilityType.LIMITED, "intel_xeon_3_0_604", max_quantity=4)
+        self._add_rule("gone", CompatibilityType.REQUIRED, "removed_component")
+        self._add_rule("nice_to_have", CompatibilityType.OPTIONAL, "wd_1tb_sata")
+        self._add_rule("psu_min_3", CompatibilityType.LIMITED, "hp_460w_psu", min_quantity=3, max_quantity=1)
+        self._add_rule("require_dell_psu", CompatibilityType.REQUIRED, "dell_750w_psu")
+        self._add_rule("psu_clash", CompatibilityType.EXCLUDED, "hp_460w_psu", "dell_750w_psu")
+        
+        analysis = analyze_rules(self.data)
+        assert ("hp_cpu_limit_copy", "max_processors_hp") in analysis.duplicates
+        assert ("hp_cpu_loose", "max_processors_hp") in analysis.subsumed
+        assert [rule_id for rule_id, _ in analysis.dead] == ["gone", "nice_to_have"]
+        assert any("psu_min_3" in c for c in analysis.contradictions)
+        assert any("psu_clash" in c for c in analysis.contradictions)
+        assert "CONTRADICTION" in analysis.format_report()
+    
+    def test_minimized_rules_reject_same_configurations(self):
+        """Test minimized rule set accepts and rejects the same configurations"""
+        import random
+        
+        self._add_rule("hp_cpu_loose", CompatibilityType.LIMITED, "intel_xeon_3_0_604", max_quantity=4)
+        rng = random.Random(3)
+        component_ids = list(self.data.components)
+        configurations = [
+            self._configuration(*rng.choices(component_ids, k=rng.randint(0, 12)))
+            for _ in range(300)
+        ]
+        before = [bool(errors) for errors in self.data.validate_many(configurations)]
+        
+        analyze_rules(self.data).apply(self.data)
+        assert [bool(errors) for errors in self.data.validate_many(configurations)] == before
+    
+    def test_matrix_asymmetry(self):
+        """Test asymmetric matrix rows are flagged and symmetrized"""
+        matrix = create_compatibility_matrix()
+        matrix["hp_460w_psu"].append("dell_poweredge_r710")
+        matrix["ghost"] = ["hp_ml350g4p"]
+        
+        analysis = analyze_rules(self.data, matrix)
+        assert analysis.asymmetric_pairs == [("hp_460w_psu", "dell_poweredge_r710"), ("ghost", "hp_ml350g4p")]
+        assert analysis.unknown_matrix_ids == ["ghost"]
+        
+        analysis.apply(self.data, matrix)
+        assert "dell_poweredge_r710" not in matrix["hp_460w_psu"]
+        
+        self.data.freeze()
+        with pytest.raises(TypeError):
+            analysis.apply(self.data)
+    
+    def test_configurator_optimize_rules(self):
+        """Test load-time optimization keeps configurator behavior"""
+        configurator = ServerConfigurator(optimize_rules=True)
+        assert configurator.rule_analysis.removed_count > 0
+        configurator.add_component("hp_ml350g4p")
+        success, _ = configurator.add_component("intel_xeon_e5620")
+        assert not success
+
+
+class TestCompatibilityMatrix:
+    """Test cases for symmetric CompatibilityMatrix"""
+    
+    @staticmethod
+    def _two_way(matrix, a, b):
+        """Reference: dict-of-lists checked in both directions"""
+        return (a not in matrix or b in matrix[a]) and (b not in matrix or a in matrix[b])
+    
+    def test_matches_two_way_dict_check(self):
+        """Test single lookup equals the old two-direction check"""
+        import random
+        
+        rng = random.Random(5)
+        ids = [f"c{i}" for i in range(40)]
+        matrix = {a: rng.sample(ids, 15) for a in ids[:30]}  # asymmetric, some unconstrained
+        compat = CompatibilityMatrix.from_dict(matrix)
+        for a in ids + ["unknown"]:
+            for b in ids + ["unknown"]:
+                assert compat.compatible(a, b) == self._two_way(matrix, a, b), (a, b)
+    
+    def test_sample_matrix_rows(self):
+        """Test rows hold both directions of each stored pair"""
+        matrix = create_compatibility_matrix()
+        compat = CompatibilityMatrix.from_dict(matrix)
+        for component_id, compatible in matrix.items():
+            assert sorted(compat.row(component_id)) == sorted(compatible)
+        assert compat.to_dict().keys() == matrix.keys()
+        assert len(compat) == len(matrix)
+    
+    def test_bulk_updates(self):
+        """Test add/remove/set_row before and after compaction"""
+        compat = CompatibilityMatrix.from_dict(create_compatibility_matrix())
+        assert not compat.compatible("hp_ml350g4p", "dell_750w_psu")
+        
+        compat.add_pairs([("hp_ml350g4p", "dell_750w_psu"), ("hp_ml350g4p", "new_psu")])
+        compat.remove_pairs([("hp_ml350g4p", "hp_460w_psu")])
+        for _ in range(2):
+            assert compat.compatible("dell_750w_psu", "hp_ml350g4p")
+            assert compat.compatible("hp_ml350g4p", "new_psu")
+            assert not compat.compatible("hp_460w_psu", "hp_ml350g4p")
+            assert "new_psu" in compat.row("hp_ml350g4p")
+            assert "hp_ml350g4p" in compat.row("dell_750w_psu")
+            compat.compact()
+        
+        compat.set_row("new_psu", ["dell_poweredge_r710"])
+        assert compat.row("new_psu") == ["dell_poweredge_r710"]
+        assert not compat.compatible("new_psu", "hp_ml350g4p")
+        assert compat.compatible("new_psu", "dell_poweredge_r710")
+    
+    def test_single_error_per_incompatible_pair(self):
+        """Test configurator reports each incompatible pair once"""
+        configurator = ServerConfigurator()
+        configurator.add_component("hp_ml350g4p")
+        success, errors = configurator.add_component("intel_xeon_e5620")
+        assert not success
+        assert errors.count("Intel Xeon E5620 is not compatible with HP ProLiant ML350 G4p") == 1
+        assert not any("HP ProLiant ML350 G4p is not compatible" in error for error in errors)
+
+
+class TestCatalogLoader:
+    """Test cases for data-file catalog loading"""
+    
+    @pytest.mark.parametrize("file_type", ["ndjson", "json", "csv"])
+    def test_round_trip(self, tmp_path, file_type):
+        """Test exported sample catalog loads back identically"""
+        data = create_sample_data()
+        matrix = create_compatibility_matrix()
+        dump_catalog(data, matrix, str(tmp_path), file_type)
+        
+        loaded, loaded_matrix, stats = load_catalog_dir(str(tmp_path))
+        assert loaded_matrix == matrix
+        assert [r.id for r in loaded.compatibility_rules] == [r.id for r in data.compatibility_rules]
+        assert loaded.compatibility_rules == data.compatibility_rules
+        for component_id, component in data.components.items():
+            other = loaded.components[component_id]
+            assert (other.name, other.component_type, other.price, other.availability) == \
+                (component.name, component.component_type, component.price, component.availability)
+            key = lambda attr: (attr.name, attr.unit or "")
+            assert sorted(other.attributes, key=key) == sorted(component.attributes, key=key)
+        assert stats.components == len(data.components)
+        assert stats.records_per_second > 0
+    
+    def test_json_array_streamed_across_chunks(self, tmp_path, monkeypatch):
+        """Test JSON array parsing with records split between reads"""
+        import catalog_loader
+        
+        dump_catalog(create_sample_data(), create_compatibility_matrix(), str(tmp_path), "json")
+        monkeypatch.setattr(catalog_loader, "_CHUNK_SIZE", 7)
+        records = list(catalog_loader.iter_records(str(tmp_path / "components.json")))
+        assert [r["id"] for r in records] == list(create_sample_data().components)
+    
+    def test_invalid_records(self, tmp_path):
+        """Test bad files raise CatalogLoadError"""
+        path = tmp_path / "components.ndjson"
+        path.write_text('{"id": "x", "name": "X", "type": "gpu"}\n')
+        with pytest.raises(CatalogLoadError):
+            load_catalog(str(path))
+        
+        path = tmp_path / "components.json"
+        path.write_text('{"id": "x"}')
+        with pytest.raises(CatalogLoadError):
+            load_catalog(str(path))
+    
+    def test_configurator_from_catalog_dir(self, tmp_path):
+        """Test ServerConfigurator built from catalog files behaves the same"""
+        dump_catalog(create_sample_data(), create_compatibility_matrix(), str(tmp_path))
+        configurator = ServerConfigurator(catalog_dir=str(tmp_path))
+        assert configurator.load_stats.components == 17
+        
+        configurator.add_component("hp_ml350g4p")
+        success, _ = configurator.add_component("intel_xeon_e5620")
+        assert not success
+
+
+class TestCatalogSnapshot:
+    """Test cases for the binary catalog snapshot"""
+    
+    def setup_method(self):
+        """Setup test environment"""
+        self.data = create_sample_data()
+        self.matrix = create_compatibility_matrix()
+    
+    def test_round_trip(self, tmp_path):
+        """Test snapshot decodes to the same catalog"""
+        path = str(tmp_path / "catalog.snap")
+        write_snapshot(path, self.data, self.matrix)
+        data, matrix = open_snapshot(path)
+        
+        assert list(data.components) == list(self.data.components)
+        for component_id, component in self.data.components.items():
+            assert data.components[component_id] == component
+        assert data.compatibility_rules == self.data.compatibility_rules
+        assert data.version == self.data.version
+        for component_type in ComponentType:
+            assert data.get_components_by_type(component_type) == self.data.get_components_by_type(component_type)
+        for component_id in self.matrix:
+            assert sorted(matrix.row(component_id)) == sorted(self.matrix[component_id])
+        assert "missing" not in data.components
+    
+    def test_lazy_decoding(self, tmp_path):
+        """Test opening decodes nothing until components are accessed"""
+        path = str(tmp_path / "catalog.snap")
+        write_snapshot(path, self.data, self.matrix)
+        data, _ = open_snapshot(path)
+        assert data.snapshot._component_cache == {}
+        
+        data.components["wd_1tb_sata"]
+        assert len(data.snapshot._component_cache) == 1
+    
+    def test_search_and_rule_index(self, tmp_path):
+        """Test snapshot search and rule index match in-memory results"""
+        path = str(tmp_path / "catalog.snap")
+        write_snapshot(path, self.data, self.matrix)
+        data, _ = open_snapshot(path)
+        
+        for query, component_type in [("xeon", None), ("HP", None), ("ddr", ComponentType.MEMORY), ("zzz", None)]:
+            assert data.search_components(query, component_type) == \
+                self.data.search_components(query, component_type)
+        for component_id in self.data.components:
+            assert data.rules_for_component(component_id) == self.data.rules_for_component(component_id)
+    
+    def test_rule_index_after_rule_changes(self, tmp_path):
+        """Test rules added or replaced since opening are found, in the copy too"""
+        path = str(tmp_path / "catalog.snap")
+        write_snapshot(path, self.data, self.matrix)
+        data, _ = open_snapshot(path)
+        unchanged = data.copy()
+        assert not unchanged._rules_changed
+        assert unchanged.rules_for_component("hp_ml350g4p") == self.data.rules_for_component("hp_ml350g4p")
+        
+        rule = CompatibilityRule("extra_rule", CompatibilityType.EXCLUDED, "hp_ml350g4p", "intel_xeon_e5620")
+        data.add_compatibility_rule(rule)
+        copied = data.copy()
+        assert rule in data.rules_for_component("hp_ml350g4p")
+        assert rule in copied.rules_for_component("intel_xeon_e5620")
+        
+        unchanged.compatibility_rules = [rule]
+        assert unchanged.rules_for_component("hp_ml350g4p") == [rule]
+        assert unchanged.copy().rules_for_component("hp_ml350g4p") == [rule]
+    
+    def test_configurator_from_snapshot(self, tmp_path):
+        """Test configurator works on a snapshot, including added components"""
+        path = str(tmp_path / "catalog.snap")
+        write_snapshot(path, self.data, self.matrix)
+        configurator = ServerConfigurator(snapshot_path=path)
+        
+        assert configurator.add_component("hp_ml350g4p")[0]
+        assert not configurator.add_component("intel_xeon_e5620")[0]
+        assert configurator.get_compatibility_info("hp_ml350g4p")["incompatible_with"] == \
+            ServerConfigurator().get_compatibility_info("hp_ml350g4p")["incompatible_with"]
+        
+        configurator = ServerConfigurator(catalog=Catalog.load(snapshot_path=path, freeze=False))
+        extra = Component("extra_psu", "Extra PSU", ComponentType.POWER_SUPPLY, "X", "PSU", [], 10.0)
+        configurator.data.add_component(extra)
+        assert configurator.get_component_details("extra_psu") is extra
+        assert extra in configurator.data.get_components_by_type(ComponentType.POWER_SUPPLY)
+        assert len(configurator.data.components) == 18
+    
+    def test_replaced_component(self, tmp_path):
+        """Test a component replaced since opening is listed and searched once, by its new fields"""
+        path = str(tmp_path / "catalog.snap")
+        write_snapshot(path, self.data, self.matrix)
+        data, _ = open_snapshot(path)
+        old = data.components["hp_ml350g4p"]
+        renamed = Component("hp_ml350g4p", "Renamed Tower", ComponentType.SERVER, old.manufacturer, "Renamed",
+                            old.attributes, 1.0)
+        data.add_component(renamed)
+        
+        servers = data.get_components_by_type(ComponentType.SERVER)
+        assert [c.id for c in servers].count("hp_ml350g4p") == 1 and renamed in servers
+        assert data.search_components("Renamed Tower") == [renamed]
+        assert renamed not in data.search_components(old.name)
+    
+    def test_shared_snapshot_workers(self):
+        """Test forked workers map one shared snapshot"""
+        import multiprocessing
+        
+        if "fork" not in multiprocessing.get_all_start_methods():
+            pytest.skip("needs fork")
+        with SharedSnapshot(self.data, self.matrix) as shared:
+            with multiprocessing.get_context("fork").Pool(2) as pool:
+                results = pool.map(_shared_snapshot_worker, [shared.path] * 2)
+            assert results == [(17, "Intel Xeon E5620", False)] * 2
+        assert not os.path.exists(shared.path)
+    
+    def test_rejects_invalid_file(self, tmp_path):
+        """Test invalid snapshot files raise SnapshotError"""
+        path = tmp_path / "bad.snap"
+        path.write_bytes(b"not a snapshot at all, definitely")
+        with pytest.raises(SnapshotError):
+            open_snapshot(str(path))
+
+
+
+class TestCatalogDatabase:
+    """Test cases for the SQLite catalog backend"""
+    
+    def setup_method(self):
+        """Setup test environment"""
+        self.data = create_sample_data()
+        self.matrix = create_compatibility_matrix()
+    
+    def write(self, tmp_path):
+        path = str(tmp_path / "catalog.db")
+        write_catalog_db(path, self.data, self.matrix)
+        return path
+    
+    def test_round_trip(self, tmp_path):
+        """Test database gives the same catalog, matrix and rule index"""
+        data, matrix = open_catalog_db(self.write(tmp_path))
+        reference = CompatibilityMatrix.from_dict(self.matrix)
+        
+        assert list(data.components) == list(self.data.components)
+        for component_id, component in self.data.components.items():
+            assert data.components[component_id] == component
+            assert data.rules_for_component(component_id) == self.data.rules_for_component(component_id)
+            assert matrix.row(component_id) == reference.row(component_id)
+            for other_id in self.data.components:
+                assert matrix.compatible(component_id, other_id) == reference.compatible(component_id, other_id)
+        assert data.compatibility_rules == self.data.compatibility_rules
+        assert matrix.constrained_ids() == reference.constrained_ids()
+        for component_type in ComponentType:
+            assert data.get_components_by_type(component_type) == self.data.get_components_by_type(component_type)
+        assert "missing" not in data.components
+    
+    def test_rule_index_after_rule_changes(self, tmp_path):
+        """Test rules added or replaced since opening are found, in the copy too"""
+        data, _ = open_catalog_db(self.write(tmp_path))
+        unchanged = data.copy()
+        assert not unchanged._rules_changed
+        assert unchanged.rules_for_component("hp_ml350g4p") == self.data.rules_for_component("hp_ml350g4p")
+        
+        rule = CompatibilityRule("extra_rule", CompatibilityType.EXCLUDED, "hp_ml350g4p", "intel_xeon_e5620")
+        data.add_compatibility_rule(rule)
+        copied = data.copy()
+        assert rule in data.rules_for_component("hp_ml350g4p")
+        assert rule in copied.rules_for_component("intel_xeon_e5620")
+        
+        unchanged.compatibility_rules = [rule]
+        assert unchanged.rules_for_component("hp_ml350g4p") == [rule]
+        assert unchanged.copy().rules_for_component("hp_ml350g4p") == [rule]
+    
+    def test_full_text_search(self, tmp_path):
+        """Test FTS5 search matches in-memory substring search"""
+        data, _ = open_catalog_db(self.write(tmp_path))
+        for query, component_type in [("xeon", None), ("HP", None), ("ProLiant ML", None), ("ddr", ComponentType.MEMORY),
+                                      ("a", None), ('"', None), ("zzz", None)]:
+            assert data.search_components(query, component_type) == \
+                self.data.search_components(query, component_type)
+    
+    def test_replaced_component(self, tmp_path):
+        """Test a component replaced since opening is listed and searched once, by its new fields"""
+        data, _ = open_catalog_db(self.write(tmp_path))
+        old = data.components["hp_ml350g4p"]
+        renamed = Component("hp_ml350g4p", "Renamed Tower", ComponentType.SERVER, old.manufacturer, "Renamed",
+                            old.attributes, 1.0)
+        data.add_component(renamed)
+        
+        servers = data.get_components_by_type(ComponentType.SERVER)
+        assert [c.id for c in servers].count("hp_ml350g4p") == 1 and renamed in servers
+        assert data.search_components("Renamed Tower") == [renamed]
+        assert renamed not in data.search_components(old.name)
+    
+    def test_bounded_cache_keeps_updates(self, tmp_path):
+        """Test only accessed components are held, price updates survive eviction"""
+        data, _ = open_catalog_db(self.write(tmp_path), cache_size=3)
+        assert data.database.cached_components == 0
+        data.components["wd_1tb_sata"]
+        assert data.database.cached_components == 1
+        
+        assert data.apply_updates([("hp_ml350g4p", 99.0, False)]) == (["hp_ml350g4p"], [])
+        for component in self.data.components.values():
+            data.components[component.id]
+        assert data.database.cached_components == 3
+        assert (data.components["hp_ml350g4p"].price, data.components["hp_ml350g4p"].availability) == (99.0, False)
+    
+    def test_configurator_and_concurrent_readers(self, tmp_path):
+        """Test configurator sessions on the database from several threads"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        catalog = Catalog.load(database_path=self.write(tmp_path))
+        
+        def session(_):
+            configurator = ServerConfigurator(catalog=catalog)
+            assert configurator.add_component("hp_ml350g4p")[0]
+            assert not configurator.add_component("intel_xeon_e5620")[0]
+            return configurator.export_configuration("csv")
+        
+        with ThreadPoolExecutor(4) as executor:
+            exports = list(executor.map(session, range(16)))
+        reference = ServerConfigurator(catalog=Catalog.load())
+        reference.add_component("hp_ml350g4p")
+        assert exports == [reference.export_configuration("csv")] * 16
+        
+        with pytest.raises(CatalogDatabaseError):
+            open_catalog_db(str(tmp_path / "missing.db"))
+
+class TestVendorImport:
+    """Test cases for vendor price list import"""
+    
+    PRICE_LIST = (
+        "Part Number,Vendor,Model,Category,Price,Stock,Form Factor\n"
+        "P1,Hewlett Packard Enterprise,ML350 G4p,Server,\"1 250,00\",3,Tower\n"
+        "P2,Dell EMC,PowerEdge R750,Servers,\"$4,100.50\",0,2U\n"
+        "P3,DELL  EMC,PowerEdge-R750,Server,4000,5,2U\n"
+        "P4,Super Micro Computer Inc.,\"SYS-1029P\nrev. B\",Server,2100,1,1U\n"
+        "P5,Lenovo,ThinkSystem SR650,GPU,3000,1,2U\n"
+        ",,,,,,\n"
+    )
+    
+    def write(self, tmp_path, copies=1):
+        path = tmp_path / "vendor.csv"
+        header, body = self.PRICE_LIST.split("\n", 1)
+        path.write_text(header + "\n" + body * copies, encoding="utf-8")
+        return str(path)
+    
+    def test_normalization(self):
+        """Test manufacturer/model normalization and price parsing"""
+        assert normalize_manufacturer("hewlett-packard enterprise") == "HPE"
+        assert normalize_manufacturer("Super Micro Computer, Inc.") == "Supermicro"
+        assert dedup_key("HP", "ML350 G4p") == dedup_key("HPE", "ml350-g4p")
+        assert parse_price("1 250,00") == 1250.0
+        assert parse_price("$4,100.50") == 4100.5
+        assert parse_price("") is None
+        assert parse_price("$1,234") == 1234.0
+        assert parse_price("12.345,67") == 12345.67
+        assert parse_price("1,234,567") == 1234567.0
+        assert parse_price("12,5") == 12.5
+        with pytest.raises(VendorImportError):
+            parse_price("1,23,4")
+        assert component_type_for("SATA SSD") == ComponentType.SSD
+        assert component_type_for("SAS SSD") == ComponentType.SSD
+        assert component_type_for("NVMe SSD") == ComponentType.NVME
+        assert component_type_for("Server CPU") == ComponentType.PROCESSOR
+        assert component_type_for("Power supply unit") == ComponentType.POWER_SUPPLY
+        assert component_type_for("SAS RAID controller") == ComponentType.CONTROLLER
+    
+    def test_merge_into_catalog(self, tmp_path):
+        """Test rows dedup, update existing components and add new ones"""
+        data = create_sample_data()
+        version = data.version
+        data, stats = import_vendor_files([self.write(tmp_path)], data, workers=1)
+        
+        assert (stats.rows, stats.added, stats.updated, stats.duplicates, stats.skipped) == (5, 2, 2, 1, 1)
+        assert "Unknown component type 'gpu'" in stats.errors[0]
+        assert data.components["hp_ml350g4p"].price == 1250.0
+        assert data.components["hp_ml350g4p"].manufacturer == "HP"
+        
+        dell = data.components["dell_poweredger750"]
+        assert (dell.manufacturer, dell.price, dell.availability) == ("Dell", 4000.0, True)
+        assert ("form_factor", "2U") in [(a.name, a.value) for a in dell.attributes]
+        assert data.components["supermicro_sys1029prevb"].model == "SYS-1029P rev. B"
+        assert len(data.components) == 19
+        assert data.version > version
+    
+    def test_frozen_catalog_untouched(self, tmp_path):
+        """Test frozen catalogs are refused and a copy is imported without changing its source"""
+        frozen = create_sample_data()
+        frozen.freeze()
+        with pytest.raises(TypeError):
+            import_vendor_files([self.write(tmp_path)], frozen, workers=1)
+        
+        data, _ = import_vendor_files([self.write(tmp_path)], frozen.copy(), workers=1)
+        assert data.components["hp_ml350g4p"].price == 1250.0
+        assert frozen.components["hp_ml350g4p"].price != 1250.0
+        assert "dell_poweredger750" not in frozen.components and len(frozen.components) == 17
+    
+    def test_parallel_matches_serial(self, tmp_path):
+        """Test process pool import gives the same catalog as serial import"""
+        path = self.write(tmp_path, copies=20)
+        serial, serial_stats = import_vendor_files([path], workers=1, chunk_rows=7)
+        parallel, parallel_stats = import_vendor_files([path], workers=2, chunk_rows=7)
+        
+        assert list(parallel.components) == list(serial.components)
+        assert list(parallel.components.values()) == list(serial.components.values())
+        assert parallel_stats.format().split(" in ")[0] == serial_stats.format().split(" in ")[0]
+        assert serial_stats.duplicates == 20 * 4 - 3
+
+
 def test_sample_data_creation():
     """Test sample data creation"""
     from sample_data import create_sample_data, create_compatibility_matrix
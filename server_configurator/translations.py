@@ -1,28 +1,42 @@
 """
 Translations for Server Configurator
 Support for Russian and English languages
+
+UI strings are looked up in a CompiledTranslations table: one immutable dict
+per language with the fallback chain (language, English, key) merged at
+compile time, so a lookup is a single dict access. Sessions hold their table
+by reference; t() and set_language() use a process-wide default table.
+
+Catalog display strings (component names, descriptions, attribute names,
+values and units) are an overlay per language keyed by component id and
+attribute name, applied lazily on top of the one shared catalog by
+CatalogLocalizer.
 """
 
-from typing import Dict
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from data_models import Component, ComponentAttribute
+
+DEFAULT_LANGUAGE = "ru"
 
 class Translations:
-    """Translation manager"""
+    """Translation manager (mutable language, see CompiledTranslations for shared tables)"""
     
-    def __init__(self, language: str = "ru"):
+    def __init__(self, language: str = DEFAULT_LANGUAGE):
         self.language = language
-        self.translations = {
-            "ru": RUSSIAN,
-            "en": ENGLISH
-        }
+        self.translations = LANGUAGES
+        self.table = compile_translations(language)
     
-    def get(self, key: str) -> str:
-        """Get translation for key"""
-        return self.translations.get(self.language, ENGLISH).get(key, key)
+    def get(self, key: str, default: Optional[str] = None) -> str:
+        """Get translation for key (default, or the key itself, if missing)"""
+        return self.table.get(key, key if default is None else default)
     
     def set_language(self, language: str) -> None:
         """Set current language"""
         if language in self.translations:
             self.language = language
+            self.table = compile_translations(language)
 
 
 # Russian translations
@@ -45,6 +59,7 @@ RUSSIAN = {
     "attr_storage_bays": "Отсеков для дисков",
     "attr_power_supply_slots": "Слотов БП",
     "attr_socket_type": "Сокет",
+    "attr_socket": "Сокет",
     "attr_chipset": "Чипсет",
     "attr_frequency": "Частота",
     "attr_cores": "Ядер",
@@ -58,6 +73,7 @@ RUSSIAN = {
     "attr_power": "Мощность",
     "attr_efficiency": "КПД",
     "attr_modular": "Модульный",
+    "attr_read_speed": "Скорость чтения",
     
     # Messages
     "component_added": "Компонент добавлен",
@@ -97,6 +113,7 @@ RUSSIAN = {
     "unit_w": "Вт",
     "unit_v": "В",
     "unit_rpm": "об/мин",
+    "unit_mb/s": "МБ/с",
     
     # UI
     "available_components": "Доступные компоненты",
@@ -151,6 +168,7 @@ ENGLISH = {
     "attr_storage_bays": "Storage Bays",
     "attr_power_supply_slots": "PSU Slots",
     "attr_socket_type": "Socket",
+    "attr_socket": "Socket",
     "attr_chipset": "Chipset",
     "attr_frequency": "Frequency",
     "attr_cores": "Cores",
@@ -164,6 +182,7 @@ ENGLISH = {
     "attr_power": "Power",
     "attr_efficiency": "Efficiency",
     "attr_modular": "Modular",
+    "attr_read_speed": "Read Speed",
     
     # Messages
     "component_added": "Component added",
@@ -203,6 +222,7 @@ ENGLISH = {
     "unit_w": "W",
     "unit_v": "V",
     "unit_rpm": "RPM",
+    "unit_mb/s": "MB/s",
     
     # UI
     "available_components": "Available Components",
@@ -238,13 +258,265 @@ ENGLISH = {
 }
 
 
-# Global translation instance
-_translator = Translations("ru")
+# Catalog display strings per language on top of the shared catalog (English):
+# component id -> {"name": ..., "description": ...}; missing entries keep catalog strings
+COMPONENT_STRINGS = {
+    "ru": {
+        "hp_ml350g4p": {
+            "description": "Начальный серверный стоечный сервер с поддержкой двух процессоров",
+        },
+        "dell_poweredge_r710": {
+            "description": "Серверный стоечный сервер среднего уровня с большой емкостью памяти",
+        },
+        "ibm_x3650_m3": {
+            "description": "Высокопроизводительный стоечный сервер для критичных нагрузок",
+        },
+        "intel_xeon_3_0_604": {
+            "name": "Intel Xeon 3.0 ГГц",
+            "description": "Одноядерный процессор для серверов начального уровня",
+        },
+        "intel_xeon_3_2_604": {
+            "name": "Intel Xeon 3.2 ГГц",
+            "description": "Одноядерный процессор с повышенной частотой",
+        },
+        "intel_xeon_e5620": {
+            "description": "Четырехядерный процессор для высокопроизводительных задач",
+        },
+        "intel_xeon_x5670": {
+            "description": "Шестиядерный процессор топового уровня",
+        },
+        "kingston_1gb_ddr2_400": {
+            "name": "Kingston 1 ГБ DDR2-400",
+            "description": "Модуль памяти DDR2 начального уровня",
+        },
+        "corsair_2gb_ddr2_533": {
+            "name": "Corsair 2 ГБ DDR2-533",
+            "description": "Модуль памяти DDR2 повышенной емкости",
+        },
+        "samsung_4gb_ddr3_1333": {
+            "name": "Samsung 4 ГБ DDR3-1333",
+            "description": "Современный модуль памяти DDR3",
+        },
+        "crucial_8gb_ddr3_1600": {
+            "name": "Crucial 8 ГБ DDR3-1600",
+            "description": "Высокоемкий модуль памяти DDR3 с высокой частотой",
+        },
+        "seagate_500gb_sata": {
+            "name": "Seagate 500 ГБ SATA",
+            "description": "Надежный жесткий диск для базовых задач",
+        },
+        "wd_1tb_sata": {
+            "name": "Western Digital 1 ТБ SATA",
+            "description": "Емкий жесткий диск для хранения данных",
+        },
+        "intel_ssd_240gb": {
+            "name": "Intel SSD 240 ГБ SATA",
+            "description": "Быстрый твердотельный накопитель",
+        },
+        "hp_460w_psu": {
+            "name": "HP Блок питания 460 Вт",
+            "description": "Блок питания для серверов HP",
+        },
+        "dell_750w_psu": {
+            "name": "Dell Блок питания 750 Вт",
+            "description": "Энергоэффективный блок питания для серверов Dell",
+        },
+        "ibm_835w_psu": {
+            "name": "IBM Блок питания 835 Вт",
+            "description": "Высокоэффективный блок питания для серверов IBM",
+        },
+    },
+}
+
+# Attribute values that read differently per language (numbers and part names are kept),
+# by value or, for values that are only text in one attribute, by (attribute, value)
+VALUE_STRINGS = {
+    "ru": {
+        "4U Rack": "4U Стойка",
+        "2U Rack": "2U Стойка",
+        "Standard": "Стандартный",
+        "No": "Нет",
+        "Yes": "Да",
+        ("form_factor", "3.5"): '3.5"',
+        ("form_factor", "2.5"): '2.5"',
+    },
+}
+
+# (name, unit) of attributes whose name depends on the unit, or that carry a unit
+# only in some languages, by (attribute, catalog unit)
+ATTRIBUTE_STRINGS = {
+    "ru": {
+        ("speed", "MHz"): ("Частота", "МГц"),
+        ("max_memory_gb", None): ("Макс. памяти", "ГБ"),
+    },
+}
+
+
+class LocalizedComponent:
+    """
+    Display view of a catalog component in one language
+    Name, description and attributes are localized; everything else (price,
+    availability, ids) is read from the catalog component, so it stays current
+    """
+    
+    __slots__ = ("component", "name", "description", "attributes")
+    
+    def __init__(self, component: Component, name: str, description: Optional[str],
+                 attributes: List[ComponentAttribute]):
+        self.component = component
+        self.name = name
+        self.description = description
+        self.attributes = attributes
+    
+    def __getattr__(self, item):
+        return getattr(self.component, item)
+
+
+class CatalogLocalizer:
+    """
+    Localized views of catalog components for one language
+    Views are built on first use and cached by component id; a component
+    replaced in the catalog (reload), or edited in place under a new catalog
+    version (vendor import), gets a new view
+    """
+    
+    def __init__(self, language: str):
+        self.language = language
+        self.translations = compile_translations(language)
+        self.strings = COMPONENT_STRINGS.get(language, {})
+        self.values = VALUE_STRINGS.get(language, {})
+        self.attributes = ATTRIBUTE_STRINGS.get(language, {})
+        self._views: Dict[str, Tuple[Component, Optional[int], LocalizedComponent]] = {}
+    
+    def attribute(self, attribute: ComponentAttribute) -> ComponentAttribute:
+        """Attribute with localized name, value and unit"""
+        get = self.translations.get
+        value = self.values.get((attribute.name, attribute.value)) or self.values.get(attribute.value, attribute.value)
+        override = self.attributes.get((attribute.name, attribute.unit))
+        if override is not None:
+            return ComponentAttribute(override[0], value, override[1], attribute.is_required)
+        return ComponentAttribute(
+            get(f"attr_{attribute.name}", attribute.name),
+            value,
+            get(f"unit_{attribute.unit.lower()}", attribute.unit) if attribute.unit else attribute.unit,
+            attribute.is_required
+        )
+    
+    def component(self, component: Component, version: Optional[int] = None) -> LocalizedComponent:
+        """Localized view of a catalog component, version is the structural version of its catalog"""
+        cached = self._views.get(component.id)
+        if cached is not None and cached[0] is component and (version is None or cached[1] == version):
+            return cached[2]
+        strings = self.strings.get(component.id, {})
+        view = LocalizedComponent(
+            component,
+            strings.get("name", component.name),
+            strings.get("description", component.description),
+            [self.attribute(attribute) for attribute in component.attributes]
+        )
+        self._views[component.id] = (component, version, view)
+        return view
+    
+    def components(self, components: Iterable[Component], version: Optional[int] = None) -> List[LocalizedComponent]:
+        """Localized views of a list of components"""
+        return [self.component(component, version) for component in components]
+
+
+_localizers: Dict[str, CatalogLocalizer] = {}
+
+
+def localizer(language: Optional[str] = None) -> CatalogLocalizer:
+    """Shared localizer for language (the global language by default)"""
+    language = language or _current.language
+    result = _localizers.get(language)
+    if result is None:
+        result = _localizers.setdefault(language, CatalogLocalizer(language))
+    return result
+
+
+def localize(component: Component, language: Optional[str] = None,
+             version: Optional[int] = None) -> LocalizedComponent:
+    """Localized view of a catalog component"""
+    return localizer(language).component(component, version)
+
+
+# Language -> translations; FALLBACKS lists where missing keys are taken from
+LANGUAGES = {
+    "ru": RUSSIAN,
+    "en": ENGLISH,
+}
+FALLBACKS = {
+    "ru": ("en",),
+}
+
+
+class CompiledTranslations:
+    """
+    Immutable lookup table for one language, safe to share between sessions and threads
+    Keys missing in the language are resolved from FALLBACKS at compile time.
+    get is the merged dict's own get, so a lookup is one C call with no Python frame;
+    table is a read-only view of the same dict
+    """
+    
+    __slots__ = ("language", "table", "get")
+    
+    def __init__(self, language: str, table: Mapping[str, str]):
+        merged = dict(table)
+        object.__setattr__(self, "language", language)
+        object.__setattr__(self, "table", MappingProxyType(merged))
+        object.__setattr__(self, "get", merged.get)  # get(key, default=None), as dict.get
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("CompiledTranslations is immutable, compile another language instead")
+    
+    def __getitem__(self, key: str) -> str:
+        """Translation for key, the key itself if missing"""
+        return self.get(key, key)
+    
+    def translate_many(self, keys: Iterable[str]) -> List[str]:
+        """Translations for many keys at once (missing keys are returned as is)"""
+        get = self.get
+        return [get(key, key) for key in keys]
+    
+    def components(self, components: Iterable[Component],
+                   version: Optional[int] = None) -> List["LocalizedComponent"]:
+        """Localized views of catalog components in this language"""
+        return localizer(self.language).components(components, version)
+
+
+_compiled: Dict[str, CompiledTranslations] = {}
+
+
+def compile_translations(language: str) -> CompiledTranslations:
+    """
+    Shared compiled table for language (compiled once per process)
+    Unknown languages get the English table, as Translations always did; it is the
+    "en" table itself, so arbitrary language strings do not add tables
+    """
+    if language not in LANGUAGES:
+        language = "en"
+    compiled = _compiled.get(language)
+    if compiled is None:
+        chain = (language,) + FALLBACKS.get(language, ())
+        table: Dict[str, str] = {}
+        for name in reversed(chain):
+            table.update(LANGUAGES[name])
+        compiled = _compiled.setdefault(language, CompiledTranslations(language, table))
+    return compiled
+
+
+# Process-wide default table for t(), replaced (never changed) by set_language();
+# _lookup is its dict.get, bound once so t() costs one C call
+_current = compile_translations(DEFAULT_LANGUAGE)
+_lookup = _current.get
 
 def t(key: str) -> str:
     """Get translation for key"""
-    return _translator.get(key)
+    return _lookup(key, key)
 
 def set_language(language: str) -> None:
-    """Set global language"""
-    _translator.set_language(language)
+    """Set global language (sessions keep their own table, see ServerConfigurator.set_language)"""
+    global _current, _lookup
+    if language in LANGUAGES:
+        _current = compile_translations(language)
+        _lookup = _current.get
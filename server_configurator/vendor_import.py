@@ -0,0 +1,459 @@
+"""
+Vendor price list import for server configurator
+Parses large vendor CSV files in parallel chunks and merges them into a catalog
+
+Vendor files differ in column names, so columns are matched by aliases:
+    sku, manufacturer, model, name, type, price, availability, description
+Any other non-empty column becomes a component attribute ("attr:<name>[:<unit>]"
+columns are accepted as well).
+
+Rows are deduplicated on the normalized (manufacturer, model) pair, both within
+the import and against components already in the catalog: a known pair updates
+the existing component (price, availability, attributes), a new one is added.
+
+Usage: python vendor_import.py <file.csv> [...] [--workers N] [--export DIR]
+"""
+
+import csv
+import dataclasses
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from data_models import Component, ComponentAttribute, ComponentType, ServerConfiguratorData
+
+CHUNK_ROWS = 5000
+MAX_REPORTED_ERRORS = 20
+
+COLUMN_ALIASES = {
+    "sku": ("sku", "part_number", "part number", "partnumber", "pn", "article", "артикул"),
+    "manufacturer": ("manufacturer", "vendor", "brand", "производитель", "бренд"),
+    "model": ("model", "модель"),
+    "name": ("name", "title", "product", "наименование", "название"),
+    "type": ("type", "category", "component_type", "категория", "тип"),
+    "price": ("price", "unit_price", "unit price", "цена"),
+    "availability": ("availability", "stock", "qty", "quantity", "in_stock", "наличие", "остаток"),
+    "description": ("description", "описание"),
+}
+
+# Normalized manufacturer key -> display name (brands from Files/configurator_brands)
+MANUFACTURERS = {
+    "hpe": "HPE",
+    "dell": "Dell",
+    "lenovo": "Lenovo",
+    "huawei": "Huawei",
+    "xfusion": "xFusion",
+    "supermicro": "Supermicro",
+    "inspur": "Inspur",
+    "fujitsu": "Fujitsu",
+    "ibm": "IBM",
+    "h3c": "H3C",
+    "intel": "Intel",
+    "amd": "AMD",
+}
+
+MANUFACTURER_ALIASES = {
+    "hp": "hpe",
+    "hewlett packard": "hpe",
+    "hewlett packard enterprise": "hpe",
+    "hp enterprise": "hpe",
+    "dell emc": "dell",
+    "dell technologies": "dell",
+    "emc": "dell",
+    "super micro": "supermicro",
+    "super micro computer": "supermicro",
+    "huawei technologies": "huawei",
+    "fujitsu technology solutions": "fujitsu",
+    "fts": "fujitsu",
+    "inspur systems": "inspur",
+    "intel corporation": "intel",
+}
+
+# Vendor category (lowercase) -> component type
+TYPE_ALIASES = {
+    "server": ComponentType.SERVER, "servers": ComponentType.SERVER, "сервер": ComponentType.SERVER,
+    "cpu": ComponentType.PROCESSOR, "processor": ComponentType.PROCESSOR, "процессор": ComponentType.PROCESSOR,
+    "memory": ComponentType.MEMORY, "ram": ComponentType.MEMORY, "dimm": ComponentType.MEMORY,
+    "память": ComponentType.MEMORY, "оперативная память": ComponentType.MEMORY,
+    "storage": ComponentType.STORAGE,
+    "ssd": ComponentType.SSD, "nvme": ComponentType.NVME,
+    "hdd": ComponentType.HDD_SAS_SATA, "sas": ComponentType.HDD_SAS_SATA, "sata": ComponentType.HDD_SAS_SATA,
+    "жесткий диск": ComponentType.HDD_SAS_SATA, "scsi": ComponentType.HDD_U320, "u320": ComponentType.HDD_U320,
+    "controller": ComponentType.CONTROLLER, "raid": ComponentType.CONTROLLER, "hba": ComponentType.CONTROLLER,
+    "контроллер": ComponentType.CONTROLLER,
+    "network": ComponentType.NETWORK, "nic": ComponentType.NETWORK, "сетевая карта": ComponentType.NETWORK,
+    "psu": ComponentType.POWER_SUPPLY, "power supply": ComponentType.POWER_SUPPLY,
+    "блок питания": ComponentType.POWER_SUPPLY,
+    "cooling": ComponentType.COOLING, "fan": ComponentType.COOLING, "heatsink": ComponentType.COOLING,
+    "охлаждение": ComponentType.COOLING,
+    "chassis": ComponentType.CHASSIS, "корпус": ComponentType.CHASSIS,
+}
+TYPE_ALIASES.update({component_type.value: component_type for component_type in ComponentType})
+
+# When a category names several types ("SATA SSD", "Server CPU", "SAS RAID controller"),
+# the more specific one wins: drives over their interface, parts over the server
+TYPE_PRECEDENCE = (
+    ComponentType.NVME, ComponentType.SSD, ComponentType.PROCESSOR, ComponentType.MEMORY,
+    ComponentType.NETWORK, ComponentType.CONTROLLER, ComponentType.POWER_SUPPLY, ComponentType.COOLING,
+    ComponentType.HDD_U320, ComponentType.HDD_SAS_SATA, ComponentType.CHASSIS, ComponentType.STORAGE,
+    ComponentType.SERVER,
+)
+
+_AVAILABLE = {"1", "true", "yes", "y", "in stock", "available", "да", "есть", "в наличии"}
+_NON_ALPHANUMERIC = re.compile(r"[^0-9a-zа-яё]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class VendorImportError(ValueError):
+    """Invalid vendor file or row"""
+
+
+@dataclass
+class ImportStats:
+    """Counters of a vendor import"""
+    rows: int = 0
+    skipped: int = 0
+    duplicates: int = 0
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)  # first MAX_REPORTED_ERRORS messages
+    
+    @property
+    def rows_per_second(self) -> float:
+        """Import throughput"""
+        return self.rows / self.seconds if self.seconds else 0.0
+    
+    def format(self) -> str:
+        """One-line summary"""
+        return (f"{self.rows} rows: {self.added} added, {self.updated} updated, {self.unchanged} unchanged, "
+                f"{self.duplicates} duplicates, {self.skipped} skipped "
+                f"in {self.seconds:.3f}s ({self.rows_per_second:,.0f} rows/s)")
+
+
+# Normalization
+
+def _clean(value: Optional[str]) -> str:
+    """Strip and collapse whitespace"""
+    return _WHITESPACE.sub(" ", value).strip() if value else ""
+
+
+def manufacturer_key(manufacturer: str) -> str:
+    """Normalized manufacturer used for deduplication ("Hewlett Packard Enterprise" -> "hpe")"""
+    key = _NON_ALPHANUMERIC.sub(" ", manufacturer.lower()).strip()
+    for suffix in (" inc", " corp", " corporation", " ltd", " co", " llc", " gmbh"):
+        if key.endswith(suffix):
+            key = key[:-len(suffix)].strip()
+    key = MANUFACTURER_ALIASES.get(key, key)
+    return key.replace(" ", "")
+
+
+def normalize_manufacturer(manufacturer: str) -> str:
+    """Display name of a manufacturer ("hewlett-packard enterprise" -> "HPE")"""
+    return MANUFACTURERS.get(manufacturer_key(manufacturer), _clean(manufacturer))
+
+
+def model_key(model: str) -> str:
+    """Normalized model used for deduplication ("ML350 G4p" -> "ml350g4p")"""
+    return _NON_ALPHANUMERIC.sub("", model.lower())
+
+
+def dedup_key(manufacturer: str, model: str) -> Tuple[str, str]:
+    """Identity of a product across vendor files and the catalog"""
+    return manufacturer_key(manufacturer), model_key(model)
+
+
+def component_type_for(category: str) -> ComponentType:
+    """Map vendor category onto ComponentType, aliases match as whole words or phrases"""
+    category = _clean(category).lower()
+    if category in TYPE_ALIASES:
+        return TYPE_ALIASES[category]
+    words = " " + " ".join(_NON_ALPHANUMERIC.sub(" ", category).split()) + " "
+    found = {component_type for alias, component_type in TYPE_ALIASES.items() if f" {alias} " in words}
+    for component_type in TYPE_PRECEDENCE:
+        if component_type in found:
+            return component_type
+    raise VendorImportError(f"Unknown component type '{category}'")
+
+
+def parse_price(value: Optional[str]) -> Optional[float]:
+    """
+    Parse vendor price ("1 234,50", "$1,234.50", "12.345,67", "1,234,567")
+    With both separators the last one is the decimal point; a single kind of
+    separator is a thousands separator when it repeats or is followed by
+    exactly three digits, the decimal point otherwise
+    """
+    original = value
+    value = _clean(value)
+    if not value:
+        return None
+    value = re.sub(r"[^\d,.\-]", "", value)
+    separators = [char for char in value if char in ",."]
+    decimal = None
+    if len(set(separators)) == 2:
+        decimal = separators[-1]
+    elif separators:
+        separator = separators[0]
+        integer, _, fraction = value.partition(separator)
+        if len(separators) == 1 and (len(fraction) != 3 or integer.lstrip("-") in ("", "0")):
+            decimal = separator
+    if decimal is not None:
+        integer, _, fraction = value.rpartition(decimal)
+    else:
+        integer, fraction = value, ""
+    groups = re.split(r"[,.]", integer)
+    if len(groups) > 1 and (not 1 <= len(groups[0].lstrip("-")) <= 3 or
+                            any(len(group) != 3 for group in groups[1:])):
+        raise VendorImportError(f"Invalid price '{_clean(original)}'")
+    try:
+        return float("".join(groups) + ("." + fraction if decimal is not None else ""))
+    except ValueError:
+        raise VendorImportError(f"Invalid price '{_clean(original)}'") from None
+
+
+def parse_availability(value: Optional[str]) -> bool:
+    """Stock column: quantity or yes/no, missing means available"""
+    value = _clean(value).lower()
+    if not value:
+        return True
+    try:
+        return float(value.replace(",", ".")) > 0
+    except ValueError:
+        return value in _AVAILABLE
+
+
+def map_columns(header: List[str]) -> Dict[str, int]:
+    """Column positions of known fields, unknown columns keep their own name"""
+    columns = {}
+    for position, column in enumerate(header):
+        name = _clean(column).lower()
+        for target, aliases in COLUMN_ALIASES.items():
+            if name in aliases:
+                columns.setdefault(target, position)
+                break
+        else:
+            columns.setdefault(_clean(column), position)
+    return columns
+
+
+def component_from_row(row: List[str], columns: Dict[str, int],
+                       default_manufacturer: Optional[str] = None) -> Component:
+    """Build normalized Component from a vendor CSV row"""
+    def cell(name):
+        position = columns.get(name)
+        return _clean(row[position]) if position is not None and position < len(row) else ""
+    
+    sku = cell("sku")
+    manufacturer = cell("manufacturer") or default_manufacturer or ""
+    model = cell("model") or sku
+    if not manufacturer or not model_key(model):
+        raise VendorImportError("Missing manufacturer or model")
+    
+    brand, product = dedup_key(manufacturer, model)
+    manufacturer = normalize_manufacturer(manufacturer)
+    attributes = [ComponentAttribute("sku", sku)] if sku else []
+    for name, position in columns.items():
+        if name in COLUMN_ALIASES or position >= len(row) or not _clean(row[position]):
+            continue
+        if name.startswith("attr:"):
+            _, name, *unit = name.split(":", 2)
+            attributes.append(ComponentAttribute(name, _clean(row[position]), unit[0] if unit else None))
+        else:
+            attributes.append(ComponentAttribute(name.lower().replace(" ", "_"), _clean(row[position])))
+    
+    return Component(
+        id=f"{brand}_{product}",
+        name=cell("name") or f"{manufacturer} {model}",
+        component_type=component_type_for(cell("type")),
+        manufacturer=manufacturer,
+        model=model,
+        attributes=attributes,
+        price=parse_price(cell("price")),
+        availability=parse_availability(cell("availability")),
+        description=cell("description") or None
+    )
+
+
+# Chunked parsing
+
+def iter_chunks(path: str, chunk_rows: int = CHUNK_ROWS) -> Iterator[Tuple[str, List[str], int, List[str]]]:
+    """
+    Split a CSV file into (path, header, first line number, raw lines) chunks
+    Chunks end only outside quoted fields, so multi-line cells stay intact
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as stream:
+        header = next(csv.reader([stream.readline()]), None)
+        if not header:
+            raise VendorImportError(f"Empty vendor file {path}")
+        lines: List[str] = []
+        start = line_number = 2
+        quoted = False
+        for line in stream:
+            lines.append(line)
+            line_number += 1
+            if line.count('"') % 2:
+                quoted = not quoted
+            if not quoted and len(lines) >= chunk_rows:
+                yield path, header, start, lines
+                lines, start = [], line_number
+        if lines:
+            yield path, header, start, lines
+
+
+def parse_chunk(chunk: Tuple[str, List[str], int, List[str]],
+                default_manufacturer: Optional[str] = None) -> Tuple[List[Component], int, List[str]]:
+    """Parse one chunk (runs in a worker process), returns (components, rows, errors)"""
+    path, header, start, lines = chunk
+    columns = map_columns(header)
+    components = []
+    errors = []
+    rows = 0
+    for offset, row in enumerate(csv.reader(lines)):
+        if not any(cell.strip() for cell in row):
+            continue
+        rows += 1
+        try:
+            components.append(component_from_row(row, columns, default_manufacturer))
+        except VendorImportError as e:
+            errors.append(f"{os.path.basename(path)}:{start + offset}: {e}")
+    return components, rows, errors
+
+
+def _parse_chunks(chunks: Iterable, workers: int, default_manufacturer: Optional[str]) -> Iterator[tuple]:
+    """Parse chunks in order, with at most 2 * workers chunks in flight"""
+    if workers <= 1:
+        for chunk in chunks:
+            yield parse_chunk(chunk, default_manufacturer)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(parse_chunk, chunk, default_manufacturer))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+# Merging
+
+def merge_component(existing: Component, incoming: Component) -> bool:
+    """
+    Update existing component in place from an imported one, returns True if anything changed
+    existing must not be shared with a frozen catalog (copy it first, as import_vendor_files does)
+    """
+    changed = False
+    if incoming.price is not None and incoming.price != existing.price:
+        existing.price = incoming.price
+        changed = True
+    if incoming.availability != existing.availability:
+        existing.availability = incoming.availability
+        changed = True
+    if incoming.description and not existing.description:
+        existing.description = incoming.description
+        changed = True
+    
+    positions = {attribute.name: index for index, attribute in enumerate(existing.attributes)}
+    for attribute in incoming.attributes:
+        index = positions.get(attribute.name)
+        if index is None:
+            existing.attributes.append(attribute)
+            changed = True
+        elif existing.attributes[index].value != attribute.value:
+            existing.attributes[index] = attribute
+            changed = True
+    return changed
+
+
+def import_vendor_files(paths: List[str], data: Optional[ServerConfiguratorData] = None,
+                        workers: Optional[int] = None, chunk_rows: int = CHUNK_ROWS,
+                        default_manufacturer: Optional[str] = None
+                        ) -> Tuple[ServerConfiguratorData, ImportStats]:
+    """
+    Import vendor CSV files into a catalog (a new one if data is None)
+    Chunks are parsed by a process pool and merged as they arrive, in file order,
+    so later rows for the same product win. data must not be frozen: import into data.copy(),
+    matched components are replaced rather than edited, so the source catalog is left as it was
+    """
+    start = time.perf_counter()
+    data = ServerConfiguratorData() if data is None else data
+    data.check_writable()
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    stats = ImportStats()
+    
+    index = {dedup_key(c.manufacturer, c.model): c for c in data.components.values()}
+    seen = set()
+    version = data.version
+    updated = False
+    
+    chunks = (chunk for path in paths for chunk in iter_chunks(path, chunk_rows))
+    for components, rows, errors in _parse_chunks(chunks, workers, default_manufacturer):
+        stats.rows += rows
+        stats.skipped += len(errors)
+        stats.errors.extend(errors[:MAX_REPORTED_ERRORS - len(stats.errors)])
+        
+        for component in components:
+            key = dedup_key(component.manufacturer, component.model)
+            if key in seen:
+                stats.duplicates += 1
+            seen.add(key)
+            
+            existing = index.get(key)
+            if existing is None:
+                base_id, suffix = component.id, 1
+                while component.id in data.components:  # different product with the same slug
+                    suffix += 1
+                    component.id = f"{base_id}_{suffix}"
+                data.add_component(component)
+                index[key] = component
+                stats.added += 1
+                continue
+            merged = dataclasses.replace(existing, attributes=list(existing.attributes))
+            if merge_component(merged, component):
+                data.components[merged.id] = merged
+                index[key] = merged
+                updated = True
+                stats.updated += 1
+            else:
+                stats.unchanged += 1
+    
+    if updated and data.version == version:
+        data.version += 1
+    stats.seconds = time.perf_counter() - start
+    return data, stats
+
+
+def main(argv: List[str]) -> None:
+    """Import vendor files into the sample catalog and print stats"""
+    paths, options = [], {}
+    arguments = iter(argv)
+    for argument in arguments:
+        if argument.startswith("--"):
+            options[argument] = next(arguments, None)
+        else:
+            paths.append(argument)
+    if not paths:
+        print(__doc__)
+        return
+    from sample_data import create_sample_data, create_compatibility_matrix
+    
+    workers = int(options["--workers"]) if "--workers" in options else None
+    data, stats = import_vendor_files(paths, create_sample_data(), workers)
+    print(stats.format())
+    for error in stats.errors:
+        print(f"  {error}")
+    if "--export" in options:
+        from catalog_loader import dump_catalog
+        dump_catalog(data, create_compatibility_matrix(), options["--export"])
+        print(f"Exported {len(data.components)} components to {options['--export']}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])